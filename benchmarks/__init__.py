@@ -0,0 +1,9 @@
+import os
+
+# The application settings are validated on import, provide dummy values so the
+# benchmarks can be run without a configured environment.
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "benchmark")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "benchmark")
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+os.environ.setdefault("SECRET_APP_CONFIG_PATH", "benchmark_app_config_path")
+os.environ.setdefault("ENVIRONMENT", "BENCH")
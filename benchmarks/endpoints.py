@@ -0,0 +1,511 @@
+"""Throughput, latency and allocations of every route of the payment and Saleor apps.
+
+Drives each route through the ASGI apps with stand-ins for Stripe, the Saleor API and
+Secrets Manager answering after the given latencies. Saleor webhooks carry real JWS
+signatures and Stripe webhooks real signature headers, so signature checks, the JWKS
+and config caches and event reporting run as in a warm Lambda. Every request belongs
+to a new transaction or checkout, so idempotency and tax calculation caches miss.
+
+`--save` stores the results as the baseline, later runs are compared with it and fail
+when an endpoint's throughput, p99 latency or allocations get worse by more than
+`--tolerance`. Baselines depend on the machine and are not committed.
+
+    uv run python -m benchmarks.endpoints --save
+    uv run python -m benchmarks.endpoints --endpoint calculate-tax
+"""
+
+import argparse
+import asyncio
+import copy
+import json
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import httpx
+import jwt
+import stripe
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import FastAPI
+from jwt.algorithms import RSAAlgorithm
+
+from benchmarks.payloads import (
+    calculate_taxes_payload,
+    payment_gateway_initialize_session_payload,
+    stripe_payment_intent,
+    stripe_refund,
+    stripe_tax_calculation,
+    transaction_action_requested_payload,
+    transaction_initialize_session_payload,
+    transaction_process_session_payload,
+)
+from benchmarks.utils import (
+    FakeSaleorTransport,
+    FakeSecretsManagerClient,
+    RoutingStripeHTTPClient,
+    run_concurrently,
+)
+from nimara_stripe.api.saleor.app import app as saleor_app
+from nimara_stripe.api.stripe.app import app as payment_app
+from nimara_stripe.services.saleor.client import SaleorClient, get_saleor_client_pool
+from nimara_stripe.services.saleor.storage import SecretsManagerConfigStorage
+from nimara_stripe.services.stripe.client import invalidate_stripe_clients
+from nimara_stripe.utils.helpers import get_logger
+from nimara_stripe.utils.metrics import metrics
+
+SALEOR_DOMAIN = "example.saleor.com"
+SALEOR_API_URL = f"https://{SALEOR_DOMAIN}/graphql/"
+CHANNEL_SLUG = "default-channel"
+SECRET_ID = "benchmark/saleor-configs"
+STRIPE_WEBHOOK_SECRET = "whsec_test"
+KEY_ID = "benchmark"
+
+
+@dataclass
+class Endpoint:
+    name: str
+    app: FastAPI
+    method: str
+    path: str
+    # Keyword arguments of `httpx.AsyncClient.request` for the n-th request.
+    request: Callable[[int], dict[str, Any]]
+
+
+@dataclass
+class EndpointResult:
+    throughput: float
+    p50: float
+    p99: float
+    allocated_kib: float
+
+
+class Signer:
+    """Signs webhooks and dashboard tokens like Saleor, with a key served as its JWKS."""
+
+    def __init__(self) -> None:
+        self.private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        jwk = json.loads(RSAAlgorithm.to_jwk(self.private_key.public_key()))
+        self.jwks = json.dumps({"keys": [{**jwk, "use": "sig", "kid": KEY_ID}]})
+
+    def sign_webhook(self, body: bytes) -> str:
+        return jwt.api_jws.encode(
+            body,
+            self.private_key,
+            algorithm="RS256",
+            headers={"kid": KEY_ID, "b64": False, "crit": ["b64"]},
+            is_payload_detached=True,
+        )
+
+    def dashboard_token(self) -> str:
+        return jwt.encode(
+            {
+                "iss": SALEOR_API_URL,
+                "email": "staff@example.com",
+                "is_staff": True,
+                "token": "user-token",
+                "user_id": "user_1",
+                "permissions": ["MANAGE_APPS"],
+                "user_permissions": ["MANAGE_APPS"],
+                "exp": int(time.time()) + 3600,
+            },
+            self.private_key,
+            algorithm="RS256",
+            headers={"kid": KEY_ID},
+        )
+
+
+def get_saleor_client_class(transport: httpx.AsyncBaseTransport) -> type[SaleorClient]:
+    class BenchmarkSaleorClient(SaleorClient):
+        def __init__(
+            self, saleor_url: str, api_key: str | None, timeout: httpx.Timeout | None = None
+        ) -> None:
+            super().__init__(saleor_url, api_key, timeout)
+            self.http_client = httpx.AsyncClient(
+                base_url=saleor_url, headers=self.http_client.headers, transport=transport
+            )
+
+    return BenchmarkSaleorClient
+
+
+def get_saleor_configs() -> dict[str, Any]:
+    return {
+        SALEOR_DOMAIN: {
+            "saleor_domain": SALEOR_DOMAIN,
+            "saleor_app_id": "app_1",
+            "auth_token": "app-token",
+            "stripe_configurations_for_channels": {
+                CHANNEL_SLUG: {
+                    "stripe_pub_key": "pk_test",
+                    "stripe_secret_key": "sk_test",
+                    "stripe_webhook_secret_key": STRIPE_WEBHOOK_SECRET,
+                    "estimate_checkout_taxes": False,
+                }
+            },
+        }
+    }
+
+
+def get_stripe_routes(lines: int) -> dict[str, dict[str, Any]]:
+    return {
+        "/v1/payment_intents": stripe_payment_intent(),
+        "/v1/payment_intents/pi_123/capture": stripe_payment_intent(status="succeeded"),
+        "/v1/payment_intents/pi_123/cancel": stripe_payment_intent(status="canceled"),
+        "/v1/refunds": stripe_refund(),
+        "/v1/tax/calculations": stripe_tax_calculation(lines=lines),
+    }
+
+
+def get_endpoints(signer: Signer, lines: int) -> list[Endpoint]:
+    def saleor_webhook(build: Callable[[int], dict[str, Any]]) -> Callable[[int], dict[str, Any]]:
+        def request(index: int) -> dict[str, Any]:
+            body = json.dumps(build(index)).encode()
+            return {
+                "content": body,
+                "headers": {
+                    "Content-Type": "application/json",
+                    "Saleor-Domain": SALEOR_DOMAIN,
+                    "Saleor-Api-Url": SALEOR_API_URL,
+                    "Saleor-Event": "benchmark",
+                    "Saleor-Signature": signer.sign_webhook(body),
+                },
+            }
+
+        return request
+
+    def with_transaction(payload: dict[str, Any]) -> Callable[[int], dict[str, Any]]:
+        def build(index: int) -> dict[str, Any]:
+            event = copy.deepcopy(payload)
+            event["transaction"]["id"] = f"transaction_{index}"
+            return event
+
+        return build
+
+    def checkout_taxes(index: int) -> dict[str, Any]:
+        event = calculate_taxes_payload(lines=lines)
+        # A different total for every request, so the tax calculation cache misses.
+        event["taxBase"]["lines"][0]["totalPrice"]["amount"] = 100 + index / 100
+        return event
+
+    def stripe_webhook(index: int) -> dict[str, Any]:
+        payment_intent = stripe_payment_intent(status="succeeded")
+        payment_intent["id"] = f"pi_{index}"
+        payment_intent["metadata"] = {
+            "transactionId": f"transaction_{index}",
+            "channelSlug": CHANNEL_SLUG,
+            "saleorDomain": SALEOR_DOMAIN,
+        }
+        body = json.dumps(
+            {
+                "id": f"evt_{index}",
+                "object": "event",
+                "type": "payment_intent.succeeded",
+                "created": 1731045944,
+                "data": {"object": payment_intent},
+            }
+        )
+        timestamp = int(time.time())
+        signature = stripe.WebhookSignature._compute_signature(
+            f"{timestamp}.{body}", STRIPE_WEBHOOK_SECRET
+        )
+        return {
+            "content": body.encode(),
+            "headers": {
+                "Content-Type": "application/json",
+                "Stripe-Signature": f"t={timestamp},v1={signature}",
+            },
+        }
+
+    def dashboard_form(fields: dict[str, str]) -> Callable[[int], dict[str, Any]]:
+        def request(index: int) -> dict[str, Any]:
+            return {
+                "params": {"domain": SALEOR_DOMAIN},
+                "data": {"jwt": signer.dashboard_token(), **fields},
+            }
+
+        return request
+
+    return [
+        Endpoint(
+            "gateway",
+            payment_app,
+            "POST",
+            "/payment/gateway",
+            saleor_webhook(lambda _: payment_gateway_initialize_session_payload(lines=lines)),
+        ),
+        Endpoint(
+            "initialize-session",
+            payment_app,
+            "POST",
+            "/payment/initialize-session",
+            saleor_webhook(with_transaction(transaction_initialize_session_payload(lines=lines))),
+        ),
+        Endpoint(
+            "process-session",
+            payment_app,
+            "POST",
+            "/payment/process-session",
+            saleor_webhook(with_transaction(transaction_process_session_payload(lines=lines))),
+        ),
+        Endpoint(
+            "charge",
+            payment_app,
+            "POST",
+            "/payment/charge",
+            saleor_webhook(
+                with_transaction(
+                    transaction_action_requested_payload(
+                        "TransactionChargeRequested", "CHARGE", lines=lines
+                    )
+                )
+            ),
+        ),
+        Endpoint(
+            "cancel",
+            payment_app,
+            "POST",
+            "/payment/cancel",
+            saleor_webhook(
+                with_transaction(
+                    transaction_action_requested_payload(
+                        "TransactionCancelationRequested", "CANCEL"
+                    )
+                )
+            ),
+        ),
+        Endpoint(
+            "refund",
+            payment_app,
+            "POST",
+            "/payment/refund",
+            saleor_webhook(
+                with_transaction(
+                    transaction_action_requested_payload(
+                        "TransactionRefundRequested", "REFUND", lines=lines
+                    )
+                )
+            ),
+        ),
+        Endpoint(
+            "calculate-tax",
+            payment_app,
+            "POST",
+            "/payment/calculate-tax",
+            saleor_webhook(checkout_taxes),
+        ),
+        Endpoint("webhook", payment_app, "POST", "/payment/webhook", stripe_webhook),
+        Endpoint("manifest", saleor_app, "GET", "/saleor/manifest", lambda _: {}),
+        Endpoint(
+            "register",
+            saleor_app,
+            "POST",
+            "/saleor/register",
+            lambda _: {
+                "json": {"auth_token": "app-token"},
+                "headers": {"Saleor-Domain": SALEOR_DOMAIN, "Saleor-Api-Url": SALEOR_API_URL},
+            },
+        ),
+        Endpoint(
+            "app",
+            saleor_app,
+            "GET",
+            "/saleor/app",
+            lambda _: {"params": {"domain": SALEOR_DOMAIN, "saleorApiUrl": SALEOR_API_URL}},
+        ),
+        Endpoint("data-fetch", saleor_app, "POST", "/saleor/app/data/fetch", dashboard_form({})),
+        Endpoint(
+            "update-channel-config",
+            saleor_app,
+            "POST",
+            "/saleor/app/data/update-channel-config",
+            dashboard_form(
+                {
+                    "channel_slug": CHANNEL_SLUG,
+                    "stripe_pub_key": "pk_test",
+                    "stripe_secret_key": "sk_test",
+                    "stripe_webhook_secret_key": STRIPE_WEBHOOK_SECRET,
+                }
+            ),
+        ),
+    ]
+
+
+async def run_endpoint(endpoint: Endpoint, args: argparse.Namespace) -> EndpointResult:
+    transport = httpx.ASGITransport(app=endpoint.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        requests = iter(
+            [endpoint.request(index) for index in range(args.requests + args.allocations + 1)]
+        )
+
+        async def call() -> None:
+            response = await client.request(endpoint.method, endpoint.path, **next(requests))
+            response.raise_for_status()
+
+        # The first request fills the JWKS, config and client caches.
+        await call()
+        metrics.reset()
+        stats = await run_concurrently(endpoint.name, call, args.requests, args.concurrency)
+        dependencies = get_dependency_report(args.requests)
+
+        allocated = 0
+        tracemalloc.start()
+        for _ in range(args.allocations):
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            await call()
+            allocated += tracemalloc.get_traced_memory()[1] - before
+        tracemalloc.stop()
+
+    result = EndpointResult(
+        throughput=stats.throughput,
+        p50=stats.percentile(50),
+        p99=stats.percentile(99),
+        allocated_kib=allocated / max(args.allocations, 1) / 1024,
+    )
+    print(f"{stats.report()}  alloc {result.allocated_kib:>8.1f} KiB")
+    if dependencies:
+        print(f"  {dependencies}")
+    return result
+
+
+def get_dependency_report(requests: int) -> str:
+    """Describe the time spent per request in each dependency, and the cache hit ratios."""
+    parts = [
+        f"{name.removesuffix('_latency')} {stats.total / requests * 1000:.1f} ms"
+        for name, stats in sorted(metrics.latencies.items())
+    ]
+    caches = sorted(
+        {name.rsplit("_cache_", 1)[0] for name in metrics.counters if "_cache_" in name}
+    )
+    for cache in caches:
+        ratio = metrics.hit_ratio(cache)
+        if ratio is not None:
+            parts.append(f"{cache} cache {ratio:.0%} hits")
+    return ", ".join(parts)
+
+
+def get_regressions(
+    baseline: dict[str, EndpointResult], results: dict[str, EndpointResult], tolerance: float
+) -> list[str]:
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        if result.throughput < before.throughput * (1 - tolerance):
+            regressions.append(
+                f"{name}: throughput {before.throughput:.1f} -> {result.throughput:.1f} req/s"
+            )
+        if result.p99 > before.p99 * (1 + tolerance):
+            regressions.append(
+                f"{name}: p99 {before.p99 * 1000:.2f} -> {result.p99 * 1000:.2f} ms"
+            )
+        if result.allocated_kib > before.allocated_kib * (1 + tolerance):
+            regressions.append(
+                f"{name}: allocations {before.allocated_kib:.1f} -> {result.allocated_kib:.1f} KiB"
+            )
+    return regressions
+
+
+async def main(args: argparse.Namespace) -> int:
+    get_logger().setLevel(args.log_level)
+    signer = Signer()
+    storage = SecretsManagerConfigStorage(
+        FakeSecretsManagerClient(
+            {SECRET_ID: json.dumps(get_saleor_configs())}, latency=args.secrets_latency / 1000
+        ),
+        SECRET_ID,
+    )
+    stripe_http_client = RoutingStripeHTTPClient(
+        get_stripe_routes(args.lines), latency=args.stripe_latency / 1000
+    )
+    # Clients are created lazily, so the ones the app creates go to the Saleor stand-in.
+    get_saleor_client_pool().client_class = get_saleor_client_class(
+        FakeSaleorTransport(signer.jwks, latency=args.saleor_latency / 1000)
+    )
+    invalidate_stripe_clients(SALEOR_DOMAIN)
+
+    endpoints = [
+        endpoint
+        for endpoint in get_endpoints(signer, args.lines)
+        if not args.endpoint or endpoint.name in args.endpoint
+    ]
+    # Results are only comparable with a baseline recorded with the same settings.
+    settings = {
+        key: getattr(args, key)
+        for key in (
+            "requests",
+            "concurrency",
+            "lines",
+            "stripe_latency",
+            "saleor_latency",
+            "secrets_latency",
+        )
+    }
+    print(
+        f"{args.requests} requests per endpoint, concurrency {args.concurrency}, "
+        f"{args.lines} lines, latency: Stripe {args.stripe_latency} ms, "
+        f"Saleor {args.saleor_latency} ms, Secrets Manager {args.secrets_latency} ms"
+    )
+
+    results: dict[str, EndpointResult] = {}
+    with (
+        patch(
+            "nimara_stripe.services.stripe.client.get_stripe_http_client",
+            return_value=stripe_http_client,
+        ),
+        patch("nimara_stripe.services.saleor.config.get_config_storage", return_value=storage),
+    ):
+        for endpoint in endpoints:
+            results[endpoint.name] = await run_endpoint(endpoint, args)
+
+    baseline_path = Path(args.baseline)
+    if args.save:
+        stored = json.loads(baseline_path.read_text()) if baseline_path.exists() else {}
+        if stored.get("settings") != settings:
+            stored = {"settings": settings, "endpoints": {}}
+        stored["endpoints"].update({name: asdict(result) for name, result in results.items()})
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(stored, indent=2) + "\n")
+        print(f"\nBaseline saved to {baseline_path}")
+        return 0
+
+    if not baseline_path.exists():
+        print(f"\nNo baseline at {baseline_path}, record one with --save")
+        return 0
+    stored = json.loads(baseline_path.read_text())
+    if stored["settings"] != settings:
+        print(f"\nBaseline at {baseline_path} was recorded with {stored['settings']}")
+        return 1
+    baseline = {name: EndpointResult(**result) for name, result in stored["endpoints"].items()}
+    regressions = get_regressions(baseline, results, args.tolerance)
+    if regressions:
+        print(f"\nRegressions over {args.tolerance:.0%}:", *regressions, sep="\n  ")
+        return 1
+    print(f"\nNo regressions over {args.tolerance:.0%} against {baseline_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--lines", type=int, default=10, help="Lines of checkouts and orders")
+    parser.add_argument("--stripe-latency", type=float, default=250.0, help="in ms")
+    parser.add_argument("--saleor-latency", type=float, default=50.0, help="in ms")
+    parser.add_argument("--secrets-latency", type=float, default=30.0, help="in ms")
+    parser.add_argument(
+        "--allocations", type=int, default=20, help="Requests traced to measure allocations"
+    )
+    parser.add_argument("--endpoint", action="append", help="Only run the named endpoints")
+    parser.add_argument("--baseline", default=".benchmarks/endpoints.json")
+    parser.add_argument("--save", action="store_true", help="Store the results as baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--log-level", default="WARNING", help="Level of the app logs")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,125 @@
+"""Cold-start import profile of the Lambda handler modules.
+
+Imports every entry point in a fresh interpreter with `-X importtime`, reports the
+import time, the number of loaded modules and the heaviest packages, and fails when an
+entry point goes over its module budget or loads a module it should not need.
+
+    uv run python -m benchmarks.import_time --runs 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import benchmarks  # noqa: F401 - provides the settings environment for the subprocesses
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+PROBE = "import json, sys; import {module}; print(json.dumps(sorted(sys.modules)))"
+
+
+@dataclass(frozen=True)
+class Budget:
+    max_modules: int
+    forbidden: tuple[str, ...] = ()
+    max_seconds: float | None = None
+
+
+@dataclass
+class ImportProfile:
+    module: str
+    seconds: list[float] = field(default_factory=list)
+    modules: list[str] = field(default_factory=list)
+    packages: Counter[str] = field(default_factory=Counter)
+
+    @property
+    def best(self) -> float:
+        return min(self.seconds)
+
+    def loaded(self, name: str) -> bool:
+        return any(module == name or module.startswith(f"{name}.") for module in self.modules)
+
+
+# Module counts are deterministic for a given lockfile, the time budgets are generous
+# to leave room for slower machines and are meant to catch regressions in the order of
+# whole dependencies being pulled in.
+BUDGETS = {
+    "nimara_stripe.api.stripe.app": Budget(
+        max_modules=1500, forbidden=("boto3", "jinja2"), max_seconds=8.0
+    ),
+    "nimara_stripe.api.saleor.app": Budget(
+        max_modules=1000,
+        forbidden=("boto3", "stripe", "graphql_client.fragments"),
+        max_seconds=5.0,
+    ),
+    "nimara_stripe.app": Budget(max_modules=1500, forbidden=("boto3",), max_seconds=8.0),
+}
+
+
+def profile(module: str, runs: int) -> ImportProfile:
+    result = ImportProfile(module)
+    env = {**os.environ, "PYTHONPATH": str(SRC_DIR)}
+    for _ in range(runs):
+        process = subprocess.run(  # noqa: S603
+            [sys.executable, "-X", "importtime", "-c", PROBE.format(module=module)],
+            capture_output=True,
+            check=True,
+            env=env,
+            text=True,
+        )
+        total = 0
+        packages: Counter[str] = Counter()
+        for line in process.stderr.splitlines():
+            if not line.startswith("import time:") or "imported package" in line:
+                continue
+            self_us, _, name = line.removeprefix("import time:").split("|")
+            packages[name.strip().split(".")[0]] += int(self_us)
+            total += int(self_us)
+        result.seconds.append(total / 1_000_000)
+        result.packages = packages
+        result.modules = json.loads(process.stdout)
+    return result
+
+
+def check(result: ImportProfile, budget: Budget) -> list[str]:
+    errors = []
+    if len(result.modules) > budget.max_modules:
+        errors.append(f"{len(result.modules)} modules loaded, budget is {budget.max_modules}")
+    if budget.max_seconds is not None and result.best > budget.max_seconds:
+        errors.append(f"imports took {result.best:.2f}s, budget is {budget.max_seconds:.2f}s")
+    errors.extend(
+        f"{name} must not be imported" for name in budget.forbidden if result.loaded(name)
+    )
+    return errors
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=3, help="imports per entry point")
+    parser.add_argument("--top", type=int, default=10, help="heaviest packages to show")
+    args = parser.parse_args()
+
+    failed = False
+    for module, budget in BUDGETS.items():
+        result = profile(module, args.runs)
+        print(
+            f"{module}: best {result.best:.3f}s, "
+            f"median {statistics.median(result.seconds):.3f}s, "
+            f"{len(result.modules)} modules"
+        )
+        for package, self_us in result.packages.most_common(args.top):
+            print(f"  {package:<32} {self_us / 1000:>9.1f} ms")
+        for error in check(result, budget):
+            failed = True
+            print(f"  OVER BUDGET: {error}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
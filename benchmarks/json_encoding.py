@@ -0,0 +1,86 @@
+"""JSON encoding and decoding with the standard library and with orjson.
+
+Measures the work `JSON_BACKEND` switches for representative payloads: decoding a
+Saleor webhook or GraphQL response body, encoding a GraphQL request and rendering the
+calculate-taxes response of the payment API.
+
+    uv run --with orjson python -m benchmarks.json_encoding --lines 250
+"""
+
+import argparse
+import json
+import time
+from collections.abc import Callable
+from typing import Any
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic_core import to_jsonable_python
+
+from benchmarks.payloads import (
+    calculate_taxes_payload,
+    calculate_taxes_response,
+    transaction_initialize_session_payload,
+)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def measure(call: Callable[[], Any], iterations: int) -> float:
+    call()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        call()
+    return (time.perf_counter() - started) / iterations
+
+
+def compare(
+    name: str, stdlib: Callable[[], Any], fast: Callable[[], Any], iterations: int
+) -> None:
+    before = measure(stdlib, iterations)
+    line = f"{name:<45} json {before * 1_000_000:>9.1f} us"
+    if orjson is not None:
+        after = measure(fast, iterations)
+        line += f"  orjson {after * 1_000_000:>9.1f} us  speed-up {before / after:>5.1f}x"
+    print(line)
+
+
+def main(args: argparse.Namespace) -> None:
+    if orjson is None:
+        print("orjson is not installed, only the standard library is measured")
+    payloads = {
+        "CalculateTaxes": calculate_taxes_payload(lines=args.lines),
+        "TransactionInitializeSession": transaction_initialize_session_payload(lines=args.lines),
+    }
+    print(f"{args.lines} lines, {args.iterations} iterations")
+    for name, payload in payloads.items():
+        body = json.dumps(payload).encode()
+        compare(
+            f"{name} decode ({len(body) / 1024:.0f} KiB)",
+            lambda: json.loads(body),
+            lambda: orjson.loads(body),
+            args.iterations,
+        )
+        compare(
+            f"{name} encode",
+            lambda: json.dumps(payload, default=to_jsonable_python).encode(),
+            lambda: orjson.dumps(payload, default=to_jsonable_python),
+            args.iterations,
+        )
+
+    response = calculate_taxes_response(lines=args.lines)
+    compare(
+        "CalculateTaxes response render",
+        lambda: JSONResponse(response),
+        lambda: ORJSONResponse(response),
+        args.iterations,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lines", type=int, default=250)
+    parser.add_argument("--iterations", type=int, default=200)
+    main(parser.parse_args())
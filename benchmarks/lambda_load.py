@@ -0,0 +1,261 @@
+"""Load test of the Lambda handlers with API Gateway and ALB events.
+
+Starts containers, each a `benchmarks.lambda_worker` process importing the handler,
+and local stand-in servers for the Stripe API, the Saleor API (GraphQL and JWKS) and
+Secrets Manager answering after the given latencies. The app reaches them through
+`STRIPE_API_BASE` and `AWS_ENDPOINT_URL`, and Saleor clients are pointed at the Saleor
+one. Requests of the endpoint benchmark (`benchmarks.endpoints`) are wrapped in events
+shaped like the fixtures in `tests/data`.
+
+Reports the cold start of every container (process start until the handler is
+imported, and its first invocation) and the warm invocation latency when 1, 2, 4...
+containers are invoked at the same time. Like Lambda, a container handles one event
+at a time, so throughput should grow with the containers until the host or the stand-ins
+become the limit.
+
+    uv run python -m benchmarks.lambda_load --event api-gateway-v1 --containers 1,2,4,8
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import statistics
+import sys
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from benchmarks.endpoints import (
+    SECRET_ID,
+    Signer,
+    get_endpoints,
+    get_saleor_configs,
+    get_stripe_routes,
+)
+from benchmarks.utils import (
+    FakeSaleorTransport,
+    FakeSecretsManagerClient,
+    RoutingStripeHTTPClient,
+    RunStats,
+    StandInServer,
+)
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+EVENT_FIXTURES = {
+    "api-gateway-v1": ("api_gateway_v1_event.json", 1),
+    "api-gateway-v2": ("api_gateway_v2_event.json", 2),
+    # ALB events have the same shape as API Gateway REST API ones.
+    "alb": ("alb_event.json", 1),
+}
+# The dashboard renders templates and the register endpoint rewrites the config, which
+# are rare next to webhooks.
+DEFAULT_ENDPOINTS = (
+    "gateway",
+    "initialize-session",
+    "process-session",
+    "charge",
+    "cancel",
+    "refund",
+    "calculate-tax",
+    "webhook",
+    "manifest",
+)
+
+
+@dataclass
+class Invocation:
+    status: int
+    duration: float
+
+
+class Container:
+    """A `benchmarks.lambda_worker` process invoked with one event at a time."""
+
+    def __init__(self, process: asyncio.subprocess.Process, started: float) -> None:
+        self.process = process
+        self.started = started
+        self.init = 0.0
+        self.ready = 0.0
+
+    @classmethod
+    async def start(cls, handler: str, saleor_url: str, env: dict[str, str]) -> "Container":
+        started = time.perf_counter()
+        process = await asyncio.create_subprocess_exec(
+            sys.executable,
+            "-m",
+            "benchmarks.lambda_worker",
+            "--handler",
+            handler,
+            "--saleor-url",
+            saleor_url,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            env=env,
+            cwd=ROOT_DIR,
+        )
+        container = cls(process, started)
+        container.init = (await container._read())["init"]
+        container.ready = time.perf_counter() - started
+        return container
+
+    async def invoke(self, event: dict[str, Any]) -> Invocation:
+        assert self.process.stdin is not None
+        self.process.stdin.write(json.dumps(event).encode() + b"\n")
+        await self.process.stdin.drain()
+        return Invocation(**await self._read())
+
+    async def _read(self) -> dict[str, Any]:
+        assert self.process.stdout is not None
+        line = await self.process.stdout.readline()
+        if not line:
+            raise RuntimeError(f"Container exited with {await self.process.wait()}")
+        answer: dict[str, Any] = json.loads(line)
+        return answer
+
+    async def stop(self) -> None:
+        assert self.process.stdin is not None
+        self.process.stdin.close()
+        await self.process.wait()
+
+
+def to_lambda_event(
+    template: dict[str, Any], version: int, request: httpx.Request
+) -> dict[str, Any]:
+    event = json.loads(json.dumps(template))
+    headers = dict(request.headers)
+    query = request.url.query.decode()
+    body = request.read().decode()
+    if version == 2:
+        event["rawPath"] = request.url.path
+        event["rawQueryString"] = query
+        event["requestContext"]["http"]["method"] = request.method
+        event["requestContext"]["http"]["path"] = request.url.path
+        event["routeKey"] = event["requestContext"]["routeKey"] = "$default"
+    else:
+        event["path"] = request.url.path
+        event["httpMethod"] = request.method
+        event["queryStringParameters"] = dict(request.url.params) or None
+    event.update(headers=headers, body=body, isBase64Encoded=False)
+    return event
+
+
+def get_events(args: argparse.Namespace, signer: Signer) -> Iterator[dict[str, Any]]:
+    """Yield events of the selected endpoints in turn, each for a new transaction."""
+    fixture, version = EVENT_FIXTURES[args.event]
+    template = json.loads((ROOT_DIR / "tests" / "data" / fixture).read_text())
+    names = args.endpoint or DEFAULT_ENDPOINTS
+    endpoints = [
+        endpoint for endpoint in get_endpoints(signer, args.lines) if endpoint.name in names
+    ]
+    for index in itertools.count():
+        endpoint = endpoints[index % len(endpoints)]
+        request = httpx.Request(
+            endpoint.method, f"https://api.example.com{endpoint.path}", **endpoint.request(index)
+        )
+        yield to_lambda_event(template, version, request)
+
+
+async def run_level(
+    containers: list[Container], events: Iterator[dict[str, Any]], requests: int
+) -> tuple[RunStats, int]:
+    pending = iter(range(requests))
+    latencies: list[float] = []
+    errors = 0
+
+    async def drive(container: Container) -> None:
+        nonlocal errors
+        for _ in pending:
+            invocation = await container.invoke(next(events))
+            latencies.append(invocation.duration)
+            errors += invocation.status >= 400
+
+    started = time.perf_counter()
+    await asyncio.gather(*(drive(container) for container in containers))
+    elapsed = time.perf_counter() - started
+    return RunStats(f"{len(containers)} containers", requests, elapsed, latencies), errors
+
+
+async def main(args: argparse.Namespace) -> None:
+    signer = Signer()
+    levels = sorted({int(level) for level in args.containers.split(",")})
+    saleor = FakeSaleorTransport(signer.jwks)
+    stripe_api = RoutingStripeHTTPClient(get_stripe_routes(args.lines))
+    secrets = FakeSecretsManagerClient({SECRET_ID: json.dumps(get_saleor_configs())}, latency=0)
+
+    with (
+        StandInServer(stripe_api.respond, latency=args.stripe_latency / 1000) as stripe_server,
+        StandInServer(saleor.respond, latency=args.saleor_latency / 1000) as saleor_server,
+        StandInServer(secrets.respond, latency=args.secrets_latency / 1000) as secrets_server,
+    ):
+        env = {
+            **os.environ,
+            "PYTHONPATH": os.pathsep.join([str(ROOT_DIR / "src"), str(ROOT_DIR)]),
+            "API_GW_VERSION": str(EVENT_FIXTURES[args.event][1]),
+            "CONFIG_STORAGE": "secrets_manager",
+            "SECRET_APP_CONFIG_PATH": SECRET_ID,
+            "AWS_ENDPOINT_URL": secrets_server.url,
+            "STRIPE_API_BASE": stripe_server.url,
+            "STRIPE_MAX_NETWORK_RETRIES": "0",
+        }
+        events = get_events(args, signer)
+        print(
+            f"{args.event} events, handler {args.handler}, latency: Stripe "
+            f"{args.stripe_latency} ms, Saleor {args.saleor_latency} ms, "
+            f"Secrets Manager {args.secrets_latency} ms\n"
+        )
+
+        # Containers are started one by one, so cold starts don't compete for the CPU.
+        containers: list[Container] = []
+        cold: list[float] = []
+        for _ in range(levels[-1]):
+            container = await Container.start(args.handler, saleor_server.url, env)
+            invocation = await container.invoke(next(events))
+            containers.append(container)
+            cold.append(invocation.duration)
+
+        def summary(name: str, values: list[float]) -> str:
+            return (
+                f"{name:<40} median {statistics.median(values) * 1000:>8.1f} ms"
+                f"  max {max(values) * 1000:>8.1f} ms"
+            )
+
+        print(f"Cold starts of {len(containers)} containers")
+        print(summary("process start to handler ready", [c.ready for c in containers]))
+        print(summary("handler module import", [c.init for c in containers]))
+        print(summary("first invocation", cold))
+        print("\nWarm invocations")
+
+        try:
+            baseline: float | None = None
+            for level in levels:
+                stats, errors = await run_level(containers[:level], events, args.requests)
+                baseline = baseline or stats.throughput / level
+                scaling = stats.throughput / (baseline * level)
+                print(f"{stats.report()}  scaling {scaling:>4.0%}  errors {errors}")
+        finally:
+            await asyncio.gather(*(container.stop() for container in containers))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--event", choices=EVENT_FIXTURES, default="api-gateway-v2")
+    parser.add_argument("--handler", default="nimara_stripe.app:http_handler")
+    parser.add_argument(
+        "--containers", default="1,2,4,8", help="Comma separated container counts to run"
+    )
+    parser.add_argument("--requests", type=int, default=200, help="Invocations per count")
+    parser.add_argument("--lines", type=int, default=10, help="Lines of checkouts and orders")
+    parser.add_argument("--stripe-latency", type=float, default=250.0, help="in ms")
+    parser.add_argument("--saleor-latency", type=float, default=50.0, help="in ms")
+    parser.add_argument("--secrets-latency", type=float, default=30.0, help="in ms")
+    parser.add_argument("--endpoint", action="append", help="Only send events of these endpoints")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,77 @@
+"""A Lambda container driven by `benchmarks.lambda_load`.
+
+Imports the handler given as `module:function`, then invokes it with the events read
+as JSON lines from stdin, one at a time like Lambda does, and answers each with a JSON
+line of the response status and the time spent in the handler. The first line written
+is the time the handler module took to import. App logs go to stderr.
+
+Saleor clients send their requests to `--saleor-url` whatever the Saleor domain they
+were created for, as webhook reports go to `https://<saleor domain>`.
+"""
+
+import argparse
+import importlib
+import json
+import os
+import sys
+import time
+import uuid
+from dataclasses import dataclass
+
+import benchmarks  # noqa: F401 - provides the settings environment
+
+
+@dataclass
+class LambdaContext:
+    aws_request_id: str
+    function_name: str = "nimara-stripe-benchmark"
+    memory_limit_in_mb: int = 1024
+    invoked_function_arn: str = (
+        "arn:aws:lambda:us-east-1:123456789012:function:nimara-stripe-benchmark"
+    )
+
+
+def redirect_saleor_clients(stand_in_url: str) -> None:
+    import httpx
+
+    from nimara_stripe.services.saleor import client
+    from nimara_stripe.settings import settings
+    from nimara_stripe.utils.loop import LoopLocal
+
+    class StandInSaleorClient(client.SaleorClient):
+        def __init__(
+            self, saleor_url: str, api_key: str | None, timeout: httpx.Timeout | None = None
+        ) -> None:
+            super().__init__(stand_in_url, api_key, timeout)
+
+    client._pool = LoopLocal(
+        lambda: client.SaleorClientPool(
+            maxsize=settings.saleor_client_pool_size, client_class=StandInSaleorClient
+        )
+    )
+
+
+def main(args: argparse.Namespace) -> None:
+    # stdout is kept for the answers, anything else printing to it goes to stderr.
+    answers = os.fdopen(os.dup(sys.stdout.fileno()), "w", buffering=1)
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    module_name, handler_name = args.handler.split(":")
+    started = time.perf_counter()
+    handler = getattr(importlib.import_module(module_name), handler_name)
+    answers.write(json.dumps({"init": time.perf_counter() - started}) + "\n")
+    redirect_saleor_clients(args.saleor_url)
+
+    for line in sys.stdin:
+        event = json.loads(line)
+        started = time.perf_counter()
+        response = handler(event, LambdaContext(aws_request_id=str(uuid.uuid4())))
+        duration = time.perf_counter() - started
+        answers.write(json.dumps({"status": response["statusCode"], "duration": duration}) + "\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--handler", default="nimara_stripe.app:http_handler")
+    parser.add_argument("--saleor-url", required=True)
+    main(parser.parse_args())
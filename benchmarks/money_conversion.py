@@ -0,0 +1,125 @@
+"""Converting amounts between Saleor and Stripe.
+
+Compares converting every amount on its own, looking its currency up and quantizing it,
+and re-parsing the strings to compute rates and gross amounts, with the batch
+conversion used by `prepare_saleor_response_data`. Then compares single conversions
+looking the currency up on every call with the precomputed currency registry.
+
+    uv run python -m benchmarks.money_conversion --lines 1000 10000
+"""
+
+import argparse
+import time
+from collections.abc import Callable
+from decimal import Decimal
+from typing import Any
+
+import stripe
+
+from graphql_client.fragments import Money
+from nimara_stripe.api.stripe.utils import calculate_tax_rate, prepare_saleor_response_data
+from nimara_stripe.services.stripe.currencies import (
+    get_saleor_amount_from_stripe_amount,
+    get_stripe_amount_from_saleor_money,
+    stripe_currencies,
+)
+
+
+def tax_calculation(lines: int) -> stripe.tax.Calculation:
+    return stripe.tax.Calculation.construct_from(
+        {
+            "object": "tax.calculation",
+            "currency": "usd",
+            "shipping_cost": {"amount": 1000, "amount_tax": 230},
+            "line_items": {
+                "object": "list",
+                "data": [
+                    {"amount": 1000 + index, "amount_tax": 230 + index % 7}
+                    for index in range(lines)
+                ],
+            },
+        },
+        key=None,
+    )
+
+
+def lookup_stripe_amount(money: Money) -> int:
+    if len(money.currency) != 3:
+        raise ValueError("currency needs to be a 3-letter code")
+    decimals = stripe_currencies.get(money.currency.upper(), 2)
+    return int(Decimal(str(money.amount)) * 10**decimals)
+
+
+def lookup_saleor_amount(amount: int, currency: str) -> str:
+    if len(currency) != 3:
+        raise ValueError("currency needs to be a 3-letter code")
+    decimals = stripe_currencies.get(currency.upper(), 2)
+    multiplier = Decimal(10) ** decimals
+    return str((Decimal(amount) / multiplier).quantize(Decimal(f"0.{'0' * decimals}")))
+
+
+def convert_per_amount(result: stripe.tax.Calculation) -> list[dict[str, Any]]:
+    tax_lines = []
+    for line in result.line_items.data:
+        amount = lookup_saleor_amount(line.amount, result.currency)
+        tax_amount = lookup_saleor_amount(line.amount_tax, result.currency)
+        tax_lines.append(
+            {
+                "tax_rate": str(calculate_tax_rate(Decimal(amount), Decimal(tax_amount))),
+                "total_gross_amount": str(Decimal(amount) + Decimal(tax_amount)),
+                "total_net_amount": amount,
+            }
+        )
+    return tax_lines
+
+
+def measure(call: Callable[[], Any], iterations: int) -> float:
+    call()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        call()
+    return (time.perf_counter() - started) / iterations
+
+
+def main(args: argparse.Namespace) -> None:
+    for lines in args.lines:
+        result = tax_calculation(lines)
+        before_lines = convert_per_amount(result)
+        after_lines = prepare_saleor_response_data({}, result)["lines"]
+        assert before_lines == after_lines, "batch conversion changed the response"
+
+        before = measure(lambda: convert_per_amount(result), args.iterations)
+        after = measure(lambda: prepare_saleor_response_data({}, result), args.iterations)
+        print(
+            f"{lines:>6} lines  per amount {before * 1000:>8.2f} ms"
+            f"  batch {after * 1000:>8.2f} ms  speed-up {before / after:.1f}x"
+        )
+
+    money = Money(currency="usd", amount=1234.56)
+    iterations = args.iterations * 1000
+    for name, before_call, after_call in [
+        (
+            "Saleor to Stripe amount",
+            lambda: lookup_stripe_amount(money),
+            lambda: get_stripe_amount_from_saleor_money(money),
+        ),
+        (
+            "Stripe to Saleor amount",
+            lambda: lookup_saleor_amount(123456, "usd"),
+            lambda: get_saleor_amount_from_stripe_amount(123456, "usd"),
+        ),
+    ]:
+        assert before_call() == after_call(), "registry changed the conversion"
+        before = measure(before_call, iterations)
+        after = measure(after_call, iterations)
+        print(
+            f"{name:<24} lookup {before * 1e6:>6.2f} us  registry {after * 1e6:>6.2f} us"
+            f"  speed-up {before / after:.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lines", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--iterations", type=int, default=20)
+    main(parser.parse_args())
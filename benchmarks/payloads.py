@@ -0,0 +1,245 @@
+"""Representative Saleor and Stripe webhook payloads used by the benchmarks."""
+
+from typing import Any
+
+
+def _address() -> dict[str, Any]:
+    return {
+        "firstName": "John",
+        "lastName": "Doe",
+        "phone": "+123456789",
+        "city": "New York",
+        "streetAddress1": "123 Main St",
+        "streetAddress2": "Apt 4",
+        "postalCode": "10001",
+        "countryArea": "NY",
+        "companyName": "Example Inc",
+        "country": {"code": "US"},
+    }
+
+
+def _money(amount: float) -> dict[str, Any]:
+    return {"currency": "USD", "amount": amount}
+
+
+def _taxed_money(gross: float) -> dict[str, Any]:
+    net = round(gross / 1.25, 2)
+    return {"gross": _money(gross), "net": _money(net), "tax": _money(round(gross - net, 2))}
+
+
+def transaction_initialize_session_payload(
+    lines: int = 1, channel_slug: str = "default-channel"
+) -> dict[str, Any]:
+    return {
+        "__typename": "Checkout",
+        "recipient": {"id": "recipient_123", "privateMetadata": [], "metadata": []},
+        "data": {"key": "value"},
+        "merchantReference": "order-123",
+        "action": {"amount": 200.0, "currency": "USD", "actionType": "CHARGE"},
+        "issuingPrincipal": {"__typename": "User", "id": "user_789"},
+        "transaction": {"id": "transaction_456", "pspReference": "psp-abc-123"},
+        "sourceObject": {
+            "__typename": "Checkout",
+            "id": "checkout_001",
+            "languageCode": "EN",
+            "channel": {"id": "channel_01", "slug": channel_slug},
+            "userEmail": "customer@example.com",
+            "billingAddress": _address(),
+            "shippingAddress": _address(),
+            "total": {"gross": _money(200.0)},
+            "shippingPrice": _taxed_money(10.0),
+            "deliveryMethod": None,
+            "lines": [
+                {
+                    "__typename": "CheckoutLine",
+                    "id": f"line_{index}",
+                    "quantity": 2,
+                    "totalPrice": _taxed_money(100.0),
+                    "checkoutVariant": {
+                        "name": "M-size Shirt",
+                        "sku": f"SKU{index:05}",
+                        "product": {
+                            "name": "Cool Shirt",
+                            "thumbnail": {"url": "https://example.com/media/shirt.jpg"},
+                            "category": {"name": "T-Shirts"},
+                        },
+                    },
+                }
+                for index in range(lines)
+            ],
+        },
+    }
+
+
+def transaction_process_session_payload(
+    lines: int = 1, channel_slug: str = "default-channel"
+) -> dict[str, Any]:
+    payload = transaction_initialize_session_payload(lines=lines, channel_slug=channel_slug)
+    del payload["issuingPrincipal"]
+    return payload
+
+
+def payment_gateway_initialize_session_payload(
+    lines: int = 1, channel_slug: str = "default-channel"
+) -> dict[str, Any]:
+    payload = transaction_initialize_session_payload(lines=lines, channel_slug=channel_slug)
+    return {
+        "__typename": "PaymentGatewayInitializeSession",
+        "recipient": payload["recipient"],
+        "data": None,
+        "amount": 200.0,
+        "issuingPrincipal": payload["issuingPrincipal"],
+        "sourceObject": payload["sourceObject"],
+    }
+
+
+def transaction_action_requested_payload(
+    typename: str, action_type: str, lines: int = 1, channel_slug: str = "default-channel"
+) -> dict[str, Any]:
+    if typename == "TransactionCancelationRequested":
+        # The cancelation subscription only selects the order channel.
+        payload = transaction_action_requested_payload(
+            "TransactionChargeRequested", action_type, channel_slug=channel_slug
+        )
+        payload["__typename"] = typename
+        payload["transaction"]["sourceObject"] = {
+            "channel": {"id": "channel_01", "slug": channel_slug}
+        }
+        return payload
+    return {
+        "__typename": typename,
+        "issuedAt": "2024-05-01T12:00:00+00:00",
+        "recipient": {"id": "recipient_123", "privateMetadata": [], "metadata": []},
+        "action": {"amount": 200.0, "currency": "USD", "actionType": action_type},
+        "transaction": {
+            "id": "transaction_456",
+            "pspReference": "pi_123",
+            "sourceObject": {
+                "__typename": "Order",
+                "total": {"gross": _money(200.0)},
+                "channel": {"id": "channel_01", "slug": channel_slug},
+                "shippingPrice": _taxed_money(10.0),
+                "deliveryMethod": None,
+                "lines": [
+                    {
+                        "__typename": "OrderLine",
+                        "id": f"line_{index}",
+                        "quantity": 2,
+                        "taxRate": 0.25,
+                        "totalPrice": _taxed_money(100.0),
+                        "orderVariant": {
+                            "name": "M-size Shirt",
+                            "sku": f"SKU{index:05}",
+                            "product": {
+                                "name": "Cool Shirt",
+                                "thumbnail": {"url": "https://example.com/media/shirt.jpg"},
+                                "category": {"name": "T-Shirts"},
+                            },
+                        },
+                    }
+                    for index in range(lines)
+                ],
+            },
+        },
+    }
+
+
+def calculate_taxes_payload(
+    lines: int = 1, channel_slug: str = "default-channel"
+) -> dict[str, Any]:
+    return {
+        "__typename": "CalculateTaxes",
+        "taxBase": {
+            "pricesEnteredWithTax": True,
+            "currency": "USD",
+            "channel": {"slug": channel_slug},
+            "discounts": [],
+            "address": _address(),
+            "shippingPrice": _money(10.0),
+            "lines": [
+                {
+                    "sourceLine": {
+                        "__typename": "CheckoutLine",
+                        "id": f"line_{index}",
+                        "checkoutProductVariant": {
+                            "id": f"variant_{index}",
+                            "product": {"taxClass": None},
+                        },
+                    },
+                    "quantity": 2,
+                    "unitPrice": {"amount": 50.0},
+                    "totalPrice": _money(100.0),
+                    "productSku": f"SKU{index:05}",
+                }
+                for index in range(lines)
+            ],
+        },
+        "recipient": {"privateMetadata": [{"key": "key", "value": "value"}]},
+    }
+
+
+def calculate_taxes_response(lines: int = 1) -> dict[str, Any]:
+    return {
+        "shipping_tax_rate": 23,
+        "shipping_price_gross_amount": 10.0,
+        "shipping_price_net_amount": 8.13,
+        "lines": [
+            {"tax_rate": 23, "total_gross_amount": 100.0, "total_net_amount": 81.3}
+            for _ in range(lines)
+        ],
+    }
+
+
+def stripe_payment_intent(
+    status: str = "requires_payment_method", amount: int = 20000
+) -> dict[str, Any]:
+    return {
+        "id": "pi_3QIlKGH0QBbcHXEP04EXBKGp",
+        "object": "payment_intent",
+        "amount": amount,
+        "amount_received": 0,
+        "capture_method": "automatic",
+        "client_secret": "pi_3QIlKGH0QBbcHXEP04EXBKGp_secret_Gl9eLFgWVB1r21uQpzki69zmZ",
+        "created": 1731045944,
+        "currency": "usd",
+        "last_payment_error": None,
+        "livemode": False,
+        "metadata": {},
+        "status": status,
+    }
+
+
+def stripe_refund(amount: int = 20000) -> dict[str, Any]:
+    return {
+        "id": "re_3QIlKGH0QBbcHXEP0Jm3aQ1x",
+        "object": "refund",
+        "amount": amount,
+        "currency": "usd",
+        "payment_intent": "pi_3QIlKGH0QBbcHXEP04EXBKGp",
+        "status": "succeeded",
+    }
+
+
+def stripe_tax_calculation(lines: int = 1) -> dict[str, Any]:
+    return {
+        "id": "taxcalc_1QIlKGH0QBbcHXEP",
+        "object": "tax.calculation",
+        "currency": "usd",
+        "amount_total": 23000 * lines + 1230,
+        "shipping_cost": {"amount": 1000, "amount_tax": 230},
+        "line_items": {
+            "object": "list",
+            "has_more": False,
+            "data": [
+                {
+                    "id": f"tax_li_{index}",
+                    "object": "tax.calculation_line_item",
+                    "amount": 10000,
+                    "amount_tax": 2300,
+                    "quantity": 2,
+                    "reference": f"SKU{index:05}",
+                }
+                for index in range(lines)
+            ],
+        },
+    }
@@ -0,0 +1,82 @@
+"""Concurrent throughput of the payment endpoints while waiting on Stripe.
+
+Drives `/payment/initialize-session` through the ASGI app with a Stripe stand-in
+answering after a fixed latency, once with the round-trip blocking the event loop (the
+behaviour of the synchronous SDK calls) and once with the non-blocking client.
+
+    uv run python -m benchmarks.stripe_concurrency --requests 200 --concurrency 20
+"""
+
+import argparse
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import httpx
+
+from benchmarks.payloads import stripe_payment_intent, transaction_initialize_session_payload
+from benchmarks.utils import FakeStripeHTTPClient, RunStats, run_concurrently
+from nimara_stripe.api.stripe.app import app
+from nimara_stripe.services.saleor.auth import verify_saleor_webhook
+from nimara_stripe.services.saleor.config import StripeConfig
+from nimara_stripe.services.stripe.client import invalidate_stripe_clients
+
+HEADERS = {
+    "Saleor-Domain": "example.saleor.com",
+    "Saleor-Api-Url": "https://example.saleor.com/graphql/",
+    "Saleor-Signature": "sig",
+}
+STRIPE_CONFIG = StripeConfig(
+    stripe_pub_key="pk_test",
+    stripe_secret_key="sk_test",
+    stripe_webhook_secret_key="whsec_test",
+)
+
+
+async def run(name: str, blocking: bool, args: argparse.Namespace) -> RunStats:
+    http_client = FakeStripeHTTPClient(
+        stripe_payment_intent(), latency=args.latency / 1000, blocking=blocking
+    )
+    payload = transaction_initialize_session_payload()
+    # Stripe clients are long-lived, drop the one built with the previous HTTP client.
+    invalidate_stripe_clients("example.saleor.com")
+
+    with (
+        patch(
+            "nimara_stripe.services.stripe.client.get_stripe_http_client",
+            return_value=http_client,
+        ),
+        patch(
+            "nimara_stripe.api.stripe.endpoints.get_stripe_channel_config",
+            AsyncMock(return_value=STRIPE_CONFIG),
+        ),
+    ):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+            async def call() -> None:
+                response = await client.post(
+                    "/payment/initialize-session", json=payload, headers=HEADERS
+                )
+                response.raise_for_status()
+
+            return await run_concurrently(name, call, args.requests, args.concurrency)
+
+
+async def main(args: argparse.Namespace) -> None:
+    app.dependency_overrides[verify_saleor_webhook] = lambda: None
+
+    before = await run("blocking Stripe calls (before)", True, args)
+    after = await run("async Stripe client (after)", False, args)
+
+    print(f"{args.requests} requests, concurrency {args.concurrency}, latency {args.latency} ms")
+    print(before.report())
+    print(after.report())
+    print(f"speed-up: {after.throughput / before.throughput:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=50.0, help="Stripe latency in ms")
+    asyncio.run(main(parser.parse_args()))
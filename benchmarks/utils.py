@@ -0,0 +1,238 @@
+import asyncio
+import json
+import statistics
+import threading
+import time
+from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import TracebackType
+from typing import Any
+
+import httpx
+import stripe
+
+
+class FakeStripeHTTPClient(stripe.HTTPClient):
+    """Stripe HTTP client answering every request with a canned response.
+
+    `blocking` emulates a synchronous SDK call made from a coroutine, which holds
+    the event loop for the whole round-trip.
+    """
+
+    name = "fake"
+
+    def __init__(
+        self, response: dict[str, Any], latency: float = 0.05, blocking: bool = False
+    ) -> None:
+        super().__init__()
+        self.response = json.dumps(response).encode()
+        self.latency = latency
+        self.blocking = blocking
+
+    def get_response(self, method: str, url: str) -> bytes:
+        return self.response
+
+    async def request_async(
+        self, method: str, url: str, headers: Mapping[str, str], post_data: Any = None
+    ) -> tuple[bytes, int, Mapping[str, str]]:
+        if self.blocking:
+            time.sleep(self.latency)
+        else:
+            await asyncio.sleep(self.latency)
+        return self.get_response(method, url), 200, {}
+
+    async def close_async(self) -> None:
+        pass
+
+
+class RoutingStripeHTTPClient(FakeStripeHTTPClient):
+    """Stripe HTTP client answering with the response of the longest matching path."""
+
+    def __init__(self, routes: Mapping[str, dict[str, Any]], latency: float = 0.05) -> None:
+        super().__init__({}, latency=latency)
+        self.routes = sorted(
+            ((path, json.dumps(response).encode()) for path, response in routes.items()),
+            key=lambda route: len(route[0]),
+            reverse=True,
+        )
+
+    def get_response(self, method: str, url: str) -> bytes:
+        path = httpx.URL(url).path
+        for route, response in self.routes:
+            if path.startswith(route):
+                return response
+        raise ValueError(f"No canned Stripe response for {method} {path}")
+
+    def respond(
+        self, method: str, path: str, headers: Mapping[str, str], body: bytes
+    ) -> tuple[int, bytes]:
+        return 200, self.get_response(method, path)
+
+
+class FakeSaleorTransport(httpx.AsyncBaseTransport):
+    """Saleor API serving the JWKS and answering the GraphQL operations the app sends."""
+
+    def __init__(self, jwks: str, latency: float = 0.05) -> None:
+        self.jwks = jwks.encode()
+        self.latency = latency
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(self.latency)
+        status, content = self.respond(
+            request.method, request.url.path, request.headers, await request.aread()
+        )
+        return httpx.Response(status, content=content)
+
+    def respond(
+        self, method: str, path: str, headers: Mapping[str, str], body: bytes
+    ) -> tuple[int, bytes]:
+        if path.endswith("/.well-known/jwks.json"):
+            return 200, self.jwks
+
+        operation = json.loads(body)
+        report = {"alreadyProcessed": False, "errors": []}
+        match operation["operationName"]:
+            case "checkAppToken":
+                data: dict[str, Any] = {"app": {"id": "app_1"}}
+            case "TransactionEventReport":
+                data = {"transactionEventReport": report}
+            case "TransactionEventReportBatch":
+                size = operation["query"].count("transactionEventReport(")
+                data = {f"report{index}": report for index in range(size)}
+            case name:
+                raise ValueError(f"Unexpected Saleor operation {name}")
+        return 200, json.dumps({"data": data}).encode()
+
+
+class FakeSecretsManagerClient:
+    """Secrets Manager client keeping secrets in memory.
+
+    Calls block for `latency` seconds, the storage runs them in the default executor.
+    """
+
+    def __init__(self, secrets: dict[str, str], latency: float = 0.03) -> None:
+        self.secrets = secrets
+        self.latency = latency
+
+    def get_secret_value(self, SecretId: str) -> dict[str, Any]:  # noqa: N803
+        time.sleep(self.latency)
+        return {"SecretString": self.secrets[SecretId], "VersionId": "1"}
+
+    def put_secret_value(self, SecretId: str, SecretString: str) -> dict[str, Any]:  # noqa: N803
+        time.sleep(self.latency)
+        self.secrets[SecretId] = SecretString
+        return {"VersionId": "1"}
+
+    def respond(
+        self, method: str, path: str, headers: Mapping[str, str], body: bytes
+    ) -> tuple[int, bytes]:
+        """Answer a request of the Secrets Manager JSON protocol, as boto3 sends it."""
+        params = json.loads(body)
+        secret_id = params["SecretId"]
+        if secret_id not in self.secrets:
+            error = {"__type": "ResourceNotFoundException", "message": f"{secret_id} not found"}
+            return 400, json.dumps(error).encode()
+        match headers["X-Amz-Target"]:
+            case "secretsmanager.GetSecretValue":
+                response = self.get_secret_value(SecretId=secret_id)
+            case "secretsmanager.PutSecretValue":
+                response = self.put_secret_value(
+                    SecretId=secret_id, SecretString=params["SecretString"]
+                )
+            case target:
+                raise ValueError(f"Unexpected Secrets Manager call {target}")
+        return 200, json.dumps({"ARN": f"arn:{secret_id}", "Name": secret_id, **response}).encode()
+
+
+Responder = Callable[[str, str, Mapping[str, str], bytes], tuple[int, bytes]]
+
+
+class StandInServer:
+    """Local HTTP server answering with a stand-in's `respond` after `latency` seconds.
+
+    Every request is handled in its own thread, so slow answers don't queue up.
+
+        with StandInServer(FakeSaleorTransport(jwks).respond, latency=0.05) as server:
+            httpx.get(f"{server.url}/.well-known/jwks.json")
+    """
+
+    def __init__(self, respond: Responder, latency: float = 0.05) -> None:
+        latency_ = latency
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def handle_request(self) -> None:
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                time.sleep(latency_)
+                status, content = respond(self.command, self.path, self.headers, body)
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            do_GET = do_POST = do_DELETE = handle_request  # noqa: N815
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def __enter__(self) -> "StandInServer":
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@dataclass
+class RunStats:
+    name: str
+    requests: int
+    elapsed: float
+    latencies: list[float]
+
+    @property
+    def throughput(self) -> float:
+        return self.requests / self.elapsed
+
+    def percentile(self, percent: int) -> float:
+        if len(self.latencies) == 1:
+            return self.latencies[0]
+        return statistics.quantiles(self.latencies, n=100, method="inclusive")[percent - 1]
+
+    def report(self) -> str:
+        return (
+            f"{self.name:<40} {self.throughput:>10.1f} req/s"
+            f"  p50 {self.percentile(50) * 1000:>8.2f} ms"
+            f"  p99 {self.percentile(99) * 1000:>8.2f} ms"
+        )
+
+
+async def run_concurrently(
+    name: str, call: Callable[[], Awaitable[Any]], requests: int, concurrency: int
+) -> RunStats:
+    """Run `call` `requests` times with at most `concurrency` calls in flight."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def timed_call() -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            await call()
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(timed_call() for _ in range(requests)))
+    return RunStats(name, requests, time.perf_counter() - started, latencies)
@@ -0,0 +1,167 @@
+"""Cost of turning a webhook request body into the typed event.
+
+Compares decoding the JSON into a dict and validating it (what FastAPI does for a body
+parameter) with pydantic parsing the bytes straight into the model, and verifying a
+Stripe signature with `construct_event` with checking only the signature header.
+Reports the time and the memory allocated per call for a checkout with many lines.
+With `--events` it also compares the generated `graphql_client` event models with the
+trimmed models of `nimara_stripe.api.stripe.schema` for every webhook the app handles.
+
+    uv run python -m benchmarks.webhook_parsing --lines 250 --events
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+import stripe
+from pydantic import BaseModel
+
+from benchmarks.payloads import (
+    calculate_taxes_payload,
+    payment_gateway_initialize_session_payload,
+    stripe_payment_intent,
+    transaction_action_requested_payload,
+    transaction_initialize_session_payload,
+    transaction_process_session_payload,
+)
+from graphql_client import fragments
+from graphql_client.calculate_taxes import CalculateTaxesEventCalculateTaxes
+from graphql_client.fragments import TransactionInitializeSessionEvent
+from nimara_stripe.api.stripe import schema
+
+SECRET = "whsec_test"
+
+
+def measure(name: str, call: Callable[[], Any], iterations: int) -> tuple[float, float]:
+    call()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        call()
+    elapsed = (time.perf_counter() - started) / iterations
+
+    tracemalloc.start()
+    call()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{name:<40} {elapsed * 1_000_000:>10.1f} us  peak {peak / 1024:>10.1f} KiB")
+    return elapsed, peak
+
+
+def get_events(lines: int) -> list[tuple[type[BaseModel], type[BaseModel], dict[str, Any]]]:
+    return [
+        (
+            fragments.PaymentGatewayInitializeSessionEvent,
+            schema.PaymentGatewayInitializeSessionEvent,
+            payment_gateway_initialize_session_payload(lines=lines),
+        ),
+        (
+            fragments.TransactionInitializeSessionEvent,
+            schema.TransactionInitializeSessionEvent,
+            transaction_initialize_session_payload(lines=lines),
+        ),
+        (
+            fragments.TransactionProcessSessionEvent,
+            schema.TransactionProcessSessionEvent,
+            transaction_process_session_payload(lines=lines),
+        ),
+        (
+            fragments.TransactionChargeRequestedEvent,
+            schema.TransactionChargeRequestedEvent,
+            transaction_action_requested_payload(
+                "TransactionChargeRequested", "CHARGE", lines=lines
+            ),
+        ),
+        (
+            fragments.TransactionCancelationRequestedEvent,
+            schema.TransactionCancelationRequestedEvent,
+            transaction_action_requested_payload(
+                "TransactionCancelationRequested", "CANCEL", lines=lines
+            ),
+        ),
+        (
+            fragments.TransactionRefundRequestedEvent,
+            schema.TransactionRefundRequestedEvent,
+            transaction_action_requested_payload(
+                "TransactionRefundRequested", "REFUND", lines=lines
+            ),
+        ),
+        (
+            CalculateTaxesEventCalculateTaxes,
+            schema.CalculateTaxesEvent,
+            calculate_taxes_payload(lines=lines),
+        ),
+    ]
+
+
+def compare_event_models(args: argparse.Namespace) -> None:
+    for generated, trimmed, payload in get_events(args.lines):
+        body = json.dumps(payload).encode()
+        print(f"{trimmed.__name__} with {args.lines} lines, {len(body) / 1024:.1f} KiB")
+        before = measure(
+            "graphql_client model (before)",
+            lambda: generated.model_validate_json(body),  # noqa: B023
+            args.iterations,
+        )
+        after = measure(
+            "schema model (after)",
+            lambda: trimmed.model_validate_json(body),  # noqa: B023
+            args.iterations,
+        )
+        print(f"speed-up: {before[0] / after[0]:.1f}x, memory: {before[1] / after[1]:.1f}x less\n")
+
+
+def main(args: argparse.Namespace) -> None:
+    body = json.dumps(transaction_initialize_session_payload(lines=args.lines)).encode()
+    print(f"Saleor event with {args.lines} lines, {len(body) / 1024:.1f} KiB")
+    before = measure(
+        "json.loads + model_validate (before)",
+        lambda: TransactionInitializeSessionEvent.model_validate(json.loads(body)),
+        args.iterations,
+    )
+    after = measure(
+        "model_validate_json (after)",
+        lambda: TransactionInitializeSessionEvent.model_validate_json(body),
+        args.iterations,
+    )
+    print(f"speed-up: {before[0] / after[0]:.1f}x, memory: {before[1] / after[1]:.1f}x less\n")
+
+    event = json.dumps(
+        {
+            "id": "evt_1",
+            "object": "event",
+            "type": "payment_intent.succeeded",
+            "data": {"object": stripe_payment_intent(status="succeeded")},
+        }
+    )
+    timestamp = int(time.time())
+    signature = stripe.WebhookSignature._compute_signature(f"{timestamp}.{event}", SECRET)
+    header = f"t={timestamp},v1={signature}"
+    print(f"Stripe event, {len(event) / 1024:.1f} KiB")
+    before = measure(
+        "Webhook.construct_event (before)",
+        lambda: stripe.Webhook.construct_event(event.encode(), header, SECRET),
+        args.iterations,
+    )
+    after = measure(
+        "WebhookSignature.verify_header (after)",
+        lambda: stripe.WebhookSignature.verify_header(event, header, SECRET),
+        args.iterations,
+    )
+    print(f"speed-up: {before[0] / after[0]:.1f}x, memory: {before[1] / after[1]:.1f}x less")
+
+    if args.events:
+        print()
+        compare_event_models(args)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lines", type=int, default=250)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--events", action="store_true")
+    main(parser.parse_args())
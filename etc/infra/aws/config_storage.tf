@@ -0,0 +1,60 @@
+# Saleor config storage other than Secrets Manager, selected with `config_storage`.
+# "ssm" keeps SecureString parameters under `/<secret name>/`, encrypted with the
+# AWS managed `aws/ssm` key, and "dynamodb" keeps items of a table keyed by domain.
+
+resource "aws_dynamodb_table" "saleor_configs" {
+  count        = var.config_storage == "dynamodb" ? 1 : 0
+  name         = "${local.resource_name}-saleor-configs"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "saleor_domain"
+
+  attribute {
+    name = "saleor_domain"
+    type = "S"
+  }
+}
+
+data "aws_iam_policy_document" "config_storage" {
+  count = var.config_storage == "secrets_manager" ? 0 : 1
+
+  dynamic "statement" {
+    for_each = var.config_storage == "ssm" ? [1] : []
+    content {
+      sid = "ConfigParameters"
+      actions = [
+        "ssm:GetParameter",
+        "ssm:GetParametersByPath",
+        "ssm:PutParameter",
+      ]
+      resources = [
+        "arn:aws:ssm:${var.aws_region}:${data.aws_caller_identity.current.account_id}:parameter/${local.secret_name}",
+        "arn:aws:ssm:${var.aws_region}:${data.aws_caller_identity.current.account_id}:parameter/${local.secret_name}/*",
+      ]
+    }
+  }
+
+  dynamic "statement" {
+    for_each = var.config_storage == "dynamodb" ? [1] : []
+    content {
+      sid = "ConfigTable"
+      actions = [
+        "dynamodb:GetItem",
+        "dynamodb:PutItem",
+        "dynamodb:Scan",
+      ]
+      resources = [aws_dynamodb_table.saleor_configs[0].arn]
+    }
+  }
+}
+
+resource "aws_iam_policy" "config_storage" {
+  count  = var.config_storage == "secrets_manager" ? 0 : 1
+  name   = "${local.resource_name}-config-storage"
+  policy = data.aws_iam_policy_document.config_storage[0].json
+}
+
+resource "aws_iam_role_policy_attachment" "config_storage" {
+  count      = var.config_storage == "secrets_manager" ? 0 : 1
+  role       = aws_iam_role.iam_role_lambda.name
+  policy_arn = aws_iam_policy.config_storage[0].arn
+}
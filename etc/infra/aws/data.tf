@@ -38,4 +38,21 @@ data "aws_iam_policy_document" "lambda_secrets" {
       aws_secretsmanager_secret.lambda_secret.arn,
     ]
   }
+
+  # Per-tenant secrets used when SECRET_APP_CONFIG_SHARDED is enabled.
+  statement {
+    sid = "ShardedSecrets"
+    actions = [
+      "secretsmanager:CreateSecret",
+      "secretsmanager:PutSecretValue",
+      "secretsmanager:GetSecretValue",
+      "secretsmanager:DescribeSecret",
+      "secretsmanager:UpdateSecretVersionStage",
+    ]
+    resources = [
+      "arn:aws:secretsmanager:${var.aws_region}:${data.aws_caller_identity.current.account_id}:secret:${local.secret_name}/*",
+    ]
+  }
 }
+
+data "aws_caller_identity" "current" {}
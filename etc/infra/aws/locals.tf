@@ -1,12 +1,27 @@
 locals {
   resource_name = "${var.app_name}-${var.environment}"
   secret_name   = "${var.environment}-${var.app_name}-secret"
-  env_vars = {
-    ENVIRONMENT            = var.environment,
-    DEBUG                  = "False",
-    SECRET_APP_CONFIG_PATH = local.secret_name
-    ALLOWED_DOMAIN_PATTERN = var.allowed_domain_patterns
-  }
+  env_vars = merge(
+    {
+      ENVIRONMENT            = var.environment,
+      DEBUG                  = "False",
+      SECRET_APP_CONFIG_PATH = local.secret_name
+      ALLOWED_DOMAIN_PATTERN = var.allowed_domain_patterns
+      CONFIG_STORAGE         = var.config_storage
+    },
+    {
+      for name, value in {
+        CONFIG_DYNAMODB_TABLE = one(aws_dynamodb_table.saleor_configs[*].name)
+      } : name => value if var.config_storage == "dynamodb"
+    },
+    {
+      for name, value in {
+        STRIPE_WEBHOOK_MODE               = "queue"
+        STRIPE_WEBHOOK_QUEUE_URL          = one(aws_sqs_queue.stripe_webhooks[*].url)
+        STRIPE_WEBHOOK_VISIBILITY_TIMEOUT = tostring(var.stripe_webhook_visibility_timeout)
+      } : name => value if var.stripe_webhook_queue
+    },
+  )
   lambda_dist_path = "${path.module}/../../../dist/lambda"
   lambda_zip_file  = "${local.lambda_dist_path}/${var.app_name}-${var.lambda_tag}.zip"
   layer_zip_file   = "${local.lambda_dist_path}/${var.app_name}-requirements-layer-${var.lambda_tag}.zip"
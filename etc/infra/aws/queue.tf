@@ -0,0 +1,95 @@
+# Asynchronous Stripe webhook ingestion, enabled with `stripe_webhook_queue = true`.
+# The HTTP Lambda enqueues verified Stripe events and the worker Lambda reports them
+# to Saleor. Messages failing `stripe_webhook_max_receive_count` times go to the DLQ.
+
+resource "aws_sqs_queue" "stripe_webhooks_dlq" {
+  count                     = var.stripe_webhook_queue ? 1 : 0
+  name                      = "${local.resource_name}-stripe-webhooks-dlq"
+  message_retention_seconds = 1209600
+}
+
+resource "aws_sqs_queue" "stripe_webhooks" {
+  count = var.stripe_webhook_queue ? 1 : 0
+  name  = "${local.resource_name}-stripe-webhooks"
+  # Must not be lower than the worker timeout, or messages are received again while
+  # still being processed.
+  visibility_timeout_seconds = var.stripe_webhook_visibility_timeout
+
+  redrive_policy = jsonencode({
+    deadLetterTargetArn = aws_sqs_queue.stripe_webhooks_dlq[0].arn
+    maxReceiveCount     = var.stripe_webhook_max_receive_count
+  })
+}
+
+resource "aws_lambda_function" "stripe_webhook_worker" {
+  count            = var.stripe_webhook_queue ? 1 : 0
+  function_name    = "${local.resource_name}-stripe-webhook-worker"
+  role             = aws_iam_role.iam_role_lambda.arn
+  filename         = local.lambda_zip_file
+  source_code_hash = filebase64sha256(local.lambda_zip_file)
+  runtime          = var.runtime
+  handler          = "nimara_stripe.worker.sqs_handler"
+  memory_size      = var.memory_size
+  timeout          = var.stripe_webhook_visibility_timeout
+  architectures    = [var.arch]
+  layers           = [aws_lambda_layer_version.lambda_layer_version.arn]
+
+  environment {
+    variables = local.env_vars
+  }
+
+  depends_on = [
+    aws_iam_role.iam_role_lambda,
+    aws_cloudwatch_log_group.stripe_webhook_worker,
+  ]
+}
+
+resource "aws_cloudwatch_log_group" "stripe_webhook_worker" {
+  count             = var.stripe_webhook_queue ? 1 : 0
+  name              = "/aws/lambda/${local.resource_name}-stripe-webhook-worker"
+  retention_in_days = var.log_retention
+}
+
+resource "aws_lambda_event_source_mapping" "stripe_webhook_worker" {
+  count                   = var.stripe_webhook_queue ? 1 : 0
+  event_source_arn        = aws_sqs_queue.stripe_webhooks[0].arn
+  function_name           = aws_lambda_function.stripe_webhook_worker[0].arn
+  batch_size              = 10
+  function_response_types = ["ReportBatchItemFailures"]
+}
+
+data "aws_iam_policy_document" "stripe_webhook_queue" {
+  count = var.stripe_webhook_queue ? 1 : 0
+
+  statement {
+    sid = "StripeWebhookQueue"
+    actions = [
+      "sqs:SendMessage",
+      "sqs:ReceiveMessage",
+      "sqs:DeleteMessage",
+      "sqs:GetQueueAttributes",
+    ]
+    resources = [aws_sqs_queue.stripe_webhooks[0].arn]
+  }
+
+  statement {
+    sid = "StripeWebhookWorkerLogs"
+    actions = [
+      "logs:CreateLogStream",
+      "logs:PutLogEvents",
+    ]
+    resources = ["${aws_cloudwatch_log_group.stripe_webhook_worker[0].arn}:*"]
+  }
+}
+
+resource "aws_iam_policy" "stripe_webhook_queue" {
+  count  = var.stripe_webhook_queue ? 1 : 0
+  name   = "${local.resource_name}-stripe-webhook-queue"
+  policy = data.aws_iam_policy_document.stripe_webhook_queue[0].json
+}
+
+resource "aws_iam_role_policy_attachment" "stripe_webhook_queue" {
+  count      = var.stripe_webhook_queue ? 1 : 0
+  role       = aws_iam_role.iam_role_lambda.name
+  policy_arn = aws_iam_policy.stripe_webhook_queue[0].arn
+}
@@ -52,3 +52,31 @@ variable "provider_bucket_name" {
 variable "allowed_domain_patterns" {
   type = string
 }
+
+variable "stripe_webhook_queue" {
+  description = "Acknowledge Stripe webhooks once queued and report them to Saleor from a worker Lambda"
+  type        = bool
+  default     = false
+}
+
+variable "stripe_webhook_visibility_timeout" {
+  description = "Worker Lambda timeout and SQS visibility timeout, in seconds"
+  type        = number
+  default     = 60
+}
+
+variable "stripe_webhook_max_receive_count" {
+  type    = number
+  default = 5
+}
+
+variable "config_storage" {
+  description = "Storage of Saleor configs: secrets_manager, ssm or dynamodb"
+  type        = string
+  default     = "secrets_manager"
+
+  validation {
+    condition     = contains(["secrets_manager", "ssm", "dynamodb"], var.config_storage)
+    error_message = "config_storage must be secrets_manager, ssm or dynamodb."
+  }
+}
@@ -1,499 +0,0 @@
-from .async_base_client import AsyncBaseClient
-from .base_model import BaseModel, Upload
-from .calculate_taxes import (
-    CalculateTaxes,
-    CalculateTaxesEventCalculateTaxes,
-    CalculateTaxesEventCalculateTaxesRecipient,
-    CalculateTaxesEventCalculateTaxesRecipientPrivateMetadata,
-    CalculateTaxesEventCalculateTaxesTaxBase,
-    CalculateTaxesEventEvent,
-)
-from .check_app_token import CheckAppToken, CheckAppTokenApp
-from .client import AutoGenClient
-from .enums import (
-    LanguageCodeEnum,
-    TransactionActionEnum,
-    TransactionEventReportErrorCode,
-    TransactionEventTypeEnum,
-    TransactionFlowStrategyEnum,
-)
-from .exceptions import (
-    GraphQLClientError,
-    GraphQLClientGraphQLError,
-    GraphQLClientGraphQLMultiError,
-    GraphQLClientHttpError,
-    GraphQLClientInvalidResponseError,
-)
-from .fragments import (
-    Address,
-    AddressCountry,
-    Money,
-    PaymentGatewayInitializeSessionAddress,
-    PaymentGatewayInitializeSessionAddressCountry,
-    PaymentGatewayInitializeSessionEvent,
-    PaymentGatewayInitializeSessionEventIssuingPrincipalApp,
-    PaymentGatewayInitializeSessionEventIssuingPrincipalUser,
-    PaymentGatewayInitializeSessionEventRecipient,
-    PaymentGatewayInitializeSessionEventSourceObjectCheckout,
-    PaymentGatewayInitializeSessionEventSourceObjectCheckoutBillingAddress,
-    PaymentGatewayInitializeSessionEventSourceObjectCheckoutChannel,
-    PaymentGatewayInitializeSessionEventSourceObjectCheckoutTotal,
-    PaymentGatewayInitializeSessionEventSourceObjectCheckoutTotalGross,
-    PaymentGatewayInitializeSessionEventSourceObjectOrder,
-    PaymentGatewayInitializeSessionEventSourceObjectOrderBillingAddress,
-    PaymentGatewayInitializeSessionEventSourceObjectOrderChannel,
-    PaymentGatewayInitializeSessionEventSourceObjectOrderTotal,
-    PaymentGatewayInitializeSessionEventSourceObjectOrderTotalGross,
-    PaymentGatewayRecipient,
-    PaymentGatewayRecipientMetadata,
-    PaymentGatewayRecipientPrivateMetadata,
-    TaxBase,
-    TaxBaseAddress,
-    TaxBaseChannel,
-    TaxBaseDiscounts,
-    TaxBaseLine,
-    TaxBaseLines,
-    TaxBaseLineSourceLineCheckoutLine,
-    TaxBaseLineSourceLineCheckoutLineCheckoutProductVariant,
-    TaxBaseLineSourceLineCheckoutLineCheckoutProductVariantProduct,
-    TaxBaseLineSourceLineCheckoutLineCheckoutProductVariantProductTaxClass,
-    TaxBaseLineSourceLineOrderLine,
-    TaxBaseLineSourceLineOrderLineOrderProductVariant,
-    TaxBaseLineSourceLineOrderLineOrderProductVariantProduct,
-    TaxBaseLineSourceLineOrderLineOrderProductVariantProductTaxClass,
-    TaxBaseLineTotalPrice,
-    TaxBaseLineUnitPrice,
-    TaxBaseShippingPrice,
-    TaxDiscount,
-    TaxDiscountAmount,
-    TransactionCancelationRequestedEvent,
-    TransactionCancelationRequestedEventAction,
-    TransactionCancelationRequestedEventRecipient,
-    TransactionCancelationRequestedEventTransaction,
-    TransactionCancelationRequestedEventTransactionSourceObject,
-    TransactionCancelationRequestedEventTransactionSourceObjectChannel,
-    TransactionChargeRequestedEvent,
-    TransactionChargeRequestedEventAction,
-    TransactionChargeRequestedEventRecipient,
-    TransactionChargeRequestedEventTransaction,
-    TransactionChargeRequestedEventTransactionSourceObject,
-    TransactionChargeRequestedEventTransactionSourceObjectChannel,
-    TransactionChargeRequestedEventTransactionSourceObjectDeliveryMethodShippingMethod,
-    TransactionChargeRequestedEventTransactionSourceObjectDeliveryMethodWarehouse,
-    TransactionChargeRequestedEventTransactionSourceObjectLines,
-    TransactionChargeRequestedEventTransactionSourceObjectLinesOrderVariant,
-    TransactionChargeRequestedEventTransactionSourceObjectLinesOrderVariantProduct,
-    TransactionChargeRequestedEventTransactionSourceObjectLinesOrderVariantProductCategory,
-    TransactionChargeRequestedEventTransactionSourceObjectLinesOrderVariantProductThumbnail,
-    TransactionChargeRequestedEventTransactionSourceObjectLinesTotalPrice,
-    TransactionChargeRequestedEventTransactionSourceObjectLinesTotalPriceGross,
-    TransactionChargeRequestedEventTransactionSourceObjectLinesTotalPriceNet,
-    TransactionChargeRequestedEventTransactionSourceObjectLinesTotalPriceTax,
-    TransactionChargeRequestedEventTransactionSourceObjectShippingPrice,
-    TransactionChargeRequestedEventTransactionSourceObjectShippingPriceGross,
-    TransactionChargeRequestedEventTransactionSourceObjectShippingPriceNet,
-    TransactionChargeRequestedEventTransactionSourceObjectShippingPriceTax,
-    TransactionChargeRequestedEventTransactionSourceObjectTotal,
-    TransactionChargeRequestedEventTransactionSourceObjectTotalGross,
-    TransactionInitializeSessionAddress,
-    TransactionInitializeSessionAddressCountry,
-    TransactionInitializeSessionEvent,
-    TransactionInitializeSessionEventAction,
-    TransactionInitializeSessionEventIssuingPrincipalApp,
-    TransactionInitializeSessionEventIssuingPrincipalUser,
-    TransactionInitializeSessionEventRecipient,
-    TransactionInitializeSessionEventSourceObjectCheckout,
-    TransactionInitializeSessionEventSourceObjectCheckoutBillingAddress,
-    TransactionInitializeSessionEventSourceObjectCheckoutChannel,
-    TransactionInitializeSessionEventSourceObjectCheckoutDeliveryMethodShippingMethod,
-    TransactionInitializeSessionEventSourceObjectCheckoutDeliveryMethodWarehouse,
-    TransactionInitializeSessionEventSourceObjectCheckoutLines,
-    TransactionInitializeSessionEventSourceObjectCheckoutLinesCheckoutVariant,
-    TransactionInitializeSessionEventSourceObjectCheckoutLinesCheckoutVariantProduct,
-    TransactionInitializeSessionEventSourceObjectCheckoutLinesCheckoutVariantProductCategory,
-    TransactionInitializeSessionEventSourceObjectCheckoutLinesCheckoutVariantProductThumbnail,
-    TransactionInitializeSessionEventSourceObjectCheckoutLinesTotalPrice,
-    TransactionInitializeSessionEventSourceObjectCheckoutLinesTotalPriceGross,
-    TransactionInitializeSessionEventSourceObjectCheckoutLinesTotalPriceNet,
-    TransactionInitializeSessionEventSourceObjectCheckoutLinesTotalPriceTax,
-    TransactionInitializeSessionEventSourceObjectCheckoutShippingAddress,
-    TransactionInitializeSessionEventSourceObjectCheckoutShippingPrice,
-    TransactionInitializeSessionEventSourceObjectCheckoutShippingPriceGross,
-    TransactionInitializeSessionEventSourceObjectCheckoutShippingPriceNet,
-    TransactionInitializeSessionEventSourceObjectCheckoutShippingPriceTax,
-    TransactionInitializeSessionEventSourceObjectCheckoutTotal,
-    TransactionInitializeSessionEventSourceObjectCheckoutTotalGross,
-    TransactionInitializeSessionEventSourceObjectOrder,
-    TransactionInitializeSessionEventSourceObjectOrderBillingAddress,
-    TransactionInitializeSessionEventSourceObjectOrderChannel,
-    TransactionInitializeSessionEventSourceObjectOrderDeliveryMethodShippingMethod,
-    TransactionInitializeSessionEventSourceObjectOrderDeliveryMethodWarehouse,
-    TransactionInitializeSessionEventSourceObjectOrderLines,
-    TransactionInitializeSessionEventSourceObjectOrderLinesOrderVariant,
-    TransactionInitializeSessionEventSourceObjectOrderLinesOrderVariantProduct,
-    TransactionInitializeSessionEventSourceObjectOrderLinesOrderVariantProductCategory,
-    TransactionInitializeSessionEventSourceObjectOrderLinesOrderVariantProductThumbnail,
-    TransactionInitializeSessionEventSourceObjectOrderLinesTotalPrice,
-    TransactionInitializeSessionEventSourceObjectOrderLinesTotalPriceGross,
-    TransactionInitializeSessionEventSourceObjectOrderLinesTotalPriceNet,
-    TransactionInitializeSessionEventSourceObjectOrderLinesTotalPriceTax,
-    TransactionInitializeSessionEventSourceObjectOrderShippingAddress,
-    TransactionInitializeSessionEventSourceObjectOrderShippingPrice,
-    TransactionInitializeSessionEventSourceObjectOrderShippingPriceGross,
-    TransactionInitializeSessionEventSourceObjectOrderShippingPriceNet,
-    TransactionInitializeSessionEventSourceObjectOrderShippingPriceTax,
-    TransactionInitializeSessionEventSourceObjectOrderTotal,
-    TransactionInitializeSessionEventSourceObjectOrderTotalGross,
-    TransactionInitializeSessionEventTransaction,
-    TransactionProcessSessionEvent,
-    TransactionProcessSessionEventAction,
-    TransactionProcessSessionEventRecipient,
-    TransactionProcessSessionEventSourceObjectCheckout,
-    TransactionProcessSessionEventSourceObjectCheckoutBillingAddress,
-    TransactionProcessSessionEventSourceObjectCheckoutChannel,
-    TransactionProcessSessionEventSourceObjectCheckoutDeliveryMethodShippingMethod,
-    TransactionProcessSessionEventSourceObjectCheckoutDeliveryMethodWarehouse,
-    TransactionProcessSessionEventSourceObjectCheckoutLines,
-    TransactionProcessSessionEventSourceObjectCheckoutLinesCheckoutVariant,
-    TransactionProcessSessionEventSourceObjectCheckoutLinesCheckoutVariantProduct,
-    TransactionProcessSessionEventSourceObjectCheckoutLinesCheckoutVariantProductCategory,
-    TransactionProcessSessionEventSourceObjectCheckoutLinesCheckoutVariantProductThumbnail,
-    TransactionProcessSessionEventSourceObjectCheckoutLinesTotalPrice,
-    TransactionProcessSessionEventSourceObjectCheckoutLinesTotalPriceGross,
-    TransactionProcessSessionEventSourceObjectCheckoutLinesTotalPriceNet,
-    TransactionProcessSessionEventSourceObjectCheckoutLinesTotalPriceTax,
-    TransactionProcessSessionEventSourceObjectCheckoutShippingAddress,
-    TransactionProcessSessionEventSourceObjectCheckoutShippingPrice,
-    TransactionProcessSessionEventSourceObjectCheckoutShippingPriceGross,
-    TransactionProcessSessionEventSourceObjectCheckoutShippingPriceNet,
-    TransactionProcessSessionEventSourceObjectCheckoutShippingPriceTax,
-    TransactionProcessSessionEventSourceObjectOrder,
-    TransactionProcessSessionEventSourceObjectOrderBillingAddress,
-    TransactionProcessSessionEventSourceObjectOrderChannel,
-    TransactionProcessSessionEventSourceObjectOrderDeliveryMethodShippingMethod,
-    TransactionProcessSessionEventSourceObjectOrderDeliveryMethodWarehouse,
-    TransactionProcessSessionEventSourceObjectOrderLines,
-    TransactionProcessSessionEventSourceObjectOrderLinesOrderVariant,
-    TransactionProcessSessionEventSourceObjectOrderLinesOrderVariantProduct,
-    TransactionProcessSessionEventSourceObjectOrderLinesOrderVariantProductCategory,
-    TransactionProcessSessionEventSourceObjectOrderLinesOrderVariantProductThumbnail,
-    TransactionProcessSessionEventSourceObjectOrderLinesTotalPrice,
-    TransactionProcessSessionEventSourceObjectOrderLinesTotalPriceGross,
-    TransactionProcessSessionEventSourceObjectOrderLinesTotalPriceNet,
-    TransactionProcessSessionEventSourceObjectOrderLinesTotalPriceTax,
-    TransactionProcessSessionEventSourceObjectOrderShippingAddress,
-    TransactionProcessSessionEventSourceObjectOrderShippingPrice,
-    TransactionProcessSessionEventSourceObjectOrderShippingPriceGross,
-    TransactionProcessSessionEventSourceObjectOrderShippingPriceNet,
-    TransactionProcessSessionEventSourceObjectOrderShippingPriceTax,
-    TransactionProcessSessionEventTransaction,
-    TransactionRefundRequestedEvent,
-    TransactionRefundRequestedEventAction,
-    TransactionRefundRequestedEventRecipient,
-    TransactionRefundRequestedEventTransaction,
-    TransactionRefundRequestedEventTransactionSourceObject,
-    TransactionRefundRequestedEventTransactionSourceObjectChannel,
-    TransactionRefundRequestedEventTransactionSourceObjectDeliveryMethodShippingMethod,
-    TransactionRefundRequestedEventTransactionSourceObjectDeliveryMethodWarehouse,
-    TransactionRefundRequestedEventTransactionSourceObjectLines,
-    TransactionRefundRequestedEventTransactionSourceObjectLinesOrderVariant,
-    TransactionRefundRequestedEventTransactionSourceObjectLinesOrderVariantProduct,
-    TransactionRefundRequestedEventTransactionSourceObjectLinesOrderVariantProductCategory,
-    TransactionRefundRequestedEventTransactionSourceObjectLinesOrderVariantProductThumbnail,
-    TransactionRefundRequestedEventTransactionSourceObjectLinesTotalPrice,
-    TransactionRefundRequestedEventTransactionSourceObjectLinesTotalPriceGross,
-    TransactionRefundRequestedEventTransactionSourceObjectLinesTotalPriceNet,
-    TransactionRefundRequestedEventTransactionSourceObjectLinesTotalPriceTax,
-    TransactionRefundRequestedEventTransactionSourceObjectShippingPrice,
-    TransactionRefundRequestedEventTransactionSourceObjectShippingPriceGross,
-    TransactionRefundRequestedEventTransactionSourceObjectShippingPriceNet,
-    TransactionRefundRequestedEventTransactionSourceObjectShippingPriceTax,
-    TransactionRefundRequestedEventTransactionSourceObjectTotal,
-    TransactionRefundRequestedEventTransactionSourceObjectTotalGross,
-)
-from .operations import (
-    CALCULATE_TAXES_GQL,
-    CHECK_APP_TOKEN_GQL,
-    PAYMENT_GATEWAY_INITIALIZE_SESSION_GQL,
-    TRANSACTION_CANCELATION_REQUESTED_GQL,
-    TRANSACTION_CHARGE_REQUESTED_GQL,
-    TRANSACTION_EVENT_REPORT_GQL,
-    TRANSACTION_INITIALIZE_SESSION_GQL,
-    TRANSACTION_PROCESS_SESSION_GQL,
-    TRANSACTION_REFUND_REQUESTED_GQL,
-)
-from .payment_gateway_initialize_session import (
-    PaymentGatewayInitializeSession,
-    PaymentGatewayInitializeSessionEventEvent,
-    PaymentGatewayInitializeSessionEventPaymentGatewayInitializeSession,
-)
-from .transaction_cancelation_requested import (
-    TransactionCancelationRequested,
-    TransactionCancelationRequestedEventEvent,
-    TransactionCancelationRequestedEventTransactionCancelationRequested,
-)
-from .transaction_charge_requested import (
-    TransactionChargeRequested,
-    TransactionChargeRequestedEventEvent,
-    TransactionChargeRequestedEventTransactionChargeRequested,
-)
-from .transaction_event_report import (
-    TransactionEventReport,
-    TransactionEventReportTransactionEventReport,
-    TransactionEventReportTransactionEventReportErrors,
-)
-from .transaction_initialize_session import (
-    TransactionInitializeSession,
-    TransactionInitializeSessionEventEvent,
-    TransactionInitializeSessionEventTransactionInitializeSession,
-)
-from .transaction_process_session import (
-    TransactionProcessSession,
-    TransactionProcessSessionEventEvent,
-    TransactionProcessSessionEventTransactionProcessSession,
-)
-from .transaction_refund_requested import (
-    TransactionRefundRequested,
-    TransactionRefundRequestedEventEvent,
-    TransactionRefundRequestedEventTransactionRefundRequested,
-)
-
-__all__ = [
-    "Address",
-    "AddressCountry",
-    "AsyncBaseClient",
-    "AutoGenClient",
-    "BaseModel",
-    "CALCULATE_TAXES_GQL",
-    "CHECK_APP_TOKEN_GQL",
-    "CalculateTaxes",
-    "CalculateTaxesEventCalculateTaxes",
-    "CalculateTaxesEventCalculateTaxesRecipient",
-    "CalculateTaxesEventCalculateTaxesRecipientPrivateMetadata",
-    "CalculateTaxesEventCalculateTaxesTaxBase",
-    "CalculateTaxesEventEvent",
-    "CheckAppToken",
-    "CheckAppTokenApp",
-    "GraphQLClientError",
-    "GraphQLClientGraphQLError",
-    "GraphQLClientGraphQLMultiError",
-    "GraphQLClientHttpError",
-    "GraphQLClientInvalidResponseError",
-    "LanguageCodeEnum",
-    "Money",
-    "PAYMENT_GATEWAY_INITIALIZE_SESSION_GQL",
-    "PaymentGatewayInitializeSession",
-    "PaymentGatewayInitializeSessionAddress",
-    "PaymentGatewayInitializeSessionAddressCountry",
-    "PaymentGatewayInitializeSessionEvent",
-    "PaymentGatewayInitializeSessionEventEvent",
-    "PaymentGatewayInitializeSessionEventIssuingPrincipalApp",
-    "PaymentGatewayInitializeSessionEventIssuingPrincipalUser",
-    "PaymentGatewayInitializeSessionEventPaymentGatewayInitializeSession",
-    "PaymentGatewayInitializeSessionEventRecipient",
-    "PaymentGatewayInitializeSessionEventSourceObjectCheckout",
-    "PaymentGatewayInitializeSessionEventSourceObjectCheckoutBillingAddress",
-    "PaymentGatewayInitializeSessionEventSourceObjectCheckoutChannel",
-    "PaymentGatewayInitializeSessionEventSourceObjectCheckoutTotal",
-    "PaymentGatewayInitializeSessionEventSourceObjectCheckoutTotalGross",
-    "PaymentGatewayInitializeSessionEventSourceObjectOrder",
-    "PaymentGatewayInitializeSessionEventSourceObjectOrderBillingAddress",
-    "PaymentGatewayInitializeSessionEventSourceObjectOrderChannel",
-    "PaymentGatewayInitializeSessionEventSourceObjectOrderTotal",
-    "PaymentGatewayInitializeSessionEventSourceObjectOrderTotalGross",
-    "PaymentGatewayRecipient",
-    "PaymentGatewayRecipientMetadata",
-    "PaymentGatewayRecipientPrivateMetadata",
-    "TRANSACTION_CANCELATION_REQUESTED_GQL",
-    "TRANSACTION_CHARGE_REQUESTED_GQL",
-    "TRANSACTION_EVENT_REPORT_GQL",
-    "TRANSACTION_INITIALIZE_SESSION_GQL",
-    "TRANSACTION_PROCESS_SESSION_GQL",
-    "TRANSACTION_REFUND_REQUESTED_GQL",
-    "TaxBase",
-    "TaxBaseAddress",
-    "TaxBaseChannel",
-    "TaxBaseDiscounts",
-    "TaxBaseLine",
-    "TaxBaseLineSourceLineCheckoutLine",
-    "TaxBaseLineSourceLineCheckoutLineCheckoutProductVariant",
-    "TaxBaseLineSourceLineCheckoutLineCheckoutProductVariantProduct",
-    "TaxBaseLineSourceLineCheckoutLineCheckoutProductVariantProductTaxClass",
-    "TaxBaseLineSourceLineOrderLine",
-    "TaxBaseLineSourceLineOrderLineOrderProductVariant",
-    "TaxBaseLineSourceLineOrderLineOrderProductVariantProduct",
-    "TaxBaseLineSourceLineOrderLineOrderProductVariantProductTaxClass",
-    "TaxBaseLineTotalPrice",
-    "TaxBaseLineUnitPrice",
-    "TaxBaseLines",
-    "TaxBaseShippingPrice",
-    "TaxDiscount",
-    "TaxDiscountAmount",
-    "TransactionActionEnum",
-    "TransactionCancelationRequested",
-    "TransactionCancelationRequestedEvent",
-    "TransactionCancelationRequestedEventAction",
-    "TransactionCancelationRequestedEventEvent",
-    "TransactionCancelationRequestedEventRecipient",
-    "TransactionCancelationRequestedEventTransaction",
-    "TransactionCancelationRequestedEventTransactionCancelationRequested",
-    "TransactionCancelationRequestedEventTransactionSourceObject",
-    "TransactionCancelationRequestedEventTransactionSourceObjectChannel",
-    "TransactionChargeRequested",
-    "TransactionChargeRequestedEvent",
-    "TransactionChargeRequestedEventAction",
-    "TransactionChargeRequestedEventEvent",
-    "TransactionChargeRequestedEventRecipient",
-    "TransactionChargeRequestedEventTransaction",
-    "TransactionChargeRequestedEventTransactionChargeRequested",
-    "TransactionChargeRequestedEventTransactionSourceObject",
-    "TransactionChargeRequestedEventTransactionSourceObjectChannel",
-    "TransactionChargeRequestedEventTransactionSourceObjectDeliveryMethodShippingMethod",
-    "TransactionChargeRequestedEventTransactionSourceObjectDeliveryMethodWarehouse",
-    "TransactionChargeRequestedEventTransactionSourceObjectLines",
-    "TransactionChargeRequestedEventTransactionSourceObjectLinesOrderVariant",
-    "TransactionChargeRequestedEventTransactionSourceObjectLinesOrderVariantProduct",
-    "TransactionChargeRequestedEventTransactionSourceObjectLinesOrderVariantProductCategory",
-    "TransactionChargeRequestedEventTransactionSourceObjectLinesOrderVariantProductThumbnail",
-    "TransactionChargeRequestedEventTransactionSourceObjectLinesTotalPrice",
-    "TransactionChargeRequestedEventTransactionSourceObjectLinesTotalPriceGross",
-    "TransactionChargeRequestedEventTransactionSourceObjectLinesTotalPriceNet",
-    "TransactionChargeRequestedEventTransactionSourceObjectLinesTotalPriceTax",
-    "TransactionChargeRequestedEventTransactionSourceObjectShippingPrice",
-    "TransactionChargeRequestedEventTransactionSourceObjectShippingPriceGross",
-    "TransactionChargeRequestedEventTransactionSourceObjectShippingPriceNet",
-    "TransactionChargeRequestedEventTransactionSourceObjectShippingPriceTax",
-    "TransactionChargeRequestedEventTransactionSourceObjectTotal",
-    "TransactionChargeRequestedEventTransactionSourceObjectTotalGross",
-    "TransactionEventReport",
-    "TransactionEventReportErrorCode",
-    "TransactionEventReportTransactionEventReport",
-    "TransactionEventReportTransactionEventReportErrors",
-    "TransactionEventTypeEnum",
-    "TransactionFlowStrategyEnum",
-    "TransactionInitializeSession",
-    "TransactionInitializeSessionAddress",
-    "TransactionInitializeSessionAddressCountry",
-    "TransactionInitializeSessionEvent",
-    "TransactionInitializeSessionEventAction",
-    "TransactionInitializeSessionEventEvent",
-    "TransactionInitializeSessionEventIssuingPrincipalApp",
-    "TransactionInitializeSessionEventIssuingPrincipalUser",
-    "TransactionInitializeSessionEventRecipient",
-    "TransactionInitializeSessionEventSourceObjectCheckout",
-    "TransactionInitializeSessionEventSourceObjectCheckoutBillingAddress",
-    "TransactionInitializeSessionEventSourceObjectCheckoutChannel",
-    "TransactionInitializeSessionEventSourceObjectCheckoutDeliveryMethodShippingMethod",
-    "TransactionInitializeSessionEventSourceObjectCheckoutDeliveryMethodWarehouse",
-    "TransactionInitializeSessionEventSourceObjectCheckoutLines",
-    "TransactionInitializeSessionEventSourceObjectCheckoutLinesCheckoutVariant",
-    "TransactionInitializeSessionEventSourceObjectCheckoutLinesCheckoutVariantProduct",
-    "TransactionInitializeSessionEventSourceObjectCheckoutLinesCheckoutVariantProductCategory",
-    "TransactionInitializeSessionEventSourceObjectCheckoutLinesCheckoutVariantProductThumbnail",
-    "TransactionInitializeSessionEventSourceObjectCheckoutLinesTotalPrice",
-    "TransactionInitializeSessionEventSourceObjectCheckoutLinesTotalPriceGross",
-    "TransactionInitializeSessionEventSourceObjectCheckoutLinesTotalPriceNet",
-    "TransactionInitializeSessionEventSourceObjectCheckoutLinesTotalPriceTax",
-    "TransactionInitializeSessionEventSourceObjectCheckoutShippingAddress",
-    "TransactionInitializeSessionEventSourceObjectCheckoutShippingPrice",
-    "TransactionInitializeSessionEventSourceObjectCheckoutShippingPriceGross",
-    "TransactionInitializeSessionEventSourceObjectCheckoutShippingPriceNet",
-    "TransactionInitializeSessionEventSourceObjectCheckoutShippingPriceTax",
-    "TransactionInitializeSessionEventSourceObjectCheckoutTotal",
-    "TransactionInitializeSessionEventSourceObjectCheckoutTotalGross",
-    "TransactionInitializeSessionEventSourceObjectOrder",
-    "TransactionInitializeSessionEventSourceObjectOrderBillingAddress",
-    "TransactionInitializeSessionEventSourceObjectOrderChannel",
-    "TransactionInitializeSessionEventSourceObjectOrderDeliveryMethodShippingMethod",
-    "TransactionInitializeSessionEventSourceObjectOrderDeliveryMethodWarehouse",
-    "TransactionInitializeSessionEventSourceObjectOrderLines",
-    "TransactionInitializeSessionEventSourceObjectOrderLinesOrderVariant",
-    "TransactionInitializeSessionEventSourceObjectOrderLinesOrderVariantProduct",
-    "TransactionInitializeSessionEventSourceObjectOrderLinesOrderVariantProductCategory",
-    "TransactionInitializeSessionEventSourceObjectOrderLinesOrderVariantProductThumbnail",
-    "TransactionInitializeSessionEventSourceObjectOrderLinesTotalPrice",
-    "TransactionInitializeSessionEventSourceObjectOrderLinesTotalPriceGross",
-    "TransactionInitializeSessionEventSourceObjectOrderLinesTotalPriceNet",
-    "TransactionInitializeSessionEventSourceObjectOrderLinesTotalPriceTax",
-    "TransactionInitializeSessionEventSourceObjectOrderShippingAddress",
-    "TransactionInitializeSessionEventSourceObjectOrderShippingPrice",
-    "TransactionInitializeSessionEventSourceObjectOrderShippingPriceGross",
-    "TransactionInitializeSessionEventSourceObjectOrderShippingPriceNet",
-    "TransactionInitializeSessionEventSourceObjectOrderShippingPriceTax",
-    "TransactionInitializeSessionEventSourceObjectOrderTotal",
-    "TransactionInitializeSessionEventSourceObjectOrderTotalGross",
-    "TransactionInitializeSessionEventTransaction",
-    "TransactionInitializeSessionEventTransactionInitializeSession",
-    "TransactionProcessSession",
-    "TransactionProcessSessionEvent",
-    "TransactionProcessSessionEventAction",
-    "TransactionProcessSessionEventEvent",
-    "TransactionProcessSessionEventRecipient",
-    "TransactionProcessSessionEventSourceObjectCheckout",
-    "TransactionProcessSessionEventSourceObjectCheckoutBillingAddress",
-    "TransactionProcessSessionEventSourceObjectCheckoutChannel",
-    "TransactionProcessSessionEventSourceObjectCheckoutDeliveryMethodShippingMethod",
-    "TransactionProcessSessionEventSourceObjectCheckoutDeliveryMethodWarehouse",
-    "TransactionProcessSessionEventSourceObjectCheckoutLines",
-    "TransactionProcessSessionEventSourceObjectCheckoutLinesCheckoutVariant",
-    "TransactionProcessSessionEventSourceObjectCheckoutLinesCheckoutVariantProduct",
-    "TransactionProcessSessionEventSourceObjectCheckoutLinesCheckoutVariantProductCategory",
-    "TransactionProcessSessionEventSourceObjectCheckoutLinesCheckoutVariantProductThumbnail",
-    "TransactionProcessSessionEventSourceObjectCheckoutLinesTotalPrice",
-    "TransactionProcessSessionEventSourceObjectCheckoutLinesTotalPriceGross",
-    "TransactionProcessSessionEventSourceObjectCheckoutLinesTotalPriceNet",
-    "TransactionProcessSessionEventSourceObjectCheckoutLinesTotalPriceTax",
-    "TransactionProcessSessionEventSourceObjectCheckoutShippingAddress",
-    "TransactionProcessSessionEventSourceObjectCheckoutShippingPrice",
-    "TransactionProcessSessionEventSourceObjectCheckoutShippingPriceGross",
-    "TransactionProcessSessionEventSourceObjectCheckoutShippingPriceNet",
-    "TransactionProcessSessionEventSourceObjectCheckoutShippingPriceTax",
-    "TransactionProcessSessionEventSourceObjectOrder",
-    "TransactionProcessSessionEventSourceObjectOrderBillingAddress",
-    "TransactionProcessSessionEventSourceObjectOrderChannel",
-    "TransactionProcessSessionEventSourceObjectOrderDeliveryMethodShippingMethod",
-    "TransactionProcessSessionEventSourceObjectOrderDeliveryMethodWarehouse",
-    "TransactionProcessSessionEventSourceObjectOrderLines",
-    "TransactionProcessSessionEventSourceObjectOrderLinesOrderVariant",
-    "TransactionProcessSessionEventSourceObjectOrderLinesOrderVariantProduct",
-    "TransactionProcessSessionEventSourceObjectOrderLinesOrderVariantProductCategory",
-    "TransactionProcessSessionEventSourceObjectOrderLinesOrderVariantProductThumbnail",
-    "TransactionProcessSessionEventSourceObjectOrderLinesTotalPrice",
-    "TransactionProcessSessionEventSourceObjectOrderLinesTotalPriceGross",
-    "TransactionProcessSessionEventSourceObjectOrderLinesTotalPriceNet",
-    "TransactionProcessSessionEventSourceObjectOrderLinesTotalPriceTax",
-    "TransactionProcessSessionEventSourceObjectOrderShippingAddress",
-    "TransactionProcessSessionEventSourceObjectOrderShippingPrice",
-    "TransactionProcessSessionEventSourceObjectOrderShippingPriceGross",
-    "TransactionProcessSessionEventSourceObjectOrderShippingPriceNet",
-    "TransactionProcessSessionEventSourceObjectOrderShippingPriceTax",
-    "TransactionProcessSessionEventTransaction",
-    "TransactionProcessSessionEventTransactionProcessSession",
-    "TransactionRefundRequested",
-    "TransactionRefundRequestedEvent",
-    "TransactionRefundRequestedEventAction",
-    "TransactionRefundRequestedEventEvent",
-    "TransactionRefundRequestedEventRecipient",
-    "TransactionRefundRequestedEventTransaction",
-    "TransactionRefundRequestedEventTransactionRefundRequested",
-    "TransactionRefundRequestedEventTransactionSourceObject",
-    "TransactionRefundRequestedEventTransactionSourceObjectChannel",
-    "TransactionRefundRequestedEventTransactionSourceObjectDeliveryMethodShippingMethod",
-    "TransactionRefundRequestedEventTransactionSourceObjectDeliveryMethodWarehouse",
-    "TransactionRefundRequestedEventTransactionSourceObjectLines",
-    "TransactionRefundRequestedEventTransactionSourceObjectLinesOrderVariant",
-    "TransactionRefundRequestedEventTransactionSourceObjectLinesOrderVariantProduct",
-    "TransactionRefundRequestedEventTransactionSourceObjectLinesOrderVariantProductCategory",
-    "TransactionRefundRequestedEventTransactionSourceObjectLinesOrderVariantProductThumbnail",
-    "TransactionRefundRequestedEventTransactionSourceObjectLinesTotalPrice",
-    "TransactionRefundRequestedEventTransactionSourceObjectLinesTotalPriceGross",
-    "TransactionRefundRequestedEventTransactionSourceObjectLinesTotalPriceNet",
-    "TransactionRefundRequestedEventTransactionSourceObjectLinesTotalPriceTax",
-    "TransactionRefundRequestedEventTransactionSourceObjectShippingPrice",
-    "TransactionRefundRequestedEventTransactionSourceObjectShippingPriceGross",
-    "TransactionRefundRequestedEventTransactionSourceObjectShippingPriceNet",
-    "TransactionRefundRequestedEventTransactionSourceObjectShippingPriceTax",
-    "TransactionRefundRequestedEventTransactionSourceObjectTotal",
-    "TransactionRefundRequestedEventTransactionSourceObjectTotalGross",
-    "Upload",
-]
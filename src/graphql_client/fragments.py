@@ -252,6 +252,7 @@ class TaxBaseLines(TaxBaseLine):
 
 class TransactionCancelationRequestedEvent(BaseModel):
     typename__: str = Field(alias="__typename")
+    issued_at: Optional[Any] = Field(alias="issuedAt")
     recipient: Optional["TransactionCancelationRequestedEventRecipient"]
     action: "TransactionCancelationRequestedEventAction"
     transaction: Optional["TransactionCancelationRequestedEventTransaction"]
@@ -286,6 +287,7 @@ class TransactionCancelationRequestedEventTransactionSourceObjectChannel(BaseMod
 
 class TransactionChargeRequestedEvent(BaseModel):
     typename__: str = Field(alias="__typename")
+    issued_at: Optional[Any] = Field(alias="issuedAt")
     recipient: Optional["TransactionChargeRequestedEventRecipient"]
     action: "TransactionChargeRequestedEventAction"
     transaction: Optional["TransactionChargeRequestedEventTransaction"]
@@ -1108,6 +1110,7 @@ class TransactionProcessSessionEventSourceObjectOrderLinesOrderVariantProductCat
 
 class TransactionRefundRequestedEvent(BaseModel):
     typename__: str = Field(alias="__typename")
+    issued_at: Optional[Any] = Field(alias="issuedAt")
     recipient: Optional["TransactionRefundRequestedEventRecipient"]
     action: "TransactionRefundRequestedEventAction"
     transaction: Optional["TransactionRefundRequestedEventTransaction"]
@@ -248,6 +248,7 @@ fragment PaymentGatewayRecipient on App {
 
 fragment TransactionCancelationRequestedEvent on TransactionCancelationRequested {
   __typename
+  issuedAt
   recipient {
     ...PaymentGatewayRecipient
   }
@@ -407,6 +408,7 @@ fragment PaymentGatewayRecipient on App {
 
 fragment TransactionChargeRequestedEvent on TransactionChargeRequested {
   __typename
+  issuedAt
   recipient {
     ...PaymentGatewayRecipient
   }
@@ -993,6 +995,7 @@ fragment PaymentGatewayRecipient on App {
 
 fragment TransactionRefundRequestedEvent on TransactionRefundRequested {
   __typename
+  issuedAt
   recipient {
     ...PaymentGatewayRecipient
   }
@@ -0,0 +1,13 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+
+from nimara_stripe.utils.lifecycle import run_shutdown_hooks
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Close pooled connections, e.g. to Saleor and Stripe, when the application shuts down."""
+    yield
+    await run_shutdown_hooks()
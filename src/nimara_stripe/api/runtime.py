@@ -0,0 +1,124 @@
+import asyncio
+import atexit
+from collections.abc import Coroutine
+from typing import Any, TypeVar
+
+import uvloop
+from aws_lambda_powertools.utilities.typing import LambdaContext
+from fastapi import FastAPI
+from lynara import (
+    APIGatewayProxyEventV1Interface,
+    APIGatewayProxyEventV2Interface,
+    LifespanInterface,
+    Lynara,
+)
+from lynara.types import LifespanMode
+
+from nimara_stripe.settings import settings
+from nimara_stripe.utils.lifecycle import run_shutdown_hooks
+
+T = TypeVar("T")
+
+
+def get_api_gw_interface() -> (
+    type[APIGatewayProxyEventV1Interface] | type[APIGatewayProxyEventV2Interface]
+):
+    if settings.api_gw_version == 1:
+        return APIGatewayProxyEventV1Interface
+    return APIGatewayProxyEventV2Interface
+
+
+async def complete_invocation(coro: Coroutine[Any, Any, T]) -> T:
+    """Run an invocation and wait for the tasks it started, e.g. config refreshes.
+
+    Lambda freezes the container once the handler returns, so tasks still pending
+    would only resume in a later invocation, or never.
+    """
+    existing = asyncio.all_tasks()
+    try:
+        return await coro
+    finally:
+        while started := asyncio.all_tasks() - existing:
+            await asyncio.wait(started)
+
+
+class EventLoopRuntime:
+    """Runs coroutines of Lambda invocations, e.g. queue worker batches.
+
+    With `lambda_persistent_loop` one uvloop event loop is kept for the lifetime of
+    the container and `startup` runs once, so pooled connections and caches bound to
+    the loop survive between warm invocations. Otherwise every invocation gets a
+    fresh loop with its own startup and shutdown. Either way an invocation returns
+    once the background tasks it started are done.
+    """
+
+    def __init__(self) -> None:
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def run(self, coro: Coroutine[Any, Any, T]) -> T:
+        if not settings.lambda_persistent_loop:
+            return asyncio.run(self._run_once(coro))
+        return self.get_loop().run_until_complete(complete_invocation(coro))
+
+    async def _run_once(self, coro: Coroutine[Any, Any, T]) -> T:
+        await self.startup()
+        try:
+            return await complete_invocation(coro)
+        finally:
+            await self.shutdown()
+
+    async def startup(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        await run_shutdown_hooks()
+
+    def get_loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None or self._loop.is_closed():
+            self._loop = uvloop.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+            self._loop.run_until_complete(self.startup())
+            atexit.register(self.close)
+        return self._loop
+
+    def close(self) -> None:
+        """Run the shutdown and close the loop."""
+        if self._loop is None or self._loop.is_closed():
+            return
+        self._loop.run_until_complete(self.shutdown())
+        self._loop.close()
+        atexit.unregister(self.close)
+
+
+class LambdaRuntime(EventLoopRuntime):
+    """Runs the ASGI app for Lambda invocations, with the app lifespan as its startup
+    and shutdown.
+    """
+
+    def __init__(self, app: FastAPI) -> None:
+        super().__init__()
+        self.app = app
+        self.lynara = Lynara(app=app, lifespan_mode=LifespanMode.OFF)
+        self._lifespan: LifespanInterface | None = None
+
+    def __call__(self, event: dict[str, Any], context: LambdaContext) -> dict[str, Any]:
+        if not settings.lambda_persistent_loop:
+            return asyncio.run(
+                complete_invocation(
+                    Lynara(app=self.app).run(
+                        event, context, get_api_gw_interface(), base_path=settings.base_path
+                    )
+                )
+            )
+        return self.run(
+            self.lynara.run(event, context, get_api_gw_interface(), base_path=settings.base_path)
+        )
+
+    async def startup(self) -> None:
+        self._lifespan = LifespanInterface(app=self.app, lifespan_mode=LifespanMode.AUTO)
+        await self._lifespan.startup()
+
+    async def shutdown(self) -> None:
+        if self._lifespan is not None:
+            await self._lifespan.shutdown()  # type: ignore[no-untyped-call]
+            self._lifespan = None
@@ -4,12 +4,12 @@ from fastapi import Depends, Form, HTTPException, Query, status
 from saleor_sdk.marina.exceptions import Unauthorized
 
 from nimara_stripe.services.saleor.auth import SaleorUser, saleor_authenticate
-from nimara_stripe.services.saleor.client import SaleorClient
-from nimara_stripe.services.saleor.deps import get_saleor_client_class
+from nimara_stripe.services.saleor.client import SaleorClientPool
+from nimara_stripe.services.saleor.deps import get_saleor_client_pool_for_request
 
 
 async def saleor_authenticate_form(
-    saleor_client_class: Annotated[SaleorClient, Depends(get_saleor_client_class)],
+    saleor_client_pool: Annotated[SaleorClientPool, Depends(get_saleor_client_pool_for_request)],
     jwt: Annotated[str, Form()],
     saleor_domain: str = Query(..., alias="domain"),
 ) -> SaleorUser:
@@ -17,7 +17,7 @@ async def saleor_authenticate_form(
         return await saleor_authenticate(
             saleor_domain=saleor_domain,
             jwt=jwt,
-            saleor_client_class=saleor_client_class,
+            saleor_client_pool=saleor_client_pool,
         )
     except Unauthorized as err:
         raise HTTPException(
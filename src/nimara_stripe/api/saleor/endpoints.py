@@ -1,12 +1,14 @@
+import hashlib
+from dataclasses import dataclass
+from functools import cache, lru_cache
 from pathlib import Path
 from typing import TYPE_CHECKING, Annotated
 
-from fastapi import APIRouter, Depends, Form, HTTPException, Query, Request, status
-from fastapi.templating import Jinja2Templates
+from fastapi import APIRouter, Depends, Form, HTTPException, Query, Request, Response, status
 from saleor_sdk.marina.install import install_app
 from saleor_sdk.schemas.manifest import Manifest
 
-from graphql_client import (
+from graphql_client.operations import (
     CALCULATE_TAXES_GQL,
     PAYMENT_GATEWAY_INITIALIZE_SESSION_GQL,
     TRANSACTION_CANCELATION_REQUESTED_GQL,
@@ -24,14 +26,14 @@ from nimara_stripe.api.saleor.utils import (
 )
 from nimara_stripe.jwks import JWKSProvider
 from nimara_stripe.services.saleor.auth import SaleorUser
-from nimara_stripe.services.saleor.client import SaleorClient
+from nimara_stripe.services.saleor.client import SaleorClientPool
 from nimara_stripe.services.saleor.config import (
     StripeConfig,
     StripeSaleorConfigProvider,
 )
 from nimara_stripe.services.saleor.deps import (
     SaleorDeps,
-    get_saleor_client_class,
+    get_saleor_client_pool_for_request,
     get_saleor_config_provider_class,
     get_saleor_jwks_provider_class,
 )
@@ -40,20 +42,49 @@ from nimara_stripe.settings import SALEOR_APP_ID, settings
 from nimara_stripe.utils.helpers import get_logger
 
 if TYPE_CHECKING:
+    from fastapi.templating import Jinja2Templates
     from starlette.templating import _TemplateResponse
 
 
 LOGGER = get_logger()
-templates = Jinja2Templates(directory=Path(__file__).parent / "templates")
+
+
+@cache
+def get_templates() -> "Jinja2Templates":
+    """Load the dashboard templates on first use, Jinja2 is not needed by the webhooks."""
+    from fastapi.templating import Jinja2Templates
+
+    return Jinja2Templates(directory=Path(__file__).parent / "templates")
+
 
 router = APIRouter()
 
 
-@router.get("/manifest", name="saleor-manifest")
-async def manifest_handler(request: Request) -> Manifest:
-    LOGGER.info(request.headers)
-    request_host = request.headers.get("host", "")
-    body = Manifest.model_validate(
+@dataclass(frozen=True)
+class RenderedManifest:
+    body: bytes
+    etag: str
+
+    @property
+    def headers(self) -> dict[str, str]:
+        return {"ETag": self.etag, "Cache-Control": f"max-age={settings.manifest_max_age}"}
+
+    def is_not_modified(self, if_none_match: str | None) -> bool:
+        """Return whether an If-None-Match header lists the ETag, compared weakly."""
+        if not if_none_match:
+            return False
+        etags = {etag.strip().removeprefix("W/") for etag in if_none_match.split(",")}
+        return "*" in etags or self.etag in etags
+
+
+@lru_cache(maxsize=32)
+def render_manifest(request_host: str) -> RenderedManifest:
+    """Build and serialize the manifest served on a host once.
+
+    The manifest only depends on the host, the cache is bounded as the header comes from
+    the client.
+    """
+    manifest = Manifest.model_validate(
         {
             "id": SALEOR_APP_ID,
             "permissions": ["HANDLE_PAYMENTS", "HANDLE_TAXES"],
@@ -120,7 +151,17 @@ async def manifest_handler(request: Request) -> Manifest:
         }
     )
 
-    return body
+    body = manifest.model_dump_json(by_alias=True).encode()
+    return RenderedManifest(body=body, etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"')
+
+
+@router.get("/manifest", name="saleor-manifest", response_model=Manifest)
+async def manifest_handler(request: Request) -> Response:
+    request_host = request.headers.get("host", "")
+    manifest = render_manifest(request_host)
+    if manifest.is_not_modified(request.headers.get("if-none-match")):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=manifest.headers)
+    return Response(manifest.body, media_type="application/json", headers=manifest.headers)
 
 
 @router.post("/register", name="saleor-register")
@@ -130,7 +171,7 @@ async def register_handler(
     saleor_config_provider_class: Annotated[
         type[StripeSaleorConfigProvider], Depends(get_saleor_config_provider_class)
     ],
-    saleor_client_class: Annotated[type[SaleorClient], Depends(get_saleor_client_class)],
+    saleor_client_pool: Annotated[SaleorClientPool, Depends(get_saleor_client_pool_for_request)],
     jwks_provider_class: Annotated[type[JWKSProvider], Depends(get_saleor_jwks_provider_class)],
 ) -> str:
     headers = request.headers
@@ -155,32 +196,29 @@ async def register_handler(
 
     LOGGER.info("Register endpoint called", extra={"saleor_domain": saleor_domain})
 
-    async with saleor_client_class(
-        saleor_url=get_saleor_url_parts(saleor_url).url,
-        api_key=register_body.auth_token,
-    ) as saleor_client:
-        jwks_provider = jwks_provider_class(jwks_service=saleor_client)
-
-        try:
-            LOGGER.info(
-                "Starting app installation",
-                extra={"auth_token": register_body.auth_token},
-            )
-            await install_app(
-                config_provider=config_provider,
-                jwks_provider=jwks_provider,
-                saleor_client=saleor_client,
-                saleor_domain=saleor_domain,
-                saleor_url=saleor_url,
-                saleor_auth_token=register_body.auth_token,
-            )
-            LOGGER.info("App installed successfully")
-        except Exception as e:
-            LOGGER.exception("Installation failed", extra={"error": str(e)})
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST, detail="Installation issue."
-            )
-        return "success!"
+    saleor_client = saleor_client_pool.get(
+        get_saleor_url_parts(saleor_url).url, api_key=register_body.auth_token
+    )
+    jwks_provider = jwks_provider_class(jwks_service=saleor_client)
+
+    try:
+        LOGGER.info(
+            "Starting app installation",
+            extra={"auth_token": register_body.auth_token},
+        )
+        await install_app(
+            config_provider=config_provider,
+            jwks_provider=jwks_provider,
+            saleor_client=saleor_client,
+            saleor_domain=saleor_domain,
+            saleor_url=saleor_url,
+            saleor_auth_token=register_body.auth_token,
+        )
+        LOGGER.info("App installed successfully")
+    except Exception as e:
+        LOGGER.exception("Installation failed", extra={"error": str(e)})
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Installation issue.")
+    return "success!"
 
 
 @router.get("/app", name="saleor-app")
@@ -193,7 +231,7 @@ async def saleor_app(
         "App loading page requested",
         extra={"domain": domain, "saleor_api_url": saleor_api_url},
     )
-    return templates.TemplateResponse(
+    return get_templates().TemplateResponse(
         request=request,
         name="loading.html",
         context={
@@ -218,7 +256,7 @@ async def saleor_data_fetch(
         saleor_domain=user.domain,
     )
     LOGGER.info("Config fetched for domain", extra={"user_domain": user.domain})
-    return templates.TemplateResponse(
+    return get_templates().TemplateResponse(
         request=request,
         name="index.html",
         context={
@@ -238,6 +276,7 @@ async def saleor_data_update_channel_config(
     stripe_pub_key: Annotated[str, Form()],
     stripe_secret_key: Annotated[str, Form()],
     stripe_webhook_secret_key: Annotated[str, Form()],
+    estimate_checkout_taxes: Annotated[bool, Form()] = False,
 ) -> "_TemplateResponse":
     LOGGER.info(
         "Updating channel config",
@@ -254,10 +293,11 @@ async def saleor_data_update_channel_config(
             stripe_pub_key=stripe_pub_key,
             stripe_secret_key=stripe_secret_key,
             stripe_webhook_secret_key=stripe_webhook_secret_key,
+            estimate_checkout_taxes=estimate_checkout_taxes,
         ),
     )
     LOGGER.info("Channel config updated successfully", extra={"channel_slug": channel_slug})
-    return templates.TemplateResponse(
+    return get_templates().TemplateResponse(
         request=request,
         name="index.html",
         context={
@@ -9,3 +9,4 @@ class StripeConfigResponse(BaseModel):
     stripe_pub_key: SecretStr
     stripe_secret_key: SecretStr
     stripe_webhook_secret_key: SecretStr
+    estimate_checkout_taxes: bool = False
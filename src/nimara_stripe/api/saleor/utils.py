@@ -23,6 +23,7 @@ def get_config_as_context_data(
                 stripe_pub_key=SecretStr(stripe_config.stripe_pub_key),
                 stripe_secret_key=SecretStr(stripe_config.stripe_secret_key),
                 stripe_webhook_secret_key=SecretStr(stripe_config.stripe_webhook_secret_key),
+                estimate_checkout_taxes=stripe_config.estimate_checkout_taxes,
             )
             for channel_slug, stripe_config in config.stripe_configurations_for_channels.items()
         },
@@ -1,35 +1,27 @@
-import asyncio
 from typing import Any
 
 from aws_lambda_powertools import Tracer
 from aws_lambda_powertools.utilities.typing import LambdaContext
 from fastapi import FastAPI
-from lynara import (
-    APIGatewayProxyEventV1Interface,
-    APIGatewayProxyEventV2Interface,
-    Lynara,
-)
 
+from nimara_stripe.api.lifespan import lifespan
+from nimara_stripe.api.runtime import LambdaRuntime
 from nimara_stripe.api.stripe.endpoints import router
 from nimara_stripe.settings import settings
 from nimara_stripe.utils.helpers import get_logger
+from nimara_stripe.utils.metrics import flush_metrics
 
 LOGGER = get_logger()
 TRACER = Tracer(service=settings.release)
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 app.include_router(router, prefix="/payment")
 
-lynara = Lynara(app=app)
+runtime = LambdaRuntime(app)
 
 
 @LOGGER.inject_lambda_context(log_event=True)
 @TRACER.capture_lambda_handler
+@flush_metrics
 def stripe_http_handler(event: dict[str, Any], context: LambdaContext) -> dict[str, Any]:
-    api_gw_interface: type[APIGatewayProxyEventV1Interface] | type[APIGatewayProxyEventV2Interface]
-    if settings.api_gw_version == 1:
-        api_gw_interface = APIGatewayProxyEventV1Interface
-    else:
-        api_gw_interface = APIGatewayProxyEventV2Interface
-
-    return asyncio.run(lynara.run(event, context, api_gw_interface, base_path=settings.base_path))
+    return runtime(event, context)
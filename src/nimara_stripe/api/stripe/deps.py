@@ -0,0 +1,30 @@
+from collections.abc import Callable, Coroutine
+from typing import Any, TypeVar
+
+from fastapi import Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ValidationError
+
+M = TypeVar("M", bound=BaseModel)
+
+
+def webhook_payload(model: type[M]) -> Callable[[Request], Coroutine[Any, Any, M]]:
+    """Return a dependency parsing the request body into a Saleor webhook event.
+
+    The body bytes are read once and cached on the request, so the signature check
+    reads the same buffer. Pydantic parses the JSON straight into the model instead
+    of FastAPI decoding it into a dict first and validating that.
+    """
+
+    async def parse(request: Request) -> M:
+        try:
+            return model.model_validate_json(await request.body())
+        except ValidationError as error:
+            raise RequestValidationError(
+                [
+                    {**details, "loc": ("body", *details["loc"])}
+                    for details in error.errors(include_url=False)
+                ]
+            ) from error
+
+    return parse
@@ -1,29 +1,28 @@
-from datetime import datetime
 from typing import Annotated, Any, cast
 
 import stripe
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from saleor_sdk.marina.exceptions import InvalidSaleorDomain
 
-from graphql_client import (
-    CalculateTaxesEventCalculateTaxes,
-    Money,
+from graphql_client.enums import TransactionEventTypeEnum, TransactionFlowStrategyEnum
+from graphql_client.fragments import Money
+from nimara_stripe.api.stripe.deps import webhook_payload
+from nimara_stripe.api.stripe.schema import (
+    CalculateTaxesEvent,
     PaymentGatewayInitializeSessionEvent,
     TransactionCancelationRequestedEvent,
     TransactionChargeRequestedEvent,
-    TransactionEventTypeEnum,
-    TransactionFlowStrategyEnum,
     TransactionInitializeSessionEvent,
     TransactionProcessSessionEvent,
     TransactionRefundRequestedEvent,
 )
 from nimara_stripe.api.stripe.utils import (
+    is_checkout_tax_base,
     prepare_saleor_base_response_data,
     prepare_saleor_response_data,
     prepare_stripe_data,
 )
 from nimara_stripe.services.saleor.auth import get_saleor_domain, verify_saleor_webhook
-from nimara_stripe.services.saleor.client import SaleorClient
 from nimara_stripe.services.saleor.config import (
     StripeConfig,
     StripeSaleorConfigData,
@@ -34,19 +33,33 @@ from nimara_stripe.services.stripe.auth import (
     get_stripe_signature,
     validate_stripe_webhook,
 )
+from nimara_stripe.services.stripe.client import get_stripe_client
 from nimara_stripe.services.stripe.currencies import (
     get_saleor_amount_from_stripe_amount,
     get_stripe_amount_from_saleor_money,
+    get_stripe_capture_amount_from_saleor_money,
 )
+from nimara_stripe.services.stripe.dedup import get_processed_event_store
 from nimara_stripe.services.stripe.enum import CaptureMethodEnum
+from nimara_stripe.services.stripe.idempotency import get_idempotency_key, run_idempotent
+from nimara_stripe.services.stripe.tax_cache import (
+    get_tax_calculation_key,
+    run_cached_tax_calculation,
+)
+from nimara_stripe.services.stripe.tax_rates import tax_rates
 from nimara_stripe.services.stripe.utils import get_result
-from nimara_stripe.services.stripe.webhook_utils import handle_payment_intent_event
+from nimara_stripe.services.stripe.webhook_queue import StripeWebhookMessage, get_webhook_queue
+from nimara_stripe.services.stripe.webhook_utils import report_stripe_event
+from nimara_stripe.settings import settings
 from nimara_stripe.utils.helpers import get_logger
+from nimara_stripe.utils.metrics import metrics
+from nimara_stripe.utils.serialization import loads, response_class
+from nimara_stripe.utils.tracing import trace
 
 LOGGER = get_logger()
 
 
-router = APIRouter()
+router = APIRouter(default_response_class=response_class)
 
 
 async def get_stripe_channel_config(channel_slug: str, saleor_api_url: str) -> "StripeConfig":
@@ -58,11 +71,20 @@ async def get_stripe_channel_config(channel_slug: str, saleor_api_url: str) -> "
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail=f"Configuration for '{channel_slug}' not found.",
         )
-    stripe.api_key = stripe_channel_config.stripe_secret_key
 
     return stripe_channel_config
 
 
+async def get_stripe_channel_client(
+    channel_slug: str, saleor_api_url: str
+) -> tuple["StripeConfig", stripe.StripeClient]:
+    stripe_channel_config = await get_stripe_channel_config(channel_slug, saleor_api_url)
+    stripe_client = get_stripe_client(
+        get_saleor_url_parts(saleor_api_url).domain, channel_slug, stripe_channel_config
+    )
+    return stripe_channel_config, stripe_client
+
+
 async def get_saleor_config(saleor_api_url: str) -> "StripeSaleorConfigData":
     saleor_url_parts = get_saleor_url_parts(saleor_api_url)
     saleor_provider = StripeSaleorConfigProvider()
@@ -80,7 +102,10 @@ async def get_saleor_config(saleor_api_url: str) -> "StripeSaleorConfigData":
 async def payment_gateway_initialize_session(
     request: Request,
     _: Annotated[None, Depends(verify_saleor_webhook)],
-    event: PaymentGatewayInitializeSessionEvent,
+    event: Annotated[
+        PaymentGatewayInitializeSessionEvent,
+        Depends(webhook_payload(PaymentGatewayInitializeSessionEvent)),
+    ],
 ) -> dict[str, dict[str, str]]:
     stripe_channel_config = await get_stripe_channel_config(
         event.source_object.channel.slug, request.headers.get("saleor-api-url", "")
@@ -94,57 +119,73 @@ async def transaction_initialize_session(
     request: Request,
     _: Annotated[None, Depends(verify_saleor_webhook)],
     saleor_domain: Annotated[str, Depends(get_saleor_domain)],
-    event: TransactionInitializeSessionEvent,
+    event: Annotated[
+        TransactionInitializeSessionEvent,
+        Depends(webhook_payload(TransactionInitializeSessionEvent)),
+    ],
 ) -> dict[str, Any]:
-    stripe_channel_config = await get_stripe_channel_config(
-        event.source_object.channel.slug, request.headers.get("saleor-api-url", "")
+    amount = get_stripe_amount_from_saleor_money(
+        Money(
+            amount=event.action.amount,
+            currency=event.action.currency,
+        )
+    )
+    idempotency_key = get_idempotency_key(
+        saleor_domain, event.transaction.id, "initialize-session", amount
     )
 
-    additional_data = event.data if event.data else {}
-    additional_metadata = additional_data.get("metadata", {})
-    payment_intent: stripe.PaymentIntent = stripe.PaymentIntent.create(
-        **additional_data,
-        amount=get_stripe_amount_from_saleor_money(
-            Money(
-                amount=event.action.amount,
-                currency=event.action.currency,
+    async def initialize_session() -> dict[str, Any]:
+        stripe_channel_config, stripe_client = await get_stripe_channel_client(
+            event.source_object.channel.slug, request.headers.get("saleor-api-url", "")
+        )
+
+        additional_data = event.data if event.data else {}
+        additional_metadata = additional_data.get("metadata", {})
+        create_data = {
+            **additional_data,
+            "amount": amount,
+            "currency": event.action.currency,
+            "capture_method": (
+                CaptureMethodEnum.AUTOMATIC.value
+                if event.action.action_type == TransactionFlowStrategyEnum.CHARGE
+                else CaptureMethodEnum.MANUAL.value
+            ),
+            "metadata": {
+                **additional_metadata,
+                "transactionId": event.transaction.id,
+                "channelId": event.source_object.channel.id,
+                "channelSlug": event.source_object.channel.slug,
+                "saleorDomain": saleor_domain,
+            },
+        }
+        async with trace("stripe.payment_intents.create", "stripe_latency"):
+            payment_intent = await stripe_client.payment_intents.create_async(
+                params=cast("stripe.PaymentIntentService.CreateParams", create_data),
+                options={"idempotency_key": idempotency_key},
             )
-        ),
-        currency=event.action.currency,
-        capture_method=(
-            CaptureMethodEnum.AUTOMATIC.value
-            if event.action.action_type == TransactionFlowStrategyEnum.CHARGE
-            else CaptureMethodEnum.MANUAL.value
-        ),
-        metadata={
-            **additional_metadata,
-            "transactionId": event.transaction.id,
-            "channelId": event.source_object.channel.id,
-            "channelSlug": event.source_object.channel.slug,
-            "saleorDomain": saleor_domain,
-        },
-    )
-    stripe_result = payment_intent.status
-    result = get_result(event.action.action_type.value, stripe_result)
+        stripe_result = payment_intent.status
+        result = get_result(event.action.action_type.value, stripe_result)
 
-    return {
-        "pspReference": payment_intent.id,
-        "result": result,
-        "amount": get_saleor_amount_from_stripe_amount(
-            amount=payment_intent.amount, currency=payment_intent.currency
-        ),
-        "message": (
-            payment_intent.last_payment_error.code if payment_intent.last_payment_error else ""
-        ),
-        "data": {
-            "paymentIntent": {
-                "clientSecret": payment_intent.client_secret,
-                "publishableKey": stripe_channel_config.stripe_pub_key,
+        return {
+            "pspReference": payment_intent.id,
+            "result": result,
+            "amount": get_saleor_amount_from_stripe_amount(
+                amount=payment_intent.amount, currency=payment_intent.currency
+            ),
+            "message": (
+                payment_intent.last_payment_error.code if payment_intent.last_payment_error else ""
+            ),
+            "data": {
+                "paymentIntent": {
+                    "clientSecret": payment_intent.client_secret,
+                    "publishableKey": stripe_channel_config.stripe_pub_key,
+                },
+                "time": payment_intent.created,
+                "externalUrl": f"https://dashboard.stripe.com/payments/{payment_intent.id}",
             },
-            "time": payment_intent.created,
-            "externalUrl": f"https://dashboard.stripe.com/payments/{payment_intent.id}",
-        },
-    }
+        }
+
+    return await run_idempotent(idempotency_key, initialize_session)
 
 
 @router.post("/process-session")
@@ -152,11 +193,14 @@ async def transaction_process_session(
     request: Request,
     _: Annotated[None, Depends(verify_saleor_webhook)],
     saleor_domain: Annotated[str, Depends(get_saleor_domain)],
-    event: TransactionProcessSessionEvent,
+    event: Annotated[
+        TransactionProcessSessionEvent, Depends(webhook_payload(TransactionProcessSessionEvent))
+    ],
 ) -> dict[str, Any]:
-    stripe_channel_config = await get_stripe_channel_config(
+    stripe_channel_config, stripe_client = await get_stripe_channel_client(
         event.source_object.channel.slug, request.headers.get("saleor-api-url", "")
     )
+
     payment_intent: stripe.PaymentIntent
     if event.data:
         additional_metadata = event.data.get("metadata", {})
@@ -182,11 +226,16 @@ async def transaction_process_session(
                 "saleorDomain": saleor_domain,
             },
         }
-        payment_intent = stripe.PaymentIntent.modify(
-            event.transaction.psp_reference, **update_data
-        )
+        async with trace("stripe.payment_intents.update", "stripe_latency"):
+            payment_intent = await stripe_client.payment_intents.update_async(
+                event.transaction.psp_reference,
+                params=cast("stripe.PaymentIntentService.UpdateParams", update_data),
+            )
     else:
-        payment_intent = stripe.PaymentIntent.retrieve(event.transaction.psp_reference)
+        async with trace("stripe.payment_intents.retrieve", "stripe_latency"):
+            payment_intent = await stripe_client.payment_intents.retrieve_async(
+                event.transaction.psp_reference
+            )
 
     stripe_result = payment_intent.status
     result = get_result(event.action.action_type.value, stripe_result)
@@ -215,122 +264,159 @@ async def transaction_process_session(
 async def transaction_charge_requested(
     request: Request,
     _: Annotated[None, Depends(verify_saleor_webhook)],
-    event: TransactionChargeRequestedEvent,
+    saleor_domain: Annotated[str, Depends(get_saleor_domain)],
+    event: Annotated[
+        TransactionChargeRequestedEvent, Depends(webhook_payload(TransactionChargeRequestedEvent))
+    ],
 ) -> dict[str, Any]:
-    if (
-        event.transaction is None
-        or event.transaction.source_object is None
-        or event.action.amount is None
-    ):
+    transaction = event.transaction
+    if transaction is None or transaction.source_object is None or event.action.amount is None:
         raise ValueError("Invalid event: transaction, source_object, or amount is None")
 
-    await get_stripe_channel_config(
-        event.transaction.source_object.channel.slug,
-        request.headers.get("saleor-api-url", ""),
+    channel_slug = transaction.source_object.channel.slug
+    # Fractions of HUF, ISK and TWD are truncated like decimals Stripe doesn't support, as
+    # Stripe only pays them out in whole units.
+    amount = get_stripe_capture_amount_from_saleor_money(
+        Money(
+            amount=event.action.amount,
+            currency=event.action.currency,
+        )
+    )
+    idempotency_key = get_idempotency_key(
+        saleor_domain, transaction.id, "charge", amount, event.issued_at
     )
 
-    payment_intent = stripe.PaymentIntent.capture(
-        intent=event.transaction.psp_reference,
-        amount_to_capture=get_stripe_amount_from_saleor_money(
-            Money(
-                amount=event.action.amount,
-                currency=event.action.currency,
+    async def charge() -> dict[str, Any]:
+        stripe_channel_config, stripe_client = await get_stripe_channel_client(
+            channel_slug, request.headers.get("saleor-api-url", "")
+        )
+
+        async with trace("stripe.payment_intents.capture", "stripe_latency"):
+            payment_intent = await stripe_client.payment_intents.capture_async(
+                transaction.psp_reference,
+                params={"amount_to_capture": amount},
+                options={"idempotency_key": idempotency_key},
             )
-        ),
-    )
 
-    stripe_result = payment_intent.status
-    result = get_result(event.action.action_type.value, stripe_result)
+        stripe_result = payment_intent.status
+        result = get_result(event.action.action_type.value, stripe_result)
+
+        if result in ("CHARGE_SUCCESS", "CHARGE_FAILURE"):
+            resp_data = {
+                "pspReference": payment_intent.id,
+                "result": result,
+                "amount": get_saleor_amount_from_stripe_amount(
+                    amount=payment_intent.amount, currency=payment_intent.currency
+                ),
+                "externalUrl": f"https://dashboard.stripe.com/payments/{payment_intent.id}",
+            }
+        else:
+            resp_data = {
+                "pspReference": payment_intent.id,
+            }
+        return resp_data
 
-    if result in ("CHARGE_SUCCESS", "CHARGE_FAILURE"):
-        resp_data = {
-            "pspReference": payment_intent.id,
-            "result": result,
-            "amount": get_saleor_amount_from_stripe_amount(
-                amount=payment_intent.amount, currency=payment_intent.currency
-            ),
-            "externalUrl": f"https://dashboard.stripe.com/payments/{payment_intent.id}",
-        }
-    else:
-        resp_data = {
-            "pspReference": payment_intent.id,
-        }
-    return resp_data
+    return await run_idempotent(idempotency_key, charge)
 
 
 @router.post("/cancel")
 async def transaction_cancel_requested(
     request: Request,
     _: Annotated[None, Depends(verify_saleor_webhook)],
-    event: TransactionCancelationRequestedEvent,
+    saleor_domain: Annotated[str, Depends(get_saleor_domain)],
+    event: Annotated[
+        TransactionCancelationRequestedEvent,
+        Depends(webhook_payload(TransactionCancelationRequestedEvent)),
+    ],
 ) -> dict[str, Any]:
-    if event.transaction is None or event.transaction.source_object is None:
+    transaction = event.transaction
+    if transaction is None or transaction.source_object is None:
         raise ValueError("Invalid event: transaction or source_object is None")
 
-    await get_stripe_channel_config(
-        event.transaction.source_object.channel.slug,
-        request.headers.get("saleor-api-url", ""),
+    channel_slug = transaction.source_object.channel.slug
+    idempotency_key = get_idempotency_key(
+        saleor_domain, transaction.id, "cancel", None, event.issued_at
     )
 
-    payment_intent = stripe.PaymentIntent.cancel(intent=event.transaction.psp_reference)
+    async def cancel() -> dict[str, Any]:
+        stripe_channel_config, stripe_client = await get_stripe_channel_client(
+            channel_slug, request.headers.get("saleor-api-url", "")
+        )
 
-    if payment_intent.status == "canceled":
-        resp_data = {
-            "pspReference": payment_intent.id,
-            "result": TransactionEventTypeEnum.CANCEL_SUCCESS,
-            "amount": get_saleor_amount_from_stripe_amount(
-                amount=payment_intent.amount, currency=payment_intent.currency
-            ),
-            "externalUrl": f"https://dashboard.stripe.com/payments/{payment_intent.id}",
-        }
-    else:
-        resp_data = {
-            "pspReference": payment_intent.id,
-        }
-    return resp_data
+        async with trace("stripe.payment_intents.cancel", "stripe_latency"):
+            payment_intent = await stripe_client.payment_intents.cancel_async(
+                transaction.psp_reference, options={"idempotency_key": idempotency_key}
+            )
+
+        if payment_intent.status == "canceled":
+            resp_data = {
+                "pspReference": payment_intent.id,
+                "result": TransactionEventTypeEnum.CANCEL_SUCCESS,
+                "amount": get_saleor_amount_from_stripe_amount(
+                    amount=payment_intent.amount, currency=payment_intent.currency
+                ),
+                "externalUrl": f"https://dashboard.stripe.com/payments/{payment_intent.id}",
+            }
+        else:
+            resp_data = {
+                "pspReference": payment_intent.id,
+            }
+        return resp_data
+
+    return await run_idempotent(idempotency_key, cancel)
 
 
 @router.post("/refund")
 async def transaction_refund_requested(
     request: Request,
     _: Annotated[None, Depends(verify_saleor_webhook)],
-    event: TransactionRefundRequestedEvent,
+    saleor_domain: Annotated[str, Depends(get_saleor_domain)],
+    event: Annotated[
+        TransactionRefundRequestedEvent, Depends(webhook_payload(TransactionRefundRequestedEvent))
+    ],
 ) -> dict[str, Any]:
-    if (
-        event.transaction is None
-        or event.transaction.source_object is None
-        or event.action.amount is None
-    ):
+    transaction = event.transaction
+    if transaction is None or transaction.source_object is None or event.action.amount is None:
         raise ValueError("Invalid event: transaction, source_object, or amount is None")
-    await get_stripe_channel_config(
-        event.transaction.source_object.channel.slug,
-        request.headers.get("saleor-api-url", ""),
+
+    channel_slug = transaction.source_object.channel.slug
+    amount = get_stripe_amount_from_saleor_money(
+        Money(
+            amount=event.action.amount,
+            currency=event.action.currency,
+        )
     )
+    idempotency_key = get_idempotency_key(
+        saleor_domain, transaction.id, "refund", amount, event.issued_at
+    )
+
+    async def refund() -> dict[str, Any]:
+        stripe_channel_config, stripe_client = await get_stripe_channel_client(
+            channel_slug, request.headers.get("saleor-api-url", "")
+        )
 
-    refund = stripe.Refund.create(
-        payment_intent=event.transaction.psp_reference,
-        amount=get_stripe_amount_from_saleor_money(
-            Money(
-                amount=event.action.amount,
-                currency=event.action.currency,
+        async with trace("stripe.refunds.create", "stripe_latency"):
+            stripe_refund = await stripe_client.refunds.create_async(
+                params={"payment_intent": transaction.psp_reference, "amount": amount},
+                options={"idempotency_key": idempotency_key},
             )
-        ),
-    )
 
-    if refund.status == "succeeded":
-        resp_data = {
-            "pspReference": event.transaction.psp_reference,
-            "result": TransactionEventTypeEnum.REFUND_SUCCESS,
-            "amount": get_saleor_amount_from_stripe_amount(
-                amount=refund.amount, currency=refund.currency
-            ),
-            "externalUrl": f"https://dashboard.stripe.com/payments/{event.transaction.psp_reference}",
-        }
-    else:
-        resp_data = {
-            "pspReference": event.transaction.psp_reference,
-        }
-    return resp_data
+        if stripe_refund.status == "succeeded":
+            resp_data = {
+                "pspReference": transaction.psp_reference,
+                "result": TransactionEventTypeEnum.REFUND_SUCCESS,
+                "amount": get_saleor_amount_from_stripe_amount(
+                    amount=stripe_refund.amount, currency=stripe_refund.currency
+                ),
+                "externalUrl": f"https://dashboard.stripe.com/payments/{transaction.psp_reference}",
+            }
+        else:
+            resp_data = {
+                "pspReference": transaction.psp_reference,
+            }
+        return resp_data
+
+    return await run_idempotent(idempotency_key, refund)
 
 
 async def get_configs_from_domain_settings(
@@ -347,7 +433,9 @@ async def get_configs_from_domain_settings(
 async def stripe_webhook(
     request: Request, stripe_signature: Annotated[str, Depends(get_stripe_signature)]
 ) -> str:
-    event_data = await request.json()
+    # The payload is parsed once, its raw bytes are what the signature is checked against.
+    payload = await request.body()
+    event_data = loads(payload)
 
     saleor_domain = event_data["data"]["object"]["metadata"].get("saleorDomain")
     channel_slug = event_data["data"]["object"]["metadata"].get("channelSlug")
@@ -357,8 +445,7 @@ async def stripe_webhook(
         return "OK"
 
     saleor_config, stripe_channel_config = await get_configs_from_domain_settings(
-        event_data["data"]["object"]["metadata"]["channelSlug"],
-        saleor_domain,
+        channel_slug, saleor_domain
     )
 
     if not (saleor_config and stripe_channel_config):
@@ -368,32 +455,28 @@ async def stripe_webhook(
             detail="No config data found!",
         )
 
-    stripe.api_key = stripe_channel_config.stripe_secret_key
+    await validate_stripe_webhook(payload, stripe_signature, stripe_channel_config, stripe)
 
-    await validate_stripe_webhook(request, stripe_signature, stripe_channel_config, stripe)
-
-    saleor_client = SaleorClient(
-        saleor_url=f"https://{saleor_domain}", api_key=saleor_config.auth_token
-    )
-    event = stripe.Event.construct_from(event_data, stripe.api_key)
-
-    payment_intent: stripe.PaymentIntent = cast(stripe.PaymentIntent, event.data.object)
-    event_data = await handle_payment_intent_event(event)
+    processed_events = get_processed_event_store()
+    if not await processed_events.add(event_data["id"]):
+        metrics.increment("stripe_event_duplicate")
+        return "OK"
 
-    await saleor_client.transaction_event_report(
-        transaction_id=payment_intent["metadata"]["transactionId"],
-        amount=get_saleor_amount_from_stripe_amount(
-            amount=payment_intent["amount"], currency=payment_intent["currency"]
-        ),
-        message=(
-            payment_intent.last_payment_error.code if payment_intent.last_payment_error else ""
-        ),
-        available_actions=event_data["available_actions"],
-        external_url=f"https://dashboard.stripe.com/payments/{payment_intent['id']}",
-        psp_reference=payment_intent["id"],
-        time=datetime.now().isoformat(),
-        type=event_data["type"],
-    )
+    try:
+        if settings.stripe_webhook_mode == "queue":
+            await get_webhook_queue().send(
+                StripeWebhookMessage(
+                    saleor_domain=saleor_domain, channel_slug=channel_slug, event=event_data
+                )
+            )
+        else:
+            await report_stripe_event(
+                saleor_domain, saleor_config, stripe_channel_config, event_data
+            )
+    except Exception:
+        # Let Stripe's retry of the event through.
+        await processed_events.discard(event_data["id"])
+        raise
     return "OK"
 
 
@@ -401,10 +484,12 @@ async def stripe_webhook(
 async def calculate_tax(
     request: Request,
     _: Annotated[None, Depends(verify_saleor_webhook)],
-    event: CalculateTaxesEventCalculateTaxes,
+    saleor_domain: Annotated[str, Depends(get_saleor_domain)],
+    event: Annotated[CalculateTaxesEvent, Depends(webhook_payload(CalculateTaxesEvent))],
 ) -> dict[str, Any]:
-    await get_stripe_channel_config(
-        event.tax_base.channel.slug, request.headers.get("saleor-api-url", "")
+    channel_slug = event.tax_base.channel.slug
+    stripe_channel_config, stripe_client = await get_stripe_channel_client(
+        channel_slug, request.headers.get("saleor-api-url", "")
     )
 
     resp_data = prepare_saleor_base_response_data(event)
@@ -412,10 +497,9 @@ async def calculate_tax(
         return resp_data
 
     shipping_cost, line_items = prepare_stripe_data(event)
-
-    result = stripe.tax.Calculation.create(
-        currency=event.tax_base.currency,
-        customer_details={
+    params: stripe.tax.CalculationService.CreateParams = {
+        "currency": event.tax_base.currency,
+        "customer_details": {
             "address": {
                 "line1": event.tax_base.address.street_address_1,
                 "line2": event.tax_base.address.street_address_2,
@@ -426,9 +510,24 @@ async def calculate_tax(
             },
             "address_source": "shipping",
         },
-        line_items=line_items,
-        shipping_cost={"amount": shipping_cost},
-        expand=["line_items"],
-    )
-
-    return prepare_saleor_response_data(resp_data, result)
+        "line_items": line_items,
+        "shipping_cost": {"amount": shipping_cost},
+        "expand": ["line_items"],
+    }
+    key = get_tax_calculation_key(saleor_domain, channel_slug, params, resp_data)
+
+    estimate_taxes = stripe_channel_config.estimate_checkout_taxes
+
+    async def calculate() -> dict[str, Any]:
+        if estimate_taxes and is_checkout_tax_base(event):
+            estimate = tax_rates.estimate(saleor_domain, channel_slug, params)
+            if estimate is not None:
+                metrics.increment("tax_calculation_estimated")
+                return prepare_saleor_response_data(resp_data, estimate)
+        async with trace("stripe.tax.calculations.create", "stripe_latency"):
+            result = await stripe_client.tax.calculations.create_async(params=params)
+        if estimate_taxes:
+            tax_rates.learn(saleor_domain, channel_slug, params, result)
+        return prepare_saleor_response_data(resp_data, result)
+
+    return await run_cached_tax_calculation(key, calculate)
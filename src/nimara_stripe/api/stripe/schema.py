@@ -0,0 +1,147 @@
+"""Saleor webhook payloads as read by the payment endpoints.
+
+The generated `graphql_client` models validate the whole subscription payload,
+including recipients, issuing principals, addresses and checkout lines the endpoints
+never read. These models only declare the fields the endpoints use, everything else
+in the payload is skipped by the JSON parser without building models for it.
+"""
+
+from typing import Annotated, Any, Literal
+
+from pydantic import BaseModel, ConfigDict, Field
+from pydantic.alias_generators import to_camel
+
+from graphql_client.enums import TransactionActionEnum, TransactionFlowStrategyEnum
+from graphql_client.fragments import Money
+
+
+class WebhookModel(BaseModel):
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+
+class Channel(WebhookModel):
+    id: str
+    slug: str
+
+
+class SourceObject(WebhookModel):
+    channel: Channel
+
+
+class Transaction(WebhookModel):
+    id: str
+    psp_reference: str
+
+
+class TransactionWithSourceObject(Transaction):
+    source_object: SourceObject | None
+
+
+class SessionAction(WebhookModel):
+    amount: float
+    currency: str
+    action_type: TransactionFlowStrategyEnum
+
+
+class TransactionAction(WebhookModel):
+    amount: float | None = None
+    currency: str
+    action_type: TransactionActionEnum
+
+
+class PaymentGatewayInitializeSessionEvent(WebhookModel):
+    source_object: SourceObject
+
+
+class TransactionSessionEvent(WebhookModel):
+    data: dict[str, Any] | None = None
+    action: SessionAction
+    transaction: Transaction
+    source_object: SourceObject
+
+
+class TransactionInitializeSessionEvent(TransactionSessionEvent):
+    pass
+
+
+class TransactionProcessSessionEvent(TransactionSessionEvent):
+    pass
+
+
+class TransactionActionRequestedEvent(WebhookModel):
+    # Missing in payloads of subscriptions registered before it was added to the manifest.
+    issued_at: str | None = None
+    action: TransactionAction
+    transaction: TransactionWithSourceObject | None
+
+
+class TransactionChargeRequestedEvent(TransactionActionRequestedEvent):
+    pass
+
+
+class TransactionCancelationRequestedEvent(TransactionActionRequestedEvent):
+    pass
+
+
+class TransactionRefundRequestedEvent(TransactionActionRequestedEvent):
+    pass
+
+
+class AddressCountry(WebhookModel):
+    code: str
+
+
+class TaxBaseAddress(WebhookModel):
+    street_address_1: str
+    street_address_2: str
+    city: str
+    country_area: str
+    postal_code: str
+    country: AddressCountry
+
+
+class TaxClass(WebhookModel):
+    name: str
+
+
+class Product(WebhookModel):
+    tax_class: TaxClass | None
+
+
+class ProductVariant(WebhookModel):
+    product: Product
+
+
+class TaxBaseCheckoutLine(WebhookModel):
+    typename__: Literal["CheckoutLine"] = Field(alias="__typename")
+    checkout_product_variant: ProductVariant
+
+
+class TaxBaseOrderLine(WebhookModel):
+    typename__: Literal["OrderLine"] = Field(alias="__typename")
+    order_product_variant: ProductVariant | None
+
+
+class TaxBaseLine(WebhookModel):
+    source_line: Annotated[
+        TaxBaseCheckoutLine | TaxBaseOrderLine, Field(discriminator="typename__")
+    ]
+    quantity: int
+    total_price: Money
+    product_sku: str | None
+
+
+class TaxBaseChannel(WebhookModel):
+    slug: str
+
+
+class TaxBase(WebhookModel):
+    currency: str
+    channel: TaxBaseChannel
+    address: TaxBaseAddress | None
+    shipping_price: Money
+    lines: list[TaxBaseLine]
+
+
+class CalculateTaxesEvent(WebhookModel):
+    tax_base: TaxBase
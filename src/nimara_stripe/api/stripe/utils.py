@@ -3,11 +3,9 @@ from typing import Any
 
 import stripe
 
-from graphql_client import (
-    CalculateTaxesEventCalculateTaxes,
-)
+from nimara_stripe.api.stripe.schema import CalculateTaxesEvent, TaxBaseCheckoutLine
 from nimara_stripe.services.stripe.currencies import (
-    get_saleor_amount_from_stripe_amount,
+    get_saleor_taxed_amounts,
     get_stripe_amount_from_saleor_money,
 )
 from nimara_stripe.services.stripe.exceptions import (
@@ -21,14 +19,20 @@ def calculate_tax_rate(net: Decimal, tax_value: Decimal) -> Decimal:
     return (tax_value / net) * 100
 
 
+def is_checkout_tax_base(event: CalculateTaxesEvent) -> bool:
+    return bool(event.tax_base.lines) and all(
+        isinstance(line.source_line, TaxBaseCheckoutLine) for line in event.tax_base.lines
+    )
+
+
 def prepare_stripe_data(
-    event: CalculateTaxesEventCalculateTaxes,
-) -> tuple[int, list["stripe.tax.Calculation.CreateParamsLineItem"]]:
+    event: CalculateTaxesEvent,
+) -> tuple[int, list["stripe.tax.CalculationService.CreateParamsLineItem"]]:
     """This function is preparing data for request to Stripe"""
     shipping_cost = 0
     if event.tax_base.shipping_price:
         shipping_cost = get_stripe_amount_from_saleor_money(event.tax_base.shipping_price)
-    line_items: list[stripe.tax.Calculation.CreateParamsLineItem] = []
+    line_items: list[stripe.tax.CalculationService.CreateParamsLineItem] = []
     for line in event.tax_base.lines:
         product_variant = (
             line.source_line.order_product_variant
@@ -38,7 +42,7 @@ def prepare_stripe_data(
         if product_variant is None:
             continue
 
-        line_item: stripe.tax.Calculation.CreateParamsLineItem = {
+        line_item: stripe.tax.CalculationService.CreateParamsLineItem = {
             "amount": get_stripe_amount_from_saleor_money(line.total_price),
             "quantity": line.quantity,
         }
@@ -52,7 +56,7 @@ def prepare_stripe_data(
 
 
 def prepare_saleor_base_response_data(
-    event: CalculateTaxesEventCalculateTaxes,
+    event: CalculateTaxesEvent,
 ) -> dict[str, Any]:
     """This function is creating empty response to Saleor"""
     basic_lines = []
@@ -78,47 +82,31 @@ def prepare_saleor_response_data(
 ) -> dict[str, Any]:
     """This function is populating response to Saleor with actual data"""
     if result.shipping_cost:
-        saleorized_shipping_amount = get_saleor_amount_from_stripe_amount(
-            amount=result.shipping_cost.amount, currency=result.currency
-        )
-        saleorized_shipping_tax_amount = get_saleor_amount_from_stripe_amount(
-            amount=result.shipping_cost.amount_tax, currency=result.currency
+        (shipping,) = get_saleor_taxed_amounts(
+            [result.shipping_cost.amount], [result.shipping_cost.amount_tax], result.currency
         )
         resp_data.update(
             {
-                "shipping_tax_rate": str(
-                    calculate_tax_rate(
-                        Decimal(saleorized_shipping_amount),
-                        Decimal(saleorized_shipping_tax_amount),
-                    )
-                ),
-                "shipping_price_gross_amount": str(
-                    Decimal(saleorized_shipping_amount) + Decimal(saleorized_shipping_tax_amount)
-                ),
-                "shipping_price_net_amount": saleorized_shipping_amount,
+                "shipping_tax_rate": shipping.tax_rate,
+                "shipping_price_gross_amount": shipping.gross,
+                "shipping_price_net_amount": shipping.net,
             }
         )
     if result.line_items:
-        tax_lines = []
-        for line in result.line_items.data:
-            saleorized_amount = get_saleor_amount_from_stripe_amount(
-                amount=line.amount, currency=result.currency
-            )
-            saleorized_tax_amount = get_saleor_amount_from_stripe_amount(
-                amount=line.amount_tax, currency=result.currency
-            )
-            tax_lines.append(
-                {
-                    "tax_rate": str(
-                        calculate_tax_rate(
-                            Decimal(saleorized_amount), Decimal(saleorized_tax_amount)
-                        )
-                    ),
-                    "total_gross_amount": str(
-                        Decimal(saleorized_amount) + Decimal(saleorized_tax_amount)
-                    ),
-                    "total_net_amount": saleorized_amount,
-                }
-            )
-        resp_data.update({"lines": tax_lines})
+        lines = result.line_items.data
+        taxed_amounts = get_saleor_taxed_amounts(
+            [line.amount for line in lines], [line.amount_tax for line in lines], result.currency
+        )
+        resp_data.update(
+            {
+                "lines": [
+                    {
+                        "tax_rate": line.tax_rate,
+                        "total_gross_amount": line.gross,
+                        "total_net_amount": line.net,
+                    }
+                    for line in taxed_amounts
+                ]
+            }
+        )
     return resp_data
@@ -1,21 +1,59 @@
-from collections import defaultdict
+import time
+from dataclasses import dataclass
 
+from cachetools import TTLCache
 from jwt.api_jwk import PyJWKSet
 from saleor_sdk.marina.jwks import AbstractJWKSClient, AbstractJWKSProvider
 
+from nimara_stripe.settings import settings
+from nimara_stripe.utils.metrics import metrics
+from nimara_stripe.utils.single_flight import SingleFlight
+from nimara_stripe.utils.tracing import trace
+
+
+@dataclass(frozen=True)
+class CachedJWKS:
+    jwks: PyJWKSet
+    fetched_at: float
+
 
 class JWKSProvider(AbstractJWKSProvider):  # type: ignore
-    jwks_cache: dict[str, str] = defaultdict()
+    """JWKS provider keeping parsed key sets, so keys are not rebuilt per webhook.
+
+    A cached key set is refetched when it expires or when a token signed with an
+    unknown `kid` forces a refresh, at most once per `jwks_min_refresh_interval`.
+    Concurrent fetches for the same issuer share a single request.
+    """
+
+    jwks_cache: TTLCache[str, CachedJWKS] = TTLCache(maxsize=128, ttl=settings.jwks_cache_ttl)
+    _fetches: SingleFlight[str, PyJWKSet] = SingleFlight()
 
     def __init__(self, jwks_service: AbstractJWKSClient):
         self.jwks_service = jwks_service
 
     async def get(self, issuer: str, force_refresh: bool = False) -> PyJWKSet:
         """Get JWKS for specified issuer."""
-        if issuer not in self.jwks_cache or force_refresh:
-            await self.set(issuer, await self.jwks_service.fetch_jwks())
-        return PyJWKSet.from_json(self.jwks_cache[issuer])
+        cached: CachedJWKS | None = self.jwks_cache.get(issuer)
+        if cached is None or (force_refresh and self._can_refresh(cached)):
+            metrics.increment("jwks_cache_miss")
+            return await self._fetches.run(issuer, lambda: self._fetch(issuer))
+        metrics.increment("jwks_cache_hit")
+        return cached.jwks
 
     async def set(self, issuer: str, jwks: str) -> None:
         """Store JWKS for an issuer in cache."""
-        self.jwks_cache[issuer] = jwks
+        self._store(issuer, jwks)
+
+    async def _fetch(self, issuer: str) -> PyJWKSet:
+        async with trace("saleor.fetch_jwks", "jwks_fetch_latency"):
+            jwks = await self.jwks_service.fetch_jwks()
+        return self._store(issuer, jwks)
+
+    def _store(self, issuer: str, jwks: str) -> PyJWKSet:
+        parsed_jwks = PyJWKSet.from_json(jwks)
+        self.jwks_cache[issuer] = CachedJWKS(jwks=parsed_jwks, fetched_at=time.monotonic())
+        return parsed_jwks
+
+    @staticmethod
+    def _can_refresh(cached: CachedJWKS) -> bool:
+        return time.monotonic() - cached.fetched_at >= settings.jwks_min_refresh_interval
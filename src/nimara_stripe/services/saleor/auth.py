@@ -8,13 +8,14 @@ from saleor_sdk.marina.auth import decode_saleor_jwt, verify_webhook_signature
 from saleor_sdk.marina.exceptions import Unauthorized
 
 from nimara_stripe.jwks import JWKSProvider
-from nimara_stripe.services.saleor.client import SaleorClient
+from nimara_stripe.services.saleor.client import SaleorClient, SaleorClientPool
 from nimara_stripe.services.saleor.deps import (
-    get_saleor_client_class,
+    get_saleor_client_pool_for_request,
     get_saleor_jwks_provider_class,
 )
 from nimara_stripe.services.saleor.utils import get_saleor_url_parts
 from nimara_stripe.utils.helpers import get_logger
+from nimara_stripe.utils.tracing import trace
 
 LOGGER = get_logger()
 
@@ -83,15 +84,15 @@ async def verify_saleor_webhook(
     request: Request,
     saleor_signature: Annotated[str, Depends(get_saleor_signature)],
     saleor_api_url: Annotated[str, Depends(get_saleor_api_url)],
-    saleor_client_class: Annotated[type[SaleorClient], Depends(get_saleor_client_class)],
+    saleor_client_pool: Annotated[SaleorClientPool, Depends(get_saleor_client_pool_for_request)],
     jwks_provider_class: Annotated[type[JWKSProvider], Depends(get_saleor_jwks_provider_class)],
 ) -> None:
-    async with saleor_client_class(
-        saleor_url=get_saleor_url_parts(saleor_api_url).url, api_key=None
-    ) as saleor_client:
-        jwks_provider = jwks_provider_class(saleor_client)
+    saleor_client = saleor_client_pool.get(get_saleor_url_parts(saleor_api_url).url, api_key=None)
+    jwks_provider = jwks_provider_class(saleor_client)
+    payload = await request.body()
+    async with trace("saleor.verify_webhook_signature", "webhook_signature_latency"):
         await verify_webhook_signature(
-            payload=await request.body(),
+            payload=payload,
             jws=saleor_signature,
             issuer=saleor_api_url,
             jwks_provider=jwks_provider,
@@ -102,7 +103,7 @@ async def verify_saleor_webhook(
 async def saleor_authenticate(
     saleor_domain: str,
     jwt: str,
-    saleor_client_class: type[SaleorClient],
+    saleor_client_pool: SaleorClientPool,
 ) -> SaleorUser:
     unverified_payload = jwt_decode(jwt=jwt, options={"verify_signature": False})
     jwt_saleor_url_parts = get_saleor_url_parts(unverified_payload["iss"])
@@ -110,13 +111,13 @@ async def saleor_authenticate(
     if saleor_domain != jwt_saleor_url_parts.domain:
         raise Unauthorized()
 
-    async with saleor_client_class(jwt_saleor_url_parts.url, api_key=None) as saleor:
-        try:
-            user = await authenticate(saleor_client=saleor, jwt=jwt)
-        except Unauthorized:
-            raise
+    saleor = saleor_client_pool.get(jwt_saleor_url_parts.url, api_key=None)
+    try:
+        user = await authenticate(saleor_client=saleor, jwt=jwt)
+    except Unauthorized:
+        raise
 
-        if not user.is_staff:
-            raise Unauthorized()
+    if not user.is_staff:
+        raise Unauthorized()
 
     return user
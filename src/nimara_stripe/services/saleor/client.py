@@ -1,3 +1,9 @@
+import asyncio
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any, cast
+
 import httpx
 from saleor_sdk.marina.client import AbstractSaleorClient
 from saleor_sdk.marina.exceptions import SaleorAppInstallationProblem
@@ -12,7 +18,11 @@ from graphql_client.exceptions import (
     GraphQLClientInvalidMessageFormat,
     GraphQLClientInvalidResponseError,
 )
+from nimara_stripe.settings import settings
 from nimara_stripe.utils.helpers import get_logger
+from nimara_stripe.utils.lifecycle import on_shutdown
+from nimara_stripe.utils.loop import LoopLocal
+from nimara_stripe.utils.serialization import dumps, loads
 
 LOGGER = get_logger()
 
@@ -34,16 +44,80 @@ class SaleorClient(AutoGenClient, AbstractSaleorClient, AbstractJWKSClient):  #
         if api_key:
             headers["Authorization"] = f"Bearer {api_key}"
         if timeout is None:
-            timeout = httpx.Timeout(10)
+            timeout = httpx.Timeout(settings.saleor_timeout)
         client = httpx.AsyncClient(
             base_url=saleor_url,
             headers=headers,
             timeout=timeout,
+            http2=settings.saleor_http2,
+            limits=httpx.Limits(
+                max_connections=settings.saleor_max_connections,
+                max_keepalive_connections=settings.saleor_max_keepalive_connections,
+                keepalive_expiry=settings.saleor_keepalive_expiry,
+            ),
         )
         super().__init__(url="/graphql/", http_client=client)
+        self._users = 0
+        self._close_when_unused = False
+
+    @asynccontextmanager
+    async def in_use(self) -> AsyncIterator[None]:
+        """Keep the client open while the block runs, even if the pool evicts it."""
+        self._users += 1
+        try:
+            yield
+        finally:
+            self._users -= 1
+            if self._close_when_unused and not self._users:
+                await self.http_client.aclose()
+
+    async def close_when_unused(self) -> None:
+        """Close the client now, or once the blocks using it are done."""
+        self._close_when_unused = True
+        if not self._users:
+            await self.http_client.aclose()
+
+    # The generated client encodes and decodes with the standard library `json`, these
+    # overrides go through the configured JSON backend instead.
+    async def _execute_json(
+        self,
+        query: str,
+        operation_name: str | None,
+        variables: dict[str, Any],
+        **kwargs: Any,
+    ) -> httpx.Response:
+        headers = {"Content-Type": "application/json", **kwargs.pop("headers", {})}
+        async with self.in_use():
+            return await self.http_client.post(
+                url=self.url,
+                content=dumps(
+                    {"query": query, "operationName": operation_name, "variables": variables}
+                ),
+                headers=headers,
+                **kwargs,
+            )
+
+    def get_data(self, response: httpx.Response) -> dict[str, Any]:
+        if not response.is_success:
+            raise GraphQLClientHttpError(status_code=response.status_code, response=response)
+        try:
+            response_json = loads(response.content)
+        except ValueError as exc:
+            raise GraphQLClientInvalidResponseError(response=response) from exc
+
+        if not isinstance(response_json, dict) or (
+            "data" not in response_json and "errors" not in response_json
+        ):
+            raise GraphQLClientInvalidResponseError(response=response)
+        if errors := response_json.get("errors"):
+            raise GraphQLClientGraphQLMultiError.from_errors_dicts(
+                errors_dicts=errors, data=response_json.get("data")
+            )
+        return cast(dict[str, Any], response_json.get("data"))
 
     async def fetch_jwks(self) -> str:
-        response = await self.http_client.get("/.well-known/jwks.json")
+        async with self.in_use():
+            response = await self.http_client.get("/.well-known/jwks.json")
         response.raise_for_status()
         return response.content.decode()
 
@@ -56,3 +130,57 @@ class SaleorClient(AutoGenClient, AbstractSaleorClient, AbstractJWKSClient):  #
         except GraphQLClientError as err:
             LOGGER.error(str(err))
             raise SaleorAppInstallationProblem(str(err)) from err
+
+
+class SaleorClientPool:
+    """Long-lived Saleor clients keyed by Saleor URL and auth token.
+
+    Reusing a client keeps its connections to Saleor open between requests, so warm
+    requests skip the DNS lookup and the TCP and TLS handshakes. The pool is bounded,
+    the least recently used client is evicted when a new one does not fit. Evicted
+    clients are closed once their requests, and reports queued with them, are done.
+    """
+
+    def __init__(self, maxsize: int, client_class: type[SaleorClient] = SaleorClient) -> None:
+        self.maxsize = maxsize
+        self.client_class = client_class
+        self._clients: OrderedDict[tuple[str, str | None], SaleorClient] = OrderedDict()
+        self._closing: set[asyncio.Task[None]] = set()
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def get(self, saleor_url: str, api_key: str | None) -> SaleorClient:
+        key = (saleor_url, api_key)
+        client = self._clients.get(key)
+        if client is None or client.http_client.is_closed:
+            client = self._clients[key] = self.client_class(saleor_url=saleor_url, api_key=api_key)
+        self._clients.move_to_end(key)
+
+        while len(self._clients) > self.maxsize:
+            _, evicted = self._clients.popitem(last=False)
+            task = asyncio.create_task(evicted.close_when_unused())
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+        return client
+
+    async def aclose(self) -> None:
+        clients = list(self._clients.values())
+        self._clients.clear()
+        await asyncio.gather(*(client.http_client.aclose() for client in clients), *self._closing)
+
+
+_pool: LoopLocal[SaleorClientPool] = LoopLocal(
+    lambda: SaleorClientPool(maxsize=settings.saleor_client_pool_size)
+)
+
+
+def get_saleor_client_pool() -> SaleorClientPool:
+    return _pool.get()
+
+
+@on_shutdown
+async def close_saleor_client_pool() -> None:
+    pool = _pool.pop()
+    if pool is not None:
+        await pool.aclose()
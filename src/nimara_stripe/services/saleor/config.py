@@ -1,13 +1,8 @@
-import asyncio
 import dataclasses
-import json
+import time
+from collections.abc import Callable
 from functools import partial
-from typing import cast
 
-from aws_lambda_powertools.utilities.parameters.exceptions import (
-    GetParameterError,
-    TransformParameterError,
-)
 from cachetools import TTLCache
 from pydantic import RootModel
 from pydantic.dataclasses import dataclass as pydantic_dataclass
@@ -17,8 +12,19 @@ from saleor_sdk.marina.config import (
 )
 from saleor_sdk.marina.exceptions import InvalidSaleorDomain
 
+from nimara_stripe.services.saleor.storage import (
+    ConfigStorage,
+    RawConfig,
+    get_config_storage,
+)
+from nimara_stripe.services.stripe.client import invalidate_stripe_clients
 from nimara_stripe.settings import settings
-from nimara_stripe.utils.aws import secrets_client
+from nimara_stripe.utils.helpers import get_logger
+from nimara_stripe.utils.metrics import metrics
+from nimara_stripe.utils.single_flight import SingleFlight
+from nimara_stripe.utils.tracing import trace
+
+logger = get_logger()
 
 # The usage of Pydantic's dataclass decorator is important here as it allows us to
 # nest dataclasses easier. It also provides a way to validate the data that is being
@@ -31,6 +37,8 @@ class StripeConfig:
     stripe_pub_key: str
     stripe_secret_key: str
     stripe_webhook_secret_key: str
+    # Answer checkout tax requests from tax rates learned from earlier calculations.
+    estimate_checkout_taxes: bool = False
 
 
 @pydantic_dataclass
@@ -43,102 +51,150 @@ class StripeSaleorConfigData(SaleorConfigData):  # type: ignore
         return self.stripe_configurations_for_channels.get(channel_slug)
 
 
+@dataclasses.dataclass(frozen=True)
+class CachedConfig:
+    config: StripeSaleorConfigData
+    fetched_at: float
+
+    @property
+    def is_stale(self) -> bool:
+        return time.monotonic() - self.fetched_at >= settings.config_cache_ttl
+
+
+def _parse_config(raw_config: RawConfig | None) -> StripeSaleorConfigData | None:
+    return StripeSaleorConfigData(**raw_config) if raw_config is not None else None
+
+
+def _dump_config(config: StripeSaleorConfigData) -> RawConfig:
+    raw_config: RawConfig = RootModel[StripeSaleorConfigData](config).model_dump(mode="json")
+    return raw_config
+
+
 class StripeSaleorConfigProvider(AbstractSaleorConfigProvider):  # type: ignore
-    _cache: TTLCache[str, dict[str, StripeSaleorConfigData]] = TTLCache(maxsize=1, ttl=60)
+    """Saleor configs kept in a `ConfigStorage` selected by `settings.config_storage`.
+
+    Configs are cached per Saleor domain. Concurrent cache misses share one storage
+    read and stale configs are served while a background refresh is running, so
+    after warm-up requests do not wait for the storage. Domains without a config are
+    remembered for a short time only, as they come from unverified webhook bodies.
+    """
+
+    _cache: TTLCache[str, CachedConfig] = TTLCache(
+        maxsize=settings.config_cache_size, ttl=settings.config_cache_max_age
+    )
+    _missing: TTLCache[str, float] = TTLCache(
+        maxsize=settings.config_cache_size, ttl=settings.config_missing_ttl
+    )
+    _fetches: SingleFlight[str, StripeSaleorConfigData | None] = SingleFlight()
+
+    def __init__(self, storage: ConfigStorage | None = None) -> None:
+        self.storage = storage or get_config_storage()
 
     async def create_or_update(
         self, auth_token: str, saleor_domain: str, saleor_app_id: str
     ) -> StripeSaleorConfigData:
-        configs = await self.get_all()
-
-        config = configs.get(saleor_domain)
-        if config:
-            config.auth_token = auth_token
-            config.saleor_app_id = saleor_app_id
-        else:
-            config = StripeSaleorConfigData(
+        def update(config: StripeSaleorConfigData | None) -> StripeSaleorConfigData:
+            if config:
+                config.auth_token = auth_token
+                config.saleor_app_id = saleor_app_id
+                return config
+            return StripeSaleorConfigData(
                 auth_token=auth_token,
                 saleor_domain=saleor_domain,
                 saleor_app_id=saleor_app_id,
             )
 
-        configs[saleor_domain] = config
-
-        secrets_client.put_secret_value(
-            SecretId=settings.secret_app_config_path,
-            SecretString=RootModel[dict[str, StripeSaleorConfigData]](configs).model_dump_json(),
-        )
-
-        self._cache.clear()
-
-        return config
+        return await self._update(saleor_domain, update)
 
     async def get_by_saleor_domain(
         self,
         saleor_domain: str,
     ) -> StripeSaleorConfigData:
-        configs = await self.get_all()
-        if saleor_domain not in configs:
+        config = await self._get_cached(saleor_domain)
+        if config is None:
             raise InvalidSaleorDomain(f"Saleor config for {saleor_domain} not found")
-        return configs[saleor_domain]
+        return config
 
     async def get_all(self) -> dict[str, StripeSaleorConfigData]:
-        if "configs" in self._cache:
-            return cast(dict[str, StripeSaleorConfigData], self._cache["configs"])
-        try:
-            response = secrets_client.get_secret_value(
-                SecretId=settings.secret_app_config_path,
-            )
-
-            secret_string = response.get("SecretString")
-            if not secret_string:
-                raise InvalidSaleorDomain("Secret is empty")
-
-            config_data = json.loads(secret_string)
-
-            parsed_configs = {
-                domain: StripeSaleorConfigData(**raw_config)
-                for domain, raw_config in config_data.items()
-            }
-
-            self._cache["configs"] = parsed_configs
+        async with trace("config_storage.get_all", "config_get_all_latency"):
+            raw_configs = await self.storage.get_all()
+        return {
+            saleor_domain: StripeSaleorConfigData(**raw_config)
+            for saleor_domain, raw_config in raw_configs.items()
+        }
+
+    async def _get_cached(self, saleor_domain: str) -> StripeSaleorConfigData | None:
+        if saleor_domain in self._missing:
+            metrics.increment("config_cache_hit")
+            return None
+        cached: CachedConfig | None = self._cache.get(saleor_domain)
+        if cached is None:
+            metrics.increment("config_cache_miss")
+            return await self._fetches.run(saleor_domain, partial(self._load, saleor_domain))
+        if cached.is_stale:
+            metrics.increment("config_cache_stale")
+            self._fetches.start(saleor_domain, partial(self._refresh, saleor_domain, cached))
+        else:
+            metrics.increment("config_cache_hit")
+        return cached.config
 
-            return parsed_configs
+    async def _refresh(
+        self, saleor_domain: str, cached: CachedConfig
+    ) -> StripeSaleorConfigData | None:
+        try:
+            return await self._load(saleor_domain, background=True)
+        except Exception:
+            metrics.increment("config_refresh_error")
+            logger.exception("Could not refresh Saleor config, serving stale one")
+            # Serve the stale config for another TTL, so failed refreshes are spaced out.
+            if self._cache.get(saleor_domain) is cached:
+                self._cache[saleor_domain] = dataclasses.replace(
+                    cached, fetched_at=time.monotonic()
+                )
+            return cached.config
+
+    async def _load(
+        self, saleor_domain: str, background: bool = False
+    ) -> StripeSaleorConfigData | None:
+        started = time.monotonic()
+        async with trace("config_storage.get", "config_refresh_latency", background=background):
+            config = _parse_config(await self.storage.get(saleor_domain))
+        cached: CachedConfig | None = self._cache.get(saleor_domain)
+        # Don't let a read that started before a write overwrite the written config.
+        if cached is not None and cached.fetched_at > started:
+            return cached.config
+        if config is None:
+            self._cache.pop(saleor_domain, None)
+            self._missing[saleor_domain] = started
+        else:
+            self._cache[saleor_domain] = CachedConfig(config=config, fetched_at=started)
+        return config
 
-        except (
-            GetParameterError,
-            TransformParameterError,
-            ValueError,
-        ) as e:
-            raise InvalidSaleorDomain("Could not retrieve Saleor config list") from e
+    async def _update(
+        self,
+        saleor_domain: str,
+        update: Callable[[StripeSaleorConfigData | None], StripeSaleorConfigData],
+    ) -> StripeSaleorConfigData:
+        # Updates are applied to configs freshly read by the storage, never to cached ones.
+        raw_config = await self.storage.update(
+            saleor_domain, lambda raw_config: _dump_config(update(_parse_config(raw_config)))
+        )
+        config = StripeSaleorConfigData(**raw_config)
+        self._missing.pop(saleor_domain, None)
+        self._cache[saleor_domain] = CachedConfig(config=config, fetched_at=time.monotonic())
+        return config
 
     async def update_stripe_config_data_by_channel_slug(
         self, saleor_domain: str, channel_slug: str, stripe_config: StripeConfig
     ) -> StripeSaleorConfigData:
-        configs = await self.get_all()
-
-        config = configs.get(saleor_domain)
-        if not config:
-            raise InvalidSaleorDomain(f"Saleor config for {saleor_domain} not found")
-
-        config.stripe_configurations_for_channels[channel_slug] = stripe_config
-        configs[saleor_domain] = config
-
-        loop = asyncio.get_running_loop()
-
-        await loop.run_in_executor(
-            None,
-            partial(
-                secrets_client.put_secret_value,
-                SecretId=settings.secret_app_config_path,
-                SecretString=RootModel[dict[str, StripeSaleorConfigData]](
-                    configs
-                ).model_dump_json(),
-            ),
-        )
-
-        self._cache.clear()
-
+        def update(config: StripeSaleorConfigData | None) -> StripeSaleorConfigData:
+            if not config:
+                raise InvalidSaleorDomain(f"Saleor config for {saleor_domain} not found")
+            config.stripe_configurations_for_channels[channel_slug] = stripe_config
+            return config
+
+        config = await self._update(saleor_domain, update)
+        invalidate_stripe_clients(saleor_domain, channel_slug)
         return config
 
     async def get_by_saleor_app_id(
@@ -1,5 +1,9 @@
 from nimara_stripe.jwks import JWKSProvider
-from nimara_stripe.services.saleor.client import SaleorClient
+from nimara_stripe.services.saleor.client import (
+    SaleorClient,
+    SaleorClientPool,
+    get_saleor_client_pool,
+)
 from nimara_stripe.services.saleor.config import StripeSaleorConfigProvider
 
 
@@ -11,6 +15,11 @@ def get_saleor_client_class() -> type[SaleorClient]:
     return SaleorClient
 
 
+async def get_saleor_client_pool_for_request() -> SaleorClientPool:
+    # Async so that FastAPI resolves it on the event loop the pool is bound to.
+    return get_saleor_client_pool()
+
+
 def get_saleor_jwks_provider_class() -> type[JWKSProvider]:
     return JWKSProvider
 
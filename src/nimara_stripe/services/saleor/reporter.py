@@ -0,0 +1,239 @@
+import asyncio
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from functools import cache
+from typing import Any
+
+from graphql_client.exceptions import (
+    GraphQLClientGraphQLError,
+    GraphQLClientGraphQLMultiError,
+    GraphQLClientHttpError,
+    GraphQLClientInvalidResponseError,
+)
+from graphql_client.transaction_event_report import (
+    TransactionEventReport,
+    TransactionEventReportTransactionEventReport,
+)
+from nimara_stripe.services.saleor.client import SaleorClient
+from nimara_stripe.settings import settings
+from nimara_stripe.utils.lifecycle import on_shutdown
+from nimara_stripe.utils.loop import LoopLocal
+from nimara_stripe.utils.metrics import metrics
+from nimara_stripe.utils.serialization import loads
+from nimara_stripe.utils.tracing import trace
+
+ReportResult = TransactionEventReportTransactionEventReport | None
+
+# Variables of the `TransactionEventReport` mutation and the arguments they are passed as.
+_VARIABLES = {
+    "transactionId": ("ID!", "id"),
+    "amount": ("PositiveDecimal!", "amount"),
+    "availableActions": ("[TransactionActionEnum!]!", "availableActions"),
+    "externalUrl": ("String!", "externalUrl"),
+    "message": ("String", "message"),
+    "pspReference": ("String!", "pspReference"),
+    "time": ("DateTime!", "time"),
+    "type": ("TransactionEventTypeEnum!", "type"),
+}
+
+
+@dataclass
+class TransactionEvent:
+    """Arguments of `SaleorClient.transaction_event_report`."""
+
+    transaction_id: str
+    amount: Any
+    available_actions: list[str]
+    external_url: str
+    psp_reference: str
+    time: str
+    type: Any
+    message: str | None = ""
+
+    def variables(self, index: int) -> dict[str, Any]:
+        return {
+            f"transactionId{index}": self.transaction_id,
+            f"amount{index}": self.amount,
+            f"availableActions{index}": self.available_actions,
+            f"externalUrl{index}": self.external_url,
+            f"message{index}": self.message,
+            f"pspReference{index}": self.psp_reference,
+            f"time{index}": self.time,
+            f"type{index}": self.type,
+        }
+
+
+@cache
+def get_batch_report_mutation(size: int) -> str:
+    """Return a mutation reporting `size` transaction events with aliased fields."""
+    definitions = ", ".join(
+        f"${name}{index}: {type_}"
+        for index in range(size)
+        for name, (type_, _) in _VARIABLES.items()
+    )
+    fields = "\n".join(
+        f"  report{index}: transactionEventReport("
+        + " ".join(f"{argument}: ${name}{index}" for name, (_, argument) in _VARIABLES.items())
+        + ") { alreadyProcessed errors { field message code } }"
+        for index in range(size)
+    )
+    return f"mutation TransactionEventReportBatch({definitions}) {{\n{fields}\n}}"
+
+
+async def report_transaction_events(
+    client: SaleorClient, events: list[TransactionEvent]
+) -> list[ReportResult | GraphQLClientGraphQLMultiError]:
+    """Report transaction events in a single request.
+
+    GraphQL errors are returned for the events they belong to, based on their path,
+    so a failing event doesn't fail the others.
+    """
+    variables: dict[str, Any] = {}
+    for index, event in enumerate(events):
+        variables.update(event.variables(index))
+    response = await client.execute(
+        query=get_batch_report_mutation(len(events)),
+        operation_name="TransactionEventReportBatch",
+        variables=variables,
+    )
+    if not response.is_success:
+        raise GraphQLClientHttpError(status_code=response.status_code, response=response)
+    try:
+        response_json = loads(response.content)
+    except ValueError as exc:
+        raise GraphQLClientInvalidResponseError(response=response) from exc
+
+    data = response_json.get("data") or {}
+    errors: defaultdict[str | None, list[GraphQLClientGraphQLError]] = defaultdict(list)
+    for error in response_json.get("errors") or []:
+        path = error.get("path") or [None]
+        errors[path[0]].append(GraphQLClientGraphQLError.from_dict(error))
+
+    results: list[ReportResult | GraphQLClientGraphQLMultiError] = []
+    for index in range(len(events)):
+        alias = f"report{index}"
+        if event_errors := errors[None] + errors[alias]:
+            results.append(GraphQLClientGraphQLMultiError(errors=event_errors, data=data))
+        else:
+            results.append(
+                TransactionEventReport.model_validate(
+                    {"transactionEventReport": data.get(alias)}
+                ).transaction_event_report
+            )
+    return results
+
+
+class TransactionEventReporter:
+    """Coalesce transaction events reported to the same Saleor into batched requests.
+
+    An event waits up to `linger` seconds for others to be reported with the same
+    client, a batch is sent as soon as it has `max_batch_size` events. Each caller
+    gets the result, or the error, of its own event.
+    """
+
+    def __init__(self, max_batch_size: int, linger: float) -> None:
+        self.max_batch_size = max_batch_size
+        self.linger = linger
+        self._pending: dict[
+            SaleorClient, list[tuple[TransactionEvent, asyncio.Future[ReportResult]]]
+        ] = {}
+        self._timers: dict[SaleorClient, asyncio.TimerHandle] = {}
+        self._sending: set[asyncio.Task[None]] = set()
+
+    async def report(self, client: SaleorClient, event: TransactionEvent) -> ReportResult:
+        if self.max_batch_size <= 1:
+            return await self._report_one(client, event, background=False)
+
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[ReportResult] = loop.create_future()
+        batch = self._pending.setdefault(client, [])
+        batch.append((event, future))
+        if len(batch) >= self.max_batch_size:
+            self._flush(client)
+        elif client not in self._timers:
+            self._timers[client] = loop.call_later(self.linger, self._flush, client)
+        # The client must stay open until the batch with the event has been sent.
+        async with client.in_use():
+            return await future
+
+    @staticmethod
+    async def _report_one(
+        client: SaleorClient, event: TransactionEvent, background: bool
+    ) -> ReportResult:
+        async with trace(
+            "saleor.transaction_event_report", "saleor_report_latency", background=background
+        ):
+            result: ReportResult = await client.transaction_event_report(**asdict(event))
+        return result
+
+    def _flush(self, client: SaleorClient) -> None:
+        timer = self._timers.pop(client, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(client, [])
+        if batch:
+            task = asyncio.create_task(self._send(client, batch))
+            self._sending.add(task)
+            task.add_done_callback(self._sending.discard)
+
+    async def _send(
+        self,
+        client: SaleorClient,
+        batch: list[tuple[TransactionEvent, asyncio.Future[ReportResult]]],
+    ) -> None:
+        # Batches are sent by a task of their own, e.g. when the linger timer fires.
+        events = [event for event, _ in batch]
+        results: list[ReportResult | BaseException]
+        try:
+            if len(events) == 1:
+                results = [await self._report_one(client, events[0], background=True)]
+            else:
+                async with trace(
+                    "saleor.transaction_event_report_batch",
+                    "saleor_report_latency",
+                    background=True,
+                ):
+                    results = [*await report_transaction_events(client, events)]
+        except Exception as error:
+            results = [error] * len(events)
+        metrics.increment("saleor_event_report_requests")
+        metrics.increment("saleor_event_reports", len(events))
+
+        for (_, future), result in zip(batch, results, strict=True):
+            # The caller may have been cancelled while the batch was sent.
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    async def aclose(self) -> None:
+        """Send the pending batches and wait for the ones being sent."""
+        for client in list(self._pending):
+            self._flush(client)
+        await asyncio.gather(*self._sending, return_exceptions=True)
+
+
+_reporter: LoopLocal[TransactionEventReporter] = LoopLocal(
+    lambda: TransactionEventReporter(
+        max_batch_size=settings.saleor_report_batch_size, linger=settings.saleor_report_linger
+    )
+)
+
+
+def get_transaction_event_reporter() -> TransactionEventReporter:
+    return _reporter.get()
+
+
+def batch_transaction_event_reports(max_batch_size: int, linger: float) -> None:
+    """Batch the transaction events reported on the running loop from now on."""
+    _reporter.set(TransactionEventReporter(max_batch_size=max_batch_size, linger=linger))
+
+
+# Registered after the Saleor client pool hook, so it runs before the clients are closed.
+@on_shutdown
+async def close_transaction_event_reporter() -> None:
+    reporter = _reporter.pop()
+    if reporter is not None:
+        await reporter.aclose()
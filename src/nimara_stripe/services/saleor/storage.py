@@ -0,0 +1,439 @@
+"""Storage backends for Saleor configs.
+
+Every backend keeps one JSON document per Saleor domain and supports point lookups
+by domain. Writes go through `update`, which each backend makes as atomic as the
+underlying store allows. All SDK calls run in the default executor so they don't
+block the event loop.
+"""
+
+import asyncio
+import json
+import sqlite3
+import string
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from functools import cache, partial
+from typing import Any, TypeVar
+
+from botocore.exceptions import ClientError
+from saleor_sdk.marina.exceptions import InvalidSaleorDomain
+
+from nimara_stripe.settings import settings
+from nimara_stripe.utils.aws import get_aws_client, get_secrets_client
+from nimara_stripe.utils.metrics import metrics
+
+T = TypeVar("T")
+
+RawConfig = dict[str, Any]
+ConfigUpdate = Callable[[RawConfig | None], RawConfig]
+
+# Version stage new secret versions are staged under before being swapped to AWSCURRENT.
+_PENDING_STAGE = "NIMARA_PENDING"
+# Characters of Saleor domains kept as they are in secret and SSM parameter names.
+_NAME_CHARS = frozenset(string.ascii_letters + string.digits + ".-")
+
+
+class ConfigWriteConflictError(Exception):
+    """Raised when a config keeps changing under a compare-and-swap write."""
+
+
+async def run_sync(func: Callable[..., T], **kwargs: Any) -> T:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, partial(func, **kwargs))
+
+
+def _error_code(error: ClientError) -> str:
+    return str(error.response.get("Error", {}).get("Code", ""))
+
+
+def _safe_name(saleor_domain: str) -> str:
+    """Return the name of the domain's secret or parameter, distinct for each domain.
+
+    Other characters, `_` included, are escaped as `_` and the hex of their UTF-8 bytes,
+    e.g. `localhost:8000` is named `localhost_3a8000`.
+    """
+    return "".join(
+        char if char in _NAME_CHARS else "".join(f"_{byte:02x}" for byte in char.encode())
+        for char in saleor_domain
+    )
+
+
+class ConfigStorage(ABC):
+    @abstractmethod
+    async def get(self, saleor_domain: str) -> RawConfig | None:
+        """Return the config stored for the Saleor domain, if any."""
+
+    @abstractmethod
+    async def get_all(self) -> dict[str, RawConfig]:
+        """Return configs of all Saleor domains."""
+
+    @abstractmethod
+    async def update(self, saleor_domain: str, update: ConfigUpdate) -> RawConfig:
+        """Read-modify-write the config of the Saleor domain and return the stored one."""
+
+
+class SecretsManagerConfigStorage(ConfigStorage):
+    """All Saleor domains in a single Secrets Manager secret.
+
+    Every lookup reads the whole secret and writes replace it with a plain
+    `PutSecretValue`, so concurrent writers can overwrite each other.
+    """
+
+    def __init__(self, client: Any, secret_id: str) -> None:
+        self.client = client
+        self.secret_id = secret_id
+
+    async def get(self, saleor_domain: str) -> RawConfig | None:
+        return (await self.get_all()).get(saleor_domain)
+
+    async def get_all(self) -> dict[str, RawConfig]:
+        try:
+            response = await run_sync(self.client.get_secret_value, SecretId=self.secret_id)
+
+            secret_string = response.get("SecretString")
+            if not secret_string:
+                raise InvalidSaleorDomain("Secret is empty")
+
+            configs: dict[str, RawConfig] = json.loads(secret_string)
+            return configs
+
+        except (ClientError, ValueError) as e:
+            raise InvalidSaleorDomain("Could not retrieve Saleor config list") from e
+
+    async def update(self, saleor_domain: str, update: ConfigUpdate) -> RawConfig:
+        configs = await self.get_all()
+        config = configs[saleor_domain] = update(configs.get(saleor_domain))
+        await run_sync(
+            self.client.put_secret_value,
+            SecretId=self.secret_id,
+            SecretString=json.dumps(configs),
+        )
+        return config
+
+
+class ShardedSecretsManagerConfigStorage(ConfigStorage):
+    """One Secrets Manager secret per Saleor domain plus an index secret listing them.
+
+    Writes are compare-and-swapped: the new value is staged as a pending version and
+    moved to AWSCURRENT only if AWSCURRENT still points at the version that was read.
+    """
+
+    def __init__(self, client: Any, secret_id_prefix: str) -> None:
+        self.client = client
+        self.secret_id_prefix = secret_id_prefix
+
+    def get_shard_secret_id(self, saleor_domain: str) -> str:
+        return f"{self.secret_id_prefix}/tenants/{_safe_name(saleor_domain)}"
+
+    def get_index_secret_id(self) -> str:
+        return f"{self.secret_id_prefix}/index"
+
+    async def get(self, saleor_domain: str) -> RawConfig | None:
+        secret_string, _ = await self._read(self.get_shard_secret_id(saleor_domain))
+        if not secret_string:
+            return None
+        config: RawConfig = json.loads(secret_string)
+        return config
+
+    async def get_all(self) -> dict[str, RawConfig]:
+        domains = await self._read_index()
+        configs = await asyncio.gather(*(self.get(domain) for domain in domains))
+        return {
+            domain: config
+            for domain, config in zip(domains, configs, strict=True)
+            if config is not None
+        }
+
+    async def update(self, saleor_domain: str, update: ConfigUpdate) -> RawConfig:
+        updated: list[RawConfig] = []
+
+        def update_secret(secret_string: str | None) -> str:
+            updated[:] = [update(json.loads(secret_string) if secret_string else None)]
+            return json.dumps(updated[0])
+
+        await self._compare_and_swap(self.get_shard_secret_id(saleor_domain), update_secret)
+        await self._add_to_index(saleor_domain)
+        return updated[0]
+
+    async def _read(self, secret_id: str) -> tuple[str | None, str | None]:
+        """Return the current secret string and its version id, or Nones if it's missing."""
+        try:
+            response = await run_sync(self.client.get_secret_value, SecretId=secret_id)
+        except ClientError as e:
+            if _error_code(e) == "ResourceNotFoundException":
+                return None, None
+            raise
+        return response.get("SecretString"), response["VersionId"]
+
+    async def _read_index(self) -> list[str]:
+        secret_string, _ = await self._read(self.get_index_secret_id())
+        return json.loads(secret_string) if secret_string else []
+
+    async def _add_to_index(self, saleor_domain: str) -> None:
+        def update_index(secret_string: str | None) -> str | None:
+            domains: list[str] = json.loads(secret_string) if secret_string else []
+            if saleor_domain in domains:
+                return None
+            return json.dumps(sorted([*domains, saleor_domain]))
+
+        await self._compare_and_swap(self.get_index_secret_id(), update_index)
+
+    async def _compare_and_swap(
+        self, secret_id: str, update: Callable[[str | None], str | None]
+    ) -> None:
+        for _ in range(settings.config_storage_write_attempts):
+            current, version_id = await self._read(secret_id)
+            new = update(current)
+            if new is None:
+                return
+            if version_id is None:
+                try:
+                    await run_sync(self.client.create_secret, Name=secret_id, SecretString=new)
+                    return
+                except ClientError as e:
+                    if _error_code(e) != "ResourceExistsException":
+                        raise
+            else:
+                response = await run_sync(
+                    self.client.put_secret_value,
+                    SecretId=secret_id,
+                    SecretString=new,
+                    VersionStages=[_PENDING_STAGE],
+                )
+                try:
+                    await run_sync(
+                        self.client.update_secret_version_stage,
+                        SecretId=secret_id,
+                        VersionStage="AWSCURRENT",
+                        MoveToVersionId=response["VersionId"],
+                        RemoveFromVersionId=version_id,
+                    )
+                    return
+                except ClientError as e:
+                    if _error_code(e) not in (
+                        "InvalidParameterException",
+                        "InvalidRequestException",
+                    ):
+                        raise
+                    # Only a version read that is no longer AWSCURRENT is a conflict.
+                    _, current_version_id = await self._read(secret_id)
+                    if current_version_id == version_id:
+                        raise
+            metrics.increment("config_write_conflict")
+        raise ConfigWriteConflictError(f"Could not update {secret_id}, it keeps changing")
+
+
+class SSMConfigStorage(ConfigStorage):
+    """One SecureString SSM parameter per Saleor domain under a common path.
+
+    Parameter Store has no conditional writes, so concurrent writes of the same
+    domain are last-writer-wins.
+    """
+
+    def __init__(self, client: Any, path: str) -> None:
+        self.client = client
+        self.path = "/" + path.strip("/")
+
+    def get_parameter_name(self, saleor_domain: str) -> str:
+        return f"{self.path}/{_safe_name(saleor_domain)}"
+
+    async def get(self, saleor_domain: str) -> RawConfig | None:
+        try:
+            response = await run_sync(
+                self.client.get_parameter,
+                Name=self.get_parameter_name(saleor_domain),
+                WithDecryption=True,
+            )
+        except ClientError as e:
+            if _error_code(e) == "ParameterNotFound":
+                return None
+            raise
+        config: RawConfig = json.loads(response["Parameter"]["Value"])
+        return config
+
+    async def get_all(self) -> dict[str, RawConfig]:
+        def get_parameters() -> list[dict[str, Any]]:
+            paginator = self.client.get_paginator("get_parameters_by_path")
+            return [
+                parameter
+                for page in paginator.paginate(Path=self.path, WithDecryption=True)
+                for parameter in page["Parameters"]
+            ]
+
+        configs = [json.loads(parameter["Value"]) for parameter in await run_sync(get_parameters)]
+        return {config["saleor_domain"]: config for config in configs}
+
+    async def update(self, saleor_domain: str, update: ConfigUpdate) -> RawConfig:
+        config = update(await self.get(saleor_domain))
+        await run_sync(
+            self.client.put_parameter,
+            Name=self.get_parameter_name(saleor_domain),
+            Value=json.dumps(config),
+            Type="SecureString",
+            Overwrite=True,
+        )
+        return config
+
+
+class DynamoDBConfigStorage(ConfigStorage):
+    """One item per Saleor domain in a DynamoDB table keyed by `saleor_domain`.
+
+    Items carry a `version` number and writes are conditional on it.
+    """
+
+    def __init__(self, client: Any, table_name: str) -> None:
+        self.client = client
+        self.table_name = table_name
+
+    async def _get_item(self, saleor_domain: str) -> dict[str, Any] | None:
+        response = await run_sync(
+            self.client.get_item,
+            TableName=self.table_name,
+            Key={"saleor_domain": {"S": saleor_domain}},
+            ConsistentRead=True,
+        )
+        item: dict[str, Any] | None = response.get("Item")
+        return item
+
+    async def get(self, saleor_domain: str) -> RawConfig | None:
+        item = await self._get_item(saleor_domain)
+        if item is None:
+            return None
+        config: RawConfig = json.loads(item["config"]["S"])
+        return config
+
+    async def get_all(self) -> dict[str, RawConfig]:
+        def scan() -> list[dict[str, Any]]:
+            paginator = self.client.get_paginator("scan")
+            return [
+                item
+                for page in paginator.paginate(TableName=self.table_name)
+                for item in page["Items"]
+            ]
+
+        return {
+            item["saleor_domain"]["S"]: json.loads(item["config"]["S"])
+            for item in await run_sync(scan)
+        }
+
+    async def update(self, saleor_domain: str, update: ConfigUpdate) -> RawConfig:
+        for _ in range(settings.config_storage_write_attempts):
+            item = await self._get_item(saleor_domain)
+            config = update(json.loads(item["config"]["S"]) if item else None)
+            version = int(item["version"]["N"]) if item else 0
+            condition: dict[str, Any] = (
+                {
+                    "ConditionExpression": "version = :version",
+                    "ExpressionAttributeValues": {":version": {"N": str(version)}},
+                }
+                if item
+                else {"ConditionExpression": "attribute_not_exists(saleor_domain)"}
+            )
+            try:
+                await run_sync(
+                    self.client.put_item,
+                    TableName=self.table_name,
+                    Item={
+                        "saleor_domain": {"S": saleor_domain},
+                        "config": {"S": json.dumps(config)},
+                        "version": {"N": str(version + 1)},
+                    },
+                    **condition,
+                )
+                return config
+            except ClientError as e:
+                if _error_code(e) != "ConditionalCheckFailedException":
+                    raise
+                metrics.increment("config_write_conflict")
+        raise ConfigWriteConflictError(f"Could not update {saleor_domain}, it keeps changing")
+
+
+class SQLiteConfigStorage(ConfigStorage):
+    """Configs in a local SQLite file, for development and load tests without AWS."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS saleor_configs "
+                "(saleor_domain TEXT PRIMARY KEY, config TEXT NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        # Connections are opened per call as they can't be shared between threads.
+        return sqlite3.connect(self.path, isolation_level=None, timeout=10)
+
+    def _get(self, saleor_domain: str) -> RawConfig | None:
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT config FROM saleor_configs WHERE saleor_domain = ?", (saleor_domain,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _get_all(self) -> dict[str, RawConfig]:
+        with self._connect() as connection:
+            rows = connection.execute("SELECT saleor_domain, config FROM saleor_configs")
+            return {saleor_domain: json.loads(config) for saleor_domain, config in rows}
+
+    def _update(self, saleor_domain: str, update: ConfigUpdate) -> RawConfig:
+        connection = self._connect()
+        try:
+            # Take the write lock before reading so the read-modify-write is atomic.
+            connection.execute("BEGIN IMMEDIATE")
+            row = connection.execute(
+                "SELECT config FROM saleor_configs WHERE saleor_domain = ?", (saleor_domain,)
+            ).fetchone()
+            config = update(json.loads(row[0]) if row else None)
+            connection.execute(
+                "INSERT OR REPLACE INTO saleor_configs (saleor_domain, config) VALUES (?, ?)",
+                (saleor_domain, json.dumps(config)),
+            )
+            connection.execute("COMMIT")
+            return config
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        finally:
+            connection.close()
+
+    async def get(self, saleor_domain: str) -> RawConfig | None:
+        return await run_sync(self._get, saleor_domain=saleor_domain)
+
+    async def get_all(self) -> dict[str, RawConfig]:
+        return await run_sync(self._get_all)
+
+    async def update(self, saleor_domain: str, update: ConfigUpdate) -> RawConfig:
+        return await run_sync(self._update, saleor_domain=saleor_domain, update=update)
+
+
+@cache
+def get_config_storage() -> ConfigStorage:
+    match settings.config_storage:
+        case "secrets_manager" if settings.secret_app_config_sharded:
+            return ShardedSecretsManagerConfigStorage(
+                get_secrets_client(), settings.secret_app_config_path
+            )
+        case "secrets_manager":
+            return SecretsManagerConfigStorage(
+                get_secrets_client(), settings.secret_app_config_path
+            )
+        case "ssm":
+            return SSMConfigStorage(get_aws_client("ssm"), settings.secret_app_config_path)
+        case "dynamodb":
+            if not settings.config_dynamodb_table:
+                raise ValueError("CONFIG_DYNAMODB_TABLE is required for the dynamodb storage")
+            return DynamoDBConfigStorage(
+                get_aws_client("dynamodb"), settings.config_dynamodb_table
+            )
+        case "sqlite":
+            return SQLiteConfigStorage(settings.config_sqlite_path)
+
+
+def _replace_config(new: RawConfig, current: RawConfig | None) -> RawConfig:
+    return new
+
+
+async def copy_configs(source: ConfigStorage, target: ConfigStorage) -> None:
+    """Copy all configs between storages, e.g. to migrate to sharded secrets."""
+    for saleor_domain, config in (await source.get_all()).items():
+        await target.update(saleor_domain, partial(_replace_config, config))
@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING, Annotated
 
-from fastapi import Depends, Header, Request
+from fastapi import Depends, Header
 
 from nimara_stripe.services.saleor.config import StripeConfig
 
@@ -15,13 +15,16 @@ async def get_stripe_signature(
 
 
 async def validate_stripe_webhook(
-    request: Request,
+    payload: bytes,
     stripe_signature: Annotated[str, Depends(get_stripe_signature)],
     stripe_config: StripeConfig,
     stripe: "ModuleType",
 ) -> None:
-    stripe.Webhook.construct_event(
-        payload=await request.body(),
-        sig_header=stripe_signature,
+    # Only the signature is verified, unlike `stripe.Webhook.construct_event` which
+    # also parses the payload into an event the endpoint has no use for.
+    stripe.WebhookSignature.verify_header(
+        payload=payload.decode("utf-8"),
+        header=stripe_signature,
         secret=stripe_config.stripe_webhook_secret_key,
+        tolerance=stripe.Webhook.DEFAULT_TOLERANCE,
     )
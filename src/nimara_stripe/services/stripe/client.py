@@ -0,0 +1,102 @@
+from typing import TYPE_CHECKING
+
+from cachetools import LRUCache
+
+from nimara_stripe.settings import settings
+from nimara_stripe.utils.lifecycle import on_shutdown
+from nimara_stripe.utils.loop import LoopLocal
+
+# `stripe` is imported when the first client is built, so modules only invalidating
+# clients, like the Saleor config provider, don't pull it in.
+if TYPE_CHECKING:
+    import stripe
+
+    from nimara_stripe.services.saleor.config import StripeConfig
+
+
+def _build_http_client() -> "stripe.HTTPXClient":
+    import stripe
+
+    return stripe.HTTPXClient(timeout=settings.stripe_timeout)
+
+
+_http_client: "LoopLocal[stripe.HTTPXClient]" = LoopLocal(_build_http_client)
+
+
+def get_stripe_http_client() -> "stripe.HTTPXClient":
+    """Return the httpx-backed Stripe HTTP client of the running event loop.
+
+    The client keeps a pool of open connections to api.stripe.com, so it is shared
+    by every Stripe call made on the loop instead of being built per request.
+    """
+    return _http_client.get()
+
+
+class StripeClientRegistry:
+    """Long-lived Stripe clients of the configured Saleor channels.
+
+    Each channel has its own Stripe account keys, so clients are kept per
+    (saleor_domain, channel_slug) instead of mutating the global `stripe.api_key`.
+    A client is rebuilt when the secret key of its channel changes.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self._clients: LRUCache[tuple[str, str], tuple[str, stripe.StripeClient]] = LRUCache(
+            maxsize=maxsize
+        )
+
+    def get(
+        self, saleor_domain: str, channel_slug: str, stripe_config: "StripeConfig"
+    ) -> "stripe.StripeClient":
+        import stripe
+
+        key = (saleor_domain, channel_slug)
+        entry: tuple[str, stripe.StripeClient] | None = self._clients.get(key)
+        if entry is None or entry[0] != stripe_config.stripe_secret_key:
+            entry = self._clients[key] = (
+                stripe_config.stripe_secret_key,
+                stripe.StripeClient(
+                    stripe_config.stripe_secret_key,
+                    http_client=get_stripe_http_client(),
+                    max_network_retries=settings.stripe_max_network_retries,
+                    base_addresses=(
+                        {"api": settings.stripe_api_base} if settings.stripe_api_base else {}
+                    ),
+                ),
+            )
+        return entry[1]
+
+    def invalidate(self, saleor_domain: str, channel_slug: str | None = None) -> None:
+        for key in list(self._clients):
+            if key[0] == saleor_domain and channel_slug in (None, key[1]):
+                del self._clients[key]
+
+
+_registry: LoopLocal[StripeClientRegistry] = LoopLocal(
+    lambda: StripeClientRegistry(maxsize=settings.stripe_client_registry_size)
+)
+
+
+def get_stripe_client(
+    saleor_domain: str, channel_slug: str, stripe_config: "StripeConfig"
+) -> "stripe.StripeClient":
+    """Return the Stripe client of a Saleor channel.
+
+    Only the `*_async` methods of the client can be used, as the HTTP client is not
+    allowed to make synchronous requests which would block the event loop.
+    """
+    return _registry.get().get(saleor_domain, channel_slug, stripe_config)
+
+
+def invalidate_stripe_clients(saleor_domain: str, channel_slug: str | None = None) -> None:
+    """Drop cached Stripe clients of a Saleor domain, or only of one of its channels."""
+    for registry in _registry.values():
+        registry.invalidate(saleor_domain, channel_slug)
+
+
+@on_shutdown
+async def close_stripe_http_client() -> None:
+    _registry.pop()
+    http_client = _http_client.pop()
+    if http_client is not None:
+        await http_client.close_async()  # type: ignore[no-untyped-call]
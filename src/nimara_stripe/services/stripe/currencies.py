@@ -1,28 +1,119 @@
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
 from decimal import Decimal
+from functools import lru_cache
+from types import MappingProxyType
+from typing import NamedTuple
 
-from graphql_client import Money
+from graphql_client.fragments import Money
+from nimara_stripe.services.stripe.exceptions import CannotCalculateTaxForZeroNetValueError
 
+_HUNDRED = Decimal(100)
+# Floats below this many minor units are integers exactly, see `Currency.to_stripe_amount`.
+_MAX_EXACT_MINOR_UNITS = 2.0**50
 
-def get_decimals_for_stripe(currency: str) -> int:
+
+class SaleorTaxedAmount(NamedTuple):
+    net: str
+    gross: str
+    tax_rate: str
+
+
+@dataclass(frozen=True, slots=True)
+class Currency:
+    """A currency as represented in Stripe amounts.
+
+    `exponent` is the number of decimals of Stripe's minor unit, which for some
+    currencies differs from the ISO 4217 one, e.g. ISK amounts are sent with two
+    decimals. `whole_units` currencies are only paid out, and for ISK charged, in whole
+    units by Stripe, so their captures are truncated to a multiple of 100 minor units.
+    """
+
+    code: str
+    exponent: int
+    whole_units: bool = False
+    multiplier: int = field(init=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "multiplier", 10**self.exponent)
+
+    def to_stripe_amount(self, amount: float | Decimal) -> int:
+        """Return the amount in minor units, truncating decimals Stripe doesn't support."""
+        if isinstance(amount, float):
+            scaled = amount * self.multiplier
+            if -_MAX_EXACT_MINOR_UNITS < scaled < _MAX_EXACT_MINOR_UNITS:
+                minor_units = round(scaled)
+                # The amount has at most `exponent` decimals when the minor units round
+                # trip to it, then its shortest repr is exactly `minor_units`.
+                if minor_units / self.multiplier == amount:
+                    return minor_units
+            amount = Decimal(str(amount))
+        return int(amount * self.multiplier)
+
+    def to_stripe_capture_amount(self, amount: float | Decimal) -> int:
+        """Return the amount in minor units, truncating fractions of whole units ones."""
+        minor_units = self.to_stripe_amount(amount)
+        if self.whole_units:
+            return minor_units // self.multiplier * self.multiplier
+        return minor_units
+
+    def to_saleor_amount(self, amount: int) -> str:
+        """Return the minor units amount as a decimal string with `exponent` decimals."""
+        return str(Decimal(amount).scaleb(-self.exponent))
+
+
+@lru_cache(maxsize=512)
+def get_currency(currency: str) -> Currency:
+    """Return the currency of a case-insensitive code, unknown ones have two decimals."""
     if len(currency) != 3:
         raise ValueError("currency needs to be a 3-letter code")
+    code = currency.upper()
+    return CURRENCIES.get(code) or Currency(code=code, exponent=stripe_currencies.get(code, 2))
 
-    stripe_decimals = stripe_currencies.get(currency.upper(), 2)
-    return stripe_decimals
+
+def get_decimals_for_stripe(currency: str) -> int:
+    return get_currency(currency).exponent
 
 
 def get_stripe_amount_from_saleor_money(money: Money) -> int:
-    amount = Decimal(str(money.amount))
-    currency = money.currency
-    decimals = get_decimals_for_stripe(currency)
-    multiplier = 10**decimals
-    return int(amount * multiplier)
+    return get_currency(money.currency).to_stripe_amount(money.amount)
+
+
+def get_stripe_capture_amount_from_saleor_money(money: Money) -> int:
+    return get_currency(money.currency).to_stripe_capture_amount(money.amount)
 
 
 def get_saleor_amount_from_stripe_amount(amount: int, currency: str) -> str:
-    decimals = get_decimals_for_stripe(currency)
-    multiplier = Decimal(10) ** decimals
-    return str((Decimal(amount) / multiplier).quantize(Decimal(f"0.{'0' * decimals}")))
+    return get_currency(currency).to_saleor_amount(amount)
+
+
+def get_saleor_amounts_from_stripe_amounts(amounts: Iterable[int], currency: str) -> list[str]:
+    """Convert many Stripe amounts of one currency, see `get_saleor_amount_from_stripe_amount`."""
+    exponent = -get_currency(currency).exponent
+    return [str(Decimal(amount).scaleb(exponent)) for amount in amounts]
+
+
+def get_saleor_taxed_amounts(
+    amounts: Sequence[int], amount_taxes: Sequence[int], currency: str
+) -> list[SaleorTaxedAmount]:
+    """Convert net and tax Stripe amounts to Saleor net and gross amounts and tax rates.
+
+    Rates are computed from the integer amounts, which gives the same result as from
+    the converted amounts as both share the currency's exponent.
+    """
+    exponent = -get_currency(currency).exponent
+    taxed_amounts = []
+    for amount, amount_tax in zip(amounts, amount_taxes, strict=True):
+        if amount == 0:
+            raise CannotCalculateTaxForZeroNetValueError
+        taxed_amounts.append(
+            SaleorTaxedAmount(
+                net=str(Decimal(amount).scaleb(exponent)),
+                gross=str(Decimal(amount + amount_tax).scaleb(exponent)),
+                tax_rate=str(Decimal(amount_tax) / Decimal(amount) * _HUNDRED),
+            )
+        )
+    return taxed_amounts
 
 
 # https://docs.stripe.com/development-resources/currency-codes
@@ -49,3 +140,35 @@ stripe_currencies: dict[str, int] = {
     "OMR": 3,
     "TND": 3,
 }
+
+
+# https://www.iso.org/iso-4217-currency-codes.html, active codes with minor units.
+# Their Stripe exponents are in `stripe_currencies`, the ISO ones may differ, e.g. ISK.
+iso_4217_codes: frozenset[str] = frozenset(
+    (
+        "BIF CLP DJF GNF ISK JPY KMF KRW PYG RWF UGX UYI VND VUV XAF XOF XPF "
+        "AED AFN ALL AMD ANG AOA ARS AUD AWG AZN BAM BBD BDT BGN BMD BND BOB BOV BRL BSD "
+        "BTN BWP BYN BZD CAD CDF CHE CHF CHW CNY COP COU CRC CUP CVE CZK DKK DOP DZD EGP "
+        "ERN ETB EUR FJD FKP GBP GEL GHS GIP GMD GTQ GYD HKD HNL HTG HUF IDR ILS INR IRR "
+        "JMD KES KGS KHR KPW KYD KZT LAK LBP LKR LRD LSL MAD MDL MGA MKD MMK MNT MOP MRU "
+        "MUR MVR MWK MXN MXV MYR MZN NAD NGN NIO NOK NPR NZD PAB PEN PGK PHP PKR PLN QAR "
+        "RON RSD RUB SAR SBD SCR SDG SEK SGD SHP SLE SOS SRD SSP STN SVC SYP SZL THB TJS "
+        "TMT TOP TRY TTD TWD TZS UAH USD USN UYU UZS VED VES WST XCD XCG YER ZAR ZMW ZWG "
+        "BHD IQD JOD KWD LYD OMR TND "
+        "CLF UYW"
+    ).split()
+)
+
+# https://docs.stripe.com/currencies#special-cases
+stripe_whole_unit_currencies = frozenset({"HUF", "ISK", "TWD"})
+
+CURRENCIES: Mapping[str, Currency] = MappingProxyType(
+    {
+        code: Currency(
+            code=code,
+            exponent=stripe_currencies.get(code, 2),
+            whole_units=code in stripe_whole_unit_currencies,
+        )
+        for code in iso_4217_codes
+    }
+)
@@ -0,0 +1,177 @@
+"""Stores of processed Stripe event ids.
+
+Stripe delivers webhooks at least once. An event id is added to the store once its
+signature is verified, so repeated deliveries are acknowledged without being
+reported to Saleor again. Ids expire after `stripe_event_dedup_ttl` seconds, which
+should cover Stripe's retry window of three days.
+"""
+
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from functools import cache
+from typing import Any
+
+from botocore.exceptions import ClientError
+from cachetools import TTLCache
+
+from nimara_stripe.services.saleor.storage import run_sync
+from nimara_stripe.settings import settings
+from nimara_stripe.utils.aws import get_aws_client
+
+
+class ProcessedEventStore(ABC):
+    @abstractmethod
+    async def add(self, event_id: str) -> bool:
+        """Add an event id, return False if it was already in the store."""
+
+    @abstractmethod
+    async def discard(self, event_id: str) -> None:
+        """Remove an event id, e.g. when the event failed so its retry is processed."""
+
+
+class MemoryProcessedEventStore(ProcessedEventStore):
+    """Event ids seen by this process, bounded and least recently used first out."""
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self._event_ids: TTLCache[str, bool] = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def add(self, event_id: str) -> bool:
+        if event_id in self._event_ids:
+            return False
+        self._event_ids[event_id] = True
+        return True
+
+    async def discard(self, event_id: str) -> None:
+        self._event_ids.pop(event_id, None)
+
+
+class CachedProcessedEventStore(ProcessedEventStore):
+    """A shared store with the ids seen by this process kept in memory.
+
+    Duplicates delivered to a warm instance are dropped without calling the shared
+    store.
+    """
+
+    def __init__(self, local: MemoryProcessedEventStore, shared: ProcessedEventStore) -> None:
+        self.local = local
+        self.shared = shared
+
+    async def add(self, event_id: str) -> bool:
+        if not await self.local.add(event_id):
+            return False
+        try:
+            return await self.shared.add(event_id)
+        except Exception:
+            await self.local.discard(event_id)
+            raise
+
+    async def discard(self, event_id: str) -> None:
+        await self.local.discard(event_id)
+        await self.shared.discard(event_id)
+
+
+class SQLiteProcessedEventStore(ProcessedEventStore):
+    """Event ids in a local SQLite file, for development and load tests without AWS."""
+
+    def __init__(self, path: str, ttl: float) -> None:
+        self.path = path
+        self.ttl = ttl
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS stripe_events "
+                "(event_id TEXT PRIMARY KEY, expires_at REAL NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        # Connections are opened per call as they can't be shared between threads.
+        return sqlite3.connect(self.path, isolation_level=None, timeout=10)
+
+    def _add(self, event_id: str) -> bool:
+        now = time.time()
+        with self._connect() as connection:
+            cursor = connection.execute(
+                "INSERT INTO stripe_events (event_id, expires_at) VALUES (?, ?) "
+                "ON CONFLICT (event_id) DO UPDATE SET expires_at = excluded.expires_at "
+                "WHERE stripe_events.expires_at <= ?",
+                (event_id, now + self.ttl, now),
+            )
+            return cursor.rowcount > 0
+
+    def _discard(self, event_id: str) -> None:
+        with self._connect() as connection:
+            connection.execute("DELETE FROM stripe_events WHERE event_id = ?", (event_id,))
+
+    async def add(self, event_id: str) -> bool:
+        return await run_sync(self._add, event_id=event_id)
+
+    async def discard(self, event_id: str) -> None:
+        await run_sync(self._discard, event_id=event_id)
+
+
+class DynamoDBProcessedEventStore(ProcessedEventStore):
+    """One item per event id in a DynamoDB table keyed by `event_id`.
+
+    Items are added with a conditional put and carry an `expires_at` epoch timestamp,
+    which can be used as the table's TTL attribute to clean them up.
+    """
+
+    def __init__(self, client: Any, table_name: str, ttl: float) -> None:
+        self.client = client
+        self.table_name = table_name
+        self.ttl = ttl
+
+    async def add(self, event_id: str) -> bool:
+        now = int(time.time())
+        try:
+            await run_sync(
+                self.client.put_item,
+                TableName=self.table_name,
+                Item={
+                    "event_id": {"S": event_id},
+                    "expires_at": {"N": str(now + int(self.ttl))},
+                },
+                # DynamoDB removes expired items lazily, they may still be present.
+                ConditionExpression="attribute_not_exists(event_id) OR expires_at <= :now",
+                ExpressionAttributeValues={":now": {"N": str(now)}},
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") != "ConditionalCheckFailedException":
+                raise
+            return False
+        return True
+
+    async def discard(self, event_id: str) -> None:
+        await run_sync(
+            self.client.delete_item,
+            TableName=self.table_name,
+            Key={"event_id": {"S": event_id}},
+        )
+
+
+@cache
+def get_processed_event_store() -> ProcessedEventStore:
+    local = MemoryProcessedEventStore(
+        maxsize=settings.stripe_event_dedup_cache_size, ttl=settings.stripe_event_dedup_ttl
+    )
+    match settings.stripe_event_dedup_store:
+        case "memory":
+            return local
+        case "sqlite":
+            return CachedProcessedEventStore(
+                local,
+                SQLiteProcessedEventStore(
+                    settings.stripe_event_dedup_sqlite_path, settings.stripe_event_dedup_ttl
+                ),
+            )
+        case "dynamodb":
+            if not settings.stripe_event_dedup_table:
+                raise ValueError("STRIPE_EVENT_DEDUP_TABLE is required for the dynamodb store")
+            return CachedProcessedEventStore(
+                local,
+                DynamoDBProcessedEventStore(
+                    get_aws_client("dynamodb"),
+                    settings.stripe_event_dedup_table,
+                    settings.stripe_event_dedup_ttl,
+                ),
+            )
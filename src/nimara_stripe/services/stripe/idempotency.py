@@ -0,0 +1,65 @@
+import hashlib
+from collections.abc import Callable, Coroutine
+from typing import Any
+
+from cachetools import TTLCache
+
+from nimara_stripe.settings import settings
+from nimara_stripe.utils.metrics import metrics
+from nimara_stripe.utils.single_flight import SingleFlight
+
+SaleorResponse = dict[str, Any]
+
+_responses: TTLCache[str, SaleorResponse] = TTLCache(
+    maxsize=settings.idempotency_cache_size, ttl=settings.idempotency_response_ttl
+)
+_calls: SingleFlight[str, SaleorResponse] = SingleFlight()
+
+
+def get_idempotency_key(
+    saleor_domain: str,
+    transaction_id: str,
+    action: str,
+    amount: int | None,
+    issued_at: str | None = None,
+) -> str:
+    """Return the key identifying a Saleor transaction action across webhook retries.
+
+    The key is passed to Stripe as the `idempotency_key` of the request made for the
+    action, so a retry handled by another Lambda instance does not repeat it either.
+    `issued_at` of the webhook event is the same for retries of a request but differs
+    between requests, so two partial refunds or charges of the same amount of one
+    transaction are both made.
+    """
+    digest = hashlib.sha256(
+        f"{saleor_domain}|{transaction_id}|{action}|{amount}|{issued_at}".encode()
+    ).hexdigest()
+    return f"saleor-{action}-{digest}"
+
+
+async def run_idempotent(
+    key: str, func: Callable[[], Coroutine[Any, Any, SaleorResponse]]
+) -> SaleorResponse:
+    """Handle a transaction action once and replay its response to Saleor retries.
+
+    Retries arriving while the action is handled wait for its response, later ones
+    get the cached response for `idempotency_response_ttl` seconds. Failed actions
+    are not cached.
+    """
+    response: SaleorResponse | None = _responses.get(key)
+    if response is not None:
+        metrics.increment("idempotency_cache_hit")
+        return response
+    metrics.increment("idempotency_cache_miss")
+    return await _calls.run(key, lambda: _run(key, func))
+
+
+async def _run(
+    key: str, func: Callable[[], Coroutine[Any, Any, SaleorResponse]]
+) -> SaleorResponse:
+    response = _responses[key] = await func()
+    return response
+
+
+def clear_idempotent_responses() -> None:
+    _responses.clear()
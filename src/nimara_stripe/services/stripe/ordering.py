@@ -0,0 +1,88 @@
+"""Ordering of PaymentIntent state events.
+
+Stripe doesn't guarantee the delivery order of events, e.g. a retried
+`payment_intent.processing` can arrive after `payment_intent.succeeded`. State
+events are ordered by their `created` timestamp, which has a one second resolution,
+and then by how far the state is in the PaymentIntent lifecycle. An event older than
+the latest one reported for its PaymentIntent is superseded and is not reported.
+
+The latest positions are kept per process, so only events handled by the same warm
+instance are ordered, or events of the same queue worker batch by `get_superseded_events`.
+"""
+
+from typing import Any
+
+from cachetools import TTLCache
+
+from nimara_stripe.settings import settings
+
+EventPosition = tuple[int, int]
+
+_STATE_RANKS = {
+    "payment_intent.created": 0,
+    "payment_intent.processing": 1,
+    "payment_intent.requires_action": 1,
+    "payment_intent.partially_funded": 1,
+    "payment_intent.payment_failed": 2,
+    "payment_intent.amount_capturable_updated": 2,
+    "payment_intent.succeeded": 3,
+    "payment_intent.canceled": 3,
+}
+
+
+def get_event_position(event_data: dict[str, Any]) -> tuple[str, EventPosition] | None:
+    """Return the PaymentIntent id and the position of a state event, None for others."""
+    rank = _STATE_RANKS.get(event_data.get("type", ""))
+    if rank is None:
+        return None
+    return event_data["data"]["object"]["id"], (event_data["created"], rank)
+
+
+def get_superseded_events(events: list[dict[str, Any] | None]) -> set[int]:
+    """Return indexes of the events superseded by a later event of the same list."""
+    latest: dict[str, tuple[EventPosition, int]] = {}
+    superseded = set()
+    for index, event_data in enumerate(events):
+        position = get_event_position(event_data) if event_data is not None else None
+        if position is None:
+            continue
+        payment_intent_id, event_position = position
+        current = latest.get(payment_intent_id)
+        if current is None or event_position >= current[0]:
+            if current is not None:
+                superseded.add(current[1])
+            latest[payment_intent_id] = (event_position, index)
+        else:
+            superseded.add(index)
+    return superseded
+
+
+class PaymentIntentEventOrdering:
+    """Positions of the latest state events reported for recently seen PaymentIntents.
+
+    Kept per process, events handled by other instances are not taken into account.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self._latest: TTLCache[str, EventPosition] = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def accept(self, event_data: dict[str, Any]) -> bool:
+        """Record the event as the latest of its PaymentIntent, False if it's superseded."""
+        position = get_event_position(event_data)
+        if position is None:
+            return True
+        payment_intent_id, event_position = position
+        latest = self._latest.get(payment_intent_id)
+        # Redeliveries of the latest event are accepted, their report may have failed.
+        if latest is not None and event_position < latest:
+            return False
+        self._latest[payment_intent_id] = event_position
+        return True
+
+    def clear(self) -> None:
+        self._latest.clear()
+
+
+payment_intent_ordering = PaymentIntentEventOrdering(
+    maxsize=settings.stripe_event_ordering_cache_size, ttl=settings.stripe_event_ordering_ttl
+)
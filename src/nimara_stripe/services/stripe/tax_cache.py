@@ -0,0 +1,73 @@
+"""Cache of Saleor tax responses built from Stripe Tax calculations.
+
+Saleor asks for taxes every time a checkout changes, e.g. when the shopper edits their
+email, even if the address and the lines stay the same. Responses are cached under a
+hash of everything sent to Stripe Tax, so an unchanged checkout is answered without
+creating another calculation. Entries expire after `tax_calculation_cache_ttl` seconds
+and the least recently used ones are evicted first.
+"""
+
+import copy
+import hashlib
+import json
+from collections.abc import Callable, Coroutine, Mapping
+from typing import Any
+
+from cachetools import TTLCache
+
+from nimara_stripe.settings import settings
+from nimara_stripe.utils.metrics import metrics
+from nimara_stripe.utils.single_flight import SingleFlight
+
+TaxResponse = dict[str, Any]
+
+_responses: TTLCache[str, TaxResponse] = TTLCache(
+    maxsize=settings.tax_calculation_cache_size, ttl=settings.tax_calculation_cache_ttl
+)
+_calls: SingleFlight[str, TaxResponse] = SingleFlight()
+
+
+def get_tax_calculation_key(
+    saleor_domain: str,
+    channel_slug: str,
+    params: Mapping[str, Any],
+    base_response: TaxResponse,
+) -> str:
+    """Return a canonical hash of a tax calculation request.
+
+    Keys are scoped to the Saleor domain and channel, which select the Stripe account.
+    The base response is part of the key as lines not sent to Stripe are answered from it.
+    """
+    content = json.dumps(
+        [saleor_domain, channel_slug, params, base_response],
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+async def run_cached_tax_calculation(
+    key: str, func: Callable[[], Coroutine[Any, Any, TaxResponse]]
+) -> TaxResponse:
+    """Return the cached response for the key, calculate it once on a miss.
+
+    Concurrent requests for the same key wait for a single calculation. Failures are
+    not cached. Each caller gets its own copy, so changing it leaves the cache intact.
+    """
+    response: TaxResponse | None = _responses.get(key)
+    if response is not None:
+        metrics.increment("tax_calculation_cache_hit")
+    else:
+        metrics.increment("tax_calculation_cache_miss")
+        response = await _calls.run(key, lambda: _run(key, func))
+    return copy.deepcopy(response)
+
+
+async def _run(key: str, func: Callable[[], Coroutine[Any, Any, TaxResponse]]) -> TaxResponse:
+    response = _responses[key] = await func()
+    return response
+
+
+def clear_tax_calculations() -> None:
+    _responses.clear()
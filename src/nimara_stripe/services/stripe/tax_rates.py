@@ -0,0 +1,119 @@
+"""Effective tax rates learned from Stripe Tax calculations.
+
+Channels with `estimate_checkout_taxes` enabled answer checkout tax requests from the
+rates of earlier calculations for the same address and tax code, so editing a
+checkout, e.g. changing a line's quantity, doesn't create a Stripe Tax calculation.
+Orders are always calculated by Stripe. Estimates assume a flat rate per tax code,
+which doesn't hold for taxes with thresholds, so the order total is the final one.
+"""
+
+from decimal import ROUND_HALF_UP, Decimal
+
+import stripe
+from cachetools import TTLCache
+
+from nimara_stripe.settings import settings
+
+# Saleor domain, channel slug, country, state, postal code and tax code.
+TaxRateKey = tuple[str, str, str, str, str, str | None]
+
+SHIPPING_TAX_CODE = "shipping"
+
+
+def _get_rate_key(
+    saleor_domain: str,
+    channel_slug: str,
+    params: "stripe.tax.CalculationService.CreateParams",
+    tax_code: str | None,
+) -> TaxRateKey:
+    address = params["customer_details"]["address"]
+    return (
+        saleor_domain,
+        channel_slug,
+        address.get("country") or "",
+        address.get("state") or "",
+        address.get("postal_code") or "",
+        tax_code,
+    )
+
+
+class TaxRateCache:
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self._rates: TTLCache[TaxRateKey, Decimal] = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def learn(
+        self,
+        saleor_domain: str,
+        channel_slug: str,
+        params: "stripe.tax.CalculationService.CreateParams",
+        result: stripe.tax.Calculation,
+    ) -> None:
+        """Record the rates of a calculation made with the given request parameters."""
+        if result.shipping_cost and result.shipping_cost.amount > 0:
+            key = _get_rate_key(saleor_domain, channel_slug, params, SHIPPING_TAX_CODE)
+            self._rates[key] = Decimal(result.shipping_cost.amount_tax) / Decimal(
+                result.shipping_cost.amount
+            )
+        if not result.line_items:
+            return
+        # Stripe returns the line items in the order they were sent.
+        for line_item, line in zip(params["line_items"], result.line_items.data, strict=False):
+            if line.amount > 0:
+                key = _get_rate_key(saleor_domain, channel_slug, params, line_item.get("tax_code"))
+                self._rates[key] = Decimal(line.amount_tax) / Decimal(line.amount)
+
+    def estimate(
+        self,
+        saleor_domain: str,
+        channel_slug: str,
+        params: "stripe.tax.CalculationService.CreateParams",
+    ) -> stripe.tax.Calculation | None:
+        """Return a calculation computed from the known rates, None if any is missing."""
+        shipping_cost = self._estimate(
+            saleor_domain,
+            channel_slug,
+            params,
+            params["shipping_cost"]["amount"],
+            SHIPPING_TAX_CODE,
+        )
+        if shipping_cost is None:
+            return None
+        line_items = []
+        for line_item in params["line_items"]:
+            estimated = self._estimate(
+                saleor_domain, channel_slug, params, line_item["amount"], line_item.get("tax_code")
+            )
+            if estimated is None:
+                return None
+            line_items.append(estimated)
+        return stripe.tax.Calculation.construct_from(
+            {
+                "object": "tax.calculation",
+                "currency": params["currency"],
+                "shipping_cost": shipping_cost,
+                "line_items": {"object": "list", "data": line_items},
+            },
+            key=None,
+        )
+
+    def _estimate(
+        self,
+        saleor_domain: str,
+        channel_slug: str,
+        params: "stripe.tax.CalculationService.CreateParams",
+        amount: int,
+        tax_code: str | None,
+    ) -> dict[str, int] | None:
+        if amount == 0:
+            return {"amount": 0, "amount_tax": 0}
+        rate = self._rates.get(_get_rate_key(saleor_domain, channel_slug, params, tax_code))
+        if rate is None:
+            return None
+        amount_tax = int((amount * rate).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+        return {"amount": amount, "amount_tax": amount_tax}
+
+    def clear(self) -> None:
+        self._rates.clear()
+
+
+tax_rates = TaxRateCache(maxsize=settings.tax_rate_cache_size, ttl=settings.tax_rate_cache_ttl)
@@ -0,0 +1,147 @@
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from functools import cache
+from typing import Any
+
+from pydantic import BaseModel
+
+from nimara_stripe.services.saleor.storage import run_sync
+from nimara_stripe.settings import settings
+from nimara_stripe.utils.aws import get_aws_client
+
+
+class StripeWebhookMessage(BaseModel):
+    """A Stripe event with a verified signature, waiting to be reported to Saleor."""
+
+    saleor_domain: str
+    channel_slug: str
+    event: dict[str, Any]
+
+
+@dataclass(frozen=True)
+class QueuedMessage:
+    body: str
+    # Identifies the delivery of the message to delete it once it's processed.
+    receipt: str
+
+
+class WebhookQueue(ABC):
+    """Durable queue between the Stripe webhook endpoint and the Saleor reporting worker.
+
+    Messages are delivered at least once: a received message becomes visible again
+    when it is not deleted within the visibility timeout.
+    """
+
+    @abstractmethod
+    async def send(self, message: StripeWebhookMessage) -> None: ...
+
+    @abstractmethod
+    async def receive(self, max_messages: int) -> list[QueuedMessage]: ...
+
+    @abstractmethod
+    async def delete(self, message: QueuedMessage) -> None: ...
+
+
+class SQSWebhookQueue(WebhookQueue):
+    def __init__(self, client: Any, queue_url: str) -> None:
+        self.client = client
+        self.queue_url = queue_url
+
+    async def send(self, message: StripeWebhookMessage) -> None:
+        await run_sync(
+            self.client.send_message,
+            QueueUrl=self.queue_url,
+            MessageBody=message.model_dump_json(),
+        )
+
+    async def receive(self, max_messages: int) -> list[QueuedMessage]:
+        response = await run_sync(
+            self.client.receive_message,
+            QueueUrl=self.queue_url,
+            # SQS returns at most 10 messages per call.
+            MaxNumberOfMessages=min(max_messages, 10),
+            VisibilityTimeout=settings.stripe_webhook_visibility_timeout,
+            WaitTimeSeconds=1,
+        )
+        return [
+            QueuedMessage(body=message["Body"], receipt=message["ReceiptHandle"])
+            for message in response.get("Messages", [])
+        ]
+
+    async def delete(self, message: QueuedMessage) -> None:
+        await run_sync(
+            self.client.delete_message, QueueUrl=self.queue_url, ReceiptHandle=message.receipt
+        )
+
+
+class SQLiteWebhookQueue(WebhookQueue):
+    """Queue in a local SQLite file, for development and load tests without AWS."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS stripe_webhooks "
+                "(id INTEGER PRIMARY KEY AUTOINCREMENT, body TEXT NOT NULL, "
+                "visible_at REAL NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        # Connections are opened per call as they can't be shared between threads.
+        return sqlite3.connect(self.path, isolation_level=None, timeout=10)
+
+    def _send(self, body: str) -> None:
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT INTO stripe_webhooks (body, visible_at) VALUES (?, ?)",
+                (body, time.time()),
+            )
+
+    def _receive(self, max_messages: int) -> list[QueuedMessage]:
+        connection = self._connect()
+        try:
+            # Take the write lock before reading so concurrent workers don't receive
+            # the same messages.
+            connection.execute("BEGIN IMMEDIATE")
+            now = time.time()
+            rows = connection.execute(
+                "SELECT id, body FROM stripe_webhooks WHERE visible_at <= ? ORDER BY id LIMIT ?",
+                (now, max_messages),
+            ).fetchall()
+            connection.executemany(
+                "UPDATE stripe_webhooks SET visible_at = ? WHERE id = ?",
+                [(now + settings.stripe_webhook_visibility_timeout, row[0]) for row in rows],
+            )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        finally:
+            connection.close()
+        return [QueuedMessage(body=body, receipt=str(message_id)) for message_id, body in rows]
+
+    def _delete(self, receipt: str) -> None:
+        with self._connect() as connection:
+            connection.execute("DELETE FROM stripe_webhooks WHERE id = ?", (int(receipt),))
+
+    async def send(self, message: StripeWebhookMessage) -> None:
+        await run_sync(self._send, body=message.model_dump_json())
+
+    async def receive(self, max_messages: int) -> list[QueuedMessage]:
+        return await run_sync(self._receive, max_messages=max_messages)
+
+    async def delete(self, message: QueuedMessage) -> None:
+        await run_sync(self._delete, receipt=message.receipt)
+
+
+@cache
+def get_webhook_queue() -> WebhookQueue:
+    match settings.stripe_webhook_queue:
+        case "sqs":
+            if not settings.stripe_webhook_queue_url:
+                raise ValueError("STRIPE_WEBHOOK_QUEUE_URL is required for the sqs queue")
+            return SQSWebhookQueue(get_aws_client("sqs"), settings.stripe_webhook_queue_url)
+        case "sqlite":
+            return SQLiteWebhookQueue(settings.stripe_webhook_queue_sqlite_path)
@@ -1,13 +1,21 @@
-from typing import TYPE_CHECKING, Any
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any, cast
 
-from graphql_client import (
-    TransactionActionEnum,
-    TransactionEventTypeEnum,
+from graphql_client.enums import TransactionActionEnum, TransactionEventTypeEnum
+from nimara_stripe.services.saleor.client import get_saleor_client_pool
+from nimara_stripe.services.saleor.reporter import (
+    TransactionEvent,
+    get_transaction_event_reporter,
 )
+from nimara_stripe.services.stripe.currencies import get_saleor_amount_from_stripe_amount
+from nimara_stripe.services.stripe.ordering import payment_intent_ordering
+from nimara_stripe.utils.metrics import metrics
 
 if TYPE_CHECKING:
     from stripe import Event
 
+    from nimara_stripe.services.saleor.config import StripeConfig, StripeSaleorConfigData
+
 
 async def handle_payment_intent_event(event: "Event") -> dict[str, Any]:
     payment_intent = event.data.object
@@ -89,3 +97,46 @@ def get_available_actions_for_type(
     if event_type_enum is None:
         return []
     return actions_map.get(event_type_enum, [])
+
+
+async def report_stripe_event(
+    saleor_domain: str,
+    saleor_config: "StripeSaleorConfigData",
+    stripe_channel_config: "StripeConfig",
+    event_data: dict[str, Any],
+) -> None:
+    """Report a Stripe PaymentIntent event, with a verified signature, to Saleor.
+
+    Events superseded by a later reported state of their PaymentIntent are skipped.
+    """
+    import stripe
+
+    if not payment_intent_ordering.accept(event_data):
+        metrics.increment("stripe_event_superseded")
+        return
+
+    saleor_client = get_saleor_client_pool().get(
+        f"https://{saleor_domain}", api_key=saleor_config.auth_token
+    )
+    event = stripe.Event.construct_from(event_data, stripe_channel_config.stripe_secret_key)
+
+    payment_intent = cast(stripe.PaymentIntent, event.data.object)
+    event_result = await handle_payment_intent_event(event)
+
+    await get_transaction_event_reporter().report(
+        saleor_client,
+        TransactionEvent(
+            transaction_id=payment_intent["metadata"]["transactionId"],
+            amount=get_saleor_amount_from_stripe_amount(
+                amount=payment_intent["amount"], currency=payment_intent["currency"]
+            ),
+            message=(
+                payment_intent.last_payment_error.code if payment_intent.last_payment_error else ""
+            ),
+            available_actions=event_result["available_actions"],
+            external_url=f"https://dashboard.stripe.com/payments/{payment_intent['id']}",
+            psp_reference=payment_intent["id"],
+            time=datetime.fromtimestamp(event.created, tz=UTC).isoformat(),
+            type=event_result["type"],
+        ),
+    )
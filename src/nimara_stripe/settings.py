@@ -1,6 +1,7 @@
 """Application settings for Nimara Stripe integration."""
 
 from pathlib import Path
+from typing import Literal
 
 from pydantic import field_validator
 from pydantic_settings import BaseSettings
@@ -20,6 +21,20 @@ class AWSSettings(BaseSettings):
     aws_session_token: str | None = None
     aws_default_region: str = "eu-central-1"
     secret_app_config_path: str
+    # Configs older than this are refreshed in the background while still being served.
+    config_cache_ttl: float = 60.0
+    # Configs of at most this many Saleor domains are cached, each until it hasn't been
+    # refreshed for `config_cache_max_age` seconds.
+    config_cache_size: int = 1024
+    config_cache_max_age: float = 24 * 60 * 60
+    # Saleor domains without a config are not looked up again for this long, in seconds.
+    config_missing_ttl: float = 10.0
+    config_storage: Literal["secrets_manager", "ssm", "dynamodb", "sqlite"] = "secrets_manager"
+    config_storage_write_attempts: int = 3
+    # Store each Saleor domain in its own `<secret_app_config_path>/tenants/<domain>` secret.
+    secret_app_config_sharded: bool = False
+    config_dynamodb_table: str | None = None
+    config_sqlite_path: str = "saleor_config.sqlite3"
 
     @field_validator("aws_endpoint_url", mode="before")
     @classmethod
@@ -33,6 +48,22 @@ class SaleorSettings(BaseSettings):
 
     environment: str = "dev"
     saleor_timeout: float = 10.0
+    # HTTP/2 requires the optional `h2` package (`httpx[http2]`).
+    saleor_http2: bool = False
+    saleor_max_connections: int = 20
+    saleor_max_keepalive_connections: int = 10
+    saleor_keepalive_expiry: float = 60.0
+    saleor_client_pool_size: int = 32
+    # Transaction events reported to the same Saleor within the linger time, in seconds,
+    # are sent in one request. A batch size of 1 disables batching. HTTP handlers serve
+    # one webhook at a time, so only the queue worker batches by default.
+    saleor_report_batch_size: int = 1
+    worker_report_batch_size: int = 20
+    saleor_report_linger: float = 0.01
+    jwks_cache_ttl: int = 3600
+    jwks_min_refresh_interval: float = 30.0
+    # How long Saleor and browsers may reuse the app manifest, in seconds.
+    manifest_max_age: int = 300
 
     _DEFAULT_HTTP_PORTS = [
         80,
@@ -41,7 +72,43 @@ class SaleorSettings(BaseSettings):
     # which makes the comparision difficult
 
 
-class Settings(SaleorSettings, AWSSettings):
+class StripeSettings(BaseSettings):
+    """Stripe API client settings."""
+
+    # Base URL of the Stripe API, e.g. of stripe-mock or a load test stand-in.
+    stripe_api_base: str | None = None
+    stripe_timeout: float = 10.0
+    stripe_max_network_retries: int = 1
+    stripe_client_registry_size: int = 256
+    # Responses of Saleor transaction actions are replayed to its retries in this window.
+    idempotency_response_ttl: float = 300.0
+    idempotency_cache_size: int = 4096
+    # Saleor tax responses are reused for unchanged checkouts within this time, in seconds.
+    tax_calculation_cache_ttl: float = 300.0
+    tax_calculation_cache_size: int = 4096
+    # Rates learned from Stripe Tax calculations, used by channels estimating checkout taxes.
+    tax_rate_cache_ttl: float = 24 * 60 * 60
+    tax_rate_cache_size: int = 10_000
+    # With "queue" Stripe webhooks are acknowledged once enqueued and reported to Saleor
+    # by the worker (`nimara_stripe.worker`).
+    stripe_webhook_mode: Literal["sync", "queue"] = "sync"
+    stripe_webhook_queue: Literal["sqs", "sqlite"] = "sqs"
+    stripe_webhook_queue_url: str | None = None
+    stripe_webhook_queue_sqlite_path: str = "stripe_webhooks.sqlite3"
+    stripe_webhook_visibility_timeout: int = 60
+    # Ids of processed Stripe events, kept in memory and optionally in a shared store.
+    stripe_event_dedup_store: Literal["memory", "sqlite", "dynamodb"] = "memory"
+    stripe_event_dedup_ttl: int = 3 * 24 * 60 * 60
+    stripe_event_dedup_cache_size: int = 10_000
+    stripe_event_dedup_table: str | None = None
+    stripe_event_dedup_sqlite_path: str = "stripe_events.sqlite3"
+    # Latest PaymentIntent states reported by this process, kept for as long as Stripe may
+    # still deliver an older event, in seconds.
+    stripe_event_ordering_ttl: int = 3 * 24 * 60 * 60
+    stripe_event_ordering_cache_size: int = 10_000
+
+
+class Settings(StripeSettings, SaleorSettings, AWSSettings):
     """Main application settings."""
 
     project_name: str
@@ -50,7 +117,19 @@ class Settings(SaleorSettings, AWSSettings):
     debug: bool = False
     base_path: str | None = None
     api_gw_version: int = 2
+    # Keep one event loop and the app lifespan alive across warm Lambda invocations.
+    # Lambda freezes the container between invocations, so each invocation waits for
+    # the background tasks it started, e.g. config refreshes and report batches.
+    lambda_persistent_loop: bool = True
     allowed_domain_pattern: str = ".*"
+    # "orjson" requires the optional `orjson` package.
+    json_backend: Literal["json", "orjson"] = "json"
+    # "emf" logs metrics in CloudWatch embedded metric format, "otel" records them to the
+    # OpenTelemetry meter and requires the optional `opentelemetry-api` package.
+    metrics_exporter: Literal["none", "emf", "otel"] = "none"
+    metrics_namespace: str = "NimaraStripe"
+    # Calls to dependencies are traced as X-Ray subsegments or, with "otel", as spans.
+    tracing_backend: Literal["xray", "otel"] = "xray"
 
 
 # Create settings instance
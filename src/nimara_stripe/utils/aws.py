@@ -1,8 +1,11 @@
-import boto3
-from boto3_type_annotations.secretsmanager import Client as SecretsClient
+from functools import cache
+from typing import TYPE_CHECKING, Any
 
 from nimara_stripe.settings import settings
 
+if TYPE_CHECKING:
+    from boto3_type_annotations.secretsmanager import Client as SecretsClient
+
 aws_config = {
     "region_name": settings.aws_default_region,
     "endpoint_url": settings.aws_endpoint_url,
@@ -11,4 +14,19 @@ aws_config = {
     "aws_session_token": settings.aws_session_token,
 }
 
-secrets_client: SecretsClient = boto3.client("secretsmanager", **aws_config)
+
+@cache
+def get_aws_client(service_name: str) -> Any:
+    """Build the boto3 client of an AWS service on first use.
+
+    boto3 is slow to import and its clients are slow to build, so neither happens
+    while the Lambda handler modules are imported.
+    """
+    import boto3
+
+    return boto3.client(service_name, **aws_config)
+
+
+def get_secrets_client() -> "SecretsClient":
+    secrets_client: SecretsClient = get_aws_client("secretsmanager")
+    return secrets_client
@@ -0,0 +1,20 @@
+from collections.abc import Awaitable, Callable
+
+ShutdownHook = Callable[[], Awaitable[None]]
+
+_shutdown_hooks: list[ShutdownHook] = []
+
+
+def on_shutdown(hook: ShutdownHook) -> ShutdownHook:
+    """Register a coroutine function to be awaited when the application shuts down.
+
+    Modules register their own cleanup when they are imported, so the application
+    lifespan doesn't have to import them, e.g. `stripe`, in Lambdas not using them.
+    """
+    _shutdown_hooks.append(hook)
+    return hook
+
+
+async def run_shutdown_hooks() -> None:
+    for hook in reversed(_shutdown_hooks):
+        await hook()
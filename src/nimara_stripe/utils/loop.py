@@ -0,0 +1,35 @@
+import asyncio
+from collections.abc import Callable
+from typing import Generic, TypeVar
+from weakref import WeakKeyDictionary
+
+T = TypeVar("T")
+
+
+class LoopLocal(Generic[T]):
+    """Lazily build and hold one value per running event loop.
+
+    Connection pools, locks and tasks are bound to the loop that created them, so
+    anything meant to be reused across requests is kept per loop. Values are dropped
+    together with their loop.
+    """
+
+    def __init__(self, factory: Callable[[], T]) -> None:
+        self._factory = factory
+        self._values: WeakKeyDictionary[asyncio.AbstractEventLoop, T] = WeakKeyDictionary()
+
+    def get(self) -> T:
+        loop = asyncio.get_running_loop()
+        value = self._values.get(loop)
+        if value is None:
+            value = self._values[loop] = self._factory()
+        return value
+
+    def set(self, value: T) -> None:
+        self._values[asyncio.get_running_loop()] = value
+
+    def pop(self) -> T | None:
+        return self._values.pop(asyncio.get_running_loop(), None)
+
+    def values(self) -> list[T]:
+        return list(self._values.values())
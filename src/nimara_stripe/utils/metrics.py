@@ -0,0 +1,214 @@
+"""In-process metrics of caches and calls to the app's dependencies.
+
+Counters and latency histograms are kept in memory, e.g. for benchmarks and tests, and
+forwarded to the exporter chosen by `METRICS_EXPORTER`:
+
+- "emf" writes them as CloudWatch embedded metric format logs with powertools, once per
+  Lambda invocation when the handler decorated with `flush_metrics` returns.
+- "otel" records them to the meter of the optional `opentelemetry-api` package.
+
+Cache hit ratios are derived from `<cache>_cache_hit`, `<cache>_cache_stale` and
+`<cache>_cache_miss` counters, a stale entry being served from the cache too.
+"""
+
+import bisect
+import functools
+import time
+from collections import Counter
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Protocol, TypeVar
+
+from nimara_stripe.settings import settings
+
+T = TypeVar("T")
+
+# Upper bounds of the latency histogram buckets, in seconds. Slower calls fall into
+# the last, unbounded bucket.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+_CACHE_COUNTERS = ("_cache_hit", "_cache_stale", "_cache_miss")
+
+
+@dataclass
+class LatencyStats:
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    buckets: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+
+    @property
+    def avg(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, percent: float) -> float:
+        """Return the upper bound of the bucket the percentile falls into."""
+        if not self.count:
+            return 0.0
+        rank = self.count * percent / 100
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS, self.buckets, strict=False):
+            seen += count
+            if seen >= rank:
+                return bound
+        return self.max
+
+
+class MetricsExporter(Protocol):
+    def increment(self, name: str, value: int) -> None: ...
+
+    def observe(self, name: str, seconds: float) -> None: ...
+
+    def record_ratio(self, name: str, ratio: float) -> None: ...
+
+    def flush(self) -> None: ...
+
+
+class EMFExporter:
+    """Exporter writing CloudWatch embedded metric format logs with powertools."""
+
+    def __init__(self, namespace: str, service: str) -> None:
+        from aws_lambda_powertools import Metrics as EMFMetrics
+        from aws_lambda_powertools.metrics import MetricUnit
+
+        self.emf = EMFMetrics(namespace=namespace, service=service)
+        self.units = MetricUnit
+
+    def increment(self, name: str, value: int) -> None:
+        self.emf.add_metric(name=name, unit=self.units.Count, value=value)
+
+    def observe(self, name: str, seconds: float) -> None:
+        # Every value is kept, so CloudWatch computes percentiles of the metric.
+        self.emf.add_metric(name=name, unit=self.units.Milliseconds, value=seconds * 1000)
+
+    def record_ratio(self, name: str, ratio: float) -> None:
+        self.emf.add_metric(name=name, unit=self.units.Percent, value=ratio * 100)
+
+    def flush(self) -> None:
+        if self.emf.metric_set:
+            self.emf.flush_metrics()
+
+
+class OTelExporter:
+    """Exporter recording to the OpenTelemetry meter, a no-op without a configured SDK."""
+
+    def __init__(self) -> None:
+        try:
+            import opentelemetry.metrics as otel_metrics  # type: ignore[import-not-found,unused-ignore]
+        except ImportError as e:
+            raise ImportError(
+                "METRICS_EXPORTER=otel requires the `opentelemetry-api` package"
+            ) from e
+
+        self.provider = otel_metrics.get_meter_provider()
+        self.meter = self.provider.get_meter("nimara_stripe")
+        self.instruments: dict[str, Any] = {}
+
+    def _instrument(self, name: str, create: Callable[..., Any], unit: str) -> Any:
+        if name not in self.instruments:
+            self.instruments[name] = create(name, unit=unit)
+        return self.instruments[name]
+
+    def increment(self, name: str, value: int) -> None:
+        self._instrument(name, self.meter.create_counter, "1").add(value)
+
+    def observe(self, name: str, seconds: float) -> None:
+        self._instrument(name, self.meter.create_histogram, "s").record(seconds)
+
+    def record_ratio(self, name: str, ratio: float) -> None:
+        self._instrument(name, self.meter.create_histogram, "1").record(ratio)
+
+    def flush(self) -> None:
+        # The API's default provider has nothing to flush, SDK ones export on demand.
+        force_flush = getattr(self.provider, "force_flush", None)
+        if force_flush is not None:
+            force_flush()
+
+
+def get_exporter() -> MetricsExporter | None:
+    match settings.metrics_exporter:
+        case "emf":
+            return EMFExporter(namespace=settings.metrics_namespace, service=settings.release)
+        case "otel":
+            return OTelExporter()
+    return None
+
+
+class Metrics:
+    """In-process counters and latency histograms for cache and upstream calls."""
+
+    def __init__(self, exporter: MetricsExporter | None = None) -> None:
+        self.counters: Counter[str] = Counter()
+        self.latencies: dict[str, LatencyStats] = {}
+        self.exporter = exporter
+        # Cache counters since the last flush, for the hit ratios of an invocation.
+        self._unflushed_cache_counters: Counter[str] = Counter()
+
+    def increment(self, name: str, value: int = 1) -> None:
+        self.counters[name] += value
+        if self.exporter is not None:
+            self.exporter.increment(name, value)
+            if name.endswith(_CACHE_COUNTERS):
+                self._unflushed_cache_counters[name] += value
+
+    def observe(self, name: str, seconds: float) -> None:
+        self.latencies.setdefault(name, LatencyStats()).observe(seconds)
+        if self.exporter is not None:
+            self.exporter.observe(name, seconds)
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started)
+
+    def hit_ratio(self, cache: str) -> float | None:
+        """Return the share of lookups of `cache` served from it, if it was used."""
+        return _hit_ratio(self.counters, cache)
+
+    def flush(self) -> None:
+        """Export the hit ratios of the caches used since the last flush, and flush."""
+        if self.exporter is None:
+            return
+        caches = {name.rsplit("_cache_", 1)[0] for name in self._unflushed_cache_counters}
+        for cache in sorted(caches):
+            ratio = _hit_ratio(self._unflushed_cache_counters, cache)
+            if ratio is not None:
+                self.exporter.record_ratio(f"{cache}_cache_hit_ratio", ratio)
+        self._unflushed_cache_counters.clear()
+        self.exporter.flush()
+
+    def reset(self) -> None:
+        self.counters.clear()
+        self.latencies.clear()
+        self._unflushed_cache_counters.clear()
+
+
+def _hit_ratio(counters: Counter[str], cache: str) -> float | None:
+    hits, stale, misses = (counters[f"{cache}{suffix}"] for suffix in _CACHE_COUNTERS)
+    lookups = hits + stale + misses
+    return (hits + stale) / lookups if lookups else None
+
+
+def flush_metrics(handler: Callable[..., T]) -> Callable[..., T]:
+    """Flush the metrics when the Lambda handler returns, before it is frozen."""
+
+    @functools.wraps(handler)
+    def wrapper(*args: Any, **kwargs: Any) -> T:
+        try:
+            return handler(*args, **kwargs)
+        finally:
+            metrics.flush()
+
+    return wrapper
+
+
+metrics = Metrics(get_exporter())
@@ -0,0 +1,36 @@
+"""JSON encoding of Saleor GraphQL requests and API responses.
+
+The standard library `json` module is used by default. With `JSON_BACKEND=orjson` the
+optional `orjson` package encodes and decodes the payloads instead, which is several
+times faster for large checkouts and tax bases.
+"""
+
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic_core import to_jsonable_python
+
+from nimara_stripe.settings import settings
+
+if settings.json_backend == "orjson":
+    try:
+        import orjson  # type: ignore[import-not-found,unused-ignore]
+    except ImportError as e:
+        raise ImportError(
+            "JSON_BACKEND=orjson requires the `orjson` package of the `fast-json` extra"
+        ) from e
+
+    def dumps(obj: Any) -> bytes:
+        encoded: bytes = orjson.dumps(obj, default=to_jsonable_python)
+        return encoded
+
+    loads = orjson.loads
+    response_class: type[JSONResponse] = ORJSONResponse
+else:
+
+    def dumps(obj: Any) -> bytes:
+        return json.dumps(obj, default=to_jsonable_python).encode()
+
+    loads = json.loads
+    response_class = JSONResponse
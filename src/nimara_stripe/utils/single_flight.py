@@ -0,0 +1,38 @@
+import asyncio
+from collections.abc import Callable, Coroutine, Hashable
+from functools import partial
+from typing import Any, Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class SingleFlight(Generic[K, V]):
+    """Coalesce concurrent calls for the same key into a single in-flight call.
+
+    The first caller starts the call, the ones arriving before it completes await
+    the same result. A cancelled caller does not cancel the call for the others.
+    """
+
+    def __init__(self) -> None:
+        self._tasks: dict[K, asyncio.Task[V]] = {}
+
+    def in_flight(self, key: K) -> bool:
+        task = self._tasks.get(key)
+        return task is not None and task.get_loop() is asyncio.get_running_loop()
+
+    def start(self, key: K, func: Callable[[], Coroutine[Any, Any, V]]) -> "asyncio.Task[V]":
+        """Start the call for the key unless it is already in flight, return its task."""
+        task = self._tasks.get(key)
+        # A task left behind by a closed event loop will never complete.
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = self._tasks[key] = asyncio.create_task(func())
+            task.add_done_callback(partial(self._forget, key))
+        return task
+
+    async def run(self, key: K, func: Callable[[], Coroutine[Any, Any, V]]) -> V:
+        return await asyncio.shield(self.start(key, func))
+
+    def _forget(self, key: K, task: "asyncio.Task[V]") -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
@@ -0,0 +1,64 @@
+"""Tracing of calls to the app's dependencies.
+
+`trace` wraps a call in an X-Ray subsegment of the Lambda handler trace, or with
+`TRACING_BACKEND=otel` in a span of the optional `opentelemetry-api` package, e.g.
+exported by the ADOT Lambda layer. The call's duration is also recorded in the
+latency histogram of its dependency.
+
+X-Ray keeps the open subsegments on a thread-local stack, so calls of background
+tasks running next to the request, e.g. stale config refreshes, only record their
+latency there.
+"""
+
+from collections.abc import AsyncIterator, Callable
+from contextlib import AbstractContextManager, asynccontextmanager, nullcontext
+from typing import Any
+
+from nimara_stripe.settings import settings
+from nimara_stripe.utils.metrics import metrics
+
+_start_span: Callable[[str], AbstractContextManager[Any]]
+_start_background_span: Callable[[str], AbstractContextManager[Any]]
+
+if settings.tracing_backend == "otel":
+    try:
+        import opentelemetry.trace as otel_trace  # type: ignore[import-not-found,unused-ignore]
+    except ImportError as e:
+        raise ImportError("TRACING_BACKEND=otel requires the `opentelemetry-api` package") from e
+
+    _tracer = otel_trace.get_tracer("nimara_stripe")
+
+    def _start_span(name: str) -> AbstractContextManager[Any]:
+        span: AbstractContextManager[Any] = _tracer.start_as_current_span(name)
+        return span
+
+    # OpenTelemetry keeps the current span in a context variable, copied to each task.
+    _start_background_span = _start_span
+
+else:
+    from aws_lambda_powertools import Tracer
+
+    _xray_tracer = Tracer(service=settings.release)
+
+    def _start_span(name: str) -> AbstractContextManager[Any]:
+        span: AbstractContextManager[Any] = _xray_tracer.provider.in_subsegment(f"## {name}")
+        return span
+
+    def _start_background_span(name: str) -> AbstractContextManager[Any]:
+        return nullcontext()
+
+
+@asynccontextmanager
+async def trace(
+    name: str, latency_metric: str, *, background: bool = False
+) -> AsyncIterator[None]:
+    """Trace a call as `name` and record its duration as `latency_metric`.
+
+    async with trace("stripe.refunds.create", "stripe_latency"):
+        refund = await stripe_client.refunds.create_async(params=params)
+
+    `background` marks calls of tasks the request does not wait for.
+    """
+    start_span = _start_background_span if background else _start_span
+    with start_span(name), metrics.timer(latency_metric):
+        yield
@@ -0,0 +1,150 @@
+"""Worker reporting queued Stripe webhooks to Saleor.
+
+Deployed as a Lambda consuming the SQS queue (`sqs_handler`), or run against the
+configured queue, e.g. the local SQLite one, with `python -m nimara_stripe.worker`.
+"""
+
+import argparse
+import asyncio
+from typing import Any
+
+from aws_lambda_powertools import Tracer
+from aws_lambda_powertools.utilities.typing import LambdaContext
+from pydantic import ValidationError
+
+from nimara_stripe.api.runtime import EventLoopRuntime
+from nimara_stripe.services.saleor.config import StripeSaleorConfigProvider
+from nimara_stripe.services.saleor.reporter import batch_transaction_event_reports
+from nimara_stripe.services.stripe.ordering import get_superseded_events
+from nimara_stripe.services.stripe.webhook_queue import (
+    StripeWebhookMessage,
+    WebhookQueue,
+    get_webhook_queue,
+)
+from nimara_stripe.services.stripe.webhook_utils import report_stripe_event
+from nimara_stripe.settings import settings
+from nimara_stripe.utils.helpers import get_logger
+from nimara_stripe.utils.metrics import flush_metrics, metrics
+
+LOGGER = get_logger()
+TRACER = Tracer(service=settings.release)
+
+
+class WorkerRuntime(EventLoopRuntime):
+    """Event loop runtime reporting the events of a batch of messages together."""
+
+    async def startup(self) -> None:
+        await super().startup()
+        batch_transaction_event_reports(
+            settings.worker_report_batch_size, settings.saleor_report_linger
+        )
+
+
+runtime = WorkerRuntime()
+
+
+async def process_message(message: StripeWebhookMessage) -> None:
+    saleor_config = await StripeSaleorConfigProvider().get_by_saleor_domain(message.saleor_domain)
+    stripe_channel_config = saleor_config.get_stripe_config_for_channel(message.channel_slug)
+    if stripe_channel_config is None:
+        raise ValueError(f"Configuration for '{message.channel_slug}' not found.")
+    await report_stripe_event(
+        message.saleor_domain, saleor_config, stripe_channel_config, message.event
+    )
+
+
+async def _process(message: StripeWebhookMessage | ValidationError, superseded: bool) -> None:
+    if isinstance(message, ValidationError):
+        raise message
+    if superseded:
+        metrics.increment("stripe_event_superseded")
+        return
+    await process_message(message)
+
+
+async def process_messages(bodies: list[str]) -> list[BaseException | None]:
+    """Process messages concurrently, return the error of each failed one.
+
+    PaymentIntent state events superseded by a later event of the same batch are
+    dropped without being reported.
+    """
+    messages: list[StripeWebhookMessage | ValidationError] = []
+    for body in bodies:
+        try:
+            messages.append(StripeWebhookMessage.model_validate_json(body))
+        except ValidationError as error:
+            messages.append(error)
+    superseded = get_superseded_events(
+        [
+            message.event if isinstance(message, StripeWebhookMessage) else None
+            for message in messages
+        ]
+    )
+    results = await asyncio.gather(
+        *(_process(message, index in superseded) for index, message in enumerate(messages)),
+        return_exceptions=True,
+    )
+    for result in results:
+        if result is not None:
+            LOGGER.error("Failed to report Stripe event to Saleor", exc_info=result)
+    return results
+
+
+async def process_sqs_records(records: list[dict[str, Any]]) -> dict[str, Any]:
+    errors = await process_messages([record["body"] for record in records])
+    # Only the failed messages are returned to the queue, the others are deleted.
+    return {
+        "batchItemFailures": [
+            {"itemIdentifier": record["messageId"]}
+            for record, error in zip(records, errors, strict=True)
+            if error is not None
+        ]
+    }
+
+
+async def drain_queue(queue: WebhookQueue, batch_size: int) -> int:
+    """Process queued messages until none are left, return the number of processed ones.
+
+    Failed messages are left in the queue and retried once their visibility times out.
+    """
+    processed = 0
+    while messages := await queue.receive(batch_size):
+        errors = await process_messages([message.body for message in messages])
+        for message, error in zip(messages, errors, strict=True):
+            if error is None:
+                await queue.delete(message)
+                processed += 1
+    return processed
+
+
+@LOGGER.inject_lambda_context(log_event=True)
+@TRACER.capture_lambda_handler
+@flush_metrics
+def sqs_handler(event: dict[str, Any], context: LambdaContext) -> dict[str, Any]:
+    return runtime.run(process_sqs_records(event["Records"]))
+
+
+async def run_worker(batch_size: int, poll_interval: float, once: bool) -> None:
+    queue = get_webhook_queue()
+    while True:
+        processed = await drain_queue(queue, batch_size)
+        LOGGER.info("Reported queued Stripe events to Saleor", extra={"processed": processed})
+        if once:
+            return
+        await asyncio.sleep(poll_interval)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batch-size", type=int, default=10)
+    parser.add_argument("--poll-interval", type=float, default=1.0, help="seconds")
+    parser.add_argument("--once", action="store_true", help="exit once the queue is empty")
+    args = parser.parse_args()
+    try:
+        runtime.run(run_worker(args.batch_size, args.poll_interval, args.once))
+    finally:
+        runtime.close()
+
+
+if __name__ == "__main__":
+    main()
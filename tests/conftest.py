@@ -12,7 +12,7 @@ from nimara_stripe.services.saleor.config import (
     StripeSaleorConfigData,
     StripeSaleorConfigProvider,
 )
-from nimara_stripe.settings import PROJECT_DIR
+from nimara_stripe.services.saleor.storage import SQLiteConfigStorage
 
 
 @pytest.fixture
@@ -46,7 +46,7 @@ def example_jwks(rsa_public):
 
 
 def load_data_file(fine_name: str):
-    with open(PROJECT_DIR / "tests" / "data" / fine_name) as data_file:
+    with open(Path(__file__).parent / "data" / fine_name) as data_file:
         return json.load(data_file)
 
 
@@ -78,8 +78,15 @@ def lambda_context():
 
 
 @pytest.fixture(scope="function")
-def saleor_config_provider():
-    return StripeSaleorConfigProvider()
+def config_storage(tmp_path: Path) -> SQLiteConfigStorage:
+    return SQLiteConfigStorage(str(tmp_path / "saleor_config.sqlite3"))
+
+
+@pytest.fixture(scope="function")
+def saleor_config_provider(config_storage: SQLiteConfigStorage):
+    StripeSaleorConfigProvider._cache.clear()
+    StripeSaleorConfigProvider._missing.clear()
+    return StripeSaleorConfigProvider(config_storage)
 
 
 @pytest.fixture(scope="function")
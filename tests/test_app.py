@@ -1,19 +1,26 @@
-from unittest.mock import MagicMock, patch
+import json
+import subprocess
+import sys
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from lynara import APIGatewayProxyEventV1Interface, APIGatewayProxyEventV2Interface
 
 from nimara_stripe.app import (
     http_handler,
+    runtime,
     settings,
 )
 
-pytestmark = pytest.mark.anyio
 
+@pytest.fixture(autouse=True)
+def close_runtime():
+    yield
+    runtime.close()
 
-@patch("nimara_stripe.app.asyncio.run")
-@patch("nimara_stripe.app.lynara.run")
-def test_http_handler_apigw_v1(mock_lynara_run, mock_asyncio_run):
+
+@patch("nimara_stripe.app.runtime.lynara.run", new_callable=AsyncMock)
+def test_http_handler_apigw_v1(mock_lynara_run):
     # Given
     event = {"version": "1.0"}
     context = MagicMock()
@@ -22,29 +29,26 @@ def test_http_handler_apigw_v1(mock_lynara_run, mock_asyncio_run):
     original_api_gw_version = settings.api_gw_version
     settings.api_gw_version = 1
 
-    mock_asyncio_run.return_value = {"statusCode": 200}
     mock_lynara_run.return_value = {"statusCode": 200}
 
     # When
     result = http_handler(event, context)
 
     # Then
-    mock_lynara_run.assert_called_once_with(
+    mock_lynara_run.assert_awaited_once_with(
         event,
         context,
         APIGatewayProxyEventV1Interface,
         base_path=settings.base_path,
     )
-    mock_asyncio_run.assert_called_once()
     assert result == {"statusCode": 200}
 
     # Cleanup
     settings.api_gw_version = original_api_gw_version
 
 
-@patch("nimara_stripe.app.asyncio.run")
-@patch("nimara_stripe.app.lynara.run")
-def test_http_handler_apigw_v2(mock_lynara_run, mock_asyncio_run):
+@patch("nimara_stripe.app.runtime.lynara.run", new_callable=AsyncMock)
+def test_http_handler_apigw_v2(mock_lynara_run):
     # Given
     event = {"version": "2.0"}
     context = MagicMock()
@@ -53,21 +57,38 @@ def test_http_handler_apigw_v2(mock_lynara_run, mock_asyncio_run):
     original_api_gw_version = settings.api_gw_version
     settings.api_gw_version = 2
 
-    mock_asyncio_run.return_value = {"statusCode": 200}
     mock_lynara_run.return_value = {"statusCode": 200}
 
     # When
     result = http_handler(event, context)
 
     # Then
-    mock_lynara_run.assert_called_once_with(
+    mock_lynara_run.assert_awaited_once_with(
         event,
         context,
         APIGatewayProxyEventV2Interface,
         base_path=settings.base_path,
     )
-    mock_asyncio_run.assert_called_once()
     assert result == {"statusCode": 200}
 
     # Cleanup
     settings.api_gw_version = original_api_gw_version
+
+
+def test_saleor_app_import_skips_unused_dependencies():
+    # Given
+    probe = (
+        "import json, sys; import nimara_stripe.api.saleor.app; "
+        "print(json.dumps(sorted(sys.modules)))"
+    )
+
+    # When
+    process = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", probe], capture_output=True, check=True, text=True
+    )
+
+    # Then
+    modules = set(json.loads(process.stdout))
+    assert "stripe" not in modules
+    assert "boto3" not in modules
+    assert "graphql_client.fragments" not in modules
@@ -1,7 +1,18 @@
+import asyncio
+import json
+from decimal import Decimal
+
+import httpx
 import pytest
 from saleor_sdk.marina.exceptions import SaleorAppInstallationProblem
 
-from nimara_stripe.services.saleor.client import SaleorClient
+from graphql_client.exceptions import GraphQLClientInvalidResponseError
+from nimara_stripe.services.saleor.client import (
+    SaleorClient,
+    SaleorClientPool,
+    close_saleor_client_pool,
+    get_saleor_client_pool,
+)
 
 pytestmark = pytest.mark.anyio
 
@@ -39,3 +50,101 @@ async def test_get_app_id_error(httpx_mock):
     client = SaleorClient(saleor_url="http://example.com", api_key=None)
     with pytest.raises(SaleorAppInstallationProblem):
         await client.get_app_id("test_auth_token")
+
+
+async def test_execute_encodes_variables(httpx_mock):
+    httpx_mock.add_response(url="http://example.com/graphql/", json={"data": {"ok": True}})
+
+    client = SaleorClient(saleor_url="http://example.com", api_key="token")
+    response = await client.execute(
+        query="query", operation_name="Operation", variables={"amount": Decimal("10.50")}
+    )
+
+    (request,) = httpx_mock.get_requests()
+    assert request.headers["Content-Type"] == "application/json"
+    assert request.headers["Authorization"] == "Bearer token"
+    assert json.loads(request.content) == {
+        "query": "query",
+        "operationName": "Operation",
+        "variables": {"amount": "10.50"},
+    }
+    assert client.get_data(response) == {"ok": True}
+
+
+async def test_get_data_invalid_json(httpx_mock):
+    httpx_mock.add_response(url="http://example.com/graphql/", content=b"<html>")
+
+    client = SaleorClient(saleor_url="http://example.com", api_key=None)
+    response = await client.execute(query="query", operation_name="Operation", variables={})
+
+    with pytest.raises(GraphQLClientInvalidResponseError):
+        client.get_data(response)
+
+
+async def test_saleor_client_pool_reuses_clients():
+    pool = SaleorClientPool(maxsize=2)
+
+    client = pool.get("http://example.com", api_key="token")
+
+    assert pool.get("http://example.com", api_key="token") is client
+    assert pool.get("http://example.com", api_key=None) is not client
+    assert pool.get("http://other.example.com", api_key="token") is not client
+
+
+async def test_saleor_client_pool_evicts_least_recently_used():
+    pool = SaleorClientPool(maxsize=2)
+    first = pool.get("http://first.example.com", api_key=None)
+    second = pool.get("http://second.example.com", api_key=None)
+    pool.get("http://first.example.com", api_key=None)
+
+    pool.get("http://third.example.com", api_key=None)
+    await asyncio.sleep(0)
+
+    assert len(pool) == 2
+    assert second.http_client.is_closed
+    assert not first.http_client.is_closed
+
+
+async def test_saleor_client_pool_keeps_evicted_client_open_during_request(httpx_mock):
+    # Given
+    release = asyncio.Event()
+
+    async def slow_jwks(request):
+        await release.wait()
+        return httpx.Response(200, json={"keys": []})
+
+    httpx_mock.add_callback(slow_jwks, url="http://first.example.com/.well-known/jwks.json")
+    pool = SaleorClientPool(maxsize=1)
+    first = pool.get("http://first.example.com", api_key=None)
+    fetch = asyncio.create_task(first.fetch_jwks())
+    await asyncio.sleep(0)
+
+    # When
+    pool.get("http://second.example.com", api_key=None)
+    await asyncio.sleep(0)
+    closed_during_request = first.http_client.is_closed
+    release.set()
+    jwks = await fetch
+    await asyncio.sleep(0)
+
+    # Then
+    assert not closed_during_request
+    assert jwks == '{"keys":[]}'
+    assert first.http_client.is_closed
+
+
+async def test_saleor_client_pool_replaces_closed_client():
+    pool = SaleorClientPool(maxsize=2)
+    client = pool.get("http://example.com", api_key=None)
+    await client.http_client.aclose()
+
+    assert pool.get("http://example.com", api_key=None) is not client
+
+
+async def test_close_saleor_client_pool():
+    client = get_saleor_client_pool().get("http://example.com", api_key=None)
+
+    await close_saleor_client_pool()
+
+    assert client.http_client.is_closed
+    assert get_saleor_client_pool().get("http://example.com", api_key=None) is not client
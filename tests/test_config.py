@@ -1,36 +1,37 @@
-import json
+import asyncio
+import time
 from unittest.mock import patch
 
 import pytest
-from aws_lambda_powertools.utilities.parameters.exceptions import GetParameterError
-from pydantic import RootModel
 from pytest_mock import MockerFixture
 from saleor_sdk.marina.exceptions import InvalidSaleorDomain
 
 from nimara_stripe.services.saleor.config import (
+    CachedConfig,
+    StripeConfig,
     StripeSaleorConfigData,
     StripeSaleorConfigProvider,
 )
-from nimara_stripe.settings import settings
+from nimara_stripe.services.saleor.storage import SQLiteConfigStorage
+from nimara_stripe.utils.metrics import metrics
 
 pytestmark = pytest.mark.anyio
 
 
-@patch("nimara_stripe.services.saleor.config.secrets_client")
-async def test_create_or_update_no_item_in_secret_manager(
-    mock_secrets_client,
+@pytest.fixture
+def stripe_config() -> StripeConfig:
+    return StripeConfig(
+        stripe_pub_key="pk_test",
+        stripe_secret_key="sk_test",
+        stripe_webhook_secret_key="whsec_test",
+    )
+
+
+async def test_create_or_update_no_item_in_storage(
     saleor_config_data: StripeSaleorConfigData,
     saleor_config_provider: StripeSaleorConfigProvider,
-    mocker: MockerFixture,
+    config_storage: SQLiteConfigStorage,
 ):
-    # Given
-    mock_get_all = mocker.AsyncMock(return_value={})
-    mocker.patch.object(
-        saleor_config_provider,
-        "get_all",
-        mock_get_all,
-    )
-
     # When
     result = await saleor_config_provider.create_or_update(
         saleor_config_data.auth_token,
@@ -40,31 +41,27 @@ async def test_create_or_update_no_item_in_secret_manager(
 
     # Then
     assert result == saleor_config_data
-    mock_get_all.assert_awaited_once()
-    mock_secrets_client.put_secret_value.assert_called_once_with(
-        SecretId=settings.secret_app_config_path,
-        SecretString=RootModel[dict[str, StripeSaleorConfigData]](
-            {saleor_config_data.saleor_domain: saleor_config_data}
-        ).model_dump_json(),
-    )
+    assert await config_storage.get_all() == {
+        saleor_config_data.saleor_domain: {
+            "auth_token": saleor_config_data.auth_token,
+            "saleor_domain": saleor_config_data.saleor_domain,
+            "saleor_app_id": saleor_config_data.saleor_app_id,
+            "stripe_configurations_for_channels": {},
+        }
+    }
 
 
-@patch("nimara_stripe.services.saleor.config.secrets_client")
-async def test_create_or_update_item_in_secret_manager(
-    mock_secrets_client,
+async def test_create_or_update_item_in_storage(
     saleor_config_data: StripeSaleorConfigData,
     saleor_config_provider: StripeSaleorConfigProvider,
-    mocker: MockerFixture,
+    stripe_config: StripeConfig,
 ):
     # Given
-    # Mock functions
-    mock_get_all = mocker.AsyncMock(
-        return_value={saleor_config_data.saleor_domain: saleor_config_data}
+    await saleor_config_provider.create_or_update(
+        "old_token", saleor_config_data.saleor_domain, "old_app_id"
     )
-    mocker.patch.object(
-        saleor_config_provider,
-        "get_all",
-        mock_get_all,
+    await saleor_config_provider.update_stripe_config_data_by_channel_slug(
+        saleor_config_data.saleor_domain, "channel", stripe_config
     )
 
     # When
@@ -75,69 +72,221 @@ async def test_create_or_update_item_in_secret_manager(
     )
 
     # Then
-    assert result == saleor_config_data
-    mock_get_all.assert_awaited_once()
-    mock_secrets_client.put_secret_value.assert_called_once_with(
-        SecretId=settings.secret_app_config_path,
-        SecretString=RootModel[dict[str, StripeSaleorConfigData]](
-            {saleor_config_data.saleor_domain: saleor_config_data}
-        ).model_dump_json(),
+    assert result.auth_token == saleor_config_data.auth_token
+    assert result.saleor_app_id == saleor_config_data.saleor_app_id
+    assert result.stripe_configurations_for_channels == {"channel": stripe_config}
+
+
+async def test_get_by_saleor_domain_data_in_storage(
+    saleor_config_data: StripeSaleorConfigData,
+    saleor_config_provider: StripeSaleorConfigProvider,
+):
+    # Given
+    await saleor_config_provider.create_or_update(
+        saleor_config_data.auth_token,
+        saleor_config_data.saleor_domain,
+        saleor_config_data.saleor_app_id,
+    )
+    StripeSaleorConfigProvider._cache.clear()
+
+    # When
+    result = await saleor_config_provider.get_by_saleor_domain(
+        saleor_config_data.saleor_domain,
     )
 
+    # Then
+    assert result == saleor_config_data
+
 
-@patch("nimara_stripe.services.saleor.config.secrets_client")
-async def test_get_by_saleor_domain_data_in_secret_manager(
-    mock_secrets_client,
+async def test_get_by_saleor_domain_no_data_in_storage(
     saleor_config_data: StripeSaleorConfigData,
     saleor_config_provider: StripeSaleorConfigProvider,
+):
+    with pytest.raises(InvalidSaleorDomain):
+        await saleor_config_provider.get_by_saleor_domain(
+            saleor_config_data.saleor_domain,
+        )
+
+
+async def test_get_by_saleor_domain_remembers_missing_domain_until_created(
+    saleor_config_data: StripeSaleorConfigData,
+    saleor_config_provider: StripeSaleorConfigProvider,
+    config_storage: SQLiteConfigStorage,
+    mocker: MockerFixture,
 ):
     # Given
     domain = saleor_config_data.saleor_domain
-    version_id = "mock-version-id"
-    serialized_config = RootModel[StripeSaleorConfigData](saleor_config_data).model_dump()
+    spy_get = mocker.spy(config_storage, "get")
 
-    secret_dict = {domain: serialized_config}
-    secret_string = json.dumps(secret_dict)
+    # When
+    for _ in range(3):
+        with pytest.raises(InvalidSaleorDomain):
+            await saleor_config_provider.get_by_saleor_domain(domain)
+    await saleor_config_provider.create_or_update("token", domain, "app")
+    result = await saleor_config_provider.get_by_saleor_domain(domain)
 
-    mock_secrets_client.get_secret_value.return_value = {
-        "SecretString": secret_string,
-        "VersionId": version_id,
-    }
+    # Then
+    spy_get.assert_awaited_once_with(domain)
+    assert domain not in StripeSaleorConfigProvider._missing
+    assert result.auth_token == "token"
 
-    # When
-    result = await saleor_config_provider.get_by_saleor_domain(
+
+async def test_get_by_saleor_app_id(saleor_config_provider: StripeSaleorConfigProvider):
+    with pytest.raises(NotImplementedError):
+        await saleor_config_provider.get_by_saleor_app_id("id")
+
+
+@patch("nimara_stripe.services.saleor.config.invalidate_stripe_clients")
+async def test_update_stripe_config_data_by_channel_slug(
+    mock_invalidate_stripe_clients,
+    saleor_config_data: StripeSaleorConfigData,
+    saleor_config_provider: StripeSaleorConfigProvider,
+    stripe_config: StripeConfig,
+):
+    # Given
+    await saleor_config_provider.create_or_update(
+        saleor_config_data.auth_token,
         saleor_config_data.saleor_domain,
+        saleor_config_data.saleor_app_id,
+    )
+
+    # When
+    result = await saleor_config_provider.update_stripe_config_data_by_channel_slug(
+        saleor_config_data.saleor_domain, "channel", stripe_config
     )
 
     # Then
-    assert result == saleor_config_data
-    mock_secrets_client.get_secret_value.assert_called_once_with(
-        SecretId=settings.secret_app_config_path,
+    assert result.stripe_configurations_for_channels == {"channel": stripe_config}
+    assert (
+        await saleor_config_provider.get_by_saleor_domain(saleor_config_data.saleor_domain)
+        == result
     )
+    mock_invalidate_stripe_clients.assert_called_once_with(
+        saleor_config_data.saleor_domain, "channel"
+    )
+
 
+async def test_update_stripe_config_data_by_channel_slug_unknown_domain(
+    saleor_config_provider: StripeSaleorConfigProvider,
+    stripe_config: StripeConfig,
+):
+    with pytest.raises(InvalidSaleorDomain):
+        await saleor_config_provider.update_stripe_config_data_by_channel_slug(
+            "missing.saleor.com", "channel", stripe_config
+        )
 
-@patch("nimara_stripe.services.saleor.config.secrets_client")
-async def test_get_by_saleor_domain_no_data_in_secret_manager(
-    mock_secrets_client,
+
+async def test_get_by_saleor_domain_concurrent_misses_share_read(
     saleor_config_data: StripeSaleorConfigData,
     saleor_config_provider: StripeSaleorConfigProvider,
+    config_storage: SQLiteConfigStorage,
+    mocker: MockerFixture,
 ):
     # Given
+    await saleor_config_provider.create_or_update(
+        saleor_config_data.auth_token,
+        saleor_config_data.saleor_domain,
+        saleor_config_data.saleor_app_id,
+    )
     StripeSaleorConfigProvider._cache.clear()
-    mock_secrets_client.get_secret_value.side_effect = GetParameterError()
+    release = asyncio.Event()
+    get = config_storage.get
+
+    async def slow_get(saleor_domain):
+        await release.wait()
+        return await get(saleor_domain)
+
+    mock_get = mocker.patch.object(config_storage, "get", side_effect=slow_get)
+    metrics.reset()
 
     # When
-    with pytest.raises(InvalidSaleorDomain):
-        await saleor_config_provider.get_by_saleor_domain(
-            saleor_config_data.saleor_domain,
+    calls = [
+        asyncio.create_task(
+            saleor_config_provider.get_by_saleor_domain(saleor_config_data.saleor_domain)
         )
+        for _ in range(5)
+    ]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*calls)
 
     # Then
-    mock_secrets_client.get_secret_value.assert_called_once_with(
-        SecretId=settings.secret_app_config_path,
+    mock_get.assert_awaited_once()
+    assert all(result is results[0] for result in results)
+    assert metrics.counters["config_cache_miss"] == 5
+    assert metrics.latencies["config_refresh_latency"].count == 1
+
+
+@patch("nimara_stripe.services.saleor.config.settings.config_cache_ttl", 0)
+async def test_get_by_saleor_domain_serves_stale_while_revalidating(
+    saleor_config_data: StripeSaleorConfigData,
+    saleor_config_provider: StripeSaleorConfigProvider,
+    config_storage: SQLiteConfigStorage,
+    mocker: MockerFixture,
+):
+    # Given
+    domain = saleor_config_data.saleor_domain
+    stale = await saleor_config_provider.create_or_update("token", domain, "app")
+    spy_get = mocker.spy(config_storage, "get")
+    metrics.reset()
+
+    # When
+    result = await saleor_config_provider.get_by_saleor_domain(domain)
+    await asyncio.sleep(0.05)
+
+    # Then
+    assert result is stale
+    assert metrics.counters["config_cache_stale"] == 1
+    spy_get.assert_awaited_once_with(domain)
+    assert StripeSaleorConfigProvider._cache[domain].config is not stale
+
+
+@patch("nimara_stripe.services.saleor.config.settings.config_cache_ttl", 0)
+async def test_get_by_saleor_domain_refresh_error_keeps_stale_config(
+    saleor_config_data: StripeSaleorConfigData,
+    saleor_config_provider: StripeSaleorConfigProvider,
+    config_storage: SQLiteConfigStorage,
+    mocker: MockerFixture,
+):
+    # Given
+    domain = saleor_config_data.saleor_domain
+    stale = await saleor_config_provider.create_or_update("token", domain, "app")
+    mocker.patch.object(config_storage, "get", side_effect=RuntimeError("storage is down"))
+    metrics.reset()
+
+    # When
+    result = await saleor_config_provider.get_by_saleor_domain(domain)
+    await asyncio.sleep(0.01)
+
+    # Then
+    assert result is stale
+    assert metrics.counters["config_refresh_error"] == 1
+    assert StripeSaleorConfigProvider._cache[domain].config is stale
+
+
+@patch("nimara_stripe.services.saleor.config.settings.config_cache_ttl", 60)
+async def test_get_by_saleor_domain_refresh_error_delays_next_refresh(
+    saleor_config_data: StripeSaleorConfigData,
+    saleor_config_provider: StripeSaleorConfigProvider,
+    config_storage: SQLiteConfigStorage,
+    mocker: MockerFixture,
+):
+    # Given
+    domain = saleor_config_data.saleor_domain
+    stale = await saleor_config_provider.create_or_update("token", domain, "app")
+    StripeSaleorConfigProvider._cache[domain] = CachedConfig(
+        config=stale, fetched_at=time.monotonic() - 120
+    )
+    mock_get = mocker.patch.object(
+        config_storage, "get", side_effect=RuntimeError("storage is down")
     )
 
+    # When
+    for _ in range(3):
+        result = await saleor_config_provider.get_by_saleor_domain(domain)
+        await asyncio.sleep(0.01)
 
-async def test_get_by_saleor_app_id(saleor_config_provider: StripeSaleorConfigProvider):
-    with pytest.raises(NotImplementedError):
-        await saleor_config_provider.get_by_saleor_app_id("id")
+    # Then
+    assert result is stale
+    mock_get.assert_awaited_once_with(domain)
+    assert not StripeSaleorConfigProvider._cache[domain].is_stale
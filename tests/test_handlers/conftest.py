@@ -1,49 +1,54 @@
 import pytest
 
-import graphql_client as gql
+from graphql_client import calculate_taxes, enums, fragments
 from nimara_stripe.services.saleor.config import StripeConfig, StripeSaleorConfigData
+from nimara_stripe.services.stripe.dedup import get_processed_event_store
+from nimara_stripe.services.stripe.idempotency import clear_idempotent_responses
+from nimara_stripe.services.stripe.ordering import payment_intent_ordering
+from nimara_stripe.services.stripe.tax_cache import clear_tax_calculations
+from nimara_stripe.services.stripe.tax_rates import tax_rates
 
 
 @pytest.fixture(scope="function")
 def saleor_test_calculate_tax_event():
-    return gql.CalculateTaxesEventCalculateTaxes(
+    return calculate_taxes.CalculateTaxesEventCalculateTaxes(
         __typename="CalculateTaxes",
-        taxBase=gql.CalculateTaxesEventCalculateTaxesTaxBase(
+        taxBase=calculate_taxes.CalculateTaxesEventCalculateTaxesTaxBase(
             pricesEnteredWithTax=True,
             currency="PLN",
-            channel=gql.TaxBaseChannel(slug="test_channel_slug"),
+            channel=fragments.TaxBaseChannel(slug="test_channel_slug"),
             discounts=[],
-            address=gql.TaxBaseAddress(
+            address=fragments.TaxBaseAddress(
                 streetAddress1="Street address 1",
                 streetAddress2="Street address 2",
                 city="Warsaw",
                 countryArea="",
                 postalCode="00-001",
-                country=gql.AddressCountry(code="PL"),
+                country=fragments.AddressCountry(code="PL"),
             ),
-            shippingPrice=gql.TaxBaseShippingPrice(currency="PLN", amount=10.0),
+            shippingPrice=fragments.TaxBaseShippingPrice(currency="PLN", amount=10.0),
             lines=[
-                gql.TaxBaseLines(
-                    sourceLine=gql.TaxBaseLineSourceLineCheckoutLine(
+                fragments.TaxBaseLines(
+                    sourceLine=fragments.TaxBaseLineSourceLineCheckoutLine(
                         __typename="CheckoutLine",
                         id="test_line_id",
-                        checkoutProductVariant=gql.TaxBaseLineSourceLineCheckoutLineCheckoutProductVariant(
+                        checkoutProductVariant=fragments.TaxBaseLineSourceLineCheckoutLineCheckoutProductVariant(
                             id="test_variant_id",
-                            product=gql.TaxBaseLineSourceLineCheckoutLineCheckoutProductVariantProduct(
+                            product=fragments.TaxBaseLineSourceLineCheckoutLineCheckoutProductVariantProduct(
                                 taxClass=None
                             ),
                         ),
                     ),
                     quantity=1,
-                    unitPrice=gql.TaxBaseLineUnitPrice(amount=1000.0),
-                    totalPrice=gql.TaxBaseLineTotalPrice(amount=1000.0, currency="PLN"),
+                    unitPrice=fragments.TaxBaseLineUnitPrice(amount=1000.0),
+                    totalPrice=fragments.TaxBaseLineTotalPrice(amount=1000.0, currency="PLN"),
                     productSku="testSku",
                 )
             ],
         ),
-        recipient=gql.CalculateTaxesEventCalculateTaxesRecipient(
+        recipient=calculate_taxes.CalculateTaxesEventCalculateTaxesRecipient(
             privateMetadata=[
-                gql.CalculateTaxesEventCalculateTaxesRecipientPrivateMetadata(
+                calculate_taxes.CalculateTaxesEventCalculateTaxesRecipientPrivateMetadata(
                     key="testKey", value="testValue"
                 )
             ]
@@ -72,6 +77,37 @@ def saleor_config_data():
     )
 
 
+@pytest.fixture(autouse=True)
+def clear_idempotency_cache():
+    yield
+    clear_idempotent_responses()
+    clear_tax_calculations()
+    tax_rates.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_processed_events():
+    yield
+    get_processed_event_store.cache_clear()
+    payment_intent_ordering.clear()
+
+
+@pytest.fixture(scope="function")
+def mock_stripe_client(mocker):
+    stripe_client = mocker.MagicMock()
+    stripe_client.payment_intents.create_async = mocker.AsyncMock()
+    stripe_client.payment_intents.retrieve_async = mocker.AsyncMock()
+    stripe_client.payment_intents.update_async = mocker.AsyncMock()
+    stripe_client.payment_intents.capture_async = mocker.AsyncMock()
+    stripe_client.payment_intents.cancel_async = mocker.AsyncMock()
+    stripe_client.refunds.create_async = mocker.AsyncMock()
+    stripe_client.tax.calculations.create_async = mocker.AsyncMock()
+    mocker.patch(
+        "nimara_stripe.api.stripe.endpoints.get_stripe_client", return_value=stripe_client
+    )
+    return stripe_client
+
+
 @pytest.fixture(scope="function")
 def stripe_config():
     return StripeConfig(
@@ -170,33 +206,33 @@ def stripe_webhook_payment_intent_created_body():
 
 @pytest.fixture
 def payment_gateway_initialize_session_event():
-    return gql.PaymentGatewayInitializeSessionEvent(
+    return fragments.PaymentGatewayInitializeSessionEvent(
         __typename="App",
-        recipient=gql.PaymentGatewayInitializeSessionEventRecipient(
+        recipient=fragments.PaymentGatewayInitializeSessionEventRecipient(
             id="recipient_123",
             privateMetadata=[
-                gql.PaymentGatewayRecipientPrivateMetadata(key="key1", value="value1")
+                fragments.PaymentGatewayRecipientPrivateMetadata(key="key1", value="value1")
             ],
-            metadata=[gql.PaymentGatewayRecipientMetadata(key="meta1", value="value1")],
+            metadata=[fragments.PaymentGatewayRecipientMetadata(key="meta1", value="value1")],
         ),
         data={"custom": "example"},
         amount={"amount": 123.45, "currency": "USD"},
-        issuingPrincipal=gql.PaymentGatewayInitializeSessionEventIssuingPrincipalApp(
+        issuingPrincipal=fragments.PaymentGatewayInitializeSessionEventIssuingPrincipalApp(
             __typename="App",
             id="app_456",
         ),
-        sourceObject=gql.PaymentGatewayInitializeSessionEventSourceObjectCheckout(
+        sourceObject=fragments.PaymentGatewayInitializeSessionEventSourceObjectCheckout(
             __typename="Checkout",
             id="checkout_789",
-            channel=gql.PaymentGatewayInitializeSessionEventSourceObjectCheckoutChannel(
+            channel=fragments.PaymentGatewayInitializeSessionEventSourceObjectCheckoutChannel(
                 id="channel_001", slug="default-channel"
             ),
-            languageCode=gql.LanguageCodeEnum.EN,
-            billingAddress=gql.PaymentGatewayInitializeSessionEventSourceObjectCheckoutBillingAddress(
-                country=gql.PaymentGatewayInitializeSessionAddressCountry(code="US")
+            languageCode=enums.LanguageCodeEnum.EN,
+            billingAddress=fragments.PaymentGatewayInitializeSessionEventSourceObjectCheckoutBillingAddress(
+                country=fragments.PaymentGatewayInitializeSessionAddressCountry(code="US")
             ),
-            total=gql.PaymentGatewayInitializeSessionEventSourceObjectCheckoutTotal(
-                gross=gql.PaymentGatewayInitializeSessionEventSourceObjectCheckoutTotalGross(
+            total=fragments.PaymentGatewayInitializeSessionEventSourceObjectCheckoutTotal(
+                gross=fragments.PaymentGatewayInitializeSessionEventSourceObjectCheckoutTotalGross(
                     currency="USD", amount=150.00
                 )
             ),
@@ -206,35 +242,35 @@ def payment_gateway_initialize_session_event():
 
 @pytest.fixture
 def transaction_initialize_session_event():
-    return gql.TransactionInitializeSessionEvent(
+    return fragments.TransactionInitializeSessionEvent(
         __typename="Checkout",
-        recipient=gql.TransactionInitializeSessionEventRecipient(
+        recipient=fragments.TransactionInitializeSessionEventRecipient(
             id="recipient_123",
             privateMetadata=[],
             metadata=[],
         ),
         data={"key": "value"},
         merchantReference="order-123",
-        action=gql.TransactionInitializeSessionEventAction(
+        action=fragments.TransactionInitializeSessionEventAction(
             amount=200.00,
             currency="USD",
-            actionType=gql.TransactionFlowStrategyEnum.CHARGE,
+            actionType=enums.TransactionFlowStrategyEnum.CHARGE,
         ),
-        issuingPrincipal=gql.TransactionInitializeSessionEventIssuingPrincipalUser(
+        issuingPrincipal=fragments.TransactionInitializeSessionEventIssuingPrincipalUser(
             __typename="User", id="user_789"
         ),
-        transaction=gql.TransactionInitializeSessionEventTransaction(
+        transaction=fragments.TransactionInitializeSessionEventTransaction(
             id="transaction_456", pspReference="psp-abc-123"
         ),
-        sourceObject=gql.TransactionInitializeSessionEventSourceObjectCheckout(
+        sourceObject=fragments.TransactionInitializeSessionEventSourceObjectCheckout(
             __typename="Checkout",
             id="checkout_001",
-            languageCode=gql.LanguageCodeEnum.EN,
+            languageCode=enums.LanguageCodeEnum.EN,
             userEmail="customer@example.com",
-            channel=gql.TransactionInitializeSessionEventSourceObjectCheckoutChannel(
+            channel=fragments.TransactionInitializeSessionEventSourceObjectCheckoutChannel(
                 id="channel_01", slug="default-channel"
             ),
-            billingAddress=gql.TransactionInitializeSessionEventSourceObjectCheckoutBillingAddress(
+            billingAddress=fragments.TransactionInitializeSessionEventSourceObjectCheckoutBillingAddress(
                 firstName="John",
                 lastName="Doe",
                 phone="+123456789",
@@ -244,9 +280,9 @@ def transaction_initialize_session_event():
                 postalCode="10001",
                 countryArea="NY",
                 companyName="Example Inc",
-                country=gql.TransactionInitializeSessionAddressCountry(code="US"),
+                country=fragments.TransactionInitializeSessionAddressCountry(code="US"),
             ),
-            shippingAddress=gql.TransactionInitializeSessionEventSourceObjectCheckoutShippingAddress(
+            shippingAddress=fragments.TransactionInitializeSessionEventSourceObjectCheckoutShippingAddress(
                 firstName="John",
                 lastName="Doe",
                 phone="+123456789",
@@ -256,50 +292,50 @@ def transaction_initialize_session_event():
                 postalCode="10001",
                 countryArea="NY",
                 companyName="Example Inc",
-                country=gql.TransactionInitializeSessionAddressCountry(code="US"),
+                country=fragments.TransactionInitializeSessionAddressCountry(code="US"),
             ),
-            total=gql.TransactionInitializeSessionEventSourceObjectCheckoutTotal(
-                gross=gql.TransactionInitializeSessionEventSourceObjectCheckoutTotalGross(
+            total=fragments.TransactionInitializeSessionEventSourceObjectCheckoutTotal(
+                gross=fragments.TransactionInitializeSessionEventSourceObjectCheckoutTotalGross(
                     currency="USD", amount=200.00
                 )
             ),
-            shippingPrice=gql.TransactionInitializeSessionEventSourceObjectCheckoutShippingPrice(
-                gross=gql.TransactionInitializeSessionEventSourceObjectCheckoutShippingPriceGross(
+            shippingPrice=fragments.TransactionInitializeSessionEventSourceObjectCheckoutShippingPrice(
+                gross=fragments.TransactionInitializeSessionEventSourceObjectCheckoutShippingPriceGross(
                     currency="USD", amount=10.00
                 ),
-                net=gql.TransactionInitializeSessionEventSourceObjectCheckoutShippingPriceNet(
+                net=fragments.TransactionInitializeSessionEventSourceObjectCheckoutShippingPriceNet(
                     currency="USD", amount=8.00
                 ),
-                tax=gql.TransactionInitializeSessionEventSourceObjectCheckoutShippingPriceTax(
+                tax=fragments.TransactionInitializeSessionEventSourceObjectCheckoutShippingPriceTax(
                     currency="USD", amount=2.00
                 ),
             ),
             deliveryMethod=None,
             lines=[
-                gql.TransactionInitializeSessionEventSourceObjectCheckoutLines(
+                fragments.TransactionInitializeSessionEventSourceObjectCheckoutLines(
                     __typename="CheckoutLine",
                     id="line_1",
                     quantity=2,
-                    totalPrice=gql.TransactionInitializeSessionEventSourceObjectCheckoutLinesTotalPrice(
-                        gross=gql.TransactionInitializeSessionEventSourceObjectCheckoutLinesTotalPriceGross(
+                    totalPrice=fragments.TransactionInitializeSessionEventSourceObjectCheckoutLinesTotalPrice(
+                        gross=fragments.TransactionInitializeSessionEventSourceObjectCheckoutLinesTotalPriceGross(
                             currency="USD", amount=100.00
                         ),
-                        net=gql.TransactionInitializeSessionEventSourceObjectCheckoutLinesTotalPriceNet(
+                        net=fragments.TransactionInitializeSessionEventSourceObjectCheckoutLinesTotalPriceNet(
                             currency="USD", amount=80.00
                         ),
-                        tax=gql.TransactionInitializeSessionEventSourceObjectCheckoutLinesTotalPriceTax(
+                        tax=fragments.TransactionInitializeSessionEventSourceObjectCheckoutLinesTotalPriceTax(
                             currency="USD", amount=20.00
                         ),
                     ),
-                    checkoutVariant=gql.TransactionInitializeSessionEventSourceObjectCheckoutLinesCheckoutVariant(
+                    checkoutVariant=fragments.TransactionInitializeSessionEventSourceObjectCheckoutLinesCheckoutVariant(
                         name="M-size Shirt",
                         sku="SKU12345",
-                        product=gql.TransactionInitializeSessionEventSourceObjectCheckoutLinesCheckoutVariantProduct(
+                        product=fragments.TransactionInitializeSessionEventSourceObjectCheckoutLinesCheckoutVariantProduct(
                             name="Cool Shirt",
-                            thumbnail=gql.TransactionInitializeSessionEventSourceObjectCheckoutLinesCheckoutVariantProductThumbnail(
+                            thumbnail=fragments.TransactionInitializeSessionEventSourceObjectCheckoutLinesCheckoutVariantProductThumbnail(
                                 url="https://example.com/media/shirt.jpg"
                             ),
-                            category=gql.TransactionInitializeSessionEventSourceObjectCheckoutLinesCheckoutVariantProductCategory(
+                            category=fragments.TransactionInitializeSessionEventSourceObjectCheckoutLinesCheckoutVariantProductCategory(
                                 name="T-Shirts"
                             ),
                         ),
@@ -312,29 +348,29 @@ def transaction_initialize_session_event():
 
 @pytest.fixture
 def transaction_process_session_event():
-    return gql.TransactionProcessSessionEvent(
+    return fragments.TransactionProcessSessionEvent(
         __typename="Checkout",
-        recipient=gql.TransactionProcessSessionEventRecipient(
+        recipient=fragments.TransactionProcessSessionEventRecipient(
             id="recipient_456",
             privateMetadata=[],
             metadata=[],
         ),
         data={"info": "processing step"},
         merchantReference="order-456",
-        action=gql.TransactionProcessSessionEventAction(
+        action=fragments.TransactionProcessSessionEventAction(
             amount=250.00,
             currency="USD",
-            actionType=gql.TransactionFlowStrategyEnum.CHARGE,
+            actionType=enums.TransactionFlowStrategyEnum.CHARGE,
         ),
-        transaction=gql.TransactionProcessSessionEventTransaction(
+        transaction=fragments.TransactionProcessSessionEventTransaction(
             id="txn_789", pspReference="psp-xyz-789"
         ),
-        sourceObject=gql.TransactionProcessSessionEventSourceObjectCheckout(
+        sourceObject=fragments.TransactionProcessSessionEventSourceObjectCheckout(
             __typename="Checkout",
             id="checkout_789",
-            languageCode=gql.LanguageCodeEnum.EN,
+            languageCode=enums.LanguageCodeEnum.EN,
             userEmail="customer2@example.com",
-            billingAddress=gql.TransactionProcessSessionEventSourceObjectCheckoutBillingAddress(
+            billingAddress=fragments.TransactionProcessSessionEventSourceObjectCheckoutBillingAddress(
                 firstName="Alice",
                 lastName="Smith",
                 phone="+1987654321",
@@ -344,9 +380,9 @@ def transaction_process_session_event():
                 postalCode="90001",
                 countryArea="CA",
                 companyName="Example Corp",
-                country=gql.TransactionInitializeSessionAddressCountry(code="US"),
+                country=fragments.TransactionInitializeSessionAddressCountry(code="US"),
             ),
-            shippingAddress=gql.TransactionProcessSessionEventSourceObjectCheckoutShippingAddress(
+            shippingAddress=fragments.TransactionProcessSessionEventSourceObjectCheckoutShippingAddress(
                 firstName="Alice",
                 lastName="Smith",
                 phone="+1987654321",
@@ -356,48 +392,48 @@ def transaction_process_session_event():
                 postalCode="90001",
                 countryArea="CA",
                 companyName="Example Corp",
-                country=gql.TransactionInitializeSessionAddressCountry(code="US"),
+                country=fragments.TransactionInitializeSessionAddressCountry(code="US"),
             ),
-            channel=gql.TransactionProcessSessionEventSourceObjectCheckoutChannel(
+            channel=fragments.TransactionProcessSessionEventSourceObjectCheckoutChannel(
                 id="channel_002", slug="us-channel"
             ),
-            shippingPrice=gql.TransactionProcessSessionEventSourceObjectCheckoutShippingPrice(
-                gross=gql.TransactionProcessSessionEventSourceObjectCheckoutShippingPriceGross(
+            shippingPrice=fragments.TransactionProcessSessionEventSourceObjectCheckoutShippingPrice(
+                gross=fragments.TransactionProcessSessionEventSourceObjectCheckoutShippingPriceGross(
                     currency="USD", amount=12.00
                 ),
-                net=gql.TransactionProcessSessionEventSourceObjectCheckoutShippingPriceNet(
+                net=fragments.TransactionProcessSessionEventSourceObjectCheckoutShippingPriceNet(
                     currency="USD", amount=10.00
                 ),
-                tax=gql.TransactionProcessSessionEventSourceObjectCheckoutShippingPriceTax(
+                tax=fragments.TransactionProcessSessionEventSourceObjectCheckoutShippingPriceTax(
                     currency="USD", amount=2.00
                 ),
             ),
             deliveryMethod=None,
             lines=[
-                gql.TransactionProcessSessionEventSourceObjectCheckoutLines(
+                fragments.TransactionProcessSessionEventSourceObjectCheckoutLines(
                     __typename="CheckoutLine",
                     id="line_002",
                     quantity=1,
-                    totalPrice=gql.TransactionProcessSessionEventSourceObjectCheckoutLinesTotalPrice(
-                        gross=gql.TransactionProcessSessionEventSourceObjectCheckoutLinesTotalPriceGross(
+                    totalPrice=fragments.TransactionProcessSessionEventSourceObjectCheckoutLinesTotalPrice(
+                        gross=fragments.TransactionProcessSessionEventSourceObjectCheckoutLinesTotalPriceGross(
                             currency="USD", amount=238.00
                         ),
-                        net=gql.TransactionProcessSessionEventSourceObjectCheckoutLinesTotalPriceNet(
+                        net=fragments.TransactionProcessSessionEventSourceObjectCheckoutLinesTotalPriceNet(
                             currency="USD", amount=190.00
                         ),
-                        tax=gql.TransactionProcessSessionEventSourceObjectCheckoutLinesTotalPriceTax(
+                        tax=fragments.TransactionProcessSessionEventSourceObjectCheckoutLinesTotalPriceTax(
                             currency="USD", amount=48.00
                         ),
                     ),
-                    checkoutVariant=gql.TransactionProcessSessionEventSourceObjectCheckoutLinesCheckoutVariant(
+                    checkoutVariant=fragments.TransactionProcessSessionEventSourceObjectCheckoutLinesCheckoutVariant(
                         name="Fancy Pants",
                         sku="SKU-9988",
-                        product=gql.TransactionProcessSessionEventSourceObjectCheckoutLinesCheckoutVariantProduct(
+                        product=fragments.TransactionProcessSessionEventSourceObjectCheckoutLinesCheckoutVariantProduct(
                             name="Designer Pants",
-                            thumbnail=gql.TransactionProcessSessionEventSourceObjectCheckoutLinesCheckoutVariantProductThumbnail(
+                            thumbnail=fragments.TransactionProcessSessionEventSourceObjectCheckoutLinesCheckoutVariantProductThumbnail(
                                 url="https://example.com/media/pants.jpg"
                             ),
-                            category=gql.TransactionProcessSessionEventSourceObjectCheckoutLinesCheckoutVariantProductCategory(
+                            category=fragments.TransactionProcessSessionEventSourceObjectCheckoutLinesCheckoutVariantProductCategory(
                                 name="Pants"
                             ),
                         ),
@@ -410,73 +446,74 @@ def transaction_process_session_event():
 
 @pytest.fixture
 def transaction_charge_requested_event():
-    return gql.TransactionChargeRequestedEvent(
+    return fragments.TransactionChargeRequestedEvent(
         __typename="Checkout",
-        recipient=gql.TransactionChargeRequestedEventRecipient(
+        issuedAt="2024-05-01T12:00:00+00:00",
+        recipient=fragments.TransactionChargeRequestedEventRecipient(
             id="recipient_999",
             privateMetadata=[],
             metadata=[],
         ),
-        action=gql.TransactionChargeRequestedEventAction(
+        action=fragments.TransactionChargeRequestedEventAction(
             amount=300.00,
             currency="USD",
-            actionType=gql.TransactionActionEnum.CHARGE,
+            actionType=enums.TransactionActionEnum.CHARGE,
         ),
-        transaction=gql.TransactionChargeRequestedEventTransaction(
+        transaction=fragments.TransactionChargeRequestedEventTransaction(
             id="txn_123456",
             pspReference="psp-456-xyz",
-            sourceObject=gql.TransactionChargeRequestedEventTransactionSourceObject(
+            sourceObject=fragments.TransactionChargeRequestedEventTransactionSourceObject(
                 __typename="Order",
-                channel=gql.TransactionChargeRequestedEventTransactionSourceObjectChannel(
+                channel=fragments.TransactionChargeRequestedEventTransactionSourceObjectChannel(
                     id="channel-003", slug="us-store"
                 ),
-                total=gql.TransactionChargeRequestedEventTransactionSourceObjectTotal(
-                    gross=gql.TransactionChargeRequestedEventTransactionSourceObjectTotalGross(
+                total=fragments.TransactionChargeRequestedEventTransactionSourceObjectTotal(
+                    gross=fragments.TransactionChargeRequestedEventTransactionSourceObjectTotalGross(
                         currency="USD", amount=300.00
                     )
                 ),
-                shippingPrice=gql.TransactionChargeRequestedEventTransactionSourceObjectShippingPrice(
-                    gross=gql.TransactionChargeRequestedEventTransactionSourceObjectShippingPriceGross(
+                shippingPrice=fragments.TransactionChargeRequestedEventTransactionSourceObjectShippingPrice(
+                    gross=fragments.TransactionChargeRequestedEventTransactionSourceObjectShippingPriceGross(
                         currency="USD", amount=15.00
                     ),
-                    net=gql.TransactionChargeRequestedEventTransactionSourceObjectShippingPriceNet(
+                    net=fragments.TransactionChargeRequestedEventTransactionSourceObjectShippingPriceNet(
                         currency="USD", amount=12.00
                     ),
-                    tax=gql.TransactionChargeRequestedEventTransactionSourceObjectShippingPriceTax(
+                    tax=fragments.TransactionChargeRequestedEventTransactionSourceObjectShippingPriceTax(
                         currency="USD", amount=3.00
                     ),
                 ),
-                deliveryMethod=gql.TransactionChargeRequestedEventTransactionSourceObjectDeliveryMethodShippingMethod(
+                deliveryMethod=fragments.TransactionChargeRequestedEventTransactionSourceObjectDeliveryMethodShippingMethod(
                     __typename="ShippingMethod",
                     id="ship-method-001",
                     name="Standard Shipping",
                 ),
                 lines=[
-                    gql.TransactionChargeRequestedEventTransactionSourceObjectLines(
+                    fragments.TransactionChargeRequestedEventTransactionSourceObjectLines(
                         __typename="OrderLine",
                         id="line-xyz",
                         quantity=1,
                         taxRate=0.2,
-                        totalPrice=gql.TransactionChargeRequestedEventTransactionSourceObjectLinesTotalPrice(
-                            gross=gql.TransactionChargeRequestedEventTransactionSourceObjectLinesTotalPriceGross(
+                        totalPrice=fragments.TransactionChargeRequestedEventTransactionSourceObjectLinesTotalPrice(
+                            gross=fragments.TransactionChargeRequestedEventTransactionSourceObjectLinesTotalPriceGross(
                                 currency="USD", amount=285.00
                             ),
-                            net=gql.TransactionChargeRequestedEventTransactionSourceObjectLinesTotalPriceNet(
+                            net=fragments.TransactionChargeRequestedEventTransactionSourceObjectLinesTotalPriceNet(
                                 currency="USD", amount=237.50
                             ),
-                            tax=gql.TransactionChargeRequestedEventTransactionSourceObjectLinesTotalPriceTax(
+                            tax=fragments.TransactionChargeRequestedEventTransactionSourceObjectLinesTotalPriceTax(
                                 currency="USD", amount=47.50
                             ),
                         ),
-                        orderVariant=gql.TransactionChargeRequestedEventTransactionSourceObjectLinesOrderVariant(
+                        orderVariant=fragments.TransactionChargeRequestedEventTransactionSourceObjectLinesOrderVariant(
                             name="Elegant Coat",
                             sku="COAT-7890",
-                            product=gql.TransactionChargeRequestedEventTransactionSourceObjectLinesOrderVariantProduct(
+                            product=fragments.TransactionChargeRequestedEventTransactionSourceObjectLinesOrderVariantProduct(
                                 name="Winter Coat",
-                                thumbnail=gql.TransactionChargeRequestedEventTransactionSourceObjectLinesOrderVariantProductThumbnail(
+                                thumbnail=fragments.TransactionChargeRequestedEventTransactionSourceObjectLinesOrderVariantProductThumbnail(
                                     url="https://example.com/media/coat.jpg"
                                 ),
-                                category=gql.TransactionChargeRequestedEventTransactionSourceObjectLinesOrderVariantProductCategory(
+                                category=fragments.TransactionChargeRequestedEventTransactionSourceObjectLinesOrderVariantProductCategory(
                                     name="Outerwear"
                                 ),
                             ),
@@ -490,23 +527,24 @@ def transaction_charge_requested_event():
 
 @pytest.fixture
 def transaction_cancellation_requested_event():
-    return gql.TransactionCancelationRequestedEvent(
+    return fragments.TransactionCancelationRequestedEvent(
         __typename="Order",
-        recipient=gql.TransactionCancelationRequestedEventRecipient(
+        issuedAt="2024-05-01T12:00:00+00:00",
+        recipient=fragments.TransactionCancelationRequestedEventRecipient(
             id="recipient_555",
             privateMetadata=[],
             metadata=[],
         ),
-        action=gql.TransactionCancelationRequestedEventAction(
-            actionType=gql.TransactionActionEnum.CANCEL,
+        action=fragments.TransactionCancelationRequestedEventAction(
+            actionType=enums.TransactionActionEnum.CANCEL,
             currency="USD",
             amount=None,  # lub np. 0.0
         ),
-        transaction=gql.TransactionCancelationRequestedEventTransaction(
+        transaction=fragments.TransactionCancelationRequestedEventTransaction(
             id="txn_cancel_001",
             pspReference="psp-cancel-abc123",
-            sourceObject=gql.TransactionCancelationRequestedEventTransactionSourceObject(
-                channel=gql.TransactionCancelationRequestedEventTransactionSourceObjectChannel(
+            sourceObject=fragments.TransactionCancelationRequestedEventTransactionSourceObject(
+                channel=fragments.TransactionCancelationRequestedEventTransactionSourceObjectChannel(
                     id="channel_cancel_001", slug="cancel-channel"
                 )
             ),
@@ -516,73 +554,74 @@ def transaction_cancellation_requested_event():
 
 @pytest.fixture
 def transaction_refund_requested_event():
-    return gql.TransactionRefundRequestedEvent(
+    return fragments.TransactionRefundRequestedEvent(
         __typename="Order",
-        recipient=gql.TransactionRefundRequestedEventRecipient(
+        issuedAt="2024-05-01T12:00:00+00:00",
+        recipient=fragments.TransactionRefundRequestedEventRecipient(
             id="recipient_888",
             privateMetadata=[],
             metadata=[],
         ),
-        action=gql.TransactionRefundRequestedEventAction(
+        action=fragments.TransactionRefundRequestedEventAction(
             amount=180.00,
             currency="USD",
-            actionType=gql.TransactionActionEnum.REFUND,
+            actionType=enums.TransactionActionEnum.REFUND,
         ),
-        transaction=gql.TransactionRefundRequestedEventTransaction(
+        transaction=fragments.TransactionRefundRequestedEventTransaction(
             id="txn_refund_001",
             pspReference="psp-refund-456abc",
-            sourceObject=gql.TransactionRefundRequestedEventTransactionSourceObject(
+            sourceObject=fragments.TransactionRefundRequestedEventTransactionSourceObject(
                 __typename="Order",
-                channel=gql.TransactionRefundRequestedEventTransactionSourceObjectChannel(
+                channel=fragments.TransactionRefundRequestedEventTransactionSourceObjectChannel(
                     id="channel_refund_01", slug="refund-channel"
                 ),
-                total=gql.TransactionRefundRequestedEventTransactionSourceObjectTotal(
-                    gross=gql.TransactionRefundRequestedEventTransactionSourceObjectTotalGross(
+                total=fragments.TransactionRefundRequestedEventTransactionSourceObjectTotal(
+                    gross=fragments.TransactionRefundRequestedEventTransactionSourceObjectTotalGross(
                         currency="USD", amount=180.00
                     )
                 ),
-                shippingPrice=gql.TransactionRefundRequestedEventTransactionSourceObjectShippingPrice(
-                    gross=gql.TransactionRefundRequestedEventTransactionSourceObjectShippingPriceGross(
+                shippingPrice=fragments.TransactionRefundRequestedEventTransactionSourceObjectShippingPrice(
+                    gross=fragments.TransactionRefundRequestedEventTransactionSourceObjectShippingPriceGross(
                         currency="USD", amount=10.00
                     ),
-                    net=gql.TransactionRefundRequestedEventTransactionSourceObjectShippingPriceNet(
+                    net=fragments.TransactionRefundRequestedEventTransactionSourceObjectShippingPriceNet(
                         currency="USD", amount=8.00
                     ),
-                    tax=gql.TransactionRefundRequestedEventTransactionSourceObjectShippingPriceTax(
+                    tax=fragments.TransactionRefundRequestedEventTransactionSourceObjectShippingPriceTax(
                         currency="USD", amount=2.00
                     ),
                 ),
-                deliveryMethod=gql.TransactionRefundRequestedEventTransactionSourceObjectDeliveryMethodShippingMethod(
+                deliveryMethod=fragments.TransactionRefundRequestedEventTransactionSourceObjectDeliveryMethodShippingMethod(
                     __typename="ShippingMethod",
                     id="shipping-method-refund-001",
                     name="Express Return",
                 ),
                 lines=[
-                    gql.TransactionRefundRequestedEventTransactionSourceObjectLines(
+                    fragments.TransactionRefundRequestedEventTransactionSourceObjectLines(
                         __typename="OrderLine",
                         id="line_refund_001",
                         quantity=1,
                         taxRate=0.2,
-                        totalPrice=gql.TransactionRefundRequestedEventTransactionSourceObjectLinesTotalPrice(
-                            gross=gql.TransactionRefundRequestedEventTransactionSourceObjectLinesTotalPriceGross(
+                        totalPrice=fragments.TransactionRefundRequestedEventTransactionSourceObjectLinesTotalPrice(
+                            gross=fragments.TransactionRefundRequestedEventTransactionSourceObjectLinesTotalPriceGross(
                                 currency="USD", amount=170.00
                             ),
-                            net=gql.TransactionRefundRequestedEventTransactionSourceObjectLinesTotalPriceNet(
+                            net=fragments.TransactionRefundRequestedEventTransactionSourceObjectLinesTotalPriceNet(
                                 currency="USD", amount=141.67
                             ),
-                            tax=gql.TransactionRefundRequestedEventTransactionSourceObjectLinesTotalPriceTax(
+                            tax=fragments.TransactionRefundRequestedEventTransactionSourceObjectLinesTotalPriceTax(
                                 currency="USD", amount=28.33
                             ),
                         ),
-                        orderVariant=gql.TransactionRefundRequestedEventTransactionSourceObjectLinesOrderVariant(
+                        orderVariant=fragments.TransactionRefundRequestedEventTransactionSourceObjectLinesOrderVariant(
                             name="Red Hoodie",
                             sku="HOODIE-001",
-                            product=gql.TransactionRefundRequestedEventTransactionSourceObjectLinesOrderVariantProduct(
+                            product=fragments.TransactionRefundRequestedEventTransactionSourceObjectLinesOrderVariantProduct(
                                 name="Stylish Red Hoodie",
-                                thumbnail=gql.TransactionRefundRequestedEventTransactionSourceObjectLinesOrderVariantProductThumbnail(
+                                thumbnail=fragments.TransactionRefundRequestedEventTransactionSourceObjectLinesOrderVariantProductThumbnail(
                                     url="https://example.com/media/hoodie.jpg"
                                 ),
-                                category=gql.TransactionRefundRequestedEventTransactionSourceObjectLinesOrderVariantProductCategory(
+                                category=fragments.TransactionRefundRequestedEventTransactionSourceObjectLinesOrderVariantProductCategory(
                                     name="Hoodies"
                                 ),
                             ),
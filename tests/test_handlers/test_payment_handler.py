@@ -1,11 +1,12 @@
 from datetime import datetime
-from unittest.mock import patch
+from unittest.mock import ANY, AsyncMock, patch
 
 import pytest
 from fastapi.testclient import TestClient
 
-from graphql_client import TransactionFlowStrategyEnum
+from graphql_client.enums import TransactionFlowStrategyEnum
 from nimara_stripe.api.stripe.app import app
+from nimara_stripe.utils.metrics import metrics
 from tests.test_stripe.stripe_mock import (
     FakePaymentIntent,
     FakeTaxCalculation,
@@ -72,13 +73,12 @@ async def test_payment_gateway_initialize_session_missing_channel_settings(
     assert response.status_code == 422
 
 
-@patch("nimara_stripe.api.stripe.endpoints.stripe.PaymentIntent.create")
 @patch("nimara_stripe.services.saleor.auth.verify_webhook_signature")
 @patch("nimara_stripe.api.stripe.endpoints.get_stripe_channel_config")
 async def test_transaction_initialize_session(
     mocked_get_stripe_channel_config,
     mocked_verify_webhook_signature,
-    mocker_intent_create,
+    mock_stripe_client,
     mocker,
     stripe_config,
     transaction_initialize_session_event,
@@ -99,7 +99,7 @@ async def test_transaction_initialize_session(
         description="",
         last_payment_error=None,
     )
-    mocker_intent_create.return_value = fake_payment_intent
+    mock_stripe_client.payment_intents.create_async.return_value = fake_payment_intent
     mocked_get_stripe_channel_config.return_value = stripe_config
 
     response = saleor_client.post(
@@ -122,27 +122,29 @@ async def test_transaction_initialize_session(
         },
     }
 
-    mocker_intent_create.assert_called_once_with(
-        amount=1099,
-        currency="USD",
-        capture_method="manual",
-        key="value",
-        metadata={
-            "transactionId": test_body.transaction.id,
-            "channelId": test_body.source_object.channel.id,
-            "channelSlug": test_body.source_object.channel.slug,
-            "saleorDomain": "example.saleor.com",
+    mock_stripe_client.payment_intents.create_async.assert_awaited_once_with(
+        params={
+            "amount": 1099,
+            "currency": "USD",
+            "capture_method": "manual",
+            "key": "value",
+            "metadata": {
+                "transactionId": test_body.transaction.id,
+                "channelId": test_body.source_object.channel.id,
+                "channelSlug": test_body.source_object.channel.slug,
+                "saleorDomain": "example.saleor.com",
+            },
         },
+        options={"idempotency_key": ANY},
     )
 
 
-@patch("nimara_stripe.api.stripe.endpoints.stripe.PaymentIntent.retrieve")
 @patch("nimara_stripe.services.saleor.auth.verify_webhook_signature")
 @patch("nimara_stripe.api.stripe.endpoints.get_stripe_channel_config")
 async def test_transaction_process_session_without_additional_data(
     mocked_get_stripe_channel_config,
     mocked_verify_webhook_signature,
-    mocker_intent_retrieve,
+    mock_stripe_client,
     mocker,
     stripe_config,
     transaction_process_session_event,
@@ -167,7 +169,7 @@ async def test_transaction_process_session_without_additional_data(
 
     mocked_get_stripe_channel_config.return_value = stripe_config
 
-    mocker_intent_retrieve.return_value = fake_payment_intent
+    mock_stripe_client.payment_intents.retrieve_async.return_value = fake_payment_intent
 
     response = saleor_client.post(
         "/payment/process-session",
@@ -189,18 +191,17 @@ async def test_transaction_process_session_without_additional_data(
         },
     }
 
-    mocker_intent_retrieve.assert_called_once_with(
+    mock_stripe_client.payment_intents.retrieve_async.assert_awaited_once_with(
         test_body.transaction.psp_reference,
     )
 
 
-@patch("nimara_stripe.api.stripe.endpoints.stripe.PaymentIntent.modify")
 @patch("nimara_stripe.services.saleor.auth.verify_webhook_signature")
 @patch("nimara_stripe.api.stripe.endpoints.get_stripe_channel_config")
 async def test_transaction_process_session_with_additional_data(
     mocked_get_stripe_channel_config,
     mocked_verify_webhook_signature,
-    mocker_intent_modify,
+    mock_stripe_client,
     mocker,
     stripe_config,
     transaction_process_session_event,
@@ -222,7 +223,7 @@ async def test_transaction_process_session_with_additional_data(
         last_payment_error=None,
     )
 
-    mocker_intent_modify.return_value = fake_payment_intent
+    mock_stripe_client.payment_intents.update_async.return_value = fake_payment_intent
     mocked_get_stripe_channel_config.return_value = stripe_config
 
     response = saleor_client.post(
@@ -245,28 +246,29 @@ async def test_transaction_process_session_with_additional_data(
         },
     }
 
-    mocker_intent_modify.assert_called_once_with(
+    mock_stripe_client.payment_intents.update_async.assert_awaited_once_with(
         test_body.transaction.psp_reference,
-        amount=1099,
-        currency="USD",
-        capture_method="manual",
-        metadata={
-            "transactionId": test_body.transaction.id,
-            "channelId": test_body.source_object.channel.id,
-            "channelSlug": test_body.source_object.channel.slug,
-            "saleorDomain": "example.saleor.com",
+        params={
+            "amount": 1099,
+            "currency": "USD",
+            "capture_method": "manual",
+            "metadata": {
+                "transactionId": test_body.transaction.id,
+                "channelId": test_body.source_object.channel.id,
+                "channelSlug": test_body.source_object.channel.slug,
+                "saleorDomain": "example.saleor.com",
+            },
+            "info": "processing step",
         },
-        info="processing step",
     )
 
 
-@patch("nimara_stripe.api.stripe.endpoints.stripe.PaymentIntent.capture")
 @patch("nimara_stripe.services.saleor.auth.verify_webhook_signature")
 @patch("nimara_stripe.api.stripe.endpoints.get_stripe_channel_config")
 async def test_transaction_charge_requested(
     mocked_get_stripe_channel_config,
     mocked_verify_webhook_signature,
-    mocker_intent_capture,
+    mock_stripe_client,
     stripe_config,
     transaction_charge_requested_event,
 ):
@@ -281,7 +283,7 @@ async def test_transaction_charge_requested(
         description="",
         last_payment_error=None,
     )
-    mocker_intent_capture.return_value = fake_payment_intent
+    mock_stripe_client.payment_intents.capture_async.return_value = fake_payment_intent
     mocked_get_stripe_channel_config.return_value = stripe_config
 
     response = saleor_client.post(
@@ -296,19 +298,59 @@ async def test_transaction_charge_requested(
         "externalUrl": f"https://dashboard.stripe.com/payments/{fake_payment_intent.id}",
     }
 
-    mocker_intent_capture.assert_called_once_with(
-        intent=transaction_charge_requested_event.transaction.psp_reference,
-        amount_to_capture=30000,
+    mock_stripe_client.payment_intents.capture_async.assert_awaited_once_with(
+        transaction_charge_requested_event.transaction.psp_reference,
+        params={"amount_to_capture": 30000},
+        options={"idempotency_key": ANY},
+    )
+
+
+@patch("nimara_stripe.services.saleor.auth.verify_webhook_signature")
+@patch("nimara_stripe.api.stripe.endpoints.get_stripe_channel_config")
+async def test_transaction_charge_requested_truncates_fractional_huf_amount(
+    mocked_get_stripe_channel_config,
+    mocked_verify_webhook_signature,
+    mock_stripe_client,
+    stripe_config,
+    transaction_charge_requested_event,
+):
+    # Given
+    transaction_charge_requested_event.action.amount = 1500.5
+    transaction_charge_requested_event.action.currency = "HUF"
+    mock_stripe_client.payment_intents.capture_async.return_value = FakePaymentIntent(
+        id="fake_payment_intent_id",
+        amount=150000,
+        currency="HUF",
+        status="succeeded",
+        client_secret="client_secret",
+        created=datetime.now().isoformat(),
+        cancellation_reason="",
+        description="",
+        last_payment_error=None,
+    )
+    mocked_get_stripe_channel_config.return_value = stripe_config
+
+    # When
+    response = saleor_client.post(
+        "/payment/charge",
+        json=transaction_charge_requested_event.model_dump(),
+    )
+
+    # Then
+    assert response.json()["result"] == "CHARGE_SUCCESS"
+    mock_stripe_client.payment_intents.capture_async.assert_awaited_once_with(
+        transaction_charge_requested_event.transaction.psp_reference,
+        params={"amount_to_capture": 150000},
+        options={"idempotency_key": ANY},
     )
 
 
-@patch("nimara_stripe.api.stripe.endpoints.stripe.PaymentIntent.cancel")
 @patch("nimara_stripe.services.saleor.auth.verify_webhook_signature")
 @patch("nimara_stripe.api.stripe.endpoints.get_stripe_channel_config")
 async def test_transaction_cancel_requested(
     mocked_get_stripe_channel_config,
     mocked_verify_webhook_signature,
-    mocker_intent_cancel,
+    mock_stripe_client,
     stripe_config,
     transaction_cancellation_requested_event,
 ):
@@ -323,7 +365,7 @@ async def test_transaction_cancel_requested(
         description="",
         last_payment_error=None,
     )
-    mocker_intent_cancel.return_value = fake_payment_intent
+    mock_stripe_client.payment_intents.cancel_async.return_value = fake_payment_intent
     mocked_get_stripe_channel_config.return_value = stripe_config
 
     response = saleor_client.post(
@@ -335,18 +377,18 @@ async def test_transaction_cancel_requested(
         "pspReference": fake_payment_intent.id,
     }
 
-    mocker_intent_cancel.assert_called_once_with(
-        intent=transaction_cancellation_requested_event.transaction.psp_reference
+    mock_stripe_client.payment_intents.cancel_async.assert_awaited_once_with(
+        transaction_cancellation_requested_event.transaction.psp_reference,
+        options={"idempotency_key": ANY},
     )
 
 
-@patch("nimara_stripe.api.stripe.endpoints.stripe.Refund.create")
 @patch("nimara_stripe.services.saleor.auth.verify_webhook_signature")
 @patch("nimara_stripe.api.stripe.endpoints.get_stripe_channel_config")
 async def test_transaction_refund_requested(
     mocked_get_stripe_channel_config,
     mocked_verify_webhook_signature,
-    mocker_intent_refund,
+    mock_stripe_client,
     stripe_config,
     transaction_refund_requested_event,
 ):
@@ -361,7 +403,7 @@ async def test_transaction_refund_requested(
         description="",
         last_payment_error=None,
     )
-    mocker_intent_refund.return_value = fake_payment_intent
+    mock_stripe_client.refunds.create_async.return_value = fake_payment_intent
     mocked_get_stripe_channel_config.return_value = stripe_config
 
     response = saleor_client.post(
@@ -376,19 +418,102 @@ async def test_transaction_refund_requested(
         "externalUrl": f"https://dashboard.stripe.com/payments/{transaction_refund_requested_event.transaction.psp_reference}",
     }
 
-    mocker_intent_refund.assert_called_once_with(
-        payment_intent=transaction_refund_requested_event.transaction.psp_reference,
-        amount=18000,
+    mock_stripe_client.refunds.create_async.assert_awaited_once_with(
+        params={
+            "payment_intent": transaction_refund_requested_event.transaction.psp_reference,
+            "amount": 18000,
+        },
+        options={"idempotency_key": ANY},
+    )
+
+
+@patch("nimara_stripe.services.saleor.auth.verify_webhook_signature")
+@patch("nimara_stripe.api.stripe.endpoints.get_stripe_channel_config")
+async def test_transaction_refund_requested_retry_replays_response(
+    mocked_get_stripe_channel_config,
+    mocked_verify_webhook_signature,
+    mock_stripe_client,
+    stripe_config,
+    transaction_refund_requested_event,
+):
+    # Given
+    mock_stripe_client.refunds.create_async.return_value = FakePaymentIntent(
+        id="fake_refund_id",
+        amount=1099,
+        currency="USD",
+        status="succeeded",
+        client_secret="client_secret",
+        created=datetime.now().isoformat(),
+        cancellation_reason="",
+        description="",
+        last_payment_error=None,
+    )
+    mocked_get_stripe_channel_config.return_value = stripe_config
+    body = transaction_refund_requested_event.model_dump()
+    first_response = saleor_client.post("/payment/refund", json=body)
+
+    # When
+    retry_response = saleor_client.post("/payment/refund", json=body)
+    body["action"]["amount"] = 100
+    other_amount_response = saleor_client.post("/payment/refund", json=body)
+
+    # Then
+    assert retry_response.json() == first_response.json()
+    assert other_amount_response.status_code == 200
+    assert mock_stripe_client.refunds.create_async.await_count == 2
+    first_key, other_amount_key = (
+        call.kwargs["options"]["idempotency_key"]
+        for call in mock_stripe_client.refunds.create_async.await_args_list
+    )
+    assert first_key != other_amount_key
+
+
+@patch("nimara_stripe.services.saleor.auth.verify_webhook_signature")
+@patch("nimara_stripe.api.stripe.endpoints.get_stripe_channel_config")
+async def test_transaction_refund_requested_same_amount_partial_refunds_are_both_made(
+    mocked_get_stripe_channel_config,
+    mocked_verify_webhook_signature,
+    mock_stripe_client,
+    stripe_config,
+    transaction_refund_requested_event,
+):
+    # Given
+    mock_stripe_client.refunds.create_async.return_value = FakePaymentIntent(
+        id="fake_refund_id",
+        amount=1000,
+        currency="USD",
+        status="succeeded",
+        client_secret="client_secret",
+        created=datetime.now().isoformat(),
+        cancellation_reason="",
+        description="",
+        last_payment_error=None,
     )
+    mocked_get_stripe_channel_config.return_value = stripe_config
+    body = transaction_refund_requested_event.model_dump()
+    body["action"]["amount"] = 10
+    second_body = {**body, "issued_at": "2024-05-01T12:05:00+00:00"}
+
+    # When
+    first_response = saleor_client.post("/payment/refund", json=body)
+    second_response = saleor_client.post("/payment/refund", json=second_body)
+
+    # Then
+    assert first_response.status_code == second_response.status_code == 200
+    assert mock_stripe_client.refunds.create_async.await_count == 2
+    first_key, second_key = (
+        call.kwargs["options"]["idempotency_key"]
+        for call in mock_stripe_client.refunds.create_async.await_args_list
+    )
+    assert first_key != second_key
 
 
-@patch("nimara_stripe.api.stripe.endpoints.stripe.tax.Calculation.create")
 @patch("nimara_stripe.services.saleor.auth.verify_webhook_signature")
 @patch("nimara_stripe.api.stripe.endpoints.get_stripe_channel_config")
 async def test_calculate_tax(
     mocked_get_stripe_channel_config,
     mocked_verify_webhook_signature,
-    mocker_tax_calculation,
+    mock_stripe_client,
     saleor_test_calculate_tax_event,
     stripe_config,
 ):
@@ -401,7 +526,7 @@ async def test_calculate_tax(
         currency="PLN",
         line_items=LineItemsData(data=[LineItem(amount=100000, amount_tax=23000)]),
     )
-    mocker_tax_calculation.return_value = fake_tax_calculation
+    mock_stripe_client.tax.calculations.create_async.return_value = fake_tax_calculation
     mocked_get_stripe_channel_config.return_value = stripe_config
 
     response = saleor_client.post(
@@ -422,28 +547,95 @@ async def test_calculate_tax(
         ],
     }
 
-    mocker_tax_calculation.assert_called_once_with(
-        currency="PLN",
-        customer_details={
-            "address": {
-                "line1": "Street address 1",
-                "line2": "Street address 2",
-                "city": "Warsaw",
-                "postal_code": "00-001",
-                "country": "PL",
-                "state": "",
+    mock_stripe_client.tax.calculations.create_async.assert_awaited_once_with(
+        params={
+            "currency": "PLN",
+            "customer_details": {
+                "address": {
+                    "line1": "Street address 1",
+                    "line2": "Street address 2",
+                    "city": "Warsaw",
+                    "postal_code": "00-001",
+                    "country": "PL",
+                    "state": "",
+                },
+                "address_source": "shipping",
             },
-            "address_source": "shipping",
-        },
-        line_items=[{"amount": 100000, "quantity": 1, "reference": "testSku"}],
-        shipping_cost={"amount": 1000},
-        expand=["line_items"],
+            "line_items": [{"amount": 100000, "quantity": 1, "reference": "testSku"}],
+            "shipping_cost": {"amount": 1000},
+            "expand": ["line_items"],
+        }
+    )
+
+
+@patch("nimara_stripe.services.saleor.auth.verify_webhook_signature")
+@patch("nimara_stripe.api.stripe.endpoints.get_stripe_channel_config")
+async def test_calculate_tax_reuses_calculation_for_unchanged_checkout(
+    mocked_get_stripe_channel_config,
+    mocked_verify_webhook_signature,
+    mock_stripe_client,
+    saleor_test_calculate_tax_event,
+    stripe_config,
+):
+    # Given
+    mock_stripe_client.tax.calculations.create_async.return_value = FakeTaxCalculation(
+        amount_total=124230,
+        shipping_cost=Money(amount=1000, amount_tax=230),
+        currency="PLN",
+        line_items=LineItemsData(data=[LineItem(amount=100000, amount_tax=23000)]),
     )
+    mocked_get_stripe_channel_config.return_value = stripe_config
+    payload = saleor_test_calculate_tax_event.model_dump()
+    changed_payload = saleor_test_calculate_tax_event.model_copy(deep=True)
+    changed_payload.tax_base.lines[0].quantity = 2
+
+    # When
+    first = saleor_client.post("/payment/calculate-tax", json=payload)
+    second = saleor_client.post("/payment/calculate-tax", json=payload)
+    saleor_client.post("/payment/calculate-tax", json=changed_payload.model_dump())
+
+    # Then
+    assert second.json() == first.json()
+    assert mock_stripe_client.tax.calculations.create_async.await_count == 2
+
+
+@patch("nimara_stripe.services.saleor.auth.verify_webhook_signature")
+@patch("nimara_stripe.api.stripe.endpoints.get_stripe_channel_config")
+async def test_calculate_tax_estimates_changed_checkout_from_learned_rates(
+    mocked_get_stripe_channel_config,
+    mocked_verify_webhook_signature,
+    mock_stripe_client,
+    saleor_test_calculate_tax_event,
+    stripe_config,
+):
+    # Given
+    mock_stripe_client.tax.calculations.create_async.return_value = FakeTaxCalculation(
+        amount_total=124230,
+        shipping_cost=Money(amount=1000, amount_tax=230),
+        currency="PLN",
+        line_items=LineItemsData(data=[LineItem(amount=100000, amount_tax=23000)]),
+    )
+    stripe_config.estimate_checkout_taxes = True
+    mocked_get_stripe_channel_config.return_value = stripe_config
+    changed_event = saleor_test_calculate_tax_event.model_copy(deep=True)
+    changed_event.tax_base.lines[0].quantity = 2
+    changed_event.tax_base.lines[0].total_price.amount = 2000.0
+
+    # When
+    saleor_client.post("/payment/calculate-tax", json=saleor_test_calculate_tax_event.model_dump())
+    response = saleor_client.post("/payment/calculate-tax", json=changed_event.model_dump())
+
+    # Then
+    mock_stripe_client.tax.calculations.create_async.assert_awaited_once()
+    assert response.json()["lines"] == [
+        {"tax_rate": "23.00", "total_gross_amount": "2460.00", "total_net_amount": "2000.00"}
+    ]
+    assert response.json()["shipping_price_gross_amount"] == "12.30"
 
 
 @patch("nimara_stripe.api.stripe.endpoints.get_configs_from_domain_settings")
 @patch("nimara_stripe.api.stripe.endpoints.validate_stripe_webhook")
-@patch("nimara_stripe.api.stripe.endpoints.SaleorClient.transaction_event_report")
+@patch("nimara_stripe.services.saleor.client.SaleorClient.transaction_event_report")
 async def test_stripe_webhook(
     mock_transaction_event_report,
     mock_validate_stripe_webhook,
@@ -469,11 +661,81 @@ async def test_stripe_webhook(
 
     _, kwargs = mock_transaction_event_report.call_args
     assert kwargs["type"] == "CHARGE_ACTION_REQUIRED"
+    assert kwargs["time"] == "2024-11-06T18:38:32+00:00"
+
+
+@patch("nimara_stripe.api.stripe.endpoints.get_configs_from_domain_settings")
+@patch("nimara_stripe.api.stripe.endpoints.validate_stripe_webhook")
+@patch("nimara_stripe.services.saleor.client.SaleorClient.transaction_event_report")
+async def test_stripe_webhook_drops_duplicate_events(
+    mock_transaction_event_report,
+    mock_validate_stripe_webhook,
+    mock_get_configs_from_domain_settings,
+    saleor_config_data,
+    stripe_config,
+    stripe_webhook_payment_intent_created_body,
+):
+    # Given
+    mock_get_configs_from_domain_settings.return_value = (saleor_config_data, stripe_config)
+    mock_transaction_event_report.side_effect = [RuntimeError("Saleor is down"), None]
+    metrics.reset()
+
+    # When
+    responses = [
+        TestClient(app, raise_server_exceptions=False).post(
+            "/payment/webhook",
+            json=stripe_webhook_payment_intent_created_body,
+            headers={"stripe-signature": "test_sig"},
+        )
+        for _ in range(3)
+    ]
+
+    # Then
+    assert [response.status_code for response in responses] == [500, 200, 200]
+    assert mock_transaction_event_report.await_count == 2
+    assert metrics.counters["stripe_event_duplicate"] == 1
+
+
+@patch("nimara_stripe.api.stripe.endpoints.settings.stripe_webhook_mode", "queue")
+@patch("nimara_stripe.api.stripe.endpoints.get_webhook_queue")
+@patch("nimara_stripe.api.stripe.endpoints.get_configs_from_domain_settings")
+@patch("nimara_stripe.api.stripe.endpoints.validate_stripe_webhook")
+@patch("nimara_stripe.services.saleor.client.SaleorClient.transaction_event_report")
+async def test_stripe_webhook_queue_mode(
+    mock_transaction_event_report,
+    mock_validate_stripe_webhook,
+    mock_get_configs_from_domain_settings,
+    mock_get_webhook_queue,
+    saleor_config_data,
+    stripe_config,
+    stripe_webhook_payment_intent_created_body,
+):
+    # Given
+    mock_get_configs_from_domain_settings.return_value = (saleor_config_data, stripe_config)
+    mock_queue = mock_get_webhook_queue.return_value
+    mock_queue.send = AsyncMock()
+
+    # When
+    response = stripe_client.post(
+        "/payment/webhook",
+        json=stripe_webhook_payment_intent_created_body,
+        headers={"stripe-signature": "test_sig"},
+    )
+
+    # Then
+    assert response.json() == "OK"
+    mock_validate_stripe_webhook.assert_awaited_once()
+    mock_transaction_event_report.assert_not_called()
+    (message,) = mock_queue.send.await_args.args
+    metadata = stripe_webhook_payment_intent_created_body["data"]["object"]["metadata"]
+    assert message.saleor_domain == metadata["saleorDomain"]
+    assert message.channel_slug == metadata["channelSlug"]
+    assert message.event == stripe_webhook_payment_intent_created_body
 
 
 @patch("nimara_stripe.api.stripe.endpoints.get_configs_from_domain_settings")
 @patch("nimara_stripe.api.stripe.endpoints.validate_stripe_webhook")
-@patch("nimara_stripe.api.stripe.endpoints.SaleorClient.transaction_event_report")
+@patch("nimara_stripe.services.saleor.client.SaleorClient.transaction_event_report")
 async def test_stripe_webhook_missing_channel_settings(
     mock_transaction_event_report,
     mock_validate_stripe_webhook,
@@ -498,7 +760,7 @@ async def test_stripe_webhook_missing_channel_settings(
 
 @patch("nimara_stripe.api.stripe.endpoints.get_configs_from_domain_settings")
 @patch("nimara_stripe.api.stripe.endpoints.validate_stripe_webhook")
-@patch("nimara_stripe.api.stripe.endpoints.SaleorClient.transaction_event_report")
+@patch("nimara_stripe.services.saleor.client.SaleorClient.transaction_event_report")
 async def test_stripe_webhook_without_proper_metadata(
     mock_transaction_event_report,
     mock_validate_stripe_webhook,
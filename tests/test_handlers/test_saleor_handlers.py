@@ -21,6 +21,43 @@ async def test_manifest_handler():
     assert response_data["appUrl"] == f"https://{request_host}/saleor/app"
 
 
+async def test_manifest_handler_not_modified():
+    # Given
+    first = client.get("/saleor/manifest", headers={"host": "example.com"})
+
+    # When
+    response = client.get(
+        "/saleor/manifest", headers={"host": "example.com", "if-none-match": first.headers["etag"]}
+    )
+    other_host = client.get(
+        "/saleor/manifest", headers={"host": "other.com", "if-none-match": first.headers["etag"]}
+    )
+
+    # Then
+    assert first.headers["cache-control"] == "max-age=300"
+    assert response.status_code == 304
+    assert response.content == b""
+    assert other_host.status_code == 200
+    assert other_host.json()["appUrl"] == "https://other.com/saleor/app"
+
+
+async def test_manifest_handler_not_modified_for_etag_list():
+    # Given
+    etag = client.get("/saleor/manifest", headers={"host": "example.com"}).headers["etag"]
+
+    # When
+    response = client.get(
+        "/saleor/manifest", headers={"host": "example.com", "if-none-match": f'"other", W/{etag}'}
+    )
+    modified = client.get(
+        "/saleor/manifest", headers={"host": "example.com", "if-none-match": '"other", W/"old"'}
+    )
+
+    # Then
+    assert response.status_code == 304
+    assert modified.status_code == 200
+
+
 async def test_register_handler_success(mocker: MockerFixture):
     mock_install = mocker.patch(
         "nimara_stripe.api.saleor.endpoints.install_app",
@@ -0,0 +1,58 @@
+import pytest
+
+from nimara_stripe.api.stripe import schema
+
+pytestmark = pytest.mark.anyio
+
+
+def assert_subset(trimmed, generated):
+    if isinstance(trimmed, dict):
+        for key, value in trimmed.items():
+            assert_subset(value, generated[key])
+    else:
+        assert trimmed == generated
+
+
+@pytest.mark.parametrize(
+    ("fixture", "model"),
+    [
+        ("payment_gateway_initialize_session_event", schema.PaymentGatewayInitializeSessionEvent),
+        ("transaction_initialize_session_event", schema.TransactionInitializeSessionEvent),
+        ("transaction_process_session_event", schema.TransactionProcessSessionEvent),
+        ("transaction_charge_requested_event", schema.TransactionChargeRequestedEvent),
+        ("transaction_cancellation_requested_event", schema.TransactionCancelationRequestedEvent),
+        ("transaction_refund_requested_event", schema.TransactionRefundRequestedEvent),
+    ],
+)
+async def test_schema_parses_saleor_payment_events(request, fixture, model):
+    # Given
+    generated = request.getfixturevalue(fixture)
+
+    # When
+    event = model.model_validate_json(generated.model_dump_json(by_alias=True))
+
+    # Then
+    assert_subset(event.model_dump(), generated.model_dump())
+
+
+async def test_schema_parses_calculate_taxes_event(saleor_test_calculate_tax_event):
+    # Given
+    body = saleor_test_calculate_tax_event.model_dump_json(by_alias=True)
+
+    # When
+    event = schema.CalculateTaxesEvent.model_validate_json(body)
+
+    # Then
+    tax_base = event.tax_base
+    assert tax_base.currency == "PLN"
+    assert tax_base.channel.slug == "test_channel_slug"
+    assert tax_base.address is not None
+    assert tax_base.address.country.code == "PL"
+    assert tax_base.address.postal_code == "00-001"
+    assert tax_base.shipping_price.amount == 10.0
+    [line] = tax_base.lines
+    assert isinstance(line.source_line, schema.TaxBaseCheckoutLine)
+    assert line.source_line.checkout_product_variant.product.tax_class is None
+    assert line.quantity == 1
+    assert line.total_price.amount == 1000.0
+    assert line.product_sku == "testSku"
@@ -0,0 +1,137 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from nimara_stripe.services.saleor.reporter import get_transaction_event_reporter
+from nimara_stripe.services.stripe.webhook_queue import SQLiteWebhookQueue, StripeWebhookMessage
+from nimara_stripe.settings import settings
+from nimara_stripe.worker import WorkerRuntime, drain_queue, process_sqs_records
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def webhook_queue(tmp_path) -> SQLiteWebhookQueue:
+    return SQLiteWebhookQueue(str(tmp_path / "stripe_webhooks.sqlite3"))
+
+
+@pytest.fixture
+def webhook_message(stripe_webhook_payment_intent_created_body) -> StripeWebhookMessage:
+    return StripeWebhookMessage(
+        saleor_domain="test_saleor_domain",
+        channel_slug="test_channel_1",
+        event=stripe_webhook_payment_intent_created_body,
+    )
+
+
+@pytest.fixture
+def mock_get_by_saleor_domain(saleor_config_data):
+    with patch(
+        "nimara_stripe.worker.StripeSaleorConfigProvider.get_by_saleor_domain",
+        AsyncMock(return_value=saleor_config_data),
+    ) as mock:
+        yield mock
+
+
+@patch("nimara_stripe.services.saleor.client.SaleorClient.transaction_event_report")
+async def test_process_sqs_records_reports_failed_messages(
+    mock_transaction_event_report,
+    mock_get_by_saleor_domain,
+    webhook_message,
+):
+    # Given
+    unknown_channel = webhook_message.model_copy(deep=True, update={"channel_slug": "unknown"})
+    unknown_channel.event["data"]["object"]["id"] = "pi_other"
+    records = [
+        {"messageId": "1", "body": webhook_message.model_dump_json()},
+        {"messageId": "2", "body": unknown_channel.model_dump_json()},
+    ]
+
+    # When
+    result = await process_sqs_records(records)
+
+    # Then
+    assert result == {"batchItemFailures": [{"itemIdentifier": "2"}]}
+    mock_transaction_event_report.assert_awaited_once()
+    assert mock_transaction_event_report.call_args.kwargs["type"] == "CHARGE_ACTION_REQUIRED"
+
+
+@patch("nimara_stripe.services.saleor.client.SaleorClient.transaction_event_report")
+async def test_drain_queue_keeps_failed_messages(
+    mock_transaction_event_report,
+    mock_get_by_saleor_domain,
+    webhook_queue,
+    webhook_message,
+):
+    # Given
+    mock_transaction_event_report.side_effect = [None, RuntimeError("Saleor is down")]
+    await webhook_queue.send(webhook_message)
+    await webhook_queue.send(webhook_message)
+
+    # When
+    processed = await drain_queue(webhook_queue, batch_size=1)
+
+    # Then
+    assert processed == 1
+    with patch("nimara_stripe.services.stripe.webhook_queue.time.time", return_value=2e9):
+        assert len(await webhook_queue.receive(10)) == 1
+
+
+@patch("nimara_stripe.services.saleor.client.SaleorClient.transaction_event_report")
+async def test_process_sqs_records_drops_superseded_states(
+    mock_transaction_event_report,
+    mock_get_by_saleor_domain,
+    webhook_message,
+):
+    # Given
+    succeeded = webhook_message.model_copy(deep=True)
+    succeeded.event["type"] = "payment_intent.succeeded"
+    processing = webhook_message.model_copy(deep=True)
+    processing.event["type"] = "payment_intent.processing"
+    records = [
+        {"messageId": "1", "body": succeeded.model_dump_json()},
+        {"messageId": "2", "body": processing.model_dump_json()},
+    ]
+
+    # When
+    result = await process_sqs_records(records)
+
+    # Then
+    assert result == {"batchItemFailures": []}
+    mock_transaction_event_report.assert_awaited_once()
+    assert mock_transaction_event_report.call_args.kwargs["type"] == "CHARGE_SUCCESS"
+
+
+async def test_sqlite_webhook_queue_hides_received_messages(webhook_queue, webhook_message):
+    # Given
+    await webhook_queue.send(webhook_message)
+
+    # When
+    received = await webhook_queue.receive(10)
+    received_again = await webhook_queue.receive(10)
+
+    # Then
+    assert [StripeWebhookMessage.model_validate_json(m.body) for m in received] == [
+        webhook_message
+    ]
+    assert received_again == []
+
+
+def test_worker_runtime_batches_transaction_event_reports():
+    # Given
+    runtime = WorkerRuntime()
+
+    async def max_batch_size() -> int:
+        return get_transaction_event_reporter().max_batch_size
+
+    # When
+    try:
+        worker_batch_size = runtime.run(max_batch_size())
+    finally:
+        runtime.close()
+    http_batch_size = asyncio.run(max_batch_size())
+
+    # Then
+    assert worker_batch_size == settings.worker_report_batch_size
+    assert http_batch_size == settings.saleor_report_batch_size == 1
@@ -1,10 +1,12 @@
-from unittest.mock import AsyncMock
+import asyncio
+from unittest.mock import AsyncMock, patch
 
 import pytest
 from jwt.api_jwk import PyJWKSet
 from saleor_sdk.marina.jwks import AbstractJWKSClient
 
 from nimara_stripe.jwks import JWKSProvider
+from nimara_stripe.utils.metrics import metrics
 
 pytestmark = pytest.mark.anyio
 
@@ -16,7 +18,7 @@ async def test_jwks_provider_set(example_jwks):
     # When
     await provider.set("issuer", example_jwks)
     # Then
-    assert provider.jwks_cache == {"issuer": example_jwks}
+    assert provider.jwks_cache["issuer"].jwks.keys[0].key_id == "kid"
 
 
 async def test_jwks_provider_get_from_jwks_service(example_jwks):
@@ -24,8 +26,7 @@ async def test_jwks_provider_get_from_jwks_service(example_jwks):
     mock_client = AsyncMock(spec=AbstractJWKSClient)
     mock_client.fetch_jwks.return_value = example_jwks
     provider = JWKSProvider(mock_client)
-    JWKSProvider.jwks_cache = {}  # clear cache
-    assert provider.jwks_cache == {}
+    JWKSProvider.jwks_cache.clear()
 
     # When
     await provider.get("issuer")
@@ -34,6 +35,7 @@ async def test_jwks_provider_get_from_jwks_service(example_jwks):
     mock_client.fetch_jwks.assert_called_once()
 
 
+@patch("nimara_stripe.jwks.settings.jwks_min_refresh_interval", 0)
 async def test_jwks_provider_get_from_jwks_service_force_refresh(example_jwks):
     # Given
     mock_client = AsyncMock(spec=AbstractJWKSClient)
@@ -49,6 +51,42 @@ async def test_jwks_provider_get_from_jwks_service_force_refresh(example_jwks):
     mock_client.fetch_jwks.assert_called_once()
 
 
+@patch("nimara_stripe.jwks.settings.jwks_min_refresh_interval", 60)
+async def test_jwks_provider_force_refresh_is_rate_limited(example_jwks):
+    # Given
+    mock_client = AsyncMock(spec=AbstractJWKSClient)
+    mock_client.fetch_jwks.return_value = example_jwks
+    provider = JWKSProvider(mock_client)
+
+    await provider.set("issuer", example_jwks)
+
+    # When
+    result = await provider.get("issuer", force_refresh=True)
+
+    # Then
+    mock_client.fetch_jwks.assert_not_called()
+    assert result is provider.jwks_cache["issuer"].jwks
+
+
+async def test_jwks_provider_concurrent_gets_share_fetch(example_jwks):
+    # Given
+    async def fetch_jwks():
+        await asyncio.sleep(0.01)
+        return example_jwks
+
+    mock_client = AsyncMock(spec=AbstractJWKSClient)
+    mock_client.fetch_jwks.side_effect = fetch_jwks
+    provider = JWKSProvider(mock_client)
+    JWKSProvider.jwks_cache.clear()
+
+    # When
+    results = await asyncio.gather(*(provider.get("issuer") for _ in range(5)))
+
+    # Then
+    mock_client.fetch_jwks.assert_called_once()
+    assert all(result is results[0] for result in results)
+
+
 async def test_jwks_provider_get_from_cache(example_jwks):
     # Given
     mock_client = AsyncMock(spec=AbstractJWKSClient)
@@ -63,3 +101,20 @@ async def test_jwks_provider_get_from_cache(example_jwks):
     # Then
     mock_client.fetch_jwks.assert_not_called()
     assert isinstance(result, PyJWKSet)
+
+
+async def test_jwks_provider_records_cache_hits_and_fetch_latency(example_jwks):
+    # Given
+    mock_client = AsyncMock(spec=AbstractJWKSClient)
+    mock_client.fetch_jwks.return_value = example_jwks
+    provider = JWKSProvider(mock_client)
+    JWKSProvider.jwks_cache.clear()
+    metrics.reset()
+
+    # When
+    for _ in range(4):
+        await provider.get("issuer")
+
+    # Then
+    assert metrics.hit_ratio("jwks") == 0.75
+    assert metrics.latencies["jwks_fetch_latency"].count == 1
@@ -0,0 +1,108 @@
+import json
+
+import pytest
+
+from nimara_stripe.utils.metrics import EMFExporter, LatencyStats, Metrics, flush_metrics
+from nimara_stripe.utils.tracing import _xray_tracer, trace
+
+pytestmark = pytest.mark.anyio
+
+
+def test_latency_stats_percentile_is_bucket_upper_bound():
+    # Given
+    stats = LatencyStats()
+
+    # When
+    for seconds in [0.002] * 90 + [0.2] * 9 + [20.0]:
+        stats.observe(seconds)
+
+    # Then
+    assert stats.percentile(50) == 0.005
+    assert stats.percentile(99) == 0.25
+    assert stats.percentile(100) == 20.0
+
+
+def test_hit_ratio_counts_stale_entries_as_hits():
+    # Given
+    metrics = Metrics()
+
+    # When
+    metrics.increment("config_cache_hit", 2)
+    metrics.increment("config_cache_stale")
+    metrics.increment("config_cache_miss")
+
+    # Then
+    assert metrics.hit_ratio("config") == 0.75
+    assert metrics.hit_ratio("jwks") is None
+
+
+def test_emf_exporter_flushes_invocation_metrics(capsys, mocker):
+    # Given
+    metrics = Metrics(EMFExporter(namespace="NimaraStripe", service="test"))
+    mocker.patch("nimara_stripe.utils.metrics.metrics", metrics)
+
+    @flush_metrics
+    def handler():
+        metrics.increment("jwks_cache_hit", 3)
+        metrics.increment("jwks_cache_miss")
+        metrics.observe("stripe_latency", 0.25)
+        metrics.observe("stripe_latency", 0.5)
+
+    # When
+    handler()
+
+    # Then
+    emf = json.loads(capsys.readouterr().out)
+    assert emf["stripe_latency"] == [250.0, 500.0]
+    assert emf["jwks_cache_hit"] == [3.0]
+    assert emf["jwks_cache_hit_ratio"] == [75.0]
+    units = {
+        metric["Name"]: metric["Unit"] for metric in emf["_aws"]["CloudWatchMetrics"][0]["Metrics"]
+    }
+    assert units["stripe_latency"] == "Milliseconds"
+    assert units["jwks_cache_hit_ratio"] == "Percent"
+
+
+def test_flush_metrics_flushes_when_handler_fails(mocker):
+    # Given
+    flush = mocker.patch("nimara_stripe.utils.metrics.metrics.flush")
+
+    @flush_metrics
+    def handler():
+        raise RuntimeError("Stripe is down")
+
+    # When
+    with pytest.raises(RuntimeError):
+        handler()
+
+    # Then
+    flush.assert_called_once()
+
+
+async def test_trace_records_latency_of_failed_calls(mocker):
+    # Given
+    metrics = Metrics()
+    mocker.patch("nimara_stripe.utils.tracing.metrics", metrics)
+
+    # When
+    with pytest.raises(RuntimeError):
+        async with trace("stripe.refunds.create", "stripe_latency"):
+            raise RuntimeError("Stripe is down")
+
+    # Then
+    assert metrics.latencies["stripe_latency"].count == 1
+
+
+async def test_trace_of_background_task_records_latency_without_xray_subsegment(mocker):
+    # Given
+    metrics = Metrics()
+    mocker.patch("nimara_stripe.utils.tracing.metrics", metrics)
+    in_subsegment = mocker.patch.object(_xray_tracer.provider, "in_subsegment")
+
+    # When
+    async with trace("config_storage.get", "config_refresh_latency", background=True):
+        pass
+
+    # Then
+    in_subsegment.assert_not_called()
+    assert metrics.latencies["config_refresh_latency"].count == 1
@@ -0,0 +1,93 @@
+import asyncio
+import json
+
+import pytest
+
+from graphql_client.exceptions import GraphQLClientGraphQLMultiError
+from nimara_stripe.services.saleor.client import SaleorClient
+from nimara_stripe.services.saleor.reporter import TransactionEvent, TransactionEventReporter
+
+pytestmark = pytest.mark.anyio
+
+REPORT = {"alreadyProcessed": False, "errors": []}
+
+
+def transaction_event(transaction_id: str) -> TransactionEvent:
+    return TransactionEvent(
+        transaction_id=transaction_id,
+        amount="10.00",
+        available_actions=["REFUND"],
+        external_url="https://dashboard.stripe.com/payments/pi_1",
+        psp_reference="pi_1",
+        time="2024-01-01T00:00:00",
+        type="CHARGE_SUCCESS",
+    )
+
+
+async def test_reporter_sends_concurrent_events_in_one_request(httpx_mock):
+    # Given
+    httpx_mock.add_response(
+        url="http://example.com/graphql/",
+        json={
+            "data": {"report0": REPORT, "report1": None},
+            "errors": [{"message": "Transaction not found", "path": ["report1"]}],
+        },
+    )
+    client = SaleorClient(saleor_url="http://example.com", api_key="token")
+    reporter = TransactionEventReporter(max_batch_size=10, linger=0.01)
+
+    # When
+    results = await asyncio.gather(
+        reporter.report(client, transaction_event("transaction_1")),
+        reporter.report(client, transaction_event("transaction_2")),
+        return_exceptions=True,
+    )
+
+    # Then
+    (request,) = httpx_mock.get_requests()
+    body = json.loads(request.content)
+    assert body["operationName"] == "TransactionEventReportBatch"
+    assert body["variables"]["transactionId0"] == "transaction_1"
+    assert body["variables"]["transactionId1"] == "transaction_2"
+    assert results[0].already_processed is False
+    assert isinstance(results[1], GraphQLClientGraphQLMultiError)
+
+
+async def test_reporter_sends_full_batch_without_waiting(httpx_mock):
+    # Given
+    httpx_mock.add_response(
+        url="http://example.com/graphql/",
+        json={"data": {"report0": REPORT, "report1": REPORT}},
+    )
+    client = SaleorClient(saleor_url="http://example.com", api_key="token")
+    reporter = TransactionEventReporter(max_batch_size=2, linger=60)
+
+    # When
+    results = await asyncio.wait_for(
+        asyncio.gather(
+            reporter.report(client, transaction_event("transaction_1")),
+            reporter.report(client, transaction_event("transaction_2")),
+        ),
+        timeout=5,
+    )
+
+    # Then
+    assert len(httpx_mock.get_requests()) == 1
+    assert [result.errors for result in results] == [[], []]
+
+
+async def test_reporter_single_event_uses_transaction_event_report(httpx_mock):
+    # Given
+    httpx_mock.add_response(
+        url="http://example.com/graphql/", json={"data": {"transactionEventReport": REPORT}}
+    )
+    client = SaleorClient(saleor_url="http://example.com", api_key="token")
+    reporter = TransactionEventReporter(max_batch_size=10, linger=0)
+
+    # When
+    result = await reporter.report(client, transaction_event("transaction_1"))
+
+    # Then
+    (request,) = httpx_mock.get_requests()
+    assert json.loads(request.content)["operationName"] == "TransactionEventReport"
+    assert result.already_processed is False
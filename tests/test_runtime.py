@@ -0,0 +1,111 @@
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import FastAPI
+
+from nimara_stripe.api.runtime import EventLoopRuntime, LambdaRuntime
+
+
+@pytest.fixture
+def lifespan_calls() -> list[str]:
+    return []
+
+
+@pytest.fixture
+def runtime(lifespan_calls: list[str]):
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        lifespan_calls.append("startup")
+        yield
+        lifespan_calls.append("shutdown")
+
+    app = FastAPI(lifespan=lifespan)
+
+    @app.get("/my-resource")
+    async def loop_id() -> int:
+        return id(asyncio.get_running_loop())
+
+    runtime = LambdaRuntime(app)
+    yield runtime
+    runtime.close()
+
+
+def test_runtime_keeps_loop_between_invocations(
+    runtime: LambdaRuntime, lifespan_calls: list[str], api_gateway_v2_event_payload
+):
+    # When
+    first = runtime(api_gateway_v2_event_payload, MagicMock())
+    second = runtime(api_gateway_v2_event_payload, MagicMock())
+
+    # Then
+    assert first["statusCode"] == 200
+    assert json.loads(first["body"]) == json.loads(second["body"])
+    assert lifespan_calls == ["startup"]
+
+
+def test_runtime_close_runs_lifespan_shutdown(
+    runtime: LambdaRuntime, lifespan_calls: list[str], api_gateway_v2_event_payload
+):
+    # Given
+    runtime(api_gateway_v2_event_payload, MagicMock())
+
+    # When
+    runtime.close()
+
+    # Then
+    assert lifespan_calls == ["startup", "shutdown"]
+
+
+@patch("nimara_stripe.api.runtime.settings.lambda_persistent_loop", False)
+def test_runtime_per_invocation_loop(
+    runtime: LambdaRuntime, lifespan_calls: list[str], api_gateway_v2_event_payload
+):
+    # When
+    runtime(api_gateway_v2_event_payload, MagicMock())
+    runtime(api_gateway_v2_event_payload, MagicMock())
+
+    # Then
+    assert lifespan_calls == ["startup", "shutdown", "startup", "shutdown"]
+
+
+@patch("nimara_stripe.api.runtime.run_shutdown_hooks")
+def test_event_loop_runtime_runs_coroutines_on_persistent_loop(mock_run_shutdown_hooks):
+    # Given
+    runtime = EventLoopRuntime()
+
+    async def loop_id() -> int:
+        return id(asyncio.get_running_loop())
+
+    # When
+    first = runtime.run(loop_id())
+    second = runtime.run(loop_id())
+    runtime.close()
+
+    # Then
+    assert first == second
+    mock_run_shutdown_hooks.assert_awaited_once()
+
+
+@patch("nimara_stripe.api.runtime.run_shutdown_hooks")
+def test_event_loop_runtime_waits_for_tasks_started_by_invocation(mock_run_shutdown_hooks):
+    # Given
+    runtime = EventLoopRuntime()
+    done: list[str] = []
+
+    async def refresh() -> None:
+        await asyncio.sleep(0.01)
+        done.append("refresh")
+
+    async def invocation() -> None:
+        asyncio.create_task(refresh())
+
+    # When
+    runtime.run(invocation())
+
+    # Then
+    assert done == ["refresh"]
+    runtime.close()
@@ -0,0 +1,645 @@
+import json
+import uuid
+from unittest.mock import MagicMock, patch
+
+import pytest
+from botocore.exceptions import ClientError
+from saleor_sdk.marina.exceptions import InvalidSaleorDomain
+
+from nimara_stripe.services.saleor.config import (
+    StripeConfig,
+    StripeSaleorConfigData,
+    StripeSaleorConfigProvider,
+)
+from nimara_stripe.services.saleor.storage import (
+    ConfigWriteConflictError,
+    DynamoDBConfigStorage,
+    SecretsManagerConfigStorage,
+    ShardedSecretsManagerConfigStorage,
+    SQLiteConfigStorage,
+    SSMConfigStorage,
+    copy_configs,
+    get_config_storage,
+)
+
+pytestmark = pytest.mark.anyio
+
+CONFIG = {"auth_token": "token", "saleor_domain": "example.saleor.com", "saleor_app_id": "app"}
+
+
+def client_error(code: str, operation: str) -> ClientError:
+    return ClientError({"Error": {"Code": code, "Message": code}}, operation)
+
+
+def set_token(token: str):
+    def update(config):
+        return {**(config or CONFIG), "auth_token": token}
+
+    return update
+
+
+class FakeSecretsClient:
+    """Secrets Manager stand-in keeping versions and the AWSCURRENT stage."""
+
+    def __init__(self) -> None:
+        self.versions: dict[str, dict[str, str]] = {}
+        self.current: dict[str, str] = {}
+
+    # Method signatures mirror boto3's keyword arguments.
+    def get_secret_value(self, SecretId: str) -> dict[str, str]:  # noqa: N803
+        if SecretId not in self.current:
+            raise client_error("ResourceNotFoundException", "GetSecretValue")
+        version_id = self.current[SecretId]
+        return {"SecretString": self.versions[SecretId][version_id], "VersionId": version_id}
+
+    def create_secret(self, Name: str, SecretString: str) -> dict[str, str]:  # noqa: N803
+        if Name in self.current:
+            raise client_error("ResourceExistsException", "CreateSecret")
+        version_id = str(uuid.uuid4())
+        self.versions[Name] = {version_id: SecretString}
+        self.current[Name] = version_id
+        return {"VersionId": version_id}
+
+    def put_secret_value(
+        self,
+        SecretId: str,  # noqa: N803
+        SecretString: str,  # noqa: N803
+        VersionStages: list[str],  # noqa: N803
+    ) -> dict[str, str]:
+        version_id = str(uuid.uuid4())
+        self.versions[SecretId][version_id] = SecretString
+        return {"VersionId": version_id}
+
+    def update_secret_version_stage(
+        self,
+        SecretId: str,  # noqa: N803
+        VersionStage: str,  # noqa: N803
+        MoveToVersionId: str,  # noqa: N803
+        RemoveFromVersionId: str,  # noqa: N803
+    ) -> dict[str, str]:
+        if self.current[SecretId] != RemoveFromVersionId:
+            raise client_error("InvalidParameterException", "UpdateSecretVersionStage")
+        self.current[SecretId] = MoveToVersionId
+        return {}
+
+    def value(self, secret_id: str) -> str:
+        return self.get_secret_value(SecretId=secret_id)["SecretString"]
+
+
+class FakeDynamoDBClient:
+    """DynamoDB stand-in supporting the conditional puts used by the storage."""
+
+    def __init__(self) -> None:
+        self.items: dict[str, dict] = {}
+
+    def get_item(self, TableName, Key, ConsistentRead):  # noqa: N803
+        item = self.items.get(Key["saleor_domain"]["S"])
+        return {"Item": item} if item else {}
+
+    def put_item(self, TableName, Item, ConditionExpression, ExpressionAttributeValues=None):  # noqa: N803
+        current = self.items.get(Item["saleor_domain"]["S"])
+        if ConditionExpression == "attribute_not_exists(saleor_domain)":
+            if current is not None:
+                raise client_error("ConditionalCheckFailedException", "PutItem")
+        elif current is None or current["version"] != ExpressionAttributeValues[":version"]:
+            raise client_error("ConditionalCheckFailedException", "PutItem")
+        self.items[Item["saleor_domain"]["S"]] = Item
+
+    def get_paginator(self, operation):
+        paginator = MagicMock()
+        paginator.paginate.return_value = [{"Items": list(self.items.values())}]
+        return paginator
+
+
+@pytest.fixture
+def fake_secrets_client():
+    return FakeSecretsClient()
+
+
+async def test_secrets_manager_storage_reads_single_secret():
+    # Given
+    client = MagicMock()
+    client.get_secret_value.return_value = {
+        "SecretString": json.dumps({"example.saleor.com": CONFIG})
+    }
+    storage = SecretsManagerConfigStorage(client, "saleor_config")
+
+    # When
+    result = await storage.get("example.saleor.com")
+
+    # Then
+    assert result == CONFIG
+    client.get_secret_value.assert_called_once_with(SecretId="saleor_config")
+
+
+async def test_secrets_manager_storage_read_error():
+    # Given
+    client = MagicMock()
+    client.get_secret_value.side_effect = client_error(
+        "ResourceNotFoundException", "GetSecretValue"
+    )
+    storage = SecretsManagerConfigStorage(client, "saleor_config")
+
+    # When
+    with pytest.raises(InvalidSaleorDomain):
+        await storage.get("example.saleor.com")
+
+
+async def test_secrets_manager_storage_update_rewrites_secret():
+    # Given
+    client = MagicMock()
+    client.get_secret_value.return_value = {"SecretString": json.dumps({"other.com": {}})}
+    storage = SecretsManagerConfigStorage(client, "saleor_config")
+
+    # When
+    result = await storage.update("example.saleor.com", set_token("new"))
+
+    # Then
+    assert result == {**CONFIG, "auth_token": "new"}
+    client.put_secret_value.assert_called_once_with(
+        SecretId="saleor_config",
+        SecretString=json.dumps({"other.com": {}, "example.saleor.com": result}),
+    )
+
+
+async def test_sharded_storage_writes_shard_and_index(fake_secrets_client: FakeSecretsClient):
+    # Given
+    storage = ShardedSecretsManagerConfigStorage(fake_secrets_client, "saleor_config")
+
+    # When
+    await storage.update("example.saleor.com", set_token("token"))
+    await storage.update("localhost:8000", set_token("token"))
+
+    # Then
+    assert json.loads(fake_secrets_client.value("saleor_config/tenants/example.saleor.com")) == (
+        CONFIG
+    )
+    assert "saleor_config/tenants/localhost_3a8000" in fake_secrets_client.current
+    assert json.loads(fake_secrets_client.value("saleor_config/index")) == [
+        "example.saleor.com",
+        "localhost:8000",
+    ]
+    assert set(await storage.get_all()) == {"example.saleor.com", "localhost:8000"}
+
+
+async def test_sharded_storage_keeps_similar_domains_apart(
+    fake_secrets_client: FakeSecretsClient,
+):
+    # Given
+    storage = ShardedSecretsManagerConfigStorage(fake_secrets_client, "saleor_config")
+
+    # When
+    await storage.update("shop.example.com:8000", set_token("first"))
+    await storage.update("shop.example.com_8000", set_token("second"))
+
+    # Then
+    assert storage.get_shard_secret_id("shop.example.com:8000") != (
+        storage.get_shard_secret_id("shop.example.com_8000")
+    )
+    assert (await storage.get("shop.example.com:8000"))["auth_token"] == "first"
+    assert (await storage.get("shop.example.com_8000"))["auth_token"] == "second"
+
+
+async def test_sharded_storage_reads_single_shard(fake_secrets_client: FakeSecretsClient):
+    # Given
+    storage = ShardedSecretsManagerConfigStorage(fake_secrets_client, "saleor_config")
+    await storage.update("example.saleor.com", set_token("token"))
+    await storage.update("other.saleor.com", set_token("token"))
+
+    # When
+    with patch.object(
+        fake_secrets_client, "get_secret_value", wraps=fake_secrets_client.get_secret_value
+    ) as mock_get_secret_value:
+        result = await storage.get("example.saleor.com")
+
+    # Then
+    assert result == CONFIG
+    mock_get_secret_value.assert_called_once_with(
+        SecretId="saleor_config/tenants/example.saleor.com"
+    )
+    assert await storage.get("missing.saleor.com") is None
+
+
+async def test_sharded_storage_retries_on_concurrent_write(
+    fake_secrets_client: FakeSecretsClient,
+):
+    # Given
+    storage = ShardedSecretsManagerConfigStorage(fake_secrets_client, "saleor_config")
+    await storage.update("example.saleor.com", set_token("first"))
+    put_secret_value = fake_secrets_client.put_secret_value
+
+    def put_after_concurrent_write(**kwargs):
+        # Another writer swaps in a new version between our read and our write.
+        fake_secrets_client.put_secret_value = put_secret_value
+        concurrent = put_secret_value(**{**kwargs, "SecretString": json.dumps({"x": 1})})
+        fake_secrets_client.update_secret_version_stage(
+            SecretId=kwargs["SecretId"],
+            VersionStage="AWSCURRENT",
+            MoveToVersionId=concurrent["VersionId"],
+            RemoveFromVersionId=fake_secrets_client.current[kwargs["SecretId"]],
+        )
+        return put_secret_value(**kwargs)
+
+    fake_secrets_client.put_secret_value = put_after_concurrent_write
+    seen = []
+
+    def update(config):
+        seen.append(config)
+        return {**config, "auth_token": "second"}
+
+    # When
+    result = await storage.update("example.saleor.com", update)
+
+    # Then
+    assert seen == [{**CONFIG, "auth_token": "first"}, {"x": 1}]
+    assert result == {"x": 1, "auth_token": "second"}
+    assert json.loads(fake_secrets_client.value("saleor_config/tenants/example.saleor.com")) == (
+        result
+    )
+
+
+@patch("nimara_stripe.services.saleor.storage.settings.config_storage_write_attempts", 2)
+async def test_sharded_storage_gives_up_after_conflicts(fake_secrets_client: FakeSecretsClient):
+    # Given
+    storage = ShardedSecretsManagerConfigStorage(fake_secrets_client, "saleor_config")
+    await storage.update("example.saleor.com", set_token("first"))
+
+    def always_conflict(**kwargs):
+        # Another writer swaps in a new version every time.
+        concurrent = fake_secrets_client.put_secret_value(
+            SecretId=kwargs["SecretId"], SecretString="{}", VersionStages=[]
+        )
+        fake_secrets_client.current[kwargs["SecretId"]] = concurrent["VersionId"]
+        raise client_error("InvalidParameterException", "UpdateSecretVersionStage")
+
+    fake_secrets_client.update_secret_version_stage = always_conflict
+
+    # When
+    with pytest.raises(ConfigWriteConflictError):
+        await storage.update("example.saleor.com", set_token("second"))
+
+
+async def test_sharded_storage_raises_errors_other_than_conflicts(
+    fake_secrets_client: FakeSecretsClient,
+):
+    # Given
+    storage = ShardedSecretsManagerConfigStorage(fake_secrets_client, "saleor_config")
+    await storage.update("example.saleor.com", set_token("first"))
+
+    def invalid_request(**kwargs):
+        raise client_error("InvalidRequestException", "UpdateSecretVersionStage")
+
+    fake_secrets_client.update_secret_version_stage = invalid_request
+
+    # When
+    with pytest.raises(ClientError):
+        await storage.update("example.saleor.com", set_token("second"))
+
+    # Then
+    assert json.loads(fake_secrets_client.value("saleor_config/tenants/example.saleor.com")) == {
+        **CONFIG,
+        "auth_token": "first",
+    }
+
+
+async def test_ssm_storage():
+    # Given
+    client = MagicMock()
+    client.get_parameter.side_effect = client_error("ParameterNotFound", "GetParameter")
+    storage = SSMConfigStorage(client, "saleor_config")
+
+    # When
+    missing = await storage.get("example.saleor.com")
+    result = await storage.update("example.saleor.com", set_token("token"))
+
+    # Then
+    assert missing is None
+    assert result == CONFIG
+    client.put_parameter.assert_called_once_with(
+        Name="/saleor_config/example.saleor.com",
+        Value=json.dumps(CONFIG),
+        Type="SecureString",
+        Overwrite=True,
+    )
+
+
+async def test_ssm_storage_get_all():
+    # Given
+    client = MagicMock()
+    client.get_paginator.return_value.paginate.return_value = [
+        {"Parameters": [{"Value": json.dumps(CONFIG)}]}
+    ]
+    storage = SSMConfigStorage(client, "/saleor_config/")
+
+    # When
+    result = await storage.get_all()
+
+    # Then
+    assert result == {"example.saleor.com": CONFIG}
+    client.get_paginator.return_value.paginate.assert_called_once_with(
+        Path="/saleor_config", WithDecryption=True
+    )
+
+
+async def test_dynamodb_storage():
+    # Given
+    storage = DynamoDBConfigStorage(FakeDynamoDBClient(), "saleor_config")
+
+    # When
+    await storage.update("example.saleor.com", set_token("first"))
+    result = await storage.update("example.saleor.com", set_token("second"))
+
+    # Then
+    assert result == {**CONFIG, "auth_token": "second"}
+    assert await storage.get("example.saleor.com") == result
+    assert await storage.get_all() == {"example.saleor.com": result}
+    assert storage.client.items["example.saleor.com"]["version"] == {"N": "2"}
+
+
+@patch("nimara_stripe.services.saleor.storage.settings.config_storage_write_attempts", 2)
+async def test_dynamodb_storage_gives_up_after_conflicts():
+    # Given
+    client = FakeDynamoDBClient()
+    storage = DynamoDBConfigStorage(client, "saleor_config")
+    await storage.update("example.saleor.com", set_token("first"))
+    client.put_item = MagicMock(
+        side_effect=client_error("ConditionalCheckFailedException", "PutItem")
+    )
+
+    # When
+    with pytest.raises(ConfigWriteConflictError):
+        await storage.update("example.saleor.com", set_token("second"))
+
+    # Then
+    assert client.put_item.call_count == 2
+
+
+async def test_sqlite_storage(config_storage: SQLiteConfigStorage):
+    # When
+    missing = await config_storage.get("example.saleor.com")
+    await config_storage.update("example.saleor.com", set_token("first"))
+    result = await config_storage.update("example.saleor.com", set_token("second"))
+
+    # Then
+    assert missing is None
+    assert await config_storage.get("example.saleor.com") == result
+    assert await config_storage.get_all() == {"example.saleor.com": result}
+
+
+async def test_sqlite_storage_failed_update_is_rolled_back(config_storage: SQLiteConfigStorage):
+    # Given
+    await config_storage.update("example.saleor.com", set_token("first"))
+
+    def failing_update(config):
+        raise InvalidSaleorDomain()
+
+    # When
+    with pytest.raises(InvalidSaleorDomain):
+        await config_storage.update("example.saleor.com", failing_update)
+
+    # Then
+    assert await config_storage.get("example.saleor.com") == CONFIG | {"auth_token": "first"}
+
+
+async def test_copy_configs(
+    fake_secrets_client: FakeSecretsClient, config_storage: SQLiteConfigStorage
+):
+    # Given
+    await config_storage.update("example.saleor.com", set_token("token"))
+    target = ShardedSecretsManagerConfigStorage(fake_secrets_client, "saleor_config")
+
+    # When
+    await copy_configs(config_storage, target)
+
+    # Then
+    assert await target.get_all() == {"example.saleor.com": CONFIG}
+
+
+@pytest.mark.parametrize(
+    ("config_storage_setting", "sharded", "storage_class"),
+    [
+        ("secrets_manager", False, SecretsManagerConfigStorage),
+        ("secrets_manager", True, ShardedSecretsManagerConfigStorage),
+        ("ssm", False, SSMConfigStorage),
+        ("sqlite", False, SQLiteConfigStorage),
+    ],
+)
+def test_get_config_storage(config_storage_setting, sharded, storage_class, tmp_path):
+    # Given
+    get_config_storage.cache_clear()
+
+    # When
+    with (
+        patch(
+            "nimara_stripe.services.saleor.storage.settings.config_storage", config_storage_setting
+        ),
+        patch("nimara_stripe.services.saleor.storage.settings.secret_app_config_sharded", sharded),
+        patch(
+            "nimara_stripe.services.saleor.storage.settings.config_sqlite_path",
+            str(tmp_path / "saleor_config.sqlite3"),
+        ),
+    ):
+        storage = get_config_storage()
+    get_config_storage.cache_clear()
+
+    # Then
+    assert isinstance(storage, storage_class)
+
+
+# Sharded secrets through the config provider, as set up by SECRET_APP_CONFIG_SHARDED.
+
+
+@pytest.fixture
+def sharded_storage(fake_secrets_client: FakeSecretsClient):
+    return ShardedSecretsManagerConfigStorage(fake_secrets_client, "saleor_config")
+
+
+@pytest.fixture
+def sharded_config_provider(sharded_storage: ShardedSecretsManagerConfigStorage):
+    StripeSaleorConfigProvider._cache.clear()
+    StripeSaleorConfigProvider._missing.clear()
+    return StripeSaleorConfigProvider(sharded_storage)
+
+
+@pytest.fixture
+def stripe_config():
+    return StripeConfig(
+        stripe_pub_key="pk_test",
+        stripe_secret_key="sk_test",
+        stripe_webhook_secret_key="whsec_test",
+    )
+
+
+async def test_create_or_update_writes_shard_and_index(
+    fake_secrets_client: FakeSecretsClient,
+    sharded_storage: ShardedSecretsManagerConfigStorage,
+    saleor_config_data: StripeSaleorConfigData,
+    sharded_config_provider: StripeSaleorConfigProvider,
+):
+    # When
+    result = await sharded_config_provider.create_or_update(
+        saleor_config_data.auth_token,
+        saleor_config_data.saleor_domain,
+        saleor_config_data.saleor_app_id,
+    )
+
+    # Then
+    assert result == saleor_config_data
+    shard = json.loads(
+        fake_secrets_client.value(sharded_storage.get_shard_secret_id(result.saleor_domain))
+    )
+    assert shard["auth_token"] == saleor_config_data.auth_token
+    assert json.loads(fake_secrets_client.value(sharded_storage.get_index_secret_id())) == [
+        saleor_config_data.saleor_domain
+    ]
+
+
+async def test_get_by_saleor_domain_reads_single_shard(
+    fake_secrets_client: FakeSecretsClient,
+    sharded_storage: ShardedSecretsManagerConfigStorage,
+    saleor_config_data: StripeSaleorConfigData,
+    sharded_config_provider: StripeSaleorConfigProvider,
+):
+    # Given
+    await sharded_config_provider.create_or_update("token", "other.saleor.com", "other_app")
+    await sharded_config_provider.create_or_update(
+        saleor_config_data.auth_token,
+        saleor_config_data.saleor_domain,
+        saleor_config_data.saleor_app_id,
+    )
+    StripeSaleorConfigProvider._cache.clear()
+
+    # When
+    with patch.object(
+        fake_secrets_client,
+        "get_secret_value",
+        wraps=fake_secrets_client.get_secret_value,
+    ) as mock_get_secret_value:
+        result = await sharded_config_provider.get_by_saleor_domain(
+            saleor_config_data.saleor_domain
+        )
+
+    # Then
+    assert result == saleor_config_data
+    mock_get_secret_value.assert_called_once_with(
+        SecretId=sharded_storage.get_shard_secret_id(saleor_config_data.saleor_domain)
+    )
+    assert set(await sharded_config_provider.get_all()) == {
+        "other.saleor.com",
+        saleor_config_data.saleor_domain,
+    }
+
+
+async def test_get_by_saleor_domain_missing_shard(
+    sharded_config_provider: StripeSaleorConfigProvider,
+):
+    with pytest.raises(InvalidSaleorDomain):
+        await sharded_config_provider.get_by_saleor_domain("missing.saleor.com")
+
+
+async def test_update_stripe_config_retries_on_concurrent_write(
+    fake_secrets_client: FakeSecretsClient,
+    sharded_storage: ShardedSecretsManagerConfigStorage,
+    saleor_config_data: StripeSaleorConfigData,
+    sharded_config_provider: StripeSaleorConfigProvider,
+    stripe_config: StripeConfig,
+):
+    # Given
+    domain = saleor_config_data.saleor_domain
+    await sharded_config_provider.create_or_update("token", domain, "app")
+    put_secret_value = fake_secrets_client.put_secret_value
+
+    def put_after_concurrent_write(**kwargs):
+        # Another writer swaps in a new version between our read and our write.
+        fake_secrets_client.put_secret_value = put_secret_value
+        concurrent = put_secret_value(**kwargs)
+        fake_secrets_client.update_secret_version_stage(
+            SecretId=kwargs["SecretId"],
+            VersionStage="AWSCURRENT",
+            MoveToVersionId=concurrent["VersionId"],
+            RemoveFromVersionId=fake_secrets_client.current[kwargs["SecretId"]],
+        )
+        return put_secret_value(**kwargs)
+
+    fake_secrets_client.put_secret_value = put_after_concurrent_write
+
+    # When
+    result = await sharded_config_provider.update_stripe_config_data_by_channel_slug(
+        domain, "channel", stripe_config
+    )
+
+    # Then
+    assert result.stripe_configurations_for_channels == {"channel": stripe_config}
+    shard = json.loads(fake_secrets_client.value(sharded_storage.get_shard_secret_id(domain)))
+    assert shard["stripe_configurations_for_channels"]["channel"]["stripe_pub_key"] == "pk_test"
+
+
+@patch("nimara_stripe.services.saleor.storage.settings.config_storage_write_attempts", 2)
+async def test_update_stripe_config_gives_up_after_conflicts(
+    fake_secrets_client: FakeSecretsClient,
+    saleor_config_data: StripeSaleorConfigData,
+    sharded_config_provider: StripeSaleorConfigProvider,
+    stripe_config: StripeConfig,
+):
+    # Given
+    domain = saleor_config_data.saleor_domain
+    await sharded_config_provider.create_or_update("token", domain, "app")
+
+    def always_conflict(**kwargs):
+        # Another writer swaps in a new version every time.
+        concurrent = fake_secrets_client.put_secret_value(
+            SecretId=kwargs["SecretId"],
+            SecretString=fake_secrets_client.value(kwargs["SecretId"]),
+            VersionStages=[],
+        )
+        fake_secrets_client.current[kwargs["SecretId"]] = concurrent["VersionId"]
+        raise client_error("InvalidParameterException", "UpdateSecretVersionStage")
+
+    fake_secrets_client.update_secret_version_stage = always_conflict
+
+    # When
+    with pytest.raises(ConfigWriteConflictError):
+        await sharded_config_provider.update_stripe_config_data_by_channel_slug(
+            domain, "channel", stripe_config
+        )
+
+
+async def test_update_stripe_config_unknown_domain(
+    sharded_config_provider: StripeSaleorConfigProvider,
+    stripe_config: StripeConfig,
+):
+    with pytest.raises(InvalidSaleorDomain):
+        await sharded_config_provider.update_stripe_config_data_by_channel_slug(
+            "missing.saleor.com", "channel", stripe_config
+        )
+
+
+async def test_migrate_to_shards(
+    fake_secrets_client: FakeSecretsClient,
+    saleor_config_data: StripeSaleorConfigData,
+    sharded_storage: ShardedSecretsManagerConfigStorage,
+    sharded_config_provider: StripeSaleorConfigProvider,
+):
+    # Given
+    fake_secrets_client.create_secret(
+        Name="saleor_config",
+        SecretString=json.dumps(
+            {
+                saleor_config_data.saleor_domain: {
+                    "auth_token": saleor_config_data.auth_token,
+                    "saleor_domain": saleor_config_data.saleor_domain,
+                    "saleor_app_id": saleor_config_data.saleor_app_id,
+                }
+            }
+        ),
+    )
+
+    # When
+    await copy_configs(
+        SecretsManagerConfigStorage(fake_secrets_client, "saleor_config"), sharded_storage
+    )
+    StripeSaleorConfigProvider._cache.clear()
+    result = await sharded_config_provider.get_all()
+
+    # Then
+    assert result == {saleor_config_data.saleor_domain: saleor_config_data}
@@ -1,7 +1,6 @@
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import MagicMock
 
 import pytest
-from fastapi import Request
 from stripe import StripeError
 
 from nimara_stripe.services.saleor.config import StripeConfig
@@ -26,8 +25,7 @@ async def test_get_stripe_signature():
 
 async def test_validate_stripe_webhook_valid_signature():
     # Given
-    mock_request = AsyncMock(spec=Request)
-    mock_request.body.return_value = b'{"test": "payload"}'
+    payload = b'{"test": "payload"}'
 
     stripe_signature = "valid_signature"
     stripe_config = StripeConfig(
@@ -42,24 +40,24 @@ async def test_validate_stripe_webhook_valid_signature():
 
     # When
     await validate_stripe_webhook(
-        request=mock_request,
+        payload=payload,
         stripe_signature=stripe_signature,
         stripe_config=stripe_config,
         stripe=mock_stripe,
     )
 
     # Then
-    mock_webhook.construct_event.assert_called_once_with(
-        payload=b'{"test": "payload"}',
-        sig_header=stripe_signature,
+    mock_stripe.WebhookSignature.verify_header.assert_called_once_with(
+        payload='{"test": "payload"}',
+        header=stripe_signature,
         secret=stripe_config.stripe_webhook_secret_key,
+        tolerance=mock_webhook.DEFAULT_TOLERANCE,
     )
 
 
 async def test_validate_stripe_webhook_invalid_signature():
     # Given
-    mock_request = AsyncMock(spec=Request)
-    mock_request.body.return_value = b'{"test": "payload"}'
+    payload = b'{"test": "payload"}'
 
     stripe_signature = "invalid_signature"
     stripe_config = StripeConfig(
@@ -73,20 +71,23 @@ async def test_validate_stripe_webhook_invalid_signature():
     mock_stripe.Webhook = mock_webhook
 
     # Setup the mock to raise an exception
-    mock_webhook.construct_event.side_effect = StripeError("Invalid signature", "sig_header")
+    mock_stripe.WebhookSignature.verify_header.side_effect = StripeError(
+        "Invalid signature", "sig_header"
+    )
 
     # When, Then
     with pytest.raises(StripeError, match="Invalid signature"):
         await validate_stripe_webhook(
-            request=mock_request,
+            payload=payload,
             stripe_signature=stripe_signature,
             stripe_config=stripe_config,
             stripe=mock_stripe,
         )
 
     # Verify the mock was called with the expected arguments
-    mock_webhook.construct_event.assert_called_once_with(
-        payload=b'{"test": "payload"}',
-        sig_header=stripe_signature,
+    mock_stripe.WebhookSignature.verify_header.assert_called_once_with(
+        payload='{"test": "payload"}',
+        header=stripe_signature,
         secret=stripe_config.stripe_webhook_secret_key,
+        tolerance=mock_webhook.DEFAULT_TOLERANCE,
     )
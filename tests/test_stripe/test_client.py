@@ -0,0 +1,109 @@
+import asyncio
+
+import pytest
+import stripe
+
+from nimara_stripe.services.saleor.config import StripeConfig
+from nimara_stripe.services.stripe.client import (
+    StripeClientRegistry,
+    get_stripe_client,
+    get_stripe_http_client,
+    invalidate_stripe_clients,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def stripe_config():
+    return StripeConfig(
+        stripe_pub_key="pk_test",
+        stripe_secret_key="sk_test",
+        stripe_webhook_secret_key="whsec_test",
+    )
+
+
+async def test_get_stripe_http_client_is_reused_within_loop():
+    # When
+    first = get_stripe_http_client()
+    second = get_stripe_http_client()
+
+    # Then
+    assert isinstance(first, stripe.HTTPXClient)
+    assert first is second
+
+
+def test_get_stripe_http_client_is_not_shared_between_loops():
+    async def get_http_client() -> stripe.HTTPXClient:
+        return get_stripe_http_client()
+
+    # When
+    first = asyncio.run(get_http_client())
+    second = asyncio.run(get_http_client())
+
+    # Then
+    assert first is not second
+
+
+async def test_get_stripe_client_uses_pooled_http_client(stripe_config):
+    # When
+    stripe_client = get_stripe_client("example.saleor.com", "channel", stripe_config)
+
+    # Then
+    assert stripe_client._requestor._client is get_stripe_http_client()
+    assert stripe_client._requestor.api_key == "sk_test"
+
+
+async def test_get_stripe_client_uses_configured_api_base(stripe_config, mocker):
+    # Given
+    mocker.patch(
+        "nimara_stripe.services.stripe.client.settings.stripe_api_base", "http://localhost:12111"
+    )
+    registry = StripeClientRegistry(maxsize=10)
+
+    # When
+    stripe_client = registry.get("example.saleor.com", "channel", stripe_config)
+
+    # Then
+    assert stripe_client._requestor.base_addresses["api"] == "http://localhost:12111"
+
+
+async def test_registry_reuses_client_per_channel(stripe_config):
+    # Given
+    registry = StripeClientRegistry(maxsize=10)
+
+    # When
+    first = registry.get("example.saleor.com", "channel-1", stripe_config)
+    second = registry.get("example.saleor.com", "channel-1", stripe_config)
+    other_channel = registry.get("example.saleor.com", "channel-2", stripe_config)
+
+    # Then
+    assert first is second
+    assert first is not other_channel
+
+
+async def test_registry_rebuilds_client_when_secret_key_changes(stripe_config):
+    # Given
+    registry = StripeClientRegistry(maxsize=10)
+    first = registry.get("example.saleor.com", "channel", stripe_config)
+    stripe_config.stripe_secret_key = "sk_test_rotated"
+
+    # When
+    second = registry.get("example.saleor.com", "channel", stripe_config)
+
+    # Then
+    assert first is not second
+    assert second._requestor.api_key == "sk_test_rotated"
+
+
+async def test_invalidate_stripe_clients(stripe_config):
+    # Given
+    first = get_stripe_client("example.saleor.com", "channel-1", stripe_config)
+    other_channel = get_stripe_client("example.saleor.com", "channel-2", stripe_config)
+
+    # When
+    invalidate_stripe_clients("example.saleor.com", "channel-1")
+
+    # Then
+    assert get_stripe_client("example.saleor.com", "channel-1", stripe_config) is not first
+    assert get_stripe_client("example.saleor.com", "channel-2", stripe_config) is other_channel
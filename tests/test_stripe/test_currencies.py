@@ -1,14 +1,23 @@
+import random
 from decimal import Decimal
 
 import pytest
 
-from graphql_client import Money
+from graphql_client.fragments import Money
 from nimara_stripe.services.stripe.currencies import (
+    CURRENCIES,
+    SaleorTaxedAmount,
+    get_currency,
     get_decimals_for_stripe,
     get_saleor_amount_from_stripe_amount,
+    get_saleor_amounts_from_stripe_amounts,
+    get_saleor_taxed_amounts,
     get_stripe_amount_from_saleor_money,
+    get_stripe_capture_amount_from_saleor_money,
+    iso_4217_codes,
     stripe_currencies,
 )
+from nimara_stripe.services.stripe.exceptions import CannotCalculateTaxForZeroNetValueError
 
 pytestmark = pytest.mark.anyio
 
@@ -139,6 +148,43 @@ async def test_get_saleor_amount_from_stripe_amount(currency, amount, expected_o
     assert saleor_amount == expected_output
 
 
+async def test_get_saleor_amounts_from_stripe_amounts():
+    # Given
+    amounts = [0, 1, 94440, 123456789]
+
+    # When
+    saleor_amounts = get_saleor_amounts_from_stripe_amounts(amounts, currency="usd")
+
+    # Then
+    assert saleor_amounts == [
+        get_saleor_amount_from_stripe_amount(amount=amount, currency="USD") for amount in amounts
+    ]
+
+
+@pytest.mark.parametrize(
+    "currency, amount, amount_tax, expected_output",
+    [
+        ("PLN", 100000, 23000, SaleorTaxedAmount("1000.00", "1230.00", "23.00")),
+        ("USD", 1000, 0, SaleorTaxedAmount("10.00", "10.00", "0")),
+        ("USD", 3, 1, SaleorTaxedAmount("0.03", "0.04", "33.33333333333333333333333333")),
+        ("BHD", 10000, 500, SaleorTaxedAmount("10.000", "10.500", "5.00")),
+        ("JPY", 1000, 100, SaleorTaxedAmount("1000", "1100", "10.0")),
+    ],
+)
+async def test_get_saleor_taxed_amounts(currency, amount, amount_tax, expected_output):
+    # When
+    (taxed_amount,) = get_saleor_taxed_amounts([amount], [amount_tax], currency)
+
+    # Then
+    assert taxed_amount == expected_output
+
+
+async def test_get_saleor_taxed_amounts_zero_net_amount():
+    # When, Then
+    with pytest.raises(CannotCalculateTaxForZeroNetValueError):
+        get_saleor_taxed_amounts([1000, 0], [230, 0], "USD")
+
+
 async def test_stripe_currencies_mapping():
     # Test that all zero-decimal currencies are properly configured
     zero_decimal_currencies = [
@@ -168,3 +214,75 @@ async def test_stripe_currencies_mapping():
 
     for currency in three_decimal_currencies:
         assert stripe_currencies[currency] == 3
+
+
+async def test_currency_registry_covers_iso_4217():
+    # Then
+    assert set(CURRENCIES) == iso_4217_codes
+    for code, currency in CURRENCIES.items():
+        assert currency.exponent == stripe_currencies.get(code, 2)
+        assert currency.multiplier == 10**currency.exponent
+    # ISK has no minor unit in ISO 4217 but Stripe amounts have two decimals.
+    assert CURRENCIES["ISK"].exponent == 2
+    assert CURRENCIES["ISK"].whole_units
+    assert not CURRENCIES["USD"].whole_units
+
+
+async def test_get_currency_unknown_code():
+    # When
+    currency = get_currency("xyz")
+
+    # Then
+    assert (currency.code, currency.exponent, currency.whole_units) == ("XYZ", 2, False)
+    assert get_currency("usd") is CURRENCIES["USD"]
+
+
+@pytest.mark.parametrize(
+    ("currency", "amount", "expected_output"),
+    [
+        ("HUF", 1500.0, 150000),
+        ("HUF", 1500.5, 150000),
+        ("TWD", 299.99, 29900),
+        ("ISK", 1000.75, 100000),
+        ("USD", 299.99, 29999),
+    ],
+)
+async def test_get_stripe_capture_amount_from_saleor_money(currency, amount, expected_output):
+    # When
+    stripe_amount = get_stripe_capture_amount_from_saleor_money(
+        Money(currency=currency, amount=amount)
+    )
+
+    # Then
+    assert stripe_amount == expected_output
+
+
+@pytest.mark.parametrize("currency", ["USD", "JPY", "BHD", "ISK"])
+async def test_stripe_amount_round_trips_through_saleor_amount(currency):
+    # Given
+    rng = random.Random(currency)
+    amounts = [rng.randrange(-(10**12), 10**12) for _ in range(2000)]
+
+    for amount in amounts:
+        # When
+        saleor_amount = get_saleor_amount_from_stripe_amount(amount=amount, currency=currency)
+        money = Money(currency=currency, amount=float(saleor_amount))
+
+        # Then
+        assert get_stripe_amount_from_saleor_money(money) == amount
+
+
+@pytest.mark.parametrize("currency", ["USD", "JPY", "BHD"])
+async def test_stripe_amount_truncates_like_decimal_conversion(currency):
+    # Given
+    rng = random.Random(currency)
+    multiplier = 10 ** get_decimals_for_stripe(currency)
+
+    for _ in range(2000):
+        amount = round(rng.uniform(-(10**9), 10**9), rng.randrange(8))
+
+        # When
+        stripe_amount = get_currency(currency).to_stripe_amount(amount)
+
+        # Then
+        assert stripe_amount == int(Decimal(str(amount)) * multiplier)
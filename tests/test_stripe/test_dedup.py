@@ -0,0 +1,69 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from nimara_stripe.services.stripe.dedup import (
+    CachedProcessedEventStore,
+    MemoryProcessedEventStore,
+    SQLiteProcessedEventStore,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def sqlite_store(tmp_path) -> SQLiteProcessedEventStore:
+    return SQLiteProcessedEventStore(str(tmp_path / "stripe_events.sqlite3"), ttl=60)
+
+
+async def test_sqlite_store_adds_event_once(sqlite_store):
+    # When
+    first = await sqlite_store.add("evt_1")
+    second = await sqlite_store.add("evt_1")
+    await sqlite_store.discard("evt_1")
+    after_discard = await sqlite_store.add("evt_1")
+
+    # Then
+    assert (first, second, after_discard) == (True, False, True)
+
+
+async def test_sqlite_store_readds_expired_event(sqlite_store):
+    # Given
+    await sqlite_store.add("evt_1")
+
+    # When
+    with patch("nimara_stripe.services.stripe.dedup.time.time", return_value=2e9):
+        result = await sqlite_store.add("evt_1")
+
+    # Then
+    assert result is True
+
+
+async def test_cached_store_skips_shared_store_for_known_events():
+    # Given
+    shared = AsyncMock()
+    shared.add.return_value = True
+    store = CachedProcessedEventStore(MemoryProcessedEventStore(maxsize=10, ttl=60), shared)
+
+    # When
+    first = await store.add("evt_1")
+    second = await store.add("evt_1")
+
+    # Then
+    assert (first, second) == (True, False)
+    shared.add.assert_awaited_once_with("evt_1")
+
+
+async def test_cached_store_forgets_event_when_shared_store_fails():
+    # Given
+    shared = AsyncMock()
+    shared.add.side_effect = [RuntimeError("store is down"), True]
+    store = CachedProcessedEventStore(MemoryProcessedEventStore(maxsize=10, ttl=60), shared)
+
+    # When
+    with pytest.raises(RuntimeError):
+        await store.add("evt_1")
+    result = await store.add("evt_1")
+
+    # Then
+    assert result is True
@@ -0,0 +1,70 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from nimara_stripe.services.stripe.idempotency import (
+    clear_idempotent_responses,
+    get_idempotency_key,
+    run_idempotent,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    yield
+    clear_idempotent_responses()
+
+
+def test_get_idempotency_key_depends_on_action_data():
+    # When
+    key = get_idempotency_key("example.saleor.com", "transaction_1", "refund", 1000)
+
+    # Then
+    assert key == get_idempotency_key("example.saleor.com", "transaction_1", "refund", 1000)
+    assert key != get_idempotency_key("example.saleor.com", "transaction_1", "refund", 500)
+    assert key != get_idempotency_key("example.saleor.com", "transaction_1", "charge", 1000)
+    assert key != get_idempotency_key("other.saleor.com", "transaction_1", "refund", 1000)
+    assert key != get_idempotency_key(
+        "example.saleor.com", "transaction_1", "refund", 1000, "2024-05-01T12:00:00+00:00"
+    )
+    assert len(key) <= 255
+
+
+async def test_run_idempotent_coalesces_concurrent_retries():
+    # Given
+    release = asyncio.Event()
+
+    async def handle():
+        await release.wait()
+        return {"pspReference": "pi_1"}
+
+    func = AsyncMock(side_effect=handle)
+
+    # When
+    calls = [asyncio.create_task(run_idempotent("key", func)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*calls)
+    replayed = await run_idempotent("key", func)
+
+    # Then
+    func.assert_awaited_once()
+    assert results == [{"pspReference": "pi_1"}] * 3
+    assert replayed == {"pspReference": "pi_1"}
+
+
+async def test_run_idempotent_does_not_cache_failures():
+    # Given
+    func = AsyncMock(side_effect=[RuntimeError("Stripe is down"), {"pspReference": "pi_1"}])
+
+    # When
+    with pytest.raises(RuntimeError):
+        await run_idempotent("key", func)
+    result = await run_idempotent("key", func)
+
+    # Then
+    assert result == {"pspReference": "pi_1"}
+    assert func.await_count == 2
@@ -0,0 +1,59 @@
+from nimara_stripe.services.stripe.ordering import (
+    PaymentIntentEventOrdering,
+    get_superseded_events,
+)
+
+
+def payment_intent_event(event_type: str, created: int, payment_intent_id: str = "pi_1") -> dict:
+    return {
+        "type": event_type,
+        "created": created,
+        "data": {"object": {"id": payment_intent_id}},
+    }
+
+
+def test_ordering_rejects_events_older_than_reported_state():
+    # Given
+    ordering = PaymentIntentEventOrdering(maxsize=10, ttl=60)
+    ordering.accept(payment_intent_event("payment_intent.succeeded", created=200))
+
+    # When
+    late_processing = ordering.accept(payment_intent_event("payment_intent.processing", 100))
+    redelivery = ordering.accept(payment_intent_event("payment_intent.succeeded", created=200))
+    other_intent = ordering.accept(payment_intent_event("payment_intent.processing", 100, "pi_2"))
+    refund = ordering.accept({"type": "charge.refunded", "created": 50, "data": {"object": {}}})
+
+    # Then
+    assert late_processing is False
+    assert redelivery is True
+    assert other_intent is True
+    assert refund is True
+
+
+def test_ordering_uses_lifecycle_within_same_second():
+    # Given
+    ordering = PaymentIntentEventOrdering(maxsize=10, ttl=60)
+    ordering.accept(payment_intent_event("payment_intent.succeeded", created=100))
+
+    # When
+    result = ordering.accept(payment_intent_event("payment_intent.processing", created=100))
+
+    # Then
+    assert result is False
+
+
+def test_get_superseded_events():
+    # Given
+    events = [
+        payment_intent_event("payment_intent.succeeded", created=200),
+        payment_intent_event("payment_intent.processing", created=100),
+        None,
+        payment_intent_event("payment_intent.created", created=100, payment_intent_id="pi_2"),
+        payment_intent_event("payment_intent.processing", created=150, payment_intent_id="pi_2"),
+    ]
+
+    # When
+    result = get_superseded_events(events)
+
+    # Then
+    assert result == {1, 3}
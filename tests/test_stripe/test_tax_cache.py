@@ -0,0 +1,82 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from nimara_stripe.services.stripe.tax_cache import (
+    clear_tax_calculations,
+    get_tax_calculation_key,
+    run_cached_tax_calculation,
+)
+
+pytestmark = pytest.mark.anyio
+
+PARAMS = {
+    "currency": "USD",
+    "line_items": [{"amount": 1000, "quantity": 1, "reference": "SKU1"}],
+    "shipping_cost": {"amount": 500},
+}
+BASE_RESPONSE = {"shipping_tax_rate": 0, "lines": []}
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    yield
+    clear_tax_calculations()
+
+
+def test_get_tax_calculation_key_is_canonical():
+    # Given
+    reordered = {"shipping_cost": {"amount": 500}, **PARAMS}
+    other_lines = {**PARAMS, "line_items": [{"amount": 2000, "quantity": 1}]}
+
+    # When
+    key = get_tax_calculation_key("example.saleor.com", "default", PARAMS, BASE_RESPONSE)
+
+    # Then
+    assert key == get_tax_calculation_key(
+        "example.saleor.com", "default", reordered, BASE_RESPONSE
+    )
+    assert key != get_tax_calculation_key(
+        "example.saleor.com", "default", other_lines, BASE_RESPONSE
+    )
+    assert key != get_tax_calculation_key("example.saleor.com", "other", PARAMS, BASE_RESPONSE)
+    assert key != get_tax_calculation_key("other.saleor.com", "default", PARAMS, BASE_RESPONSE)
+
+
+async def test_run_cached_tax_calculation_calculates_once():
+    # Given
+    func = AsyncMock(return_value={"lines": []})
+
+    # When
+    first = await run_cached_tax_calculation("key", func)
+    second = await run_cached_tax_calculation("key", func)
+
+    # Then
+    func.assert_awaited_once()
+    assert first == second == {"lines": []}
+
+
+async def test_run_cached_tax_calculation_does_not_cache_failures():
+    # Given
+    func = AsyncMock(side_effect=[RuntimeError("Stripe is down"), {"lines": []}])
+
+    # When
+    with pytest.raises(RuntimeError):
+        await run_cached_tax_calculation("key", func)
+    result = await run_cached_tax_calculation("key", func)
+
+    # Then
+    assert result == {"lines": []}
+
+
+async def test_run_cached_tax_calculation_returns_copies():
+    # Given
+    func = AsyncMock(return_value={"lines": [{"total_gross_amount": 10}]})
+    first = await run_cached_tax_calculation("key", func)
+
+    # When
+    first["lines"][0]["total_gross_amount"] = 0
+    second = await run_cached_tax_calculation("key", func)
+
+    # Then
+    assert second == {"lines": [{"total_gross_amount": 10}]}
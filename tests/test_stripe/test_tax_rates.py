@@ -0,0 +1,63 @@
+import pytest
+
+from nimara_stripe.services.stripe.tax_rates import TaxRateCache
+from tests.test_stripe.stripe_mock import FakeTaxCalculation, LineItem, LineItemsData, Money
+
+
+def tax_params(postal_code="00-001", amount=10000):
+    return {
+        "currency": "PLN",
+        "customer_details": {
+            "address": {"country": "PL", "state": "", "postal_code": postal_code},
+            "address_source": "shipping",
+        },
+        "line_items": [
+            {"amount": amount, "quantity": 1, "tax_code": "txcd_99999999"},
+            {"amount": 5000, "quantity": 1},
+        ],
+        "shipping_cost": {"amount": 1000},
+    }
+
+
+@pytest.fixture
+def rates():
+    rates = TaxRateCache(maxsize=10, ttl=60)
+    rates.learn(
+        "example.saleor.com",
+        "default",
+        tax_params(),
+        FakeTaxCalculation(
+            amount_total=18740,
+            shipping_cost=Money(amount=1000, amount_tax=230),
+            currency="PLN",
+            line_items=LineItemsData(
+                data=[
+                    LineItem(amount=10000, amount_tax=2300),
+                    LineItem(amount=5000, amount_tax=400),
+                ]
+            ),
+        ),
+    )
+    return rates
+
+
+def test_estimate_applies_learned_rates_per_tax_code(rates):
+    # When
+    estimate = rates.estimate("example.saleor.com", "default", tax_params(amount=25005))
+
+    # Then
+    assert estimate.currency == "PLN"
+    assert estimate.shipping_cost.amount_tax == 230
+    assert [(line.amount, line.amount_tax) for line in estimate.line_items.data] == [
+        (25005, 5751),
+        (5000, 400),
+    ]
+
+
+def test_estimate_requires_rates_for_the_same_address_and_channel(rates):
+    # When, Then
+    assert (
+        rates.estimate("example.saleor.com", "default", tax_params(postal_code="00-002")) is None
+    )
+    assert rates.estimate("example.saleor.com", "other", tax_params()) is None
+    assert rates.estimate("other.saleor.com", "default", tax_params()) is None
@@ -2,10 +2,7 @@ from unittest.mock import AsyncMock
 
 import pytest
 
-from graphql_client import (
-    TransactionActionEnum,
-    TransactionEventTypeEnum,
-)
+from graphql_client.enums import TransactionActionEnum, TransactionEventTypeEnum
 from nimara_stripe.services.stripe.webhook_utils import (
     get_available_actions_for_type,
     get_refund_updated_event_type,